@@ -1,7 +1,49 @@
 # alpha_vantage_api.py
 import requests
+import threading
 import time
 
+from config import API_CALLS_PER_MINUTE, INTRADAY_INTERVALS, PRICE_CACHE_EXPIRY_DAYS
+
+
+class RateLimiter:
+    """
+    Limitador de requisições (token bucket) seguro entre threads
+
+    O plano gratuito da Alpha Vantage permite 5 requisições por minuto.
+    Para dividir o orçamento entre N processos/máquinas, cada um recebe
+    um limitador com calls_per_minute / N.
+    """
+
+    def __init__(self, calls_per_minute=5, burst=None):
+        """
+        Inicializa o limitador
+
+        Args:
+            calls_per_minute (float): Requisições permitidas por minuto
+            burst (float): Máximo de requisições em rajada (padrão = calls_per_minute)
+        """
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1.0, burst if burst is not None else calls_per_minute)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver orçamento para uma requisição"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+            # Reserva o token já; se faltar, espera o tempo proporcional
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
 class AlphaVantageAPI:
     """
     Classe para interagir com a API da Alpha Vantage
@@ -10,14 +52,18 @@ class AlphaVantageAPI:
 
     BASE_URL = "https://www.alphavantage.co/query"
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, cache=None, rate_limiter=None):
         """
         Inicializa a API com a chave fornecida
 
         Args:
             api_key (str): Chave da API Alpha Vantage
+            cache (CacheManager): Cache em disco das respostas (opcional)
+            rate_limiter (RateLimiter): Limitador de requisições (padrão: API_CALLS_PER_MINUTE)
         """
         self.api_key = api_key
+        self.cache = cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter(API_CALLS_PER_MINUTE)
 
     def _make_request(self, params):
         """
@@ -30,13 +76,13 @@ class AlphaVantageAPI:
             dict: Resposta da API em formato JSON
         """
         try:
+            # Respeita o rate limit da API (5 req/min no plano gratuito)
+            self.rate_limiter.acquire()
+
             print(f"🔄 Fazendo requisição para: {params.get('function', 'N/A')}")
 
             response = requests.get(self.BASE_URL, params=params, timeout=30)
 
-            # Adiciona delay para respeitar rate limit da API (5 req/min)
-            time.sleep(12)
-
             response.raise_for_status()
             data = response.json()
 
@@ -54,6 +100,33 @@ class AlphaVantageAPI:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Erro na requisição: {str(e)}")
 
+    def _cached_request(self, cache_key, params, max_age_days=None):
+        """
+        Faz a requisição passando pelo cache em disco (se configurado)
+
+        Args:
+            cache_key (str): Chave do cache (ex: 'profile_SPY')
+            params (dict): Parâmetros da requisição
+            max_age_days (float): Validade da entrada (None = padrão do cache)
+
+        Returns:
+            dict: Resposta da API em formato JSON
+        """
+        if self.cache is None:
+            return self._make_request(params)
+
+        data = self.cache.get(cache_key, max_age_days)
+        if data is not None:
+            return data
+
+        data = self._make_request(params)
+
+        # Mensagens informativas (ex: limite diário) não vão para o cache
+        if 'Information' not in data:
+            self.cache.set(cache_key, data)
+
+        return data
+
     def get_etf_profile(self, symbol):
         """
         Obtém o perfil de um ETF
@@ -70,7 +143,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"profile_{symbol.upper()}", params)
 
     def get_time_series_daily(self, symbol, outputsize='compact'):
         """
@@ -90,7 +163,36 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"daily_{symbol.upper()}_{outputsize}", params, max_age_days=PRICE_CACHE_EXPIRY_DAYS)
+
+    def get_time_series_intraday(self, symbol, interval='5min', outputsize='compact'):
+        """
+        Obtém série temporal intraday de preços
+
+        A validade do cache é de um intervalo: antes disso não há barra nova
+        para buscar.
+
+        Args:
+            symbol (str): Símbolo da ação/ETF
+            interval (str): '1min', '5min', '15min' ou '60min'
+            outputsize (str): 'compact' (últimas 100 barras) ou 'full' (últimos 30 dias)
+
+        Returns:
+            dict: Dados de preços (bloco 'Time Series (<interval>)')
+        """
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Intervalo intraday inválido: {interval} (use {', '.join(INTRADAY_INTERVALS)})")
+
+        params = {
+            'function': 'TIME_SERIES_INTRADAY',
+            'symbol': symbol,
+            'interval': interval,
+            'outputsize': outputsize,
+            'apikey': self.api_key
+        }
+
+        max_age_days = INTRADAY_INTERVALS[interval] / (24 * 60)
+        return self._cached_request(f"intraday_{symbol.upper()}_{interval}_{outputsize}", params, max_age_days=max_age_days)
 
     def get_sma(self, symbol, interval='daily', time_period=20, series_type='close'):
         """
@@ -114,7 +216,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"sma_{symbol.upper()}_{interval}_{time_period}", params, max_age_days=PRICE_CACHE_EXPIRY_DAYS)
 
     def get_rsi(self, symbol, interval='daily', time_period=14, series_type='close'):
         """
@@ -138,7 +240,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"rsi_{symbol.upper()}_{interval}_{time_period}", params, max_age_days=PRICE_CACHE_EXPIRY_DAYS)
 
     def get_company_overview(self, symbol):
         """
@@ -156,7 +258,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"overview_{symbol.upper()}", params)
 
     def get_income_statement(self, symbol):
         """
@@ -174,7 +276,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"income_{symbol.upper()}", params)
 
     def get_balance_sheet(self, symbol):
         """
@@ -192,7 +294,7 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"balance_{symbol.upper()}", params)
 
     def get_cash_flow(self, symbol):
         """
@@ -210,9 +312,9 @@ class AlphaVantageAPI:
             'apikey': self.api_key
         }
 
-        return self._make_request(params)
+        return self._cached_request(f"cashflow_{symbol.upper()}", params)
 
-    def get_news_sentiment(self, tickers=None, topics=None, time_from=None, time_to=None, limit=50):
+    def get_news_sentiment(self, tickers=None, topics=None, time_from=None, time_to=None, limit=50, sort=None):
         """
         Obtém notícias e análise de sentimento
 
@@ -222,6 +324,7 @@ class AlphaVantageAPI:
             time_from (str): Data início formato YYYYMMDDTHHMM
             time_to (str): Data fim formato YYYYMMDDTHHMM
             limit (int): Número de notícias (max 1000)
+            sort (str): 'LATEST' (padrão da API), 'EARLIEST' ou 'RELEVANCE'
 
         Returns:
             dict: Notícias e sentimento
@@ -241,6 +344,8 @@ class AlphaVantageAPI:
             params['time_to'] = time_to
         if limit:
             params['limit'] = limit
+        if sort:
+            params['sort'] = sort
 
         return self._make_request(params)
 
@@ -0,0 +1,103 @@
+# app_common.py
+"""
+Recursos compartilhados pelas páginas do app
+
+Singletons (st.cache_resource, um por processo e compartilhados entre
+sessões) e funções usadas por mais de uma página. Os recursos de uma só
+página ficam no módulo dela, que só é importado quando a página é aberta.
+"""
+import streamlit as st
+
+from alpha_vantage_api import AlphaVantageAPI
+from cache_manager import CacheManager
+from config import ALPHA_VANTAGE_API_KEY, ETF_UNIVERSE
+from covariance import CovarianceEngine
+from etf_crawler import holdings_store_path
+from fundamentals_store import FundamentalsStore
+from holdings_store import HoldingsStore
+from overlap_calculator import OverlapCalculator
+from price_store import PriceGapError, PriceStore
+
+
+# Inicializa API
+@st.cache_resource
+def get_api():
+    return AlphaVantageAPI(ALPHA_VANTAGE_API_KEY, cache=CacheManager())
+
+api = get_api()
+
+# Calculadora de overlap compartilhada (mantém o repositório de holdings em memória)
+@st.cache_resource
+def get_overlap_calculator():
+    # Reaproveita o HoldingsStore gerado pelo crawler (etf_crawler.py), se existir
+    store_path = holdings_store_path(ETF_UNIVERSE)
+    store = HoldingsStore.load(store_path) if store_path.exists() else None
+    return OverlapCalculator(ALPHA_VANTAGE_API_KEY, store=store, api=api)
+
+# Armazém local de fundamentos (SQLite, para screens entre empresas)
+@st.cache_resource
+def get_fundamentals_store():
+    return FundamentalsStore()
+
+# Séries de preços locais (memmap, compartilhadas entre sessões)
+@st.cache_resource
+def get_price_store():
+    return PriceStore()
+
+# Grava uma resposta diária no price store; se ela deixaria um buraco depois da
+# última barra local (resposta 'compact' de um símbolo desatualizado), busca o
+# histórico completo
+def store_daily_prices(symbol, data):
+    store = get_price_store()
+    try:
+        return store.upsert_daily(symbol, data)
+    except PriceGapError:
+        data = api.get_time_series_daily(symbol, 'full')
+        if 'Time Series (Daily)' not in data:
+            raise Exception(data.get('Information') or data.get('Error Message') or f"No price data available for {symbol}")
+        return store.upsert_daily(symbol, data)
+
+# Garante o histórico diário de um símbolo no price store
+def load_daily_prices(symbol, min_bars=300):
+    store = get_price_store()
+
+    # Histórico completo só na primeira vez; depois basta atualizar as últimas barras
+    outputsize = 'compact' if store.length(symbol) >= min_bars else 'full'
+    data = api.get_time_series_daily(symbol, outputsize)
+
+    if 'Time Series (Daily)' not in data:
+        raise Exception(data.get('Information') or data.get('Error Message') or f"No price data available for {symbol}")
+
+    store_daily_prices(symbol, data)
+    return store.read(symbol)
+
+# Mostra quantos símbolos têm histórico local e oferece baixar os que faltam
+def price_coverage(symbols, key):
+    store = get_price_store()
+    missing = [s for s in symbols if s not in store]
+    st.caption(f"{len(symbols) - len(missing)} of {len(symbols)} symbols have local price history")
+
+    if missing:
+        with st.expander(f"📥 {len(missing)} symbols without local prices"):
+            st.write(", ".join(missing))
+            st.caption(f"Downloading is limited by the API rate (~{len(missing) / 5:.0f} minutes for uncached symbols)")
+            if st.button("📥 Download missing prices", key=key):
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+                for idx, sym in enumerate(missing):
+                    status_text.text(f"📥 {sym} ({idx + 1}/{len(missing)})")
+                    try:
+                        load_daily_prices(sym)
+                    except Exception as e:
+                        st.warning(f"⚠️ {sym}: {str(e)}")
+                    progress_bar.progress((idx + 1) / len(missing))
+                progress_bar.empty()
+                status_text.empty()
+                st.rerun()
+
+    return [s for s in symbols if s not in missing]
+
+# Matrizes de covariância/correlação (atualização incremental por universo)
+@st.cache_resource
+def get_covariance_engine():
+    return CovarianceEngine(get_price_store())
@@ -0,0 +1,57 @@
+# app_session.py
+"""
+Session state leve: as sessões guardam só chaves para o PayloadStore do processo
+
+Os resultados grandes (perfil do ETF, fundamentos, overlap, simulações...)
+ficam uma vez no PayloadStore, compartilhados entre as sessões que olham o
+mesmo conteúdo; st.session_state[slot] guarda só a chave. hold() guarda,
+held() lê (None se a referência foi solta pelo limite de memória da sessão
+ou por ociosidade, como se nada tivesse sido buscado).
+"""
+import uuid
+
+import streamlit as st
+
+from payload_store import PayloadStore
+
+# Payloads das sessões (um por processo, com limite de memória por sessão)
+@st.cache_resource
+def get_payload_store():
+    return PayloadStore()
+
+
+# Identificador da sessão no PayloadStore (criado no primeiro acesso)
+def session_id():
+    if '_payload_session' not in st.session_state:
+        st.session_state._payload_session = uuid.uuid4().hex
+    return st.session_state._payload_session
+
+
+# Marca a sessão como ativa (chamado a cada execução do script)
+def touch_session():
+    get_payload_store().touch(session_id())
+
+
+# Guarda um valor sob key e aponta st.session_state[slot] para ele; devolve o
+# valor compartilhado (o já guardado, se a chave existia e replace=False)
+def hold(slot, key, value, replace=False):
+    value = get_payload_store().put(session_id(), slot, key, value, replace)
+    st.session_state[slot] = key
+    return value
+
+
+# Valor do slot (None se nada foi guardado ou a referência foi solta)
+def held(slot):
+    key = st.session_state.get(slot)
+    if key is None:
+        return None
+    value = get_payload_store().get(session_id(), slot, key)
+    if value is None:
+        st.session_state[slot] = None
+    return value
+
+
+# Solta a referência do slot
+def drop(slot):
+    get_payload_store().release(session_id(), slot)
+    st.session_state[slot] = None
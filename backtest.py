@@ -0,0 +1,329 @@
+# backtest.py
+"""
+Backtest vetorizado de estratégias de sinal sobre o histórico diário local
+
+Cada estratégia vira uma matriz de posições (barras x combinações de
+parâmetros), então centenas de combinações de um símbolo são avaliadas
+com algumas operações de array. A posição decidida no fechamento de um dia
+vale a partir do dia seguinte (sem olhar o futuro) e cada mudança de
+posição paga o custo de transação.
+
+Varreduras de parâmetros em vários símbolos usam um pool de processos; os
+preços ficam em memória compartilhada, sem cópia por tarefa.
+
+Uso:
+    python backtest.py --universe optimized --strategy sma_cross -o sweep.csv
+    python backtest.py --symbols SPY QQQ --strategy rsi --cost-bps 5 --workers 4
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from config import ETF_UNIVERSE
+from etf_list import load_universe
+from price_store import PriceStore
+from utils import pool_context
+
+YEAR_BARS = 252
+
+# Combinações avaliadas de uma vez (limita a memória: barras x combinações)
+CHUNK_SIZE = 512
+
+# Grades padrão das varreduras
+DEFAULT_GRIDS = {
+    'sma_cross': {'fast': range(5, 101, 5), 'slow': range(20, 201, 10)},
+    'rsi': {'period': (7, 14, 21), 'lower': range(20, 41, 5), 'upper': range(60, 81, 5)},
+}
+
+# Preços compartilhados com os processos do pool
+_SHARED = None
+
+
+def sma_cross_positions(close, fast, slow):
+    """
+    Posições do cruzamento de médias: comprado quando SMA rápida > SMA lenta
+
+    Args:
+        close (np.ndarray): Fechamentos (n,)
+        fast (array-like): Períodos da média rápida (um por combinação)
+        slow (array-like): Períodos da média lenta
+
+    Returns:
+        np.ndarray: Posições (n, combinações) em {0, 1}
+    """
+    fast = np.atleast_1d(fast)
+    slow = np.atleast_1d(slow)
+    periods = np.unique(np.concatenate([fast, slow]))
+
+    # Cada período é calculado uma única vez para todas as combinações
+    means = np.column_stack([indicators.sma(close, int(p)) for p in periods])
+    col = {int(p): i for i, p in enumerate(periods)}
+
+    fast_means = means[:, [col[int(p)] for p in fast]]
+    slow_means = means[:, [col[int(p)] for p in slow]]
+    with np.errstate(invalid='ignore'):
+        return (fast_means > slow_means).astype(np.float64)
+
+
+def rsi_positions(close, period, lower, upper):
+    """
+    Posições de reversão por RSI: compra abaixo de lower, vende acima de upper
+
+    Args:
+        close (np.ndarray): Fechamentos (n,)
+        period (array-like): Períodos do RSI (um por combinação)
+        lower (array-like): Nível de entrada
+        upper (array-like): Nível de saída
+
+    Returns:
+        np.ndarray: Posições (n, combinações) em {0, 1}
+    """
+    period = np.atleast_1d(period)
+    lower = np.atleast_1d(lower).astype(np.float64)
+    upper = np.atleast_1d(upper).astype(np.float64)
+
+    values = {int(p): indicators.rsi(close, int(p)) for p in np.unique(period)}
+    rsi = np.column_stack([values[int(p)] for p in period])
+
+    # Eventos: 1 na entrada, 0 na saída; entre eventos a posição se mantém
+    with np.errstate(invalid='ignore'):
+        events = np.where(rsi < lower, 1.0, np.where(rsi > upper, 0.0, np.nan))
+    n = len(events)
+    rows = np.where(np.isfinite(events), np.arange(n)[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    positions = events[rows, np.arange(events.shape[1])]
+    return np.nan_to_num(positions, nan=0.0)
+
+
+STRATEGIES = {
+    'sma_cross': (sma_cross_positions, ('fast', 'slow')),
+    'rsi': (rsi_positions, ('period', 'lower', 'upper')),
+}
+
+
+def strategy_returns(close, positions, cost_bps=0.0):
+    """
+    Retornos diários das estratégias, líquidos de custos
+
+    Args:
+        close (np.ndarray): Fechamentos (n,)
+        positions (np.ndarray): Posições decididas em cada fechamento (n, k)
+        cost_bps (float): Custo por mudança de posição, em pontos-base do valor negociado
+
+    Returns:
+        np.ndarray: Retornos (n, k); o primeiro dia é zero
+    """
+    returns = np.zeros(len(close))
+    returns[1:] = close[1:] / close[:-1] - 1.0
+
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+    return held * returns[:, None] - turnover * cost_bps / 1e4
+
+
+def performance(returns, positions=None):
+    """
+    Métricas de desempenho de cada coluna de retornos
+
+    Args:
+        returns (np.ndarray): Retornos diários (n, k)
+        positions (np.ndarray): Posições (n, k), para contar operações e exposição
+
+    Returns:
+        dict: Arrays de total_return, cagr, volatility, sharpe, max_drawdown,
+            trades e exposure (frações)
+    """
+    returns = np.atleast_2d(returns.T).T
+    n = len(returns)
+    equity = np.cumprod(1.0 + returns, axis=0)
+    total = equity[-1] - 1.0
+    years = max(n / YEAR_BARS, 1e-9)
+
+    mean = returns.mean(axis=0)
+    std = returns.std(axis=0, ddof=1) if n > 1 else np.zeros(returns.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(YEAR_BARS), np.nan)
+        cagr = np.where(equity[-1] > 0, equity[-1] ** (1.0 / years) - 1.0, -1.0)
+
+    stats = {
+        'total_return': total,
+        'cagr': cagr,
+        'volatility': std * np.sqrt(YEAR_BARS),
+        'sharpe': sharpe,
+        'max_drawdown': (equity / np.maximum.accumulate(equity, axis=0) - 1.0).min(axis=0),
+    }
+    if positions is not None:
+        stats['trades'] = (np.diff(positions, axis=0, prepend=0.0) > 0).sum(axis=0)
+        stats['exposure'] = positions.mean(axis=0)
+    return stats
+
+
+def backtest(close, strategy, cost_bps=0.0, **params):
+    """
+    Backtest de uma ou várias combinações de parâmetros de um símbolo
+
+    Args:
+        close (array-like): Fechamentos (n,) sem lacunas
+        strategy (str): 'sma_cross' ou 'rsi'
+        cost_bps (float): Custo por mudança de posição (pontos-base)
+        **params: Parâmetros da estratégia (escalares ou arrays do mesmo tamanho)
+
+    Returns:
+        tuple: (retornos (n, k), posições (n, k), métricas de performance())
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia desconhecida: {strategy} (use {', '.join(STRATEGIES)})")
+
+    func, names = STRATEGIES[strategy]
+    close = np.asarray(close, dtype=np.float64)
+    positions = func(close, *(params[name] for name in names))
+    returns = strategy_returns(close, positions, cost_bps)
+    return returns, positions, performance(returns, positions)
+
+
+def parameter_grid(strategy, grid=None):
+    """
+    Todas as combinações válidas de uma grade
+
+    Args:
+        strategy (str): 'sma_cross' ou 'rsi'
+        grid (dict): {parâmetro: valores} (padrão = DEFAULT_GRIDS)
+
+    Returns:
+        dict: {parâmetro: array}, uma posição por combinação
+    """
+    grid = grid or DEFAULT_GRIDS[strategy]
+    names = STRATEGIES[strategy][1]
+    combos = np.array(list(itertools.product(*(list(grid[name]) for name in names))), dtype=np.int64)
+
+    # Combinações sem sentido: média rápida >= lenta, entrada >= saída
+    if strategy == 'sma_cross':
+        combos = combos[combos[:, 0] < combos[:, 1]]
+    elif strategy == 'rsi':
+        combos = combos[combos[:, 1] < combos[:, 2]]
+
+    return {name: combos[:, i] for i, name in enumerate(names)}
+
+
+def _sweep_symbol(j, strategy, params, cost_bps, close_panel=None):
+    # Varre todas as combinações de um símbolo (coluna j do painel), em blocos
+    panel = close_panel if close_panel is not None else _SHARED[1]
+    close = panel[:, j]
+    valid = np.flatnonzero(np.isfinite(close))
+    if len(valid) < 2:
+        return j, None
+
+    # Do primeiro ao último pregão do símbolo; lacunas repetem o último preço
+    close = pd.Series(close[valid[0]:valid[-1] + 1]).ffill().to_numpy()
+
+    total = len(next(iter(params.values())))
+    parts = []
+    for start in range(0, total, CHUNK_SIZE):
+        chunk = {name: values[start:start + CHUNK_SIZE] for name, values in params.items()}
+        _, _, stats = backtest(close, strategy, cost_bps, **chunk)
+        parts.append(stats)
+
+    return j, {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+
+def _init_worker(name, shape):
+    global _SHARED
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED = (shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf))
+
+
+def sweep(panel, strategy, grid=None, cost_bps=0.0, workers=None):
+    """
+    Varredura de parâmetros em todos os símbolos de um painel
+
+    Args:
+        panel (PricePanel): Painel com a coluna 'close'
+        strategy (str): 'sma_cross' ou 'rsi'
+        grid (dict): Grade de parâmetros (padrão = DEFAULT_GRIDS)
+        cost_bps (float): Custo por mudança de posição (pontos-base)
+        workers (int): Processos (padrão = número de CPUs; 1 = sem pool)
+
+    Returns:
+        pd.DataFrame: Uma linha por (símbolo, combinação) com as métricas
+    """
+    params = parameter_grid(strategy, grid)
+    close = np.ascontiguousarray(panel['close'], dtype=np.float64)
+    symbols = panel.symbols
+    workers = workers or os.cpu_count() or 1
+
+    results = {}
+    if workers == 1 or len(symbols) < 2:
+        for j in range(len(symbols)):
+            results[j] = _sweep_symbol(j, strategy, params, cost_bps, close)[1]
+    else:
+        # O painel vai uma única vez para a memória compartilhada
+        shm = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        try:
+            np.ndarray(close.shape, dtype=np.float64, buffer=shm.buf)[:] = close
+            with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker,
+                                     initargs=(shm.name, close.shape)) as executor:
+                futures = [executor.submit(_sweep_symbol, j, strategy, params, cost_bps) for j in range(len(symbols))]
+                for future in futures:
+                    j, stats = future.result()
+                    results[j] = stats
+        finally:
+            shm.close()
+            shm.unlink()
+
+    frames = []
+    for j, stats in results.items():
+        if stats is None:
+            continue
+        frame = pd.DataFrame({'symbol': symbols[j], **params, **stats})
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros de estratégias sobre o price store")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--universe', help="Universo ou arquivo de símbolos")
+    source.add_argument('--symbols', nargs='+', help="Símbolos")
+    parser.add_argument('--strategy', choices=list(STRATEGIES), default='sma_cross')
+    parser.add_argument('--cost-bps', type=float, default=5.0, help="Custo por mudança de posição (pontos-base)")
+    parser.add_argument('--years', type=int, help="Histórico usado (anos; padrão = tudo)")
+    parser.add_argument('--workers', type=int, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--top', type=int, default=20, help="Melhores combinações exibidas (por Sharpe)")
+    parser.add_argument('-o', '--output', help="Arquivo CSV com todas as combinações")
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or load_universe(args.universe or ETF_UNIVERSE)
+    start = None
+    if args.years:
+        start = np.datetime64('today', 'D') - np.timedelta64(int(args.years * 366), 'D')
+    panel = PriceStore().panel(symbols, start=start)
+
+    n_combos = len(next(iter(parameter_grid(args.strategy).values())))
+    begin = time.perf_counter()
+    df = sweep(panel, args.strategy, cost_bps=args.cost_bps, workers=args.workers)
+    elapsed = time.perf_counter() - begin
+
+    if args.output:
+        df.to_csv(args.output, index=False)
+    if len(df):
+        print(df.sort_values('sharpe', ascending=False).head(args.top).to_string(index=False))
+
+    total = len(panel.symbols) * n_combos
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ {len(panel.symbols)} símbolos x {n_combos} combinações = {total:,} backtests "
+          f"em {elapsed:.2f}s ({rate:,.0f}/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+# batch_overlap.py
+"""
+Cálculo de overlap em lote, via linha de comando (não precisa de Streamlit)
+
+Uso:
+    python batch_overlap.py --pairs pares.csv -o overlap.csv
+    python batch_overlap.py --universe optimized -o overlap.parquet --workers 8
+
+O arquivo de pares tem dois símbolos por linha (ex: "SPY,VOO"). Com
+--universe, todos os pares do universo são calculados. Os holdings vêm
+do HoldingsStore gerado pelo etf_crawler.py ou, na falta dele, dos perfis
+em cache - nenhuma requisição é feita à API.
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from cache_manager import CacheManager
+from config import CACHE_DIR, ETF_UNIVERSE
+from etf_crawler import holdings_store_path
+from etf_list import load_universe
+from holdings_store import HoldingsStore
+
+# Store carregado uma vez por processo do pool
+_STORE = None
+
+# Colunas do resultado (na ordem de HoldingsStore.overlap), mesmo sem pares
+RESULT_COLUMNS = [
+    'etf_a', 'etf_b', 'overlap_weight', 'overlap_a_in_b', 'overlap_b_in_a', 'overlap_average',
+    'total_holdings_a', 'total_holdings_b', 'common_count', 'common_holdings',
+]
+
+
+def read_pairs(path):
+    """
+    Lê um arquivo de pares de ETFs
+
+    Args:
+        path (str | Path): Arquivo com "ETF_A,ETF_B" por linha ('#' = comentário)
+
+    Returns:
+        list: Tuplas (etf_a, etf_b)
+    """
+    pairs = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+
+        parts = [p.strip().upper() for p in line.replace(';', ',').replace('\t', ',').split(',')]
+        if len(parts) >= 2 and parts[0] and parts[1] and parts[:2] != ['ETF_A', 'ETF_B']:
+            pairs.append((parts[0], parts[1]))
+    return pairs
+
+
+def load_store(symbols, store_path=None, cache_dir=CACHE_DIR):
+    """
+    Carrega os holdings: HoldingsStore salvo ou perfis em cache
+
+    Args:
+        symbols (list): ETFs necessários
+        store_path (str | Path): Arquivo .npz do HoldingsStore (opcional)
+        cache_dir (str | Path): Diretório do cache de perfis
+
+    Returns:
+        HoldingsStore: Repositório com os ETFs encontrados
+    """
+    if store_path and Path(store_path).exists():
+        store = HoldingsStore.load(store_path)
+    else:
+        store = HoldingsStore()
+
+    cache = CacheManager(cache_dir)
+    for symbol in symbols:
+        if symbol not in store:
+            profile = cache.get(f"profile_{symbol}", max_age_days=float('inf'))
+            if profile:
+                store.add_profile(symbol, profile)
+
+    return store
+
+
+def _init_worker(store_path):
+    global _STORE
+    _STORE = HoldingsStore.load(store_path)
+
+
+def _overlap_rows(pairs, store=None, top_common=None):
+    store = store if store is not None else _STORE
+    rows = []
+
+    for etf_a, etf_b in pairs:
+        result = store.overlap(etf_a, etf_b, top=top_common)
+        common = result.pop('common_holdings')
+
+        rows.append({'etf_a': etf_a, 'etf_b': etf_b, **result, 'common_holdings': json.dumps(common)})
+
+    return rows
+
+
+def compute_overlaps(store, pairs, workers=None, top_common=None):
+    """
+    Calcula o overlap de vários pares, em paralelo num pool de processos
+
+    Args:
+        store (HoldingsStore): Repositório de holdings
+        pairs (list): Tuplas (etf_a, etf_b) presentes no store
+        workers (int): Processos (padrão = número de CPUs; 1 = sem pool)
+        top_common (int): Limita common_holdings aos N maiores (None = todos)
+
+    Returns:
+        pd.DataFrame: Uma linha por par com todas as métricas de calculate_overlap
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pairs) < 2:
+        return pd.DataFrame(_overlap_rows(pairs, store, top_common), columns=RESULT_COLUMNS)
+
+    # Os processos recebem o store por arquivo, não por pickle a cada tarefa
+    chunk_size = max(1, len(pairs) // (workers * 8))
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store_file = Path(tmp_dir) / 'holdings.npz'
+        store.save(store_file)
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(store_file),)) as executor:
+            for chunk_rows in executor.map(_overlap_rows, chunks, itertools.repeat(None), itertools.repeat(top_common)):
+                rows.extend(chunk_rows)
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def write_results(df, output, fmt=None):
+    """
+    Grava o resultado em CSV ou Parquet (pelo formato ou extensão do arquivo)
+    """
+    fmt = fmt or ('parquet' if str(output).endswith('.parquet') else 'csv')
+
+    if fmt == 'parquet':
+        try:
+            df.to_parquet(output, index=False)
+        except ImportError:
+            raise SystemExit("❌ Parquet requer pyarrow ou fastparquet instalados (pip install pyarrow)")
+    else:
+        df.to_csv(output, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Overlap de ETFs em lote")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--pairs', help="Arquivo com pares de ETFs (ETF_A,ETF_B por linha)")
+    source.add_argument('--universe', help="Universo ou arquivo de símbolos (todos os pares)")
+    parser.add_argument('-o', '--output', default='overlap_results.csv', help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="Formato de saída (padrão: pela extensão)")
+    parser.add_argument('--store', help="HoldingsStore .npz (padrão: o do universo)")
+    parser.add_argument('--workers', type=int, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--top-common', type=int, help="Mantém apenas os N maiores holdings comuns por par")
+    args = parser.parse_args(argv)
+
+    universe = args.universe or ETF_UNIVERSE
+    if args.pairs:
+        pairs = read_pairs(args.pairs)
+    else:
+        pairs = list(itertools.combinations(load_universe(universe), 2))
+
+    symbols = sorted({s for pair in pairs for s in pair})
+    start = time.perf_counter()
+    store = load_store(symbols, args.store or holdings_store_path(universe))
+    load_time = time.perf_counter() - start
+
+    # ETFs ausentes ou sem nenhum holding fariam overlap() falhar no lote inteiro
+    available = {s for s in symbols if s in store and len(store.get(s)) > 0}
+    missing = [s for s in symbols if s not in available]
+    valid_pairs = [(a, b) for a, b in pairs if a in available and b in available]
+
+    print(f"📦 {len(store)} ETFs carregados em {load_time:.2f}s ({store.nbytes() / 1e6:.2f} MB)")
+    if missing:
+        print(f"⚠️ {len(missing)} ETFs sem holdings em cache (pares ignorados): {', '.join(missing[:20])}")
+    if not valid_pairs:
+        print("⚠️ Nenhum par com holdings dos dois ETFs - o arquivo terá apenas o cabeçalho")
+
+    start = time.perf_counter()
+    df = compute_overlaps(store, valid_pairs, args.workers, args.top_common)
+    elapsed = time.perf_counter() - start
+
+    write_results(df, args.output, args.format)
+
+    rate = len(valid_pairs) / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ {len(valid_pairs)} pares em {elapsed:.2f}s ({rate:,.0f} pares/s) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
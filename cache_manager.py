@@ -0,0 +1,84 @@
+# cache_manager.py
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import CACHE_DIR, CACHE_EXPIRY_DAYS
+
+
+class CacheManager:
+    """
+    Cache em disco das respostas da API
+
+    Cada entrada é um arquivo JSON {"timestamp": ..., "data": ...} no
+    diretório de cache (ex: cache/profile_SPY.json). A escrita é atômica,
+    então vários processos podem compartilhar o mesmo diretório.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, expiry_days=CACHE_EXPIRY_DAYS):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir (str | Path): Diretório dos arquivos de cache
+            expiry_days (float): Validade padrão das entradas em dias
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.expiry_days = expiry_days
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key, max_age_days=None):
+        """
+        Lê uma entrada do cache
+
+        Args:
+            key (str): Chave da entrada (ex: 'profile_SPY')
+            max_age_days (float): Validade em dias (None = padrão do cache,
+                float('inf') = nunca expira)
+
+        Returns:
+            Dados armazenados ou None se não existirem ou estiverem expirados
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            timestamp = datetime.fromisoformat(entry['timestamp'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+        max_age = self.expiry_days if max_age_days is None else max_age_days
+        if max_age != float('inf') and datetime.now() - timestamp > timedelta(days=max_age):
+            return None
+
+        return entry['data']
+
+    def set(self, key, data):
+        """
+        Grava uma entrada no cache
+
+        Args:
+            key (str): Chave da entrada
+            data: Dados serializáveis em JSON
+        """
+        path = self._path(key)
+        entry = {'timestamp': datetime.now().isoformat(), 'data': data}
+
+        # Grava num arquivo temporário e renomeia (atômico no mesmo diretório)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
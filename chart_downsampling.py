@@ -0,0 +1,177 @@
+# chart_downsampling.py
+"""
+Redução de pontos dos gráficos de preço antes de enviá-los ao navegador
+
+Linhas usam LTTB (Largest-Triangle-Three-Buckets), que preserva picos e
+vales; candles são agregados em barras OHLC maiores (semana, mês...) em vez
+de descartados. A resolução é definida pela largura do gráfico: não adianta
+enviar mais pontos do que pixels.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from config import CHART_WIDTH_PX, WEBGL_POINT_THRESHOLD
+
+# Pixels por candle (corpo + espaço) e pontos de linha por pixel
+CANDLE_PX = 4
+LINE_POINTS_PER_PX = 2
+
+
+def target_points(kind='line', width=CHART_WIDTH_PX):
+    """
+    Número máximo de pontos que o gráfico consegue exibir
+
+    Args:
+        kind (str): 'line' ou 'candle'
+        width (int): Largura do gráfico em pixels
+
+    Returns:
+        int: Pontos (linhas) ou barras (candles)
+    """
+    if kind == 'candle':
+        return max(1, width // CANDLE_PX)
+    return max(3, width * LINE_POINTS_PER_PX)
+
+
+def lttb(x, y, n_out):
+    """
+    Seleciona n_out pontos de uma linha com o algoritmo LTTB
+
+    O primeiro e o último ponto são sempre mantidos; em cada balde
+    intermediário fica o ponto que forma o maior triângulo com o ponto
+    escolhido no balde anterior e a média do balde seguinte.
+
+    Args:
+        x (array-like): Coordenadas x crescentes (numéricas)
+        y (array-like): Valores
+        n_out (int): Número de pontos desejado
+
+    Returns:
+        np.ndarray: Índices dos pontos escolhidos (crescentes)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Fronteiras dos n_out - 2 baldes internos (sem o primeiro e o último ponto)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Médias de cada balde (usadas como terceiro vértice do triângulo)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    mean_x = np.append(mean_x[1:], x[-1]).tolist()
+    mean_y = np.append(mean_y[1:], y[-1]).tolist()
+
+    # Os baldes têm poucos pontos: listas Python são mais rápidas que fatias NumPy aqui
+    xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        ax, ay = xs[a], ys[a]
+        cx, cy = mean_x[i] - ax, mean_y[i] - ay
+        best, best_j = -1.0, bounds[i]
+        for j in range(bounds[i], bounds[i + 1]):
+            # Dobro da área do triângulo (a, ponto do balde, média do próximo balde)
+            area = abs(cx * (ys[j] - ay) - (xs[j] - ax) * cy)
+            if area > best:
+                best, best_j = area, j
+        a = best_j
+        selected.append(a)
+
+    selected.append(n - 1)
+    return np.array(selected, dtype=np.int64)
+
+
+def downsample_line(index, values, n_out=None):
+    """
+    Aplica LTTB a uma série indexada por datas
+
+    Args:
+        index (pd.DatetimeIndex): Datas
+        values (array-like): Valores
+        n_out (int): Pontos desejados (padrão = target_points('line'))
+
+    Returns:
+        tuple: (datas, valores) reduzidos
+    """
+    n_out = n_out or target_points('line')
+    values = np.asarray(values, dtype=np.float64)
+    keep = lttb(np.asarray(index, dtype='datetime64[s]').astype(np.int64), values, n_out)
+    return index[keep], values[keep]
+
+
+def aggregate_ohlc(df, max_bars=None):
+    """
+    Agrupa barras consecutivas para caber em max_bars candles
+
+    Cada candle agregado tem o open da primeira barra, a máxima e a mínima
+    do grupo, o close da última e a soma do volume, então o gráfico continua
+    exato (nenhuma máxima ou mínima é perdida).
+
+    Args:
+        df (pd.DataFrame): Barras com Open, High, Low, Close, Volume
+        max_bars (int): Número máximo de candles (padrão = target_points('candle'))
+
+    Returns:
+        tuple: (DataFrame agregado indexado pela data da primeira barra, barras por candle)
+    """
+    max_bars = max_bars or target_points('candle')
+    n = len(df)
+    if n <= max_bars:
+        return df, 1
+
+    step = -(-n // max_bars)
+    # Grupos alinhados ao final, para que o último candle termine na última barra
+    starts = np.arange(n - step * (n // step), n, step)
+    if starts[0] != 0:
+        starts = np.insert(starts, 0, 0)
+
+    out = pd.DataFrame({
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[np.append(starts[1:], n) - 1],
+        'Volume': np.add.reduceat(df['Volume'].to_numpy(), starts),
+    }, index=df.index[starts])
+    return out, step
+
+
+def line_trace(index, values, max_points=None, **kwargs):
+    """
+    Trace de linha reduzido com LTTB, em WebGL acima de WEBGL_POINT_THRESHOLD
+
+    Args:
+        index (pd.DatetimeIndex): Datas
+        values (array-like): Valores
+        max_points (int): Pontos máximos (padrão = target_points('line'))
+        **kwargs: Argumentos repassados ao go.Scatter / go.Scattergl
+
+    Returns:
+        go.Scatter | go.Scattergl: Trace pronto para o gráfico
+    """
+    x, y = downsample_line(index, values, max_points)
+    trace_type = go.Scattergl if len(x) > WEBGL_POINT_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+def figure_stats(fig):
+    """
+    Mede o custo de envio de uma figura
+
+    Args:
+        fig (go.Figure): Figura
+
+    Returns:
+        dict: Pontos, bytes do JSON enviado ao navegador e tempo de serialização
+    """
+    start = time.perf_counter()
+    payload = fig.to_json()
+    elapsed = time.perf_counter() - start
+    points = sum(len(trace.x) for trace in fig.data if trace.x is not None)
+    return {'points': points, 'bytes': len(payload.encode('utf-8')), 'serialize_ms': elapsed * 1000}
@@ -9,6 +9,60 @@ ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_KEY', 'XQQGFVANPDON7AEK')
 CACHE_DIR = Path('cache')
 CACHE_DIR.mkdir(exist_ok=True)
 CACHE_EXPIRY_DAYS = 7
+PRICE_CACHE_EXPIRY_DAYS = 1
+
+# Rate limit da API (requisições por minuto, somando todos os processos)
+API_CALLS_PER_MINUTE = float(os.getenv('ALPHA_VANTAGE_CALLS_PER_MINUTE', '5'))
+
+# Universo de ETFs (nome em etf_list.ETF_UNIVERSES ou caminho de um arquivo)
+ETF_UNIVERSE = os.getenv('ETF_UNIVERSE', 'optimized')
+UNIVERSES_DIR = Path('universes')
+
+# Séries de preços locais (arquivos colunares mapeados em memória)
+PRICE_STORE_DIR = CACHE_DIR / 'prices'
+
+# Símbolos mantidos mapeados em memória pelo price store (cada um usa 6
+# descritores de arquivo)
+PRICE_STORE_OPEN_SYMBOLS = 64
+
+# Séries intraday: intervalo -> minutos por barra
+INTRADAY_INTERVALS = {'1min': 1, '5min': 5, '15min': 15, '60min': 60}
+
+# Barras intraday mantidas em memória por símbolo (as mais antigas vão para
+# o price store) e número máximo de símbolos em memória
+INTRADAY_BUFFER_BARS = 1000
+INTRADAY_MAX_SYMBOLS = 50
+
+# Armazém local de fundamentos (SQLite)
+FUNDAMENTALS_DB = CACHE_DIR / 'fundamentals.sqlite'
+
+# Look-through de ETFs: fração do peso dos holdings (em ordem de peso)
+# cujos overviews são buscados
+LOOK_THROUGH_COVERAGE = float(os.getenv('LOOK_THROUGH_COVERAGE', '0.8'))
+
+# Armazém local de notícias (SQLite + FTS5): máximo de notícias por
+# requisição, intervalo mínimo entre consultas iguais à API (minutos) e
+# máximo de páginas por consulta quando chegaram mais notícias que o limite
+NEWS_DB = CACHE_DIR / 'news.sqlite'
+NEWS_POLL_LIMIT = 1000
+NEWS_POLL_MINUTES = 15
+NEWS_POLL_PAGES = 5
+
+# Memória máxima dos DataFrames convertidos compartilhados entre sessões
+FRAME_MEMO_BYTES = 64 * 1024 * 1024
+
+# Session state: memória máxima referenciada por sessão no repositório de
+# payloads compartilhado e tempo sem atividade até a sessão ser descartada
+SESSION_STATE_BYTES = int(os.getenv('SESSION_STATE_MB', '32')) * 1024 * 1024
+SESSION_IDLE_MINUTES = float(os.getenv('SESSION_IDLE_MINUTES', '30'))
+
+# Checkpoints do crawler
+CRAWL_DIR = CACHE_DIR / 'crawl'
+
+# Gráficos: largura de referência (px) usada para definir a resolução e
+# número de pontos a partir do qual as linhas usam WebGL (Scattergl)
+CHART_WIDTH_PX = int(os.getenv('CHART_WIDTH_PX', '1200'))
+WEBGL_POINT_THRESHOLD = 1000
 
 # Configurações da aplicação
 APP_TITLE = "ETF Analyzer Pro"
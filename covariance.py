@@ -0,0 +1,398 @@
+# covariance.py
+"""
+Matrizes de correlação e covariância entre ETFs a partir do price store
+
+Os retornos diários de todos os símbolos ficam num painel alinhado pelo
+calendário. As matrizes são derivadas de estatísticas suficientes
+(contagens e somas por par de ativos), atualizadas barra a barra quando o
+store recebe dados novos, e ficam em cache em memória e em disco.
+
+Estimadores:
+    sample     - covariância amostral com pares completos (cada par usa as
+                 datas em que os dois ativos têm retorno)
+    ewma       - média exponencial RiskMetrics (média zero, lambda = 0.94)
+    shrinkage  - Ledoit-Wolf em direção à identidade escalada (sempre
+                 positiva definida; adequada para otimização de carteiras)
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR
+from price_store import PricePanel
+
+# Janela padrão (3 anos de pregões) e decaimento do EWMA
+LOOKBACK = 756
+EWMA_DECAY = 0.94
+
+METHODS = ('sample', 'ewma', 'shrinkage')
+
+# Pregões por ano (anualização)
+YEAR_BARS = 252
+
+
+def return_panel(panel, min_coverage=0.5):
+    """
+    Retornos diários simples alinhados
+
+    Datas em que menos de min_coverage dos símbolos negociaram (ex: dado
+    espúrio de um único ativo) são descartadas. Lacunas isoladas de um
+    símbolo repetem o último preço (retorno zero no dia, o movimento aparece
+    no dia seguinte); antes da primeira e depois da última barra do símbolo
+    os retornos são NaN.
+
+    Args:
+        panel (PricePanel): Painel com a coluna 'close'
+        min_coverage (float): Fração mínima de símbolos com barra na data
+
+    Returns:
+        tuple: (datas, retornos (n_datas, n_símbolos)) - a primeira data do painel é descartada
+    """
+    close = panel['close']
+    if close.size == 0:
+        return panel.dates[:0], close[:0]
+
+    keep = np.isfinite(close).sum(axis=1) >= min_coverage * close.shape[1]
+    aligned = PricePanel(panel.dates[keep], panel.symbols, {'close': close[keep]})
+    last = aligned.last_valid()
+    filled = aligned.ffill()['close']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = filled[1:] / filled[:-1] - 1.0
+    returns[np.arange(1, len(filled))[:, None] > last] = np.nan
+    return aligned.dates[1:], returns
+
+
+def _rows_hash(returns):
+    # Identifica os retornos já processados (NaN têm representação fixa)
+    return hashlib.blake2b(np.ascontiguousarray(returns).tobytes(), digest_size=16).hexdigest()
+
+
+class CovarianceState:
+    """
+    Estatísticas suficientes das matrizes, atualizáveis barra a barra
+
+    Para cada par (i, j), somas sobre as datas em que os dois têm retorno:
+    contagem, soma de x_i, soma de x_i^2 e soma de x_i * x_j. A janela
+    móvel guarda os últimos lookback retornos para descontar os que saem.
+    """
+
+    __slots__ = ('lookback', 'decay', 'count', 'sum_x', 'sum_x2', 'sum_xy', 'ewma_xy', 'ewma_w', 'window')
+
+    def __init__(self, n_assets, lookback=LOOKBACK, decay=EWMA_DECAY):
+        self.lookback = lookback
+        self.decay = decay
+        shape = (n_assets, n_assets)
+        self.count = np.zeros(shape)
+        self.sum_x = np.zeros(shape)
+        self.sum_x2 = np.zeros(shape)
+        self.sum_xy = np.zeros(shape)
+        self.ewma_xy = np.zeros(shape)
+        self.ewma_w = np.zeros(shape)
+        self.window = np.empty((0, n_assets))
+
+    def _accumulate(self, returns, sign):
+        valid = np.isfinite(returns).astype(np.float64)
+        x = np.where(valid > 0, returns, 0.0)
+        self.count += sign * (valid.T @ valid)
+        self.sum_x += sign * (x.T @ valid)
+        self.sum_x2 += sign * ((x * x).T @ valid)
+        self.sum_xy += sign * (x.T @ x)
+
+    def update(self, returns):
+        """
+        Acrescenta barras novas
+
+        Args:
+            returns (np.ndarray): Retornos (n_barras, n_ativos) ou uma barra (n_ativos,)
+        """
+        returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        if not len(returns):
+            return
+
+        self._accumulate(returns, 1.0)
+        self.window = np.concatenate([self.window, returns])
+        if self.lookback and len(self.window) > self.lookback:
+            self._accumulate(self.window[:-self.lookback], -1.0)
+            self.window = self.window[-self.lookback:]
+
+        # EWMA: pesos decay^(idade), todas as barras novas de uma vez
+        valid = np.isfinite(returns).astype(np.float64)
+        x = np.where(valid > 0, returns, 0.0)
+        weights = self.decay ** np.arange(len(returns) - 1, -1, -1)[:, None]
+        scale = self.decay ** len(returns)
+        self.ewma_xy = scale * self.ewma_xy + (x * weights).T @ x
+        self.ewma_w = scale * self.ewma_w + (valid * weights).T @ valid
+
+    def sample(self, ddof=1, min_periods=20):
+        """
+        Covariância e correlação amostrais com pares completos
+
+        Returns:
+            tuple: (covariância, correlação) - NaN nos pares com menos de min_periods datas
+        """
+        n = self.count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self.sum_xy - self.sum_x * self.sum_x.T / n) / (n - ddof)
+            # Variâncias de cada ativo nas mesmas datas do par
+            var = (self.sum_x2 - self.sum_x ** 2 / n) / (n - ddof)
+            corr = cov / np.sqrt(var * var.T)
+        cov[n < min_periods] = np.nan
+        corr[n < min_periods] = np.nan
+        return cov, np.clip(corr, -1.0, 1.0)
+
+    def ewma(self, min_periods=20):
+        """
+        Covariância e correlação EWMA (média zero)
+
+        Returns:
+            tuple: (covariância, correlação)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self.ewma_xy / self.ewma_w
+            std = np.sqrt(np.diag(cov))
+            corr = cov / np.outer(std, std)
+        cov[self.count < min_periods] = np.nan
+        corr[self.count < min_periods] = np.nan
+        return cov, np.clip(corr, -1.0, 1.0)
+
+    def shrinkage(self):
+        """
+        Covariância de Ledoit-Wolf em direção a mu * I
+
+        Usa a janela atual; retornos ausentes recebem a média do ativo (não
+        contribuem para a covariância). Ativos sem nenhum retorno na janela
+        ficam NaN.
+
+        Returns:
+            tuple: (covariância, correlação, intensidade do encolhimento)
+        """
+        window = self.window
+        has_data = np.isfinite(window).any(axis=0) if len(window) else np.zeros(window.shape[1], dtype=bool)
+        p = int(has_data.sum())
+        m = window.shape[1]
+        cov = np.full((m, m), np.nan)
+        if p == 0 or len(window) < 2:
+            return cov, cov.copy(), float('nan')
+
+        x = window[:, has_data]
+        x = x - np.nanmean(x, axis=0)
+        x = np.where(np.isfinite(x), x, 0.0)
+        n = len(x)
+
+        sample = x.T @ x / n
+        mu = np.trace(sample) / p
+        delta = ((sample - mu * np.eye(p)) ** 2).sum() / p
+        # Variância dos termos x_k x_k' em torno de sample (ver Ledoit & Wolf, 2004)
+        beta = (((x ** 2).sum(axis=1) ** 2).sum() - n * (sample ** 2).sum()) / (n ** 2 * p)
+        shrink = min(beta, delta) / delta if delta > 0 else 1.0
+
+        sub = shrink * mu * np.eye(p) + (1.0 - shrink) * sample
+        cov[np.ix_(has_data, has_data)] = sub
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        return cov, corr, float(shrink)
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in ('count', 'sum_x', 'sum_x2', 'sum_xy', 'ewma_xy', 'ewma_w', 'window')}
+
+    @classmethod
+    def from_arrays(cls, arrays, lookback, decay):
+        obj = cls(arrays['count'].shape[0], lookback, decay)
+        for name, value in arrays.items():
+            setattr(obj, name, np.array(value))
+        return obj
+
+
+class CovarianceMatrix:
+    """
+    Resultado de um estimador (matrizes de retornos diários)
+    """
+
+    __slots__ = ('symbols', 'method', 'cov', 'corr', 'n_obs', 'start', 'end', 'shrinkage')
+
+    def __init__(self, symbols, method, cov, corr, n_obs, start, end, shrinkage=None):
+        self.symbols = list(symbols)
+        self.method = method
+        self.cov = cov
+        self.corr = corr
+        self.n_obs = n_obs
+        self.start = start
+        self.end = end
+        self.shrinkage = shrinkage
+
+    def to_frame(self, kind='corr', annualize=False):
+        """
+        Matriz como DataFrame
+
+        Args:
+            kind (str): 'corr' ou 'cov'
+            annualize (bool): Multiplica a covariância por 252
+        """
+        values = self.corr if kind == 'corr' else self.cov * (YEAR_BARS if annualize else 1)
+        return pd.DataFrame(values, index=self.symbols, columns=self.symbols)
+
+    def pairs(self, top=10, ascending=False):
+        """
+        Pares mais (ou menos) correlacionados
+
+        Returns:
+            pd.DataFrame: etf_a, etf_b, correlation e observações
+        """
+        i, j = np.triu_indices(len(self.symbols), k=1)
+        corr = self.corr[i, j]
+        ok = np.isfinite(corr)
+        i, j, corr = i[ok], j[ok], corr[ok]
+        order = np.argsort(corr if ascending else -corr, kind='stable')[:top]
+        return pd.DataFrame({
+            'etf_a': [self.symbols[k] for k in i[order]],
+            'etf_b': [self.symbols[k] for k in j[order]],
+            'correlation': corr[order],
+            'observations': self.n_obs[i[order], j[order]].astype(np.int64),
+        })
+
+
+class CovarianceEngine:
+    """
+    Matrizes do universo com atualização incremental e cache
+
+    O estado (estatísticas suficientes) de cada universo fica em memória e
+    em cache/covariance_<hash>.npz. Quando o store recebe barras novas, só
+    os retornos das datas novas entram no estado; se dados antigos mudarem
+    (histórico mais longo, correção de barra já processada), o estado é
+    recalculado do zero.
+    """
+
+    def __init__(self, store, cache_dir=CACHE_DIR, lookback=LOOKBACK, decay=EWMA_DECAY):
+        self.store = store
+        self.cache_dir = Path(cache_dir)
+        self.lookback = lookback
+        self.decay = decay
+        self._states = {}
+        self._results = {}
+
+    def panel_version(self, symbols):
+        """
+        Versão do painel (muda quando qualquer série do universo muda)
+
+        Returns:
+            str: Hash curto
+        """
+        h = hashlib.blake2b(digest_size=8)
+        for symbol in symbols:
+            h.update(f"{symbol}:{self.store.version(symbol)};".encode('utf-8'))
+        return h.hexdigest()
+
+    def _universe_key(self, symbols):
+        h = hashlib.blake2b(digest_size=8)
+        h.update(f"{','.join(symbols)}|{self.lookback}|{self.decay}".encode('utf-8'))
+        return h.hexdigest()
+
+    def state(self, symbols):
+        """
+        Estado atualizado de um universo
+
+        Args:
+            symbols (list): Símbolos (os que não estão no store são ignorados)
+
+        Returns:
+            tuple: (CovarianceState, símbolos, datas dos retornos processados)
+        """
+        symbols = [s for s in dict.fromkeys(s.upper() for s in symbols) if s in self.store]
+        key = self._universe_key(symbols)
+        version = self.panel_version(symbols)
+
+        cached = self._states.get(key) or self._load(key)
+        if cached is not None and cached['version'] == version:
+            self._states[key] = cached
+            return cached['state'], symbols, cached['dates']
+
+        dates, returns = return_panel(self.store.panel(symbols))
+
+        # Incremental: as datas e retornos já processados precisam continuar idênticos
+        state = None
+        if cached is not None:
+            n_old = len(cached['dates'])
+            if n_old and n_old <= len(dates) and np.array_equal(dates[:n_old], cached['dates']) \
+                    and _rows_hash(returns[:n_old]) == cached['rows_hash']:
+                state = cached['state']
+                state.update(returns[n_old:])
+
+        if state is None:
+            state = CovarianceState(len(symbols), self.lookback, self.decay)
+            state.update(returns)
+
+        entry = {'version': version, 'state': state, 'dates': dates, 'rows_hash': _rows_hash(returns)}
+        self._states[key] = entry
+        self._save(key, entry)
+        return state, symbols, dates
+
+    def matrix(self, symbols, method='sample'):
+        """
+        Matriz de covariância/correlação do universo
+
+        Args:
+            symbols (list): Símbolos
+            method (str): 'sample', 'ewma' ou 'shrinkage'
+
+        Returns:
+            CovarianceMatrix: Matrizes (retornos diários)
+        """
+        if method not in METHODS:
+            raise ValueError(f"Método desconhecido: {method} (use {', '.join(METHODS)})")
+
+        state, symbols, dates = self.state(symbols)
+        result_key = (tuple(symbols), method, self.panel_version(symbols))
+        if result_key in self._results:
+            return self._results[result_key]
+
+        shrink = None
+        if method == 'sample':
+            cov, corr = state.sample()
+        elif method == 'ewma':
+            cov, corr = state.ewma()
+        else:
+            cov, corr, shrink = state.shrinkage()
+
+        window = dates[-self.lookback:] if self.lookback else dates
+        result = CovarianceMatrix(symbols, method, cov, corr, state.count.copy(),
+                                  window[0] if len(window) else None, window[-1] if len(window) else None, shrink)
+
+        # Mantém apenas a versão atual de cada universo/método
+        self._results = {k: v for k, v in self._results.items() if k[:2] != result_key[:2]}
+        self._results[result_key] = result
+        return result
+
+    def _path(self, key):
+        return self.cache_dir / f"covariance_{key}.npz"
+
+    def _load(self, key):
+        try:
+            with np.load(self._path(key)) as data:
+                arrays = {name[6:]: data[name] for name in data.files if name.startswith('state_')}
+                return {
+                    'version': str(data['version']),
+                    'state': CovarianceState.from_arrays(arrays, self.lookback, self.decay),
+                    'dates': data['dates'],
+                    'rows_hash': str(data['rows_hash']),
+                }
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, key, entry):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=np.array(entry['version']), dates=entry['dates'], rows_hash=np.array(entry['rows_hash']),
+                         **{f"state_{name}": value for name, value in entry['state'].to_arrays().items()})
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,261 @@
+# etf_crawler.py
+"""
+Crawler de perfis de ETFs em shards, com checkpoint e retomada
+
+Uso:
+    python etf_crawler.py --universe optimized --shards 4 --workers 4
+    python etf_crawler.py --symbols-file universes/us_all.txt --shards 8 --shard-index 3
+
+Cada símbolo concluído é gravado num arquivo de checkpoint, então uma
+execução interrompida continua de onde parou. Os perfis vão para o cache
+em disco e, ao final, o universo é consolidado num HoldingsStore (.npz).
+"""
+import argparse
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from alpha_vantage_api import AlphaVantageAPI, RateLimiter
+from cache_manager import CacheManager
+from config import ALPHA_VANTAGE_API_KEY, API_CALLS_PER_MINUTE, CACHE_DIR, CRAWL_DIR, ETF_UNIVERSE
+from etf_list import load_universe
+from holdings_store import HoldingsStore
+
+
+def universe_slug(universe):
+    """Nome curto do universo (um caminho de arquivo vira o nome do arquivo)"""
+    return Path(universe).stem
+
+
+def holdings_store_path(universe, cache_dir=CACHE_DIR):
+    """Caminho do HoldingsStore consolidado de um universo"""
+    return Path(cache_dir) / f"holdings_{universe_slug(universe)}.npz"
+
+
+def shard_of(symbol, num_shards):
+    """
+    Shard de um símbolo (hash estável - não muda se o universo crescer)
+
+    Args:
+        symbol (str): Símbolo do ETF
+        num_shards (int): Número total de shards
+
+    Returns:
+        int: Índice do shard (0 a num_shards-1)
+    """
+    return zlib.crc32(symbol.upper().encode('utf-8')) % num_shards
+
+
+class ETFCrawler:
+    """
+    Crawler resumível de ETF_PROFILE para um universo grande de ETFs
+    """
+
+    def __init__(self, symbols, universe='custom', api_key=ALPHA_VANTAGE_API_KEY, num_shards=1,
+                 calls_per_minute=API_CALLS_PER_MINUTE, cache_dir=CACHE_DIR, checkpoint_dir=CRAWL_DIR):
+        """
+        Inicializa o crawler
+
+        Args:
+            symbols (list): Símbolos dos ETFs
+            universe (str): Nome do universo (usado nos checkpoints e no store)
+            api_key (str): Chave da API Alpha Vantage
+            num_shards (int): Número de shards em que o universo é dividido
+            calls_per_minute (float): Orçamento GLOBAL de requisições por minuto
+            cache_dir (str | Path): Diretório do cache de respostas
+            checkpoint_dir (str | Path): Diretório raiz dos checkpoints
+        """
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.universe = universe_slug(universe)
+        self.api_key = api_key
+        self.num_shards = max(1, int(num_shards))
+        self.calls_per_minute = calls_per_minute
+        self.cache_dir = Path(cache_dir)
+        self.checkpoint_dir = Path(checkpoint_dir) / self.universe
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _checkpoint_path(self, shard_index):
+        return self.checkpoint_dir / f"shard_{shard_index}_of_{self.num_shards}.done"
+
+    def completed(self):
+        """
+        Símbolos já concluídos (todos os checkpoints do universo)
+
+        Lê também checkpoints de execuções com outro número de shards.
+
+        Returns:
+            set: Símbolos concluídos
+        """
+        done = set()
+        for path in self.checkpoint_dir.glob('*.done'):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    symbol = line.split('\t', 1)[0].strip()
+                    if symbol:
+                        done.add(symbol)
+        return done
+
+    def shard(self, shard_index):
+        """Símbolos de um shard"""
+        return [s for s in self.symbols if shard_of(s, self.num_shards) == shard_index]
+
+    def pending(self, shard_index=None):
+        """
+        Símbolos ainda não concluídos
+
+        Args:
+            shard_index (int): Restringe a um shard (None = todos)
+
+        Returns:
+            list: Símbolos pendentes
+        """
+        done = self.completed()
+        symbols = self.symbols if shard_index is None else self.shard(shard_index)
+        return [s for s in symbols if s not in done]
+
+    def reset(self):
+        """Apaga os checkpoints do universo (próxima execução recomeça do zero)"""
+        for path in self.checkpoint_dir.glob('*.done'):
+            path.unlink()
+
+    def crawl_shard(self, shard_index, calls_per_minute=None):
+        """
+        Busca os perfis pendentes de um shard
+
+        Args:
+            shard_index (int): Índice do shard
+            calls_per_minute (float): Orçamento deste shard
+                (padrão: orçamento global / número de shards)
+
+        Returns:
+            dict: Estatísticas do shard
+        """
+        if calls_per_minute is None:
+            calls_per_minute = self.calls_per_minute / self.num_shards
+
+        api = AlphaVantageAPI(
+            self.api_key,
+            cache=CacheManager(self.cache_dir),
+            rate_limiter=RateLimiter(calls_per_minute)
+        )
+
+        pending = self.pending(shard_index)
+        stats = {'shard': shard_index, 'fetched': 0, 'empty': 0, 'failed': 0, 'pending': len(pending)}
+
+        with open(self._checkpoint_path(shard_index), 'a', encoding='utf-8') as checkpoint:
+            for idx, symbol in enumerate(pending, 1):
+                try:
+                    print(f"[shard {shard_index}] [{idx}/{len(pending)}] Buscando {symbol}...")
+                    profile = api.get_etf_profile(symbol)
+                except Exception as e:
+                    # Falhas não entram no checkpoint - serão refeitas na próxima execução
+                    print(f"⚠️ [shard {shard_index}] Erro ao buscar {symbol}: {str(e)}")
+                    stats['failed'] += 1
+                    continue
+
+                if 'Information' in profile:
+                    # Limite diário atingido - não adianta continuar este shard
+                    print(f"⚠️ [shard {shard_index}] API: {profile['Information']}")
+                    stats['failed'] += 1
+                    break
+
+                status = 'ok' if profile.get('holdings') else 'empty'
+                stats['fetched' if status == 'ok' else 'empty'] += 1
+
+                checkpoint.write(f"{symbol}\t{status}\n")
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+
+        return stats
+
+    def run(self, workers=None):
+        """
+        Executa todos os shards, em paralelo num pool de processos
+
+        O orçamento global é dividido entre os shards que rodam ao mesmo tempo.
+
+        Args:
+            workers (int): Processos simultâneos (padrão = número de shards)
+
+        Returns:
+            list: Estatísticas de cada shard
+        """
+        workers = min(workers or self.num_shards, self.num_shards)
+        share = self.calls_per_minute / workers
+
+        if workers == 1:
+            return [self.crawl_shard(i, share) for i in range(self.num_shards)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.crawl_shard, i, share) for i in range(self.num_shards)]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        return sorted(results, key=lambda r: r['shard'])
+
+    def build_holdings_store(self, path=None):
+        """
+        Consolida os perfis em cache num HoldingsStore e salva em disco
+
+        Args:
+            path (str | Path): Arquivo .npz (padrão: cache/holdings_<universo>.npz)
+
+        Returns:
+            HoldingsStore: Repositório com todos os ETFs do universo em cache
+        """
+        cache = CacheManager(self.cache_dir)
+        store = HoldingsStore()
+
+        for symbol in self.symbols:
+            profile = cache.get(f"profile_{symbol}", max_age_days=float('inf'))
+            if profile:
+                store.add_profile(symbol, profile)
+
+        store.save(path or holdings_store_path(self.universe, self.cache_dir))
+        return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler resumível de perfis de ETFs")
+    parser.add_argument('--universe', default=ETF_UNIVERSE, help="Nome do universo ou arquivo de símbolos")
+    parser.add_argument('--symbols-file', help="Arquivo com um símbolo por linha (substitui --universe)")
+    parser.add_argument('--shards', type=int, default=1, help="Número total de shards")
+    parser.add_argument('--shard-index', type=int, help="Executa apenas este shard (modo multi-máquina)")
+    parser.add_argument('--workers', type=int, help="Processos simultâneos (padrão = shards)")
+    parser.add_argument('--rate', type=float, default=API_CALLS_PER_MINUTE, help="Orçamento global (req/min)")
+    parser.add_argument('--reset', action='store_true', help="Apaga os checkpoints antes de começar")
+    parser.add_argument('--no-store', action='store_true', help="Não gera o HoldingsStore ao final")
+    args = parser.parse_args(argv)
+
+    universe = args.symbols_file or args.universe
+    crawler = ETFCrawler(load_universe(universe), universe=universe, num_shards=args.shards,
+                         calls_per_minute=args.rate)
+
+    if args.reset:
+        crawler.reset()
+
+    print(f"🔍 Universo '{crawler.universe}': {len(crawler.symbols)} ETFs, "
+          f"{len(crawler.pending())} pendentes, {crawler.num_shards} shard(s)")
+
+    start = time.perf_counter()
+    if args.shard_index is not None:
+        # Cada máquina roda um shard com a sua parte do orçamento global
+        stats = [crawler.crawl_shard(args.shard_index)]
+    else:
+        stats = crawler.run(args.workers)
+
+    for s in stats:
+        print(f"✅ Shard {s['shard']}: {s['fetched']} ok, {s['empty']} sem holdings, {s['failed']} falhas")
+    print(f"⏱️ {time.perf_counter() - start:.1f}s - restam {len(crawler.pending())} pendentes")
+
+    if not args.no_store:
+        store = crawler.build_holdings_store()
+        print(f"💾 HoldingsStore: {len(store)} ETFs, {len(store.tickers)} tickers, "
+              f"{store.nbytes() / 1e6:.2f} MB -> {holdings_store_path(crawler.universe)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
 # etf_list.py
+from pathlib import Path
+
+from config import UNIVERSES_DIR
+
 # Lista otimizada dos ETFs mais líquidos SEM redundâncias
 # Cada ETF representa uma estratégia/índice único
 
@@ -123,3 +127,55 @@ Esta lista contém 50 ETFs únicos selecionados por:
 
 4. **Tempo de Busca**: ~10 minutos (ao invés de 20-30)
 """
+
+
+# Universos disponíveis (OPTIMIZED_ETFS é o padrão)
+# Universos adicionais podem ser arquivos em universes/<nome>.txt
+ETF_UNIVERSES = {
+    "optimized": OPTIMIZED_ETFS,
+}
+
+
+def list_universes():
+    """
+    Lista os nomes de universos disponíveis
+
+    Returns:
+        list: Universos embutidos + arquivos em UNIVERSES_DIR
+    """
+    names = list(ETF_UNIVERSES)
+    if UNIVERSES_DIR.exists():
+        names += sorted(p.stem for p in UNIVERSES_DIR.glob('*.txt') if p.stem not in ETF_UNIVERSES)
+    return names
+
+
+def load_universe(name):
+    """
+    Carrega um universo de ETFs
+
+    Args:
+        name (str): Nome do universo (ex: 'optimized'), nome de um arquivo em
+            UNIVERSES_DIR ou caminho de um arquivo com um símbolo por linha
+            (linhas iniciadas por '#' são ignoradas)
+
+    Returns:
+        list: Símbolos do universo, sem duplicatas e em maiúsculas
+    """
+    if name in ETF_UNIVERSES:
+        symbols = ETF_UNIVERSES[name]
+    else:
+        path = Path(name)
+        if not path.exists():
+            path = UNIVERSES_DIR / f"{name}.txt"
+        if not path.exists():
+            raise ValueError(f"Universo de ETFs não encontrado: {name}")
+
+        symbols = []
+        for line in path.read_text(encoding='utf-8').splitlines():
+            line = line.split('#', 1)[0].strip()
+            # Aceita também CSV (primeira coluna = símbolo, cabeçalho opcional)
+            symbol = line.split(',')[0].strip()
+            if symbol and symbol.lower() != 'symbol':
+                symbols.append(symbol)
+
+    return list(dict.fromkeys(s.upper() for s in symbols if s))
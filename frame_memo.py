@@ -0,0 +1,126 @@
+# frame_memo.py
+"""
+Memo de DataFrames já convertidos, compartilhado entre sessões e reruns
+
+A cada rerun o Streamlit executa a página inteira de novo; sem o memo, os
+relatórios da API (listas de dicts com números em texto) seriam
+convertidos para DataFrame, datas e floats toda vez que um widget muda.
+
+As entradas são indexadas pelo hash do conteúdo da resposta (a mesma
+resposta em duas sessões reaproveita o mesmo DataFrame) e o memo é um LRU
+limitado em bytes. Os DataFrames devolvidos são compartilhados: quem
+precisar alterá-los deve trabalhar numa cópia.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from config import FRAME_MEMO_BYTES
+
+# Colunas de texto dos relatórios (as demais são valores em USD)
+TEXT_COLUMNS = ('fiscalDateEnding', 'reportedCurrency')
+
+
+def content_hash(payload):
+    """
+    Hash do conteúdo de uma resposta da API
+
+    Args:
+        payload: Estrutura JSON (dict/list)
+
+    Returns:
+        str: Hash curto (igual para respostas com o mesmo conteúdo)
+    """
+    raw = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def parse_reports(payload, report='annualReports', scale=1e9):
+    """
+    Relatórios de INCOME_STATEMENT / BALANCE_SHEET / CASH_FLOW prontos para gráfico
+
+    Args:
+        payload (dict): Resposta da API
+        report (str): 'annualReports' ou 'quarterlyReports'
+        scale (float): Divisor dos valores (1e9 = bilhões)
+
+    Returns:
+        pd.DataFrame: fiscalDateEnding (datetime), em ordem cronológica, e
+            uma coluna float por métrica ('None' vira NaN); vazio se a
+            resposta não tem relatórios
+    """
+    frame = pd.DataFrame(payload.get(report) or [])
+    if frame.empty or 'fiscalDateEnding' not in frame.columns:
+        return pd.DataFrame()
+
+    frame['fiscalDateEnding'] = pd.to_datetime(frame['fiscalDateEnding'], errors='coerce')
+    numeric = [c for c in frame.columns if c not in TEXT_COLUMNS]
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce') / scale
+    return frame.sort_values('fiscalDateEnding', kind='stable').reset_index(drop=True)
+
+
+class FrameMemo:
+    """
+    LRU de DataFrames convertidos, limitado em bytes e seguro entre threads
+    """
+
+    def __init__(self, max_bytes=FRAME_MEMO_BYTES):
+        """
+        Args:
+            max_bytes (int): Memória máxima ocupada pelos DataFrames
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, payload, parser, *args):
+        """
+        DataFrame de uma resposta, convertendo só na primeira vez
+
+        Args:
+            kind (str): Tipo da conversão (parte da chave, ex: 'income')
+            payload: Resposta da API
+            parser (callable): parser(payload, *args) -> pd.DataFrame
+            *args: Argumentos extras do parser (também fazem parte da chave)
+
+        Returns:
+            pd.DataFrame: Compartilhado - não deve ser alterado
+        """
+        key = (kind, content_hash(payload)) + args
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Converte fora do lock (duas sessões convertendo ao mesmo tempo só duplicam trabalho)
+        frame = parser(payload, *args)
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (frame, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self._bytes -= old_size
+        return frame
+
+    def reports(self, kind, payload, report='annualReports'):
+        """Atalho para parse_reports (ver get)"""
+        return self.get(kind, payload, parse_reports, report)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
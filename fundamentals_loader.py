@@ -0,0 +1,123 @@
+# fundamentals_loader.py
+"""
+Carregamento concorrente dos fundamentos de uma empresa
+
+OVERVIEW, INCOME_STATEMENT, BALANCE_SHEET e CASH_FLOW são pedidos ao mesmo
+tempo, num pool de threads compartilhado. O RateLimiter da API continua
+controlando o orçamento de requisições (as threads esperam a vez dentro
+dele) e as partes que já estão no cache em disco terminam na hora, sem
+consumir orçamento.
+
+A página usa cada parte assim que ela chega: o Overview é pedido primeiro
+e aparece sem esperar os demonstrativos. Com um FundamentalsStore, cada
+parte recebida também é gravada no armazém local (para os screens).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Partes do pacote, na ordem de envio: nome -> método da AlphaVantageAPI
+PARTS = {
+    'overview': 'get_company_overview',
+    'income': 'get_income_statement',
+    'balance': 'get_balance_sheet',
+    'cashflow': 'get_cash_flow',
+}
+
+# Threads do pool (várias sessões podem carregar símbolos ao mesmo tempo)
+MAX_WORKERS = 8
+
+
+class FundamentalsBundle:
+    """
+    As quatro partes dos fundamentos de um símbolo, em andamento
+
+    Cada parte é um Future; result() bloqueia só até aquela parte chegar.
+    """
+
+    __slots__ = ('symbol', 'futures')
+
+    def __init__(self, symbol, futures):
+        self.symbol = symbol
+        self.futures = futures
+
+    def done(self, part=None):
+        """Indica se uma parte (ou todas, com part=None) já terminou"""
+        if part is None:
+            return all(f.done() for f in self.futures.values())
+        return self.futures[part].done()
+
+    def result(self, part, timeout=None):
+        """
+        Resposta de uma parte, esperando se necessário
+
+        Args:
+            part (str): 'overview', 'income', 'balance' ou 'cashflow'
+            timeout (float): Espera máxima em segundos (None = sem limite)
+
+        Returns:
+            dict: Resposta da API
+
+        Raises:
+            Exception: O erro da requisição daquela parte
+        """
+        return self.futures[part].result(timeout)
+
+
+class FundamentalsLoader:
+    """
+    Dispara as partes dos fundamentos em paralelo, respeitando o rate limit
+
+    Pedidos simultâneos do mesmo símbolo (ex: duas sessões) compartilham o
+    mesmo pacote enquanto ele estiver em andamento.
+    """
+
+    def __init__(self, api, max_workers=MAX_WORKERS, warehouse=None):
+        """
+        Args:
+            api (AlphaVantageAPI): Cliente da API (com cache e rate limiter)
+            max_workers (int): Threads do pool
+            warehouse (FundamentalsStore): Armazém onde gravar as partes
+                recebidas (None = não grava)
+        """
+        self.api = api
+        self.warehouse = warehouse
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fundamentals')
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def load(self, symbol):
+        """
+        Inicia (ou reaproveita) o carregamento dos fundamentos de um símbolo
+
+        Args:
+            symbol (str): Símbolo da ação
+
+        Returns:
+            FundamentalsBundle: Partes em andamento
+        """
+        symbol = symbol.strip().upper()
+        with self._lock:
+            bundle = self._pending.get(symbol)
+            if bundle is not None and not bundle.done():
+                return bundle
+
+            # Pacote novo: partes em cache completam na hora, as outras disputam o rate limit
+            futures = {part: self._executor.submit(self._fetch, part, symbol) for part in PARTS}
+            bundle = FundamentalsBundle(symbol, futures)
+            self._pending[symbol] = bundle
+
+            # Descarta os pacotes concluídos (o cache em disco já guarda as respostas)
+            for key in [k for k, b in self._pending.items() if b.done() and k != symbol]:
+                del self._pending[key]
+
+        return bundle
+
+    def _fetch(self, part, symbol):
+        data = getattr(self.api, PARTS[part])(symbol)
+        if self.warehouse is not None and data:
+            # Uma falha do armazém não impede a página de exibir a resposta
+            try:
+                self.warehouse.ingest(symbol, part, data)
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar {part} de {symbol} no armazém: {e}")
+        return data
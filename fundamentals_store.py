@@ -0,0 +1,455 @@
+# fundamentals_store.py
+"""
+Armazém local de fundamentos (SQLite) para consultas entre empresas
+
+Cada OVERVIEW, INCOME_STATEMENT, BALANCE_SHEET e CASH_FLOW recebido vira
+linhas de uma tabela longa:
+
+    facts(symbol, statement, period, fiscal_date, metric, value)
+
+statement é 'overview', 'income', 'balance' ou 'cashflow'; period é
+'annual', 'quarterly' ou 'snapshot' (overview, datado pelo LatestQuarter).
+Os campos de texto do overview (nome, setor...) ficam em companies.
+
+A tabela latest guarda o valor mais recente de cada (símbolo, métrica),
+com métricas derivadas (crescimento anual, margens, ROE), e é indexada por
+(métrica, valor): um screen como "PERatio < 15 e revenue_growth > 0.1"
+é um join de buscas por faixa no índice, sem varrer as empresas.
+
+Uso:
+    python fundamentals_store.py --import-cache
+    python fundamentals_store.py --screen "PERatio<15" "revenue_growth>0.1" --etf SPY
+"""
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from config import CACHE_DIR, ETF_UNIVERSE, FUNDAMENTALS_DB
+from etf_crawler import holdings_store_path
+from holdings_store import HoldingsStore
+from utils import safe_float
+
+STATEMENTS = ('overview', 'income', 'balance', 'cashflow')
+
+# Campos de texto do overview (os demais são numéricos)
+COMPANY_FIELDS = {
+    'Name': 'name',
+    'AssetType': 'asset_type',
+    'Exchange': 'exchange',
+    'Currency': 'currency',
+    'Country': 'country',
+    'Sector': 'sector',
+    'Industry': 'industry',
+}
+OVERVIEW_TEXT = set(COMPANY_FIELDS) | {'Symbol', 'Description', 'CIK', 'Address', 'OfficialSite', 'FiscalYearEnd',
+                                       'LatestQuarter', 'DividendDate', 'ExDividendDate'}
+
+# Métricas derivadas: nome -> (numerador, denominador) do último relatório anual
+RATIOS = {
+    'gross_margin': ('grossProfit', 'totalRevenue'),
+    'operating_margin': ('operatingIncome', 'totalRevenue'),
+    'net_margin': ('netIncome', 'totalRevenue'),
+    'roe': ('netIncome', 'totalShareholderEquity'),
+    'debt_to_equity': ('totalLiabilities', 'totalShareholderEquity'),
+}
+
+# Crescimento anual: nome -> métrica do demonstrativo de resultados
+GROWTH = {
+    'revenue_growth': 'totalRevenue',
+    'earnings_growth': 'netIncome',
+}
+
+OPERATORS = ('<', '<=', '>', '>=', '=', '!=')
+
+# Códigos dos períodos na tabela facts
+PERIODS = {'snapshot': 0, 'annual': 1, 'quarterly': 2}
+
+# Símbolos e métricas são tabelas de dimensão: facts só guarda inteiros, a
+# data e o valor (métricas repetidas em dois demonstrativos, como netIncome,
+# têm um id por demonstrativo)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL UNIQUE,
+    name TEXT,
+    asset_type TEXT,
+    exchange TEXT,
+    currency TEXT,
+    country TEXT,
+    sector TEXT,
+    industry TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    statement TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (statement, name)
+);
+
+CREATE TABLE IF NOT EXISTS facts (
+    company_id INTEGER NOT NULL,
+    metric_id INTEGER NOT NULL,
+    period INTEGER NOT NULL,
+    fiscal_date TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (company_id, metric_id, period, fiscal_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facts_metric_date ON facts (metric_id, period, fiscal_date);
+
+CREATE TABLE IF NOT EXISTS latest (
+    company_id INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    fiscal_date TEXT,
+    PRIMARY KEY (company_id, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS latest_metric_value ON latest (metric, value);
+"""
+
+# Valor mais recente de cada métrica (snapshot do overview e último relatório
+# anual); em nomes repetidos vale a ordem dos demonstrativos
+LATEST_SQL = """
+INSERT OR IGNORE INTO latest (company_id, metric, value, fiscal_date)
+SELECT company_id, name, value, fiscal_date FROM (
+    SELECT f.company_id, m.name, f.value, f.fiscal_date, m.statement,
+           RANK() OVER (PARTITION BY m.statement ORDER BY f.fiscal_date DESC) AS position
+    FROM facts f JOIN metrics m ON m.id = f.metric_id
+    WHERE f.company_id = ? AND f.period IN (0, 1)
+)
+WHERE position = 1 AND value IS NOT NULL
+ORDER BY CASE statement WHEN 'overview' THEN 0 WHEN 'income' THEN 1 WHEN 'balance' THEN 2 ELSE 3 END
+"""
+
+
+def _number(value):
+    # Valores da API vêm como string; 'None', '-' e '' viram None
+    number = safe_float(value, None)
+    return number if number is None or number == number else None
+
+
+def parse_condition(text):
+    """
+    Converte uma condição em texto (ex: 'PERatio<15') numa tupla
+
+    Returns:
+        tuple: (métrica, operador, valor)
+    """
+    match = re.fullmatch(r"\s*([A-Za-z_][\w]*)\s*(<=|>=|!=|<|>|=)\s*(-?[\d.]+(?:e-?\d+)?)\s*", text)
+    if match is None:
+        raise ValueError(f"Condição inválida: {text} (use ex: PERatio<15)")
+    return match.group(1), match.group(2), float(match.group(3))
+
+
+class FundamentalsStore:
+    """
+    Armazém SQLite de fundamentos
+
+    Cada thread usa sua própria conexão, então a mesma instância pode ser
+    compartilhada entre sessões; o modo WAL permite leituras enquanto outro
+    processo grava.
+    """
+
+    def __init__(self, path=FUNDAMENTALS_DB):
+        """
+        Args:
+            path (str | Path): Arquivo do banco
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._metric_ids = {}
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Uma conexão por thread, reaproveitada (fechar a última conexão em WAL
+        # força um checkpoint); cada bloco é uma transação
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        except BaseException:
+            # Ids de métricas criadas na transação desfeita não valem mais
+            self._metric_ids.clear()
+            raise
+
+    def _company_id(self, conn, symbol):
+        conn.execute("INSERT OR IGNORE INTO companies (symbol) VALUES (?)", (symbol,))
+        return conn.execute("SELECT id FROM companies WHERE symbol = ?", (symbol,)).fetchone()[0]
+
+    def _metric_id(self, conn, statement, name):
+        key = (statement, name)
+        metric_id = self._metric_ids.get(key)
+        if metric_id is None:
+            conn.execute("INSERT OR IGNORE INTO metrics (statement, name) VALUES (?, ?)", key)
+            metric_id = conn.execute("SELECT id FROM metrics WHERE statement = ? AND name = ?", key).fetchone()[0]
+            self._metric_ids[key] = metric_id
+        return metric_id
+
+    def ingest(self, symbol, statement, payload):
+        """
+        Grava uma resposta da API
+
+        Args:
+            symbol (str): Símbolo
+            statement (str): 'overview', 'income', 'balance' ou 'cashflow'
+            payload (dict): Resposta da API
+
+        Returns:
+            int: Número de fatos gravados (0 se a resposta não tem dados)
+        """
+        with self._connect() as conn:
+            return self._ingest(conn, symbol, statement, payload)
+
+    def _ingest(self, conn, symbol, statement, payload):
+        if statement not in STATEMENTS:
+            raise ValueError(f"Demonstrativo inválido: {statement} (use {', '.join(STATEMENTS)})")
+
+        symbol = symbol.upper()
+        facts = []
+        company = None
+
+        if statement == 'overview':
+            if not payload or 'Symbol' not in payload:
+                return 0
+            fiscal_date = payload.get('LatestQuarter') or date.today().isoformat()
+            facts = [('snapshot', fiscal_date, key, value) for key, value in payload.items() if key not in OVERVIEW_TEXT]
+            company = [payload.get(field) for field in COMPANY_FIELDS] + [date.today().isoformat()]
+        else:
+            for block, period in (('annualReports', 'annual'), ('quarterlyReports', 'quarterly')):
+                for report in (payload or {}).get(block) or []:
+                    fiscal_date = report.get('fiscalDateEnding')
+                    if fiscal_date:
+                        facts.extend((period, fiscal_date, key, value) for key, value in report.items()
+                                     if key not in ('fiscalDateEnding', 'reportedCurrency'))
+
+        if not facts:
+            return 0
+
+        company_id = self._company_id(conn, symbol)
+        if company is not None:
+            columns = ", ".join(f"{column} = ?" for column in list(COMPANY_FIELDS.values()) + ['updated_at'])
+            conn.execute(f"UPDATE companies SET {columns} WHERE id = ?", company + [company_id])
+
+        rows = [(company_id, self._metric_id(conn, statement, key), PERIODS[period], fiscal_date, _number(value))
+                for period, fiscal_date, key, value in facts]
+        conn.executemany("INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?)", rows)
+        self._refresh_latest(conn, company_id)
+        return len(rows)
+
+    def _refresh_latest(self, conn, company_id):
+        conn.execute("DELETE FROM latest WHERE company_id = ?", (company_id,))
+        conn.execute(LATEST_SQL, (company_id,))
+
+        values = dict(conn.execute("SELECT metric, value FROM latest WHERE company_id = ?", (company_id,)))
+        derived = []
+        for name, (numerator, denominator) in RATIOS.items():
+            if values.get(numerator) is not None and values.get(denominator):
+                derived.append((name, values[numerator] / values[denominator]))
+
+        for name, metric in GROWTH.items():
+            last = conn.execute(
+                "SELECT value FROM facts WHERE company_id = ? AND metric_id = ? AND period = 1 "
+                "ORDER BY fiscal_date DESC LIMIT 2", (company_id, self._metric_id(conn, 'income', metric))
+            ).fetchall()
+            if len(last) == 2 and last[0][0] is not None and last[1][0] is not None and last[1][0] > 0:
+                derived.append((name, last[0][0] / last[1][0] - 1.0))
+
+        income_date = conn.execute(
+            "SELECT fiscal_date FROM latest WHERE company_id = ? AND metric = 'totalRevenue'", (company_id,)
+        ).fetchone()
+        conn.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?)",
+                         [(company_id, name, value, income_date[0] if income_date else None) for name, value in derived])
+
+    def ingest_cache(self, cache_dir=CACHE_DIR):
+        """
+        Importa as respostas de fundamentos já gravadas pelo CacheManager
+
+        Args:
+            cache_dir (str | Path): Diretório do cache
+
+        Returns:
+            int: Número de arquivos importados
+        """
+        count = 0
+        with self._connect() as conn:
+            # Os arquivos do CacheManager usam o nome do demonstrativo como prefixo (ex: income_AAPL.json)
+            for statement in STATEMENTS:
+                for path in Path(cache_dir).glob(f"{statement}_*.json"):
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            payload = json.load(f)['data']
+                    except (OSError, ValueError, KeyError):
+                        continue
+                    if self._ingest(conn, path.stem[len(statement) + 1:], statement, payload):
+                        count += 1
+        return count
+
+    def symbols(self):
+        """Símbolos com algum fundamento armazenado"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT symbol FROM companies c WHERE EXISTS (SELECT 1 FROM latest l WHERE l.company_id = c.id) ORDER BY symbol"
+            )]
+
+    def metrics(self):
+        """Métricas disponíveis para screens"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT metric FROM latest ORDER BY metric")]
+
+    def history(self, symbol, metric, statement='income', period='annual'):
+        """
+        Série de uma métrica de uma empresa
+
+        Args:
+            symbol (str): Símbolo
+            metric (str): Métrica (ex: 'totalRevenue')
+            statement (str): Demonstrativo da métrica
+            period (str): 'annual', 'quarterly' ou 'snapshot'
+
+        Returns:
+            pd.Series: Valores indexados pela data fiscal
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT f.fiscal_date, f.value FROM facts f "
+                "JOIN companies c ON c.id = f.company_id JOIN metrics m ON m.id = f.metric_id "
+                "WHERE c.symbol = ? AND m.statement = ? AND m.name = ? AND f.period = ? ORDER BY f.fiscal_date",
+                (symbol.upper(), statement, metric, PERIODS[period])
+            ).fetchall()
+        return pd.Series([v for _, v in rows], index=pd.to_datetime([d for d, _ in rows]), name=metric, dtype=float)
+
+    def latest(self, symbols=None, metrics=None):
+        """
+        Valores mais recentes em formato largo
+
+        Args:
+            symbols (list): Símbolos (None = todos)
+            metrics (list): Métricas (None = todas)
+
+        Returns:
+            pd.DataFrame: Índice = símbolo, uma coluna por métrica
+        """
+        query = "SELECT c.symbol, l.metric, l.value FROM latest l JOIN companies c ON c.id = l.company_id"
+        params = []
+        if symbols is not None:
+            query += " JOIN temp.universe u ON u.symbol = c.symbol"
+        if metrics is not None:
+            query += f" WHERE l.metric IN ({', '.join('?' * len(metrics))})"
+            params.extend(metrics)
+
+        with self._connect() as conn:
+            if symbols is not None:
+                self._universe(conn, symbols)
+            rows = conn.execute(query, params).fetchall()
+
+        frame = pd.DataFrame(rows, columns=['symbol', 'metric', 'value'])
+        wide = frame.pivot(index='symbol', columns='metric', values='value') if len(frame) else pd.DataFrame()
+        if metrics is not None:
+            wide = wide.reindex(columns=list(metrics))
+        return wide
+
+    def _universe(self, conn, symbols):
+        # Tabela temporária com o universo do screen (join indexado, sem IN gigante)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS universe (symbol TEXT PRIMARY KEY) WITHOUT ROWID")
+        conn.execute("DELETE FROM temp.universe")
+        conn.executemany("INSERT OR IGNORE INTO temp.universe VALUES (?)", [(s.upper(),) for s in symbols])
+
+    def screen(self, conditions, symbols=None, columns=()):
+        """
+        Empresas que atendem a todas as condições
+
+        Args:
+            conditions (list): Tuplas (métrica, operador, valor) ou textos
+                como 'PERatio<15'
+            symbols (list): Universo (ex: holdings de um ETF; None = todas)
+            columns (list): Métricas extras exibidas no resultado
+
+        Returns:
+            pd.DataFrame: symbol, name, sector, uma coluna por métrica
+        """
+        conditions = [parse_condition(c) if isinstance(c, str) else tuple(c) for c in conditions]
+        if not conditions:
+            raise ValueError("Informe pelo menos uma condição")
+        for _, operator, _ in conditions:
+            if operator not in OPERATORS:
+                raise ValueError(f"Operador inválido: {operator} (use {', '.join(OPERATORS)})")
+
+        # Uma busca por faixa no índice (metric, value) por condição, ligadas pela
+        # empresa; as colunas extras são buscas pela chave (company_id, metric)
+        names = list(dict.fromkeys(metric for metric, _, _ in conditions))
+        extra = [c for c in dict.fromkeys(columns) if c not in names]
+        first_metric, first_operator, first_value = conditions[0]
+        values = [f"c{i}.value" for i in range(len(conditions))] + [f"e{j}.value" for j in range(len(extra))]
+        query = f"SELECT co.symbol, co.name, co.sector, {', '.join(values)} FROM latest c0"
+        params = []
+        for i, (metric, operator, value) in enumerate(conditions[1:], start=1):
+            query += (f" JOIN latest c{i} ON c{i}.company_id = c0.company_id"
+                      f" AND c{i}.metric = ? AND c{i}.value {operator} ?")
+            params.extend([metric, value])
+        for j, metric in enumerate(extra):
+            query += f" LEFT JOIN latest e{j} ON e{j}.company_id = c0.company_id AND e{j}.metric = ?"
+            params.append(metric)
+        query += " JOIN companies co ON co.id = c0.company_id"
+        if symbols is not None:
+            query += " JOIN temp.universe u ON u.symbol = co.symbol"
+        query += f" WHERE c0.metric = ? AND c0.value {first_operator} ? ORDER BY co.symbol"
+        params.extend([first_metric, first_value])
+
+        with self._connect() as conn:
+            if symbols is not None:
+                self._universe(conn, symbols)
+            rows = conn.execute(query, params).fetchall()
+
+        labels = [f"c{i}" for i in range(len(conditions))] + extra
+        frame = pd.DataFrame(rows, columns=['symbol', 'name', 'sector'] + labels)
+        for i, (metric, _, _) in enumerate(conditions):
+            frame[metric] = frame.pop(f"c{i}")
+        return frame[['symbol', 'name', 'sector'] + names + extra]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Armazém local de fundamentos")
+    parser.add_argument('--import-cache', action='store_true', help="Importa os fundamentos do cache da API")
+    parser.add_argument('--screen', nargs='+', metavar='CONDITION', help="Condições (ex: PERatio<15 revenue_growth>0.1)")
+    parser.add_argument('--etf', help="Restringe o screen aos holdings de um ETF (HoldingsStore do crawler)")
+    args = parser.parse_args(argv)
+
+    store = FundamentalsStore()
+    if args.import_cache:
+        start = time.perf_counter()
+        count = store.ingest_cache()
+        print(f"✅ {count} respostas importadas em {time.perf_counter() - start:.2f}s "
+              f"({len(store.symbols())} empresas no armazém)")
+
+    if args.screen:
+        symbols = None
+        if args.etf:
+            holdings = HoldingsStore.load(holdings_store_path(ETF_UNIVERSE)).to_dict(args.etf)
+            if holdings is None:
+                raise SystemExit(f"❌ {args.etf.upper()} não está no HoldingsStore")
+            symbols = list(holdings)
+
+        start = time.perf_counter()
+        result = store.screen(args.screen, symbols)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(result.to_string(index=False))
+        print(f"✅ {len(result)} empresas em {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+# holdings_store.py
+import numpy as np
+
+from utils import safe_float
+
+# Tickers que os perfis usam para linhas sem ativo (caixa, derivativos...)
+PLACEHOLDER_TICKERS = frozenset({'', 'N/A'})
+
+
+class TickerTable:
+    """
+    Tabela global de internação de tickers
+
+    Cada símbolo recebe um ID int32 estável, permitindo que as carteiras dos
+    ETFs sejam guardadas como arrays numéricos em vez de dicts de strings.
+    """
+
+    __slots__ = ('_ids', '_symbols')
+
+    def __init__(self, symbols=None):
+        """
+        Inicializa a tabela
+
+        Args:
+            symbols (list): Símbolos iniciais, na ordem dos IDs (opcional)
+        """
+        self._ids = {}
+        self._symbols = []
+
+        for symbol in symbols or []:
+            self.intern(symbol)
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._ids
+
+    def intern(self, symbol):
+        """
+        Retorna o ID de um símbolo, criando-o se necessário
+
+        Args:
+            symbol (str): Símbolo do ativo
+
+        Returns:
+            int: ID do símbolo
+        """
+        symbol = symbol.upper()
+        ticker_id = self._ids.get(symbol)
+
+        if ticker_id is None:
+            ticker_id = len(self._symbols)
+            self._ids[symbol] = ticker_id
+            self._symbols.append(symbol)
+
+        return ticker_id
+
+    def intern_many(self, symbols):
+        """
+        Interna uma lista de símbolos
+
+        Args:
+            symbols (list): Símbolos dos ativos
+
+        Returns:
+            np.ndarray: IDs int32 na mesma ordem
+        """
+        return np.fromiter((self.intern(s) for s in symbols), dtype=np.int32, count=len(symbols))
+
+    def get_id(self, symbol):
+        """Retorna o ID de um símbolo ou None se ele não foi internado"""
+        return self._ids.get(symbol.upper())
+
+    def symbol(self, ticker_id):
+        """Retorna o símbolo de um ID"""
+        return self._symbols[ticker_id]
+
+    def symbols(self, ids=None):
+        """
+        Converte IDs de volta para símbolos
+
+        Args:
+            ids (iterable): IDs a converter (None = todos)
+
+        Returns:
+            list: Símbolos correspondentes
+        """
+        if ids is None:
+            return list(self._symbols)
+        return [self._symbols[i] for i in ids]
+
+
+class ETFHoldings:
+    """
+    Carteira compacta de um ETF
+
+    Guarda um array ordenado de IDs (int32) e um array paralelo de pesos
+    (float32, fração do patrimônio - 0.05 = 5%).
+    """
+
+    __slots__ = ('symbol', 'ids', 'weights')
+
+    def __init__(self, symbol, ids, weights):
+        """
+        Inicializa a carteira, ordenando por ID e somando tickers repetidos
+
+        Args:
+            symbol (str): Símbolo do ETF
+            ids (array-like): IDs dos holdings
+            weights (array-like): Pesos dos holdings (fração)
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32)
+
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        weights = weights[order]
+
+        # Alguns perfis repetem o mesmo ticker em mais de uma linha - soma os pesos
+        if len(ids) > 1 and not np.all(ids[1:] != ids[:-1]):
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            weights = np.add.reduceat(weights, starts).astype(np.float32)
+            ids = ids[starts]
+
+        self.symbol = symbol.upper()
+        self.ids = ids
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.weights.nbytes
+
+    def total_weight(self):
+        """Soma dos pesos (fração)"""
+        return float(self.weights.sum(dtype=np.float64))
+
+    def intersect(self, other):
+        """
+        Interseção por merge de arrays ordenados
+
+        Args:
+            other (ETFHoldings): Outra carteira
+
+        Returns:
+            tuple: (ids comuns, pesos em self, pesos em other)
+        """
+        if len(self.ids) == 0 or len(other.ids) == 0:
+            empty = np.empty(0, dtype=np.float32)
+            return np.empty(0, dtype=np.int32), empty, empty
+
+        # Percorre o array menor e localiza cada ID no maior via busca binária
+        small, large = (self, other) if len(self.ids) <= len(other.ids) else (other, self)
+        pos = np.searchsorted(large.ids, small.ids)
+        pos[pos == len(large.ids)] = 0
+        mask = large.ids[pos] == small.ids
+
+        common = small.ids[mask]
+        w_small = small.weights[mask]
+        w_large = large.weights[pos[mask]]
+
+        if small is self:
+            return common, w_small, w_large
+        return common, w_large, w_small
+
+
+class HoldingsStore:
+    """
+    Repositório de carteiras compactas de todo o universo de ETFs
+
+    Todas as carteiras compartilham a mesma TickerTable. Em disco o universo
+    é salvo em formato CSR (offsets + IDs + pesos concatenados) num único
+    arquivo .npz.
+    """
+
+    __slots__ = ('tickers', '_etfs')
+
+    def __init__(self, tickers=None):
+        self.tickers = tickers if tickers is not None else TickerTable()
+        self._etfs = {}
+
+    def __len__(self):
+        return len(self._etfs)
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._etfs
+
+    def symbols(self):
+        """Lista os ETFs presentes no repositório"""
+        return list(self._etfs)
+
+    def get(self, symbol):
+        """Retorna a carteira de um ETF ou None"""
+        return self._etfs.get(symbol.upper())
+
+    def add(self, symbol, holdings):
+        """
+        Adiciona a carteira de um ETF a partir da lista 'holdings' da API
+
+        Linhas sem ticker ('', 'n/a') são descartadas: não identificam um
+        ativo e, somadas num ID só, virariam um holding comum entre ETFs.
+
+        Args:
+            symbol (str): Símbolo do ETF
+            holdings (list): Lista de dicts com 'symbol' e 'weight'
+
+        Returns:
+            ETFHoldings: Carteira compacta criada ou None se não sobra nenhum
+                holding (o ETF não é adicionado)
+        """
+        holdings = [h for h in holdings if str(h.get('symbol') or '').strip().upper() not in PLACEHOLDER_TICKERS]
+        if not holdings:
+            return None
+        tickers = [str(h['symbol']).strip() for h in holdings]
+        weights = np.array([safe_float(h.get('weight', 0), 0.0) for h in holdings], dtype=np.float32)
+
+        etf = ETFHoldings(symbol, self.tickers.intern_many(tickers), weights)
+        self._etfs[etf.symbol] = etf
+        return etf
+
+    def add_profile(self, symbol, profile):
+        """
+        Adiciona um ETF a partir da resposta de ETF_PROFILE
+
+        Returns:
+            ETFHoldings: Carteira criada ou None se o perfil não tem holdings
+        """
+        if not profile or not profile.get('holdings'):
+            return None
+        return self.add(symbol, profile['holdings'])
+
+    def to_dict(self, symbol):
+        """
+        Converte uma carteira para o formato antigo {ticker: peso em %}
+
+        Returns:
+            dict: Pesos em percentual ou None se o ETF não existe
+        """
+        etf = self.get(symbol)
+        if etf is None:
+            return None
+        return dict(zip(self.tickers.symbols(etf.ids), _to_percent(etf.weights).tolist()))
+
+    def nbytes(self):
+        """Memória ocupada pelos arrays de todas as carteiras (bytes)"""
+        return sum(etf.nbytes for etf in self._etfs.values())
+
+    def overlap(self, etf_a, etf_b, top=None):
+        """
+        Calcula as métricas de overlap entre dois ETFs do repositório
+
+        Args:
+            etf_a (str): Símbolo do ETF A
+            etf_b (str): Símbolo do ETF B
+            top (int): Limita common_holdings aos N maiores overlaps (None = todos)
+
+        Returns:
+            dict: Mesmas métricas de OverlapCalculator.calculate_overlap
+        """
+        holdings_a = self.get(etf_a)
+        holdings_b = self.get(etf_b)
+
+        if holdings_a is None or holdings_b is None or not len(holdings_a) or not len(holdings_b):
+            raise ValueError("Não foi possível obter holdings dos ETFs")
+
+        common, weights_a, weights_b = holdings_a.intersect(holdings_b)
+
+        # Pesos em percentual, como no cálculo original
+        weights_a = _to_percent(weights_a)
+        weights_b = _to_percent(weights_b)
+        overlaps = np.minimum(weights_a, weights_b)
+
+        order = np.argsort(-overlaps, kind='stable')[:top]
+        common_tickers = self.tickers.symbols(common[order])
+        common_holdings = [
+            {'ticker': t, 'weight_in_a': a, 'weight_in_b': b, 'overlap': o}
+            for t, a, b, o in zip(common_tickers, weights_a[order].tolist(),
+                                  weights_b[order].tolist(), overlaps[order].tolist())
+        ]
+
+        overlap_weight = float(overlaps.sum())
+        total_weight_a = float(_to_percent(holdings_a.weights).sum())
+        total_weight_b = float(_to_percent(holdings_b.weights).sum())
+
+        overlap_a_in_b = (overlap_weight / total_weight_a * 100) if total_weight_a > 0 else 0
+        overlap_b_in_a = (overlap_weight / total_weight_b * 100) if total_weight_b > 0 else 0
+
+        return {
+            'overlap_weight': overlap_weight,
+            'overlap_a_in_b': overlap_a_in_b,
+            'overlap_b_in_a': overlap_b_in_a,
+            'overlap_average': (overlap_a_in_b + overlap_b_in_a) / 2,
+            'common_holdings': common_holdings,
+            'total_holdings_a': len(holdings_a),
+            'total_holdings_b': len(holdings_b),
+            'common_count': len(common)
+        }
+
+    def save(self, path):
+        """
+        Salva o universo num arquivo .npz (formato CSR)
+
+        Args:
+            path (str | Path): Caminho do arquivo
+        """
+        etfs = list(self._etfs.values())
+        lengths = np.array([len(etf) for etf in etfs], dtype=np.int64)
+        offsets = np.zeros(len(etfs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        np.savez(
+            path,
+            tickers=np.array(self.tickers.symbols(), dtype=str),
+            etf_symbols=np.array([etf.symbol for etf in etfs], dtype=str),
+            offsets=offsets,
+            ids=np.concatenate([etf.ids for etf in etfs]) if etfs else np.empty(0, dtype=np.int32),
+            weights=np.concatenate([etf.weights for etf in etfs]) if etfs else np.empty(0, dtype=np.float32)
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega um universo salvo com save()
+
+        Args:
+            path (str | Path): Caminho do arquivo .npz
+
+        Returns:
+            HoldingsStore: Repositório carregado
+        """
+        with np.load(path) as data:
+            store = cls(TickerTable(data['tickers'].tolist()))
+            offsets = data['offsets']
+            ids = data['ids']
+            weights = data['weights']
+
+            # Universos salvos antes de add() descartar as linhas sem ticker
+            placeholders = [i for i in map(store.tickers.get_id, PLACEHOLDER_TICKERS) if i is not None]
+
+            for i, symbol in enumerate(data['etf_symbols'].tolist()):
+                start, end = offsets[i], offsets[i + 1]
+                keep = ~np.isin(ids[start:end], placeholders)
+                if not keep.any():
+                    continue
+                etf = ETFHoldings.__new__(ETFHoldings)
+                etf.symbol = symbol
+                etf.ids = ids[start:end][keep]
+                etf.weights = weights[start:end][keep]
+                store._etfs[symbol] = etf
+
+        return store
+
+
+def _to_percent(weights):
+    # Arredonda para remover o ruído da conversão float32 -> float64
+    return np.round(weights.astype(np.float64) * 100, 4)
+
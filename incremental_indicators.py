@@ -0,0 +1,403 @@
+# incremental_indicators.py
+"""
+Indicadores incrementais: cada nova barra é processada em O(1)
+
+Os valores coincidem com os de indicators.py para a mesma série. O estado
+de cada símbolo é salvo em JSON ao lado das suas séries no PriceStore, de
+modo que a atualização noturna só processa as barras novas.
+
+Uso (atualização de todos os símbolos do store):
+    python incremental_indicators.py
+"""
+import json
+import math
+import os
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+
+from intraday_buffer import forming_daily_bar
+from price_store import PriceStore
+
+STATE_FILE = 'indicators.json'
+
+
+class RollingSMA:
+    """Média móvel simples com buffer circular e soma corrente"""
+
+    __slots__ = ('period', 'window', 'total', 'value')
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.value = math.nan
+
+    def update(self, x):
+        """Processa um valor e retorna a SMA (NaN até completar a janela)"""
+        self.window.append(x)
+        self.total += x
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+    def to_state(self):
+        return {'period': self.period, 'window': list(self.window)}
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls(state['period'])
+        obj.window = deque(state['window'])
+        obj.total = math.fsum(obj.window)
+        if len(obj.window) == obj.period:
+            obj.value = obj.total / obj.period
+        return obj
+
+
+class EMA:
+    """
+    Média móvel exponencial semeada com a SMA dos primeiros N valores
+
+    Com alpha = 1 / period vira a suavização de Wilder.
+    """
+
+    __slots__ = ('period', 'alpha', 'count', 'seed_sum', 'value')
+
+    def __init__(self, period, alpha=None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = math.nan
+
+    def update(self, x):
+        """Processa um valor e retorna a EMA (NaN até completar a semente)"""
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += x
+        elif self.count == self.period:
+            self.value = (self.seed_sum + x) / self.period
+        else:
+            self.value = (1.0 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+    def to_state(self):
+        return {'period': self.period, 'alpha': self.alpha, 'count': self.count,
+                'seed_sum': self.seed_sum, 'value': _encode(self.value)}
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls(state['period'], state['alpha'])
+        obj.count = state['count']
+        obj.seed_sum = state['seed_sum']
+        obj.value = _decode(state['value'])
+        return obj
+
+
+class WilderRSI:
+    """RSI com suavização de Wilder"""
+
+    __slots__ = ('period', 'prev', 'gain', 'loss', 'value')
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev = math.nan
+        self.gain = EMA(period, 1.0 / period)
+        self.loss = EMA(period, 1.0 / period)
+        self.value = math.nan
+
+    def update(self, close):
+        """Processa um fechamento e retorna o RSI"""
+        if not math.isnan(self.prev):
+            delta = close - self.prev
+            avg_gain = self.gain.update(max(delta, 0.0))
+            avg_loss = self.loss.update(max(-delta, 0.0))
+
+            if not math.isnan(avg_gain):
+                self.value = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        self.prev = close
+        return self.value
+
+    def to_state(self):
+        return {'period': self.period, 'prev': _encode(self.prev), 'gain': self.gain.to_state(),
+                'loss': self.loss.to_state(), 'value': _encode(self.value)}
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls(state['period'])
+        obj.prev = _decode(state['prev'])
+        obj.gain = EMA.from_state(state['gain'])
+        obj.loss = EMA.from_state(state['loss'])
+        obj.value = _decode(state['value'])
+        return obj
+
+
+class RollingMinMax:
+    """
+    Mínimo e máximo móveis com deques monotônicos (O(1) amortizado)
+    """
+
+    __slots__ = ('period', 'count', 'min_deque', 'max_deque')
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.min_deque = deque()
+        self.max_deque = deque()
+
+    def update(self, x, low=None):
+        """
+        Processa uma barra
+
+        Args:
+            x (float): Valor para o máximo (ex: high)
+            low (float): Valor para o mínimo (padrão = x)
+
+        Returns:
+            tuple: (mínimo, máximo) da janela; NaN até completá-la
+        """
+        low = x if low is None else low
+        i = self.count
+        self.count += 1
+
+        while self.max_deque and self.max_deque[-1][1] <= x:
+            self.max_deque.pop()
+        self.max_deque.append((i, x))
+        while self.min_deque and self.min_deque[-1][1] >= low:
+            self.min_deque.pop()
+        self.min_deque.append((i, low))
+
+        # Descarta o que saiu da janela
+        start = i - self.period + 1
+        if self.max_deque[0][0] < start:
+            self.max_deque.popleft()
+        if self.min_deque[0][0] < start:
+            self.min_deque.popleft()
+
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.period:
+            return (math.nan, math.nan)
+        return (self.min_deque[0][1], self.max_deque[0][1])
+
+    def to_state(self):
+        return {'period': self.period, 'count': self.count,
+                'min': [list(e) for e in self.min_deque], 'max': [list(e) for e in self.max_deque]}
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls(state['period'])
+        obj.count = state['count']
+        obj.min_deque = deque(tuple(e) for e in state['min'])
+        obj.max_deque = deque(tuple(e) for e in state['max'])
+        return obj
+
+
+INDICATOR_TYPES = {cls.__name__: cls for cls in (RollingSMA, EMA, WilderRSI, RollingMinMax)}
+
+# Indicadores mantidos por padrão para cada símbolo: nome -> (classe, argumentos)
+DEFAULT_SPEC = {
+    'sma_20': ('RollingSMA', {'period': 20}),
+    'sma_50': ('RollingSMA', {'period': 50}),
+    'sma_200': ('RollingSMA', {'period': 200}),
+    'ema_12': ('EMA', {'period': 12}),
+    'ema_26': ('EMA', {'period': 26}),
+    'rsi_14': ('WilderRSI', {'period': 14}),
+    'range_252': ('RollingMinMax', {'period': 252}),
+}
+
+
+class IndicatorSet:
+    """
+    Conjunto de indicadores incrementais de um símbolo
+
+    Guarda o timestamp da última barra processada; barras repetidas ou
+    anteriores são ignoradas, então a atualização pode rodar várias vezes.
+    A barra só deve ser processada depois de fechada (o candle do dia ainda
+    muda até o fechamento).
+    """
+
+    __slots__ = ('indicators', 'last_timestamp')
+
+    def __init__(self, spec=None):
+        spec = spec or DEFAULT_SPEC
+        self.indicators = {name: INDICATOR_TYPES[kind](**args) for name, (kind, args) in spec.items()}
+        self.last_timestamp = None
+
+    def update_bar(self, timestamp, high, low, close):
+        """
+        Processa uma barra fechada
+
+        Args:
+            timestamp (int): Timestamp da barra em segundos
+            high (float): Máxima
+            low (float): Mínima
+            close (float): Fechamento
+
+        Returns:
+            bool: True se a barra era nova
+        """
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+
+        for indicator in self.indicators.values():
+            if isinstance(indicator, RollingMinMax):
+                indicator.update(high, low)
+            else:
+                indicator.update(close)
+
+        self.last_timestamp = int(timestamp)
+        return True
+
+    def update_series(self, series, until=None):
+        """
+        Processa as barras de uma PriceSeries posteriores à última processada
+
+        Args:
+            series (PriceSeries): Barras do símbolo
+            until (int): Timestamp (segundos) exclusivo: barras a partir dele
+                ainda não fecharam e ficam para a próxima atualização
+                (None = todas)
+
+        Returns:
+            int: Número de barras processadas
+        """
+        index = np.asarray(series.index).astype('datetime64[s]').astype(np.int64)
+        start = 0 if self.last_timestamp is None else int(np.searchsorted(index, self.last_timestamp, side='right'))
+        end = len(index) if until is None else int(np.searchsorted(index, until, side='left'))
+        if start >= end:
+            return 0
+
+        highs = np.asarray(series.high[start:end]).tolist()
+        lows = np.asarray(series.low[start:end]).tolist()
+        closes = np.asarray(series.close[start:end]).tolist()
+
+        # Os indicadores são independentes: percorre a série uma vez por indicador
+        for indicator in self.indicators.values():
+            if isinstance(indicator, RollingMinMax):
+                update = indicator.update
+                for high, low in zip(highs, lows):
+                    update(high, low)
+            else:
+                update = indicator.update
+                for close in closes:
+                    update(close)
+
+        self.last_timestamp = int(index[end - 1])
+        return len(closes)
+
+    def values(self):
+        """Valores atuais de todos os indicadores"""
+        out = {}
+        for name, indicator in self.indicators.items():
+            if isinstance(indicator, RollingMinMax):
+                out[f"{name}_low"], out[f"{name}_high"] = indicator.value
+            else:
+                out[name] = indicator.value
+        return out
+
+    def to_state(self):
+        return {
+            'last_timestamp': self.last_timestamp,
+            'indicators': {name: {'type': type(ind).__name__, 'state': ind.to_state()}
+                           for name, ind in self.indicators.items()}
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls.__new__(cls)
+        obj.last_timestamp = state['last_timestamp']
+        obj.indicators = {name: INDICATOR_TYPES[entry['type']].from_state(entry['state'])
+                          for name, entry in state['indicators'].items()}
+        return obj
+
+    def save(self, path):
+        """Grava o estado em JSON (escrita atômica)"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            # json.dumps usa o codificador em C (json.dump escreve em pedaços, em Python)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self.to_state()))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Carrega o estado salvo ou None se não existir"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_state(json.load(f))
+        except FileNotFoundError:
+            return None
+
+
+def refresh_indicators(store, symbols=None, spec=None, now=None):
+    """
+    Atualiza os indicadores incrementais de vários símbolos
+
+    Símbolos sem estado salvo são inicializados com todo o histórico; os
+    demais processam apenas as barras novas do PriceStore. A barra do
+    pregão em andamento não é processada: o PriceStore ainda a reescreve
+    e o estado salvo não pode voltar atrás.
+
+    Args:
+        store (PriceStore): Store de preços
+        symbols (list): Símbolos (None = todos do store)
+        spec (dict): Indicadores a manter (padrão = DEFAULT_SPEC)
+        now (datetime): Instante de referência para a barra em formação (None = agora)
+
+    Returns:
+        dict: {símbolo: valores atuais dos indicadores}
+    """
+    until = forming_daily_bar(now)
+    results = {}
+    for symbol in symbols or store.symbols():
+        path = store.state_path(symbol, STATE_FILE)
+        if path is None:
+            continue
+
+        indicator_set = IndicatorSet.load(path)
+        if indicator_set is None:
+            indicator_set = IndicatorSet(spec)
+            series = store.read(symbol)
+        else:
+            # Lê apenas as barras posteriores à última processada
+            series = store.read_after(symbol, indicator_set.last_timestamp)
+
+        if series is not None and len(series) and indicator_set.update_series(series, until):
+            indicator_set.save(path)
+
+        results[symbol] = indicator_set.values()
+
+    return results
+
+
+def _encode(value):
+    # JSON não tem NaN
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _decode(value):
+    return math.nan if value is None else value
+
+
+def main():
+    store = PriceStore()
+    start = time.perf_counter()
+    results = refresh_indicators(store)
+    print(f"✅ {len(results)} símbolos atualizados em {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
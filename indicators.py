@@ -0,0 +1,374 @@
+# indicators.py
+"""
+Indicadores técnicos calculados localmente com NumPy
+
+Todas as funções aceitam arrays 1-D (uma série) ou 2-D (barras x
+símbolos, calculando cada coluna de forma independente) e devolvem NaN
+nas posições sem histórico suficiente. Nos indicadores recursivos (EMA,
+Wilder, RSI, MACD, ATR) um NaN depois do primeiro valor válido é uma barra
+faltante e entra com o valor da barra anterior; nas janelas móveis (SMA, desvio,
+máximo/mínimo) ele deixa NaN só as janelas que o contêm. As convenções seguem as da Alpha
+Vantage (TA-Lib): EMA semeada com a SMA dos primeiros N valores e RSI/ATR
+com a suavização de Wilder.
+"""
+import numpy as np
+import pandas as pd
+
+from utils import ffill
+
+# Tamanho do bloco do filtro recursivo (EMA/Wilder)
+_BLOCK = 128
+
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (x[:, None], True) if x.ndim == 1 else (x, False)
+
+
+def _restore(y, was_1d):
+    return y[:, 0] if was_1d else y
+
+
+def _rolling_sum(x, period):
+    # Soma móvel via soma acumulada; janelas com NaN resultam em NaN
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    if period > n:
+        return out
+
+    valid = np.isfinite(x)
+    csum = np.zeros((n + 1,) + x.shape[1:])
+    np.cumsum(np.where(valid, x, 0.0), axis=0, out=csum[1:])
+    ccount = np.zeros((n + 1,) + x.shape[1:])
+    np.cumsum(valid, axis=0, out=ccount[1:])
+
+    sums = csum[period:] - csum[:-period]
+    counts = ccount[period:] - ccount[:-period]
+    out[period - 1:] = np.where(counts == period, sums, np.nan)
+    return out
+
+
+def _first_valid(x):
+    # Índice do primeiro valor finito de cada coluna (n se não houver)
+    valid = np.isfinite(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), x.shape[0])
+
+
+def _ewm_filter(x, alpha, seed_index, seed_value):
+    """
+    Filtro recursivo y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+
+    Cada coluna começa em seed_index com y = seed_value (antes disso, NaN).
+    O filtro é aplicado em blocos: dentro de cada bloco a recursão vira um
+    produto por uma matriz triangular de pesos, então o laço em Python tem
+    apenas n / _BLOCK iterações. x não pode ter NaN depois da semente: no
+    produto, um NaN contaminaria o bloco inteiro e todas as barras seguintes.
+    """
+    n, m = x.shape
+    decay = 1.0 - alpha
+    cols = np.arange(m)
+
+    # Antes da semente a entrada é zero; na semente, uma entrada que leva y ao valor inicial
+    inputs = np.where(np.arange(n)[:, None] > seed_index, x, 0.0)
+    seeded = seed_index < n
+    inputs[seed_index[seeded], cols[seeded]] = seed_value[seeded] / alpha
+
+    lags = np.arange(_BLOCK)
+    powers = decay ** lags
+    weights = np.tril(alpha * decay ** np.maximum(lags[:, None] - lags[None, :], 0))
+
+    y = np.empty((n, m))
+    prev = np.zeros(m)
+    for start in range(0, n, _BLOCK):
+        block = inputs[start:start + _BLOCK]
+        size = block.shape[0]
+        y[start:start + size] = weights[:size, :size] @ block + np.outer(powers[:size] * decay, prev)
+        prev = y[start + size - 1]
+
+    y[np.arange(n)[:, None] < seed_index] = np.nan
+    return y
+
+
+def sma(x, period):
+    """
+    Média móvel simples
+
+    Args:
+        x (array-like): Série (n,) ou painel (n, m)
+        period (int): Janela
+
+    Returns:
+        np.ndarray: SMA (NaN nas primeiras period-1 posições)
+    """
+    x, was_1d = _as_2d(x)
+    return _restore(_rolling_sum(x, period) / period, was_1d)
+
+
+def rolling_std(x, period, ddof=0):
+    """
+    Desvio padrão móvel (populacional por padrão, como na TA-Lib)
+
+    Args:
+        x (array-like): Série ou painel
+        period (int): Janela
+        ddof (int): Graus de liberdade descontados
+
+    Returns:
+        np.ndarray: Desvio padrão móvel
+    """
+    x, was_1d = _as_2d(x)
+
+    # Centraliza antes de somar quadrados para evitar cancelamento numérico
+    centered = x - np.nanmean(x, axis=0)
+    sums = _rolling_sum(centered, period)
+    squares = _rolling_sum(centered ** 2, period)
+    var = (squares - sums ** 2 / period) / (period - ddof)
+    return _restore(np.sqrt(np.maximum(var, 0.0)), was_1d)
+
+
+def _rolling_extreme(x, period, ufunc, fill):
+    """
+    Máximo/mínimo móvel em O(n) (algoritmo de van Herk/Gil-Werman)
+
+    A série é dividida em blocos de tamanho period; toda janela cobre o
+    final de um bloco e o início do seguinte, então o extremo da janela é
+    o extremo entre o acumulado reverso de um e o acumulado direto do outro.
+    """
+    n, m = x.shape
+    out = np.full(x.shape, np.nan)
+    if period > n:
+        return out
+
+    pad = (-n) % period
+    padded = np.concatenate([np.where(np.isnan(x), fill, x), np.full((pad, m), fill)])
+    blocks = padded.reshape(-1, period, m)
+
+    prefix = ufunc.accumulate(blocks, axis=1).reshape(-1, m)
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, m)
+    out[period - 1:] = ufunc(suffix[:n - period + 1], prefix[period - 1:n])
+
+    # Janelas com NaN resultam em NaN, como em sma()
+    missing = _rolling_sum(np.isnan(x).astype(np.float64), period)
+    out[missing > 0] = np.nan
+    return out
+
+
+def rolling_max(x, period):
+    """
+    Máximo móvel (ex: máxima de 52 semanas com period=252)
+
+    Args:
+        x (array-like): Série ou painel
+        period (int): Janela
+
+    Returns:
+        np.ndarray: Máximo da janela terminada em cada posição
+    """
+    x, was_1d = _as_2d(x)
+    return _restore(_rolling_extreme(x, period, np.maximum, -np.inf), was_1d)
+
+
+def rolling_min(x, period):
+    """
+    Mínimo móvel
+
+    Args:
+        x (array-like): Série ou painel
+        period (int): Janela
+
+    Returns:
+        np.ndarray: Mínimo da janela terminada em cada posição
+    """
+    x, was_1d = _as_2d(x)
+    return _restore(_rolling_extreme(x, period, np.minimum, np.inf), was_1d)
+
+
+def ema(x, period):
+    """
+    Média móvel exponencial (alpha = 2 / (period + 1))
+
+    A primeira EMA de cada coluna é a SMA dos primeiros period valores.
+
+    Args:
+        x (array-like): Série ou painel
+        period (int): Período
+
+    Returns:
+        np.ndarray: EMA
+    """
+    x, was_1d = _as_2d(x)
+    return _restore(_seeded_ewm(x, period, 2.0 / (period + 1)), was_1d)
+
+
+def wilder(x, period):
+    """
+    Suavização de Wilder (EMA com alpha = 1 / period, semeada com a SMA)
+    """
+    x, was_1d = _as_2d(x)
+    return _restore(_seeded_ewm(x, period, 1.0 / period), was_1d)
+
+
+def _seeded_ewm(x, period, alpha):
+    # Barras faltantes repetem o valor anterior (ver _ewm_filter)
+    x = ffill(x)
+    first = _first_valid(x)
+    seed_index = first + period - 1
+    means = _rolling_sum(x, period) / period
+
+    m = x.shape[1]
+    seed_value = np.full(m, np.nan)
+    ok = seed_index < x.shape[0]
+    seed_value[ok] = means[seed_index[ok], np.arange(m)[ok]]
+    return _ewm_filter(x, alpha, seed_index, seed_value)
+
+
+def rsi(close, period=14):
+    """
+    Relative Strength Index (Wilder)
+
+    Args:
+        close (array-like): Fechamentos
+        period (int): Período
+
+    Returns:
+        np.ndarray: RSI entre 0 e 100
+    """
+    close, was_1d = _as_2d(close)
+    close = ffill(close)
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = np.diff(close, axis=0)
+
+    avg_gain = _seeded_ewm(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), period, 1.0 / period)
+    avg_loss = _seeded_ewm(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), period, 1.0 / period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out = np.where((avg_loss == 0) & np.isfinite(avg_gain), 100.0, out)
+    return _restore(out, was_1d)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    MACD
+
+    Args:
+        close (array-like): Fechamentos
+        fast (int): Período da EMA rápida
+        slow (int): Período da EMA lenta
+        signal (int): Período da linha de sinal
+
+    Returns:
+        tuple: (macd, signal, histograma)
+    """
+    close, was_1d = _as_2d(close)
+    line = _seeded_ewm(close, fast, 2.0 / (fast + 1)) - _seeded_ewm(close, slow, 2.0 / (slow + 1))
+    signal_line = _seeded_ewm(line, signal, 2.0 / (signal + 1))
+    hist = line - signal_line
+    return _restore(line, was_1d), _restore(signal_line, was_1d), _restore(hist, was_1d)
+
+
+def bollinger(close, period=20, num_std=2.0):
+    """
+    Bandas de Bollinger
+
+    Returns:
+        tuple: (banda superior, média, banda inferior)
+    """
+    middle = sma(close, period)
+    width = num_std * rolling_std(close, period)
+    return middle + width, middle, middle - width
+
+
+def true_range(high, low, close):
+    """
+    True range (a primeira barra não tem fechamento anterior: NaN)
+    """
+    high, was_1d = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+    high, low, close = ffill(high), ffill(low), ffill(close)
+
+    tr = np.full(high.shape, np.nan)
+    prev = close[:-1]
+    tr[1:] = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+    return _restore(tr, was_1d)
+
+
+def atr(high, low, close, period=14):
+    """
+    Average True Range (Wilder)
+
+    Returns:
+        np.ndarray: ATR
+    """
+    return wilder(true_range(high, low, close), period)
+
+
+def resample_ohlcv(df, interval):
+    """
+    Agrega um DataFrame diário (Open..Volume) em semanal ou mensal
+
+    Args:
+        df (pd.DataFrame): Barras diárias
+        interval (str): 'daily', 'weekly' ou 'monthly'
+
+    Returns:
+        pd.DataFrame: Barras no intervalo pedido
+    """
+    if interval == 'daily':
+        return df
+
+    rule = 'W-FRI' if interval == 'weekly' else 'ME'
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    return df.resample(rule).agg(agg).dropna(subset=['Close'])
+
+
+def compare_with_alpha_vantage(local, payload, column, warmup=0, tolerance=1e-6):
+    """
+    Compara um indicador local com a resposta da Alpha Vantage
+
+    Os indicadores da API usam fechamentos ajustados por dividendos e
+    desdobramentos, enquanto TIME_SERIES_DAILY traz preços brutos; por isso
+    os valores só coincidem depois do último evento corporativo.
+    'matching_since' indica a partir de quando a diferença fica dentro da
+    tolerância.
+
+    Args:
+        local (pd.Series): Indicador local indexado por data
+        payload (dict): Resposta da API (ex: get_sma)
+        column (str): Nome do indicador (ex: 'SMA', 'RSI')
+        warmup (int): Barras iniciais da série local ignoradas
+            (indicadores recursivos dependem do ponto de partida)
+        tolerance (float): Diferença relativa considerada igual
+
+    Returns:
+        dict: Pontos comparados, diferenças máximas e data desde a qual batem
+    """
+    remote = pd.Series({
+        pd.Timestamp(date): float(values[column])
+        for date, values in payload[f"Technical Analysis: {column}"].items()
+    }).sort_index()
+
+    local = local.iloc[warmup:].dropna()
+    common = local.index.intersection(remote.index)
+    if not len(common):
+        return {'points': 0, 'max_abs_diff': float('nan'), 'max_rel_diff': float('nan'), 'matching_since': None}
+
+    diff = (local[common] - remote[common]).abs()
+    rel = (diff / remote[common].abs()).to_numpy()
+
+    # Último ponto fora da tolerância -> coincide a partir do seguinte
+    bad = np.flatnonzero(rel > tolerance)
+    if len(bad) == 0:
+        matching_since = common[0]
+    elif bad[-1] + 1 < len(common):
+        matching_since = common[bad[-1] + 1]
+    else:
+        matching_since = None
+
+    return {
+        'points': len(common),
+        'max_abs_diff': float(diff.max()),
+        'max_rel_diff': float(rel.max()),
+        'matching_since': matching_since
+    }
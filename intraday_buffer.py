@@ -0,0 +1,314 @@
+# intraday_buffer.py
+"""
+Barras intraday recentes em buffers circulares de capacidade fixa
+
+Cada (símbolo, intervalo) tem um RingBuffer com as últimas N barras em
+arrays NumPy pré-alocados: anexar uma barra sobrescreve a mais antiga, sem
+realocar nem copiar a série. As barras que saem do buffer são gravadas no
+PriceStore (chave SYMBOL@interval), então a memória por símbolo é fixa e o
+histórico completo continua disponível em disco.
+
+Os gráficos ao vivo pedem só as barras a partir da última exibida
+(since()), em vez de reler a série inteira.
+"""
+import atexit
+import threading
+from collections import OrderedDict
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from config import INTRADAY_BUFFER_BARS, INTRADAY_INTERVALS, INTRADAY_MAX_SYMBOLS
+from price_store import FRAME_COLUMNS, PRICE_COLUMNS, parse_time_series
+
+# Pregão regular da bolsa americana (horário de Nova York, sem feriados)
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+
+
+def market_open(now=None):
+    """
+    Indica se o pregão regular está aberto
+
+    Args:
+        now (datetime): Instante a verificar (None = agora)
+
+    Returns:
+        bool: True entre 9:30 e 16:00 de Nova York, de segunda a sexta
+    """
+    now = datetime.now(MARKET_TZ) if now is None else now.astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def forming_daily_bar(now=None):
+    """
+    Início da barra diária que ainda está se formando
+
+    Até o fechamento de Nova York a barra de hoje muda a cada atualização;
+    depois dele, a próxima barra aberta é a de amanhã.
+
+    Args:
+        now (datetime): Instante de referência (None = agora)
+
+    Returns:
+        int: Timestamp (segundos) da meia-noite do dia da barra em formação;
+            barras diárias a partir dele ainda não fecharam
+    """
+    now = datetime.now(MARKET_TZ) if now is None else now.astimezone(MARKET_TZ)
+    day = np.datetime64(now.date(), 'D')
+    if now.time() >= MARKET_CLOSE:
+        day += 1
+    return int(day.astype('datetime64[s]').astype(np.int64))
+
+
+class RingBuffer:
+    """
+    Buffer circular de barras OHLCV com capacidade fixa
+
+    index guarda os timestamps (segundos int64) e values as colunas
+    (capacidade x 5, float64). start aponta para a barra mais antiga.
+    """
+
+    __slots__ = ('capacity', 'index', 'values', 'start', 'count')
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("A capacidade do buffer deve ser positiva")
+        self.capacity = capacity
+        self.index = np.zeros(capacity, dtype='<i8')
+        self.values = np.full((capacity, len(PRICE_COLUMNS)), np.nan)
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return self.index.nbytes + self.values.nbytes
+
+    def _positions(self, lo=0):
+        return (self.start + np.arange(lo, self.count)) % self.capacity
+
+    def first(self):
+        """Timestamp da barra mais antiga (segundos) ou None"""
+        return int(self.index[self.start]) if self.count else None
+
+    def last(self):
+        """Timestamp da barra mais recente (segundos) ou None"""
+        return int(self.index[(self.start + self.count - 1) % self.capacity]) if self.count else None
+
+    def replace_last(self, values):
+        """Atualiza a barra mais recente no lugar (candle ainda em formação)"""
+        self.values[(self.start + self.count - 1) % self.capacity] = values
+
+    def extend(self, index, values):
+        """
+        Anexa barras posteriores à última do buffer
+
+        Args:
+            index (np.ndarray): Timestamps em segundos, crescentes
+            values (np.ndarray): Colunas OHLCV (n, 5)
+
+        Returns:
+            tuple: (timestamps, valores) das barras que saíram do buffer,
+                em ordem cronológica
+        """
+        overflow = max(0, self.count + len(index) - self.capacity)
+        dropped = min(overflow, self.count)
+
+        # Barras antigas que saem + novas que nem chegam a caber
+        pos = self._positions()[:dropped]
+        evicted_index = np.concatenate([self.index[pos], index[:overflow - dropped]])
+        evicted_values = np.concatenate([self.values[pos], values[:overflow - dropped]])
+
+        self.start = (self.start + dropped) % self.capacity
+        self.count -= dropped
+        index, values = index[overflow - dropped:], values[overflow - dropped:]
+
+        pos = (self.start + self.count + np.arange(len(index))) % self.capacity
+        self.index[pos] = index
+        self.values[pos] = values
+        self.count += len(index)
+
+        return evicted_index, evicted_values
+
+    def view(self, since=None):
+        """
+        Cópia das barras em ordem cronológica
+
+        Args:
+            since (int): Timestamp inclusivo em segundos (None = todas)
+
+        Returns:
+            tuple: (timestamps, valores (n, 5))
+        """
+        pos = self._positions()
+        index = self.index[pos]
+        if since is not None:
+            pos = pos[np.searchsorted(index, since, side='left'):]
+            index = self.index[pos]
+        return index, self.values[pos]
+
+
+class IntradayBuffers:
+    """
+    Buffers intraday de vários símbolos, compartilhados entre sessões
+
+    Mantém no máximo max_symbols buffers (o menos usado é gravado no store
+    e descartado), cada um com capacity barras. Um buffer novo começa com
+    as últimas barras do store.
+    """
+
+    def __init__(self, store, capacity=INTRADAY_BUFFER_BARS, max_symbols=INTRADAY_MAX_SYMBOLS):
+        """
+        Args:
+            store (PriceStore): Destino das barras que saem dos buffers
+            capacity (int): Barras em memória por símbolo e intervalo
+            max_symbols (int): Número máximo de buffers em memória
+        """
+        self.store = store
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+
+        # As barras que ainda só estão em memória vão para o store ao encerrar o processo
+        atexit.register(self.flush)
+
+    def _buffer(self, symbol, interval):
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is not None:
+            self._buffers.move_to_end(key)
+            return buffer
+
+        buffer = self._buffers[key] = RingBuffer(self.capacity)
+
+        # Começa com o final da série já gravada (ex: depois de reiniciar o app)
+        series = self.store.read(symbol, interval=interval)
+        if series is not None and len(series):
+            tail = series[-self.capacity:]
+            buffer.extend(np.asarray(tail.index).astype('<i8'),
+                          np.column_stack([np.asarray(getattr(tail, c)) for c in PRICE_COLUMNS]))
+
+        while len(self._buffers) > self.max_symbols:
+            (old_symbol, old_interval), old = self._buffers.popitem(last=False)
+            self._spill(old_symbol, old_interval, *old.view())
+        return buffer
+
+    def _spill(self, symbol, interval, index, values):
+        if len(index):
+            self.store.append(symbol, index, {c: values[:, i] for i, c in enumerate(PRICE_COLUMNS)}, interval=interval)
+
+    def length(self, symbol, interval):
+        """Número de barras em memória"""
+        buffer = self._buffers.get((symbol.upper(), interval))
+        return len(buffer) if buffer is not None else 0
+
+    def update(self, symbol, interval, payload):
+        """
+        Incorpora uma resposta de TIME_SERIES_INTRADAY
+
+        Só as barras posteriores à última do buffer são anexadas; a última
+        barra é atualizada se veio com valores novos. Barras anteriores ao
+        buffer (ex: resposta 'full') vão direto para o store.
+
+        Args:
+            symbol (str): Símbolo
+            interval (str): Intervalo ('1min', '5min', '15min', '60min')
+            payload (dict): Resposta da API com 'Time Series (<interval>)'
+
+        Returns:
+            int: Número de barras novas
+        """
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Intervalo intraday inválido: {interval}")
+
+        symbol = symbol.upper()
+        index, columns = parse_time_series(payload[f"Time Series ({interval})"])
+        values = np.column_stack([columns[c] for c in PRICE_COLUMNS])
+
+        with self._lock:
+            buffer = self._buffer(symbol, interval)
+            first, last = buffer.first(), buffer.last()
+
+            if last is not None:
+                older = index < first
+                self._spill(symbol, interval, index[older], values[older])
+
+                same_last = np.flatnonzero(index == last)
+                if len(same_last):
+                    buffer.replace_last(values[same_last[-1]])
+
+            new = index > last if last is not None else np.ones(len(index), dtype=bool)
+            evicted = buffer.extend(index[new], values[new])
+            self._spill(symbol, interval, *evicted)
+
+        return int(new.sum())
+
+    def last(self, symbol, interval):
+        """Timestamp (segundos) da barra local mais recente - buffer ou store - ou None"""
+        with self._lock:
+            return self._buffer(symbol.upper(), interval).last()
+
+    def leaves_gap(self, symbol, interval, payload):
+        """
+        Indica se uma resposta começa depois da barra seguinte à última local
+
+        Só as barras posteriores à última do buffer são anexadas, então as que
+        ficariam entre as duas se perderiam (ex: resposta 'compact', 100
+        barras, de um símbolo parado há mais tempo que isso): nesse caso a
+        resposta 'full' deve ser buscada.
+
+        Args:
+            symbol (str): Símbolo
+            interval (str): Intervalo
+            payload (dict): Resposta da API com 'Time Series (<interval>)'
+
+        Returns:
+            bool: True se faltariam barras
+        """
+        last = self.last(symbol, interval)
+        series = payload.get(f"Time Series ({interval})") or {}
+        if last is None or not series:
+            return False
+        first = int(np.datetime64(min(series), 's').astype('<i8'))
+        return first - INTRADAY_INTERVALS[interval] * 60 > last
+
+    def since(self, symbol, interval, after=None):
+        """
+        Barras em memória a partir de um timestamp
+
+        Args:
+            symbol (str): Símbolo
+            interval (str): Intervalo
+            after: Timestamp inclusivo (pd.Timestamp, datetime64 ou None =
+                todas); inclusivo para trazer a última barra atualizada
+
+        Returns:
+            pd.DataFrame: Open, High, Low, Close, Volume (vazio se não houver)
+        """
+        since = None if after is None else int(np.datetime64(after, 's').astype('<i8'))
+        with self._lock:
+            index, values = self._buffer(symbol.upper(), interval).view(since)
+
+        return pd.DataFrame(values, index=pd.DatetimeIndex(index.view('datetime64[s]')),
+                            columns=[FRAME_COLUMNS[c] for c in PRICE_COLUMNS])
+
+    def flush(self):
+        """
+        Grava no store as barras em memória de todos os buffers
+
+        Os buffers continuam em memória; o store ignora as barras que já tem.
+        """
+        with self._lock:
+            for (symbol, interval), buffer in self._buffers.items():
+                self._spill(symbol, interval, *buffer.view())
+
+    def memory_bytes(self):
+        """Memória ocupada pelos buffers"""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
@@ -0,0 +1,276 @@
+# look_through.py
+"""
+Fundamentos de um ETF agregados a partir dos holdings (look-through)
+
+P/E, dividend yield, ROE e crescimento de receita do fundo são médias dos
+OVERVIEW dos holdings ponderadas pelo peso na carteira. O P/E usa a média
+harmônica (soma dos preços / soma dos lucros, o inverso do earnings yield
+ponderado), como os provedores de dados de fundos; empresas com prejuízo
+ou sem o dado ficam fora de cada métrica e a cobertura mostra quanto do
+peso do ETF entrou na conta.
+
+Um fundo amplo tem centenas de holdings, então os overviews são pedidos
+em ordem decrescente de peso e a busca para quando os overviews recebidos
+cobrem o peso alvo (holdings sem overview, como caixa ou títulos, não
+contam e a busca segue para os próximos). Os overviews em cache chegam na
+hora; os outros respeitam o rate limit da API. Os resultados parciais são
+emitidos durante a busca. Um erro da API (limite diário, rate limit,
+falha de rede) interrompe a busca: pedir mais holdings só gastaria cota e
+o holding não pode ser dado como sem overview.
+
+Uso:
+    python look_through.py SPY --coverage 0.6
+"""
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from config import ALPHA_VANTAGE_API_KEY, LOOK_THROUGH_COVERAGE
+from holdings_store import PLACEHOLDER_TICKERS
+from utils import safe_float
+
+# Métricas do fundo: nome -> campo do OVERVIEW
+METRICS = {
+    'pe': 'PERatio',
+    'dividend_yield': 'DividendYield',
+    'roe': 'ReturnOnEquityTTM',
+    'revenue_growth': 'QuarterlyRevenueGrowthYOY',
+}
+
+# Métricas agregadas pela média harmônica (só valores positivos)
+HARMONIC = {'pe'}
+
+# Métricas em que 'None' no OVERVIEW vale zero (empresa que não paga dividendos)
+NONE_IS_ZERO = {'dividend_yield'}
+
+# Overviews pedidos em paralelo (o rate limiter da API continua valendo)
+MAX_WORKERS = 4
+
+# Intervalo mínimo entre resultados parciais (segundos)
+PROGRESS_INTERVAL = 0.5
+
+
+def order_holdings(holdings):
+    """
+    Holdings em ordem decrescente de peso, com pesos normalizados
+
+    Args:
+        holdings (dict): {ticker: peso} (qualquer escala; % ou fração)
+
+    Returns:
+        pd.Series: Fração do peso total, índice = ticker
+    """
+    weights = pd.Series({str(s).strip().upper(): safe_float(w) for s, w in holdings.items()}, dtype=float)
+    weights = weights[(weights > 0) & ~weights.index.isin(PLACEHOLDER_TICKERS)]
+    weights = weights.groupby(level=0).sum().sort_values(ascending=False, kind='stable')
+    if weights.empty:
+        raise ValueError("O ETF não possui holdings com peso")
+    return weights / weights.sum()
+
+
+def aggregate(weights, values):
+    """
+    Métricas do fundo ponderadas pelo peso dos holdings
+
+    Args:
+        weights (np.ndarray): Pesos dos holdings (fração do ETF)
+        values (np.ndarray): Valores (holdings x métricas, NaN = sem dado),
+            colunas na ordem de METRICS
+
+    Returns:
+        pd.DataFrame: Índice = métrica, colunas value e coverage (fração
+            do peso do ETF com dado válido)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(len(weights), len(METRICS))
+
+    harmonic = np.array([name in HARMONIC for name in METRICS])
+    valid = np.isfinite(values) & (~harmonic | (values > 0))
+    w = np.where(valid, weights[:, None], 0.0)
+    covered = w.sum(axis=0)
+
+    # Média harmônica = peso / soma(peso / valor); aritmética = soma(peso * valor) / peso
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(valid, np.where(harmonic, 1 / values, values), 0.0)
+        mean = (w * terms).sum(axis=0) / covered
+        result = np.where(harmonic, 1 / mean, mean)
+
+    result[covered == 0] = np.nan
+    return pd.DataFrame({'value': result, 'coverage': covered}, index=list(METRICS))
+
+
+class LookThroughResult:
+    """
+    Estado (parcial ou final) do look-through de um ETF
+
+    holdings tem uma linha por holding pedido (peso, status e os campos de
+    METRICS); status é 'pending', 'ok' ou 'missing'.
+    """
+
+    __slots__ = ('symbol', 'holdings', 'target', 'done', 'elapsed')
+
+    def __init__(self, symbol, holdings, target, done, elapsed):
+        self.symbol = symbol
+        self.holdings = holdings
+        self.target = target
+        self.done = done
+        self.elapsed = elapsed
+
+    @property
+    def fetched(self):
+        """Holdings já respondidos (com ou sem dados)"""
+        return int((self.holdings['status'] != 'pending').sum())
+
+    @property
+    def coverage(self):
+        """Fração do peso do ETF com overview recebido"""
+        return float(self.holdings.loc[self.holdings['status'] == 'ok', 'weight'].sum())
+
+    def metrics(self):
+        """Métricas do fundo com os holdings recebidos até agora (ver aggregate)"""
+        received = self.holdings[self.holdings['status'] == 'ok']
+        return aggregate(received['weight'].to_numpy(), received[list(METRICS)].to_numpy())
+
+
+class LookThrough:
+    """
+    Busca os overviews dos holdings de um ETF e agrega as métricas
+    """
+
+    def __init__(self, api, warehouse=None, max_workers=MAX_WORKERS):
+        """
+        Args:
+            api (AlphaVantageAPI): Cliente da API (com cache e rate limiter)
+            warehouse (FundamentalsStore): Armazém onde gravar os overviews
+                recebidos (None = não grava)
+            max_workers (int): Overviews pedidos em paralelo
+        """
+        self.api = api
+        self.warehouse = warehouse
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='look_through')
+
+    def _fetch(self, symbol):
+        overview = self.api.get_company_overview(symbol)
+        if overview and 'Information' in overview:
+            # Limite diário: a resposta não diz nada sobre o holding
+            raise Exception(overview['Information'])
+        if not overview or 'Symbol' not in overview:
+            return None
+        if self.warehouse is not None:
+            try:
+                self.warehouse.ingest(symbol, 'overview', overview)
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar overview de {symbol} no armazém: {e}")
+        return [0.0 if name in NONE_IS_ZERO and overview.get(field) == 'None' else safe_float(overview.get(field), np.nan)
+                for name, field in METRICS.items()]
+
+    def run(self, symbol, holdings, coverage=LOOK_THROUGH_COVERAGE, progress_interval=PROGRESS_INTERVAL):
+        """
+        Busca os overviews e emite resultados parciais
+
+        Os pedidos saem em ordem de peso, no máximo 2 * max_workers por vez;
+        se o gerador for abandonado, os que ainda não começaram são
+        cancelados.
+
+        Args:
+            symbol (str): Símbolo do ETF
+            holdings (dict): {ticker: peso}
+            coverage (float): Fração do peso total a cobrir
+            progress_interval (float): Intervalo mínimo entre parciais (s)
+
+        Yields:
+            LookThroughResult: Parciais e, por último, o resultado com done=True
+
+        Raises:
+            Exception: Erro da API ao buscar um overview (os pedidos
+                pendentes são cancelados)
+        """
+        if not 0 < coverage <= 1:
+            raise ValueError("A cobertura deve estar entre 0 e 1")
+
+        start = time.perf_counter()
+        weights = order_holdings(holdings)
+        tickers = list(weights.index)
+        w = weights.to_numpy()
+
+        values = np.full((len(tickers), len(METRICS)), np.nan)
+        status = np.full(len(tickers), 'pending', dtype=object)
+
+        futures = {}
+        pending = set()
+        covered = 0.0
+        requested = 0
+
+        def top_up():
+            # Pede os próximos holdings enquanto recebidos + em andamento não cobrem o alvo
+            nonlocal requested
+            in_flight = sum(w[futures[f]] for f in pending)
+            while (requested < len(tickers) and len(pending) < 2 * self.max_workers
+                   and covered + in_flight < coverage - 1e-12):
+                future = self._executor.submit(self._fetch, tickers[requested])
+                futures[future] = requested
+                pending.add(future)
+                in_flight += w[requested]
+                requested += 1
+
+        def snapshot(done):
+            frame = pd.DataFrame(values[:requested], index=pd.Index(tickers[:requested], name='symbol'),
+                                 columns=list(METRICS))
+            frame.insert(0, 'weight', w[:requested])
+            frame.insert(1, 'status', status[:requested].copy())
+            return LookThroughResult(symbol.upper(), frame, coverage, done, time.perf_counter() - start)
+
+        top_up()
+        last_yield = time.perf_counter()
+        try:
+            while pending:
+                finished, pending = wait(pending, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = futures[future]
+                    row = future.result()
+                    if row is None:
+                        status[i] = 'missing'
+                    else:
+                        values[i] = row
+                        status[i] = 'ok'
+                        covered += w[i]
+                top_up()
+
+                if pending and time.perf_counter() - last_yield >= progress_interval:
+                    last_yield = time.perf_counter()
+                    yield snapshot(False)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        yield snapshot(True)
+
+def main(argv=None):
+    from alpha_vantage_api import AlphaVantageAPI
+    from cache_manager import CacheManager
+
+    parser = argparse.ArgumentParser(description="Fundamentos de um ETF agregados pelos holdings")
+    parser.add_argument('etf', help="Símbolo do ETF")
+    parser.add_argument('--coverage', type=float, default=LOOK_THROUGH_COVERAGE,
+                        help="Fração do peso a cobrir (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    api = AlphaVantageAPI(ALPHA_VANTAGE_API_KEY, cache=CacheManager())
+    profile = api.get_etf_profile(args.etf)
+    holdings = {h.get('symbol'): h.get('weight') for h in profile.get('holdings', [])}
+    if not holdings:
+        raise SystemExit(f"❌ Sem holdings para {args.etf.upper()}")
+
+    for result in LookThrough(api).run(args.etf, holdings, args.coverage):
+        print(f"{result.fetched}/{len(result.holdings)} holdings · cobertura {result.coverage:.1%}")
+
+    print(result.metrics().round(4).to_string())
+    print(f"✅ {args.etf.upper()} em {result.elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
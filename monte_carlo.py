@@ -0,0 +1,456 @@
+# monte_carlo.py
+"""
+Simulação de Monte Carlo do valor futuro de uma carteira de ETFs
+
+Os retornos são sorteados em passos mensais (21 pregões) de duas formas:
+
+    bootstrap  - janelas de 21 pregões do histórico local (todas as
+                 janelas sobrepostas; preserva caudas gordas e a
+                 correlação entre os ativos no mesmo mês)
+    normal     - normal multivariada dos log-retornos, com média e
+                 covariância do histórico local
+
+Os sorteios são arrays (caminhos x passos x ativos) gerados em blocos de
+tamanho limitado. De cada bloco ficam só o valor de cada caminho ao fim de
+cada ano e um histograma por mês (as faixas de percentis saem dele), então
+a memória cresce com caminhos x anos, não com caminhos x meses. Os blocos
+são independentes (cada um tem sua semente derivada da semente principal)
+e são distribuídos num pool de processos; o resultado é o mesmo com
+qualquer número de processos.
+
+Uso:
+    python monte_carlo.py SPY=60 AGG=40 --paths 100000 --years 10
+    python monte_carlo.py QQQ=50 TLT=30 GLD=20 --method normal --workers 4
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from price_store import PriceStore
+from utils import pool_context
+
+METHODS = ('bootstrap', 'normal')
+
+# Pregões por passo (mensal) e passos por ano
+STEP_BARS = 21
+STEPS_PER_YEAR = 12
+
+# Elementos (caminhos x passos x ativos) sorteados de uma vez (~16 MB em float32)
+CHUNK_ELEMENTS = 4_000_000
+
+# Faixas de percentis do gráfico e nível padrão do VaR/CVaR
+PERCENTILES = (5, 25, 50, 75, 95)
+CONFIDENCE = 0.95
+
+# Classes do histograma de cada mês (log do valor) e folga em torno da
+# faixa do primeiro bloco, que define os limites das classes
+BAND_BINS = 2048
+BAND_MARGIN = 0.5
+
+# Mínimo de pregões em comum entre os ativos
+MIN_OBSERVATIONS = 252
+
+# Modelo e pesos nos processos do pool
+_WORKER = None
+
+
+class ReturnModel:
+    """
+    Modelo dos log-retornos mensais de um conjunto de ativos
+
+    Para 'bootstrap' guarda as janelas históricas (n_janelas, ativos); para
+    'normal', a média e um fator da covariância (cov = factor @ factor.T).
+    """
+
+    __slots__ = ('method', 'symbols', 'samples', 'mean', 'factor', 'n_obs', 'start', 'end')
+
+    def __init__(self, method, symbols, samples=None, mean=None, factor=None, n_obs=0, start=None, end=None):
+        self.method = method
+        self.symbols = list(symbols)
+        self.samples = samples
+        self.mean = mean
+        self.factor = factor
+        self.n_obs = n_obs
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_returns(cls, log_returns, symbols, method='bootstrap', dates=None):
+        """
+        Ajusta o modelo a log-retornos diários
+
+        Args:
+            log_returns (np.ndarray): Log-retornos diários sem lacunas (n, ativos)
+            symbols (list): Símbolos das colunas
+            method (str): 'bootstrap' ou 'normal'
+            dates (np.ndarray): Datas dos retornos (opcional, só informativo)
+
+        Returns:
+            ReturnModel: Modelo
+        """
+        if method not in METHODS:
+            raise ValueError(f"Método inválido: {method} (use {', '.join(METHODS)})")
+        n = len(log_returns)
+        if n < max(MIN_OBSERVATIONS, STEP_BARS + 1):
+            raise ValueError(f"Histórico em comum insuficiente: {n} pregões (mínimo {MIN_OBSERVATIONS})")
+
+        start = dates[0] if dates is not None else None
+        end = dates[-1] if dates is not None else None
+
+        if method == 'bootstrap':
+            # Somas móveis de 21 dias: cada linha é um mês histórico
+            csum = np.zeros((n + 1, log_returns.shape[1]))
+            np.cumsum(log_returns, axis=0, out=csum[1:])
+            samples = (csum[STEP_BARS:] - csum[:-STEP_BARS]).astype(np.float32)
+            return cls(method, symbols, samples=samples, n_obs=n, start=start, end=end)
+
+        mean = log_returns.mean(axis=0) * STEP_BARS
+        cov = np.atleast_2d(np.cov(log_returns, rowvar=False)) * STEP_BARS
+
+        # Fator pela decomposição espectral: funciona também com ativos quase colineares
+        eigval, eigvec = np.linalg.eigh(cov)
+        factor = eigvec * np.sqrt(np.clip(eigval, 0.0, None))
+        return cls(method, symbols, mean=mean.astype(np.float32), factor=factor.astype(np.float32),
+                   n_obs=n, start=start, end=end)
+
+    @classmethod
+    def from_store(cls, store, symbols, method='bootstrap', years=None):
+        """
+        Ajusta o modelo ao histórico do price store
+
+        Usa as datas em que todos os ativos têm preço (o histórico em comum).
+
+        Args:
+            store (PriceStore): Store de preços
+            symbols (list): Símbolos
+            method (str): 'bootstrap' ou 'normal'
+            years (float): Anos de histórico usados (None = todo o histórico em comum)
+
+        Returns:
+            ReturnModel: Modelo (na ordem dos símbolos pedidos)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        start = None
+        if years:
+            start = np.datetime64('today', 'D') - np.timedelta64(int(years * 366), 'D')
+
+        panel = store.panel(symbols, start=start)
+        missing = [s for s in symbols if s not in panel.symbols]
+        if missing:
+            raise ValueError(f"Sem histórico local para: {', '.join(missing)}")
+
+        order = [panel.symbols.index(s) for s in symbols]
+        close = panel['close'][:, order]
+        rows = np.isfinite(close).all(axis=1) & (close > 0).all(axis=1)
+        log_returns = np.diff(np.log(close[rows]), axis=0)
+        return cls.from_returns(log_returns, symbols, method, panel.dates[rows][1:])
+
+    @property
+    def n_assets(self):
+        return len(self.symbols)
+
+    def draw(self, rng, n_paths, steps):
+        """
+        Sorteia log-retornos mensais
+
+        Returns:
+            np.ndarray: (n_paths, steps, ativos) em float32
+        """
+        if self.method == 'bootstrap':
+            return self.samples[rng.integers(0, len(self.samples), size=(n_paths, steps))]
+
+        draws = rng.standard_normal((n_paths, steps, self.n_assets), dtype=np.float32) @ self.factor.T
+        draws += self.mean
+        return draws
+
+
+def simulate_paths(model, weights, n_paths, steps, rng, rebalance=True):
+    """
+    Valor da carteira ao longo dos passos (valor inicial = 1)
+
+    Args:
+        model (ReturnModel): Modelo dos retornos
+        weights (np.ndarray): Pesos dos ativos (somam 1)
+        n_paths (int): Caminhos
+        steps (int): Passos mensais
+        rng (np.random.Generator): Gerador
+        rebalance (bool): True rebalanceia para os pesos todo mês; False
+            mantém as quantidades iniciais (buy and hold)
+
+    Returns:
+        np.ndarray: (n_paths, steps + 1) em float32
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    values = np.empty((n_paths, steps + 1), dtype=np.float32)
+    values[:, 0] = 1.0
+
+    if rebalance and model.method == 'bootstrap':
+        # Com pesos fixos, o retorno da carteira só depende do mês sorteado:
+        # sorteia direto o retorno bruto da carteira em cada janela histórica
+        gross = np.exp(model.samples) @ weights
+        np.cumprod(gross[rng.integers(0, len(gross), size=(n_paths, steps))], axis=1, out=values[:, 1:])
+        return values
+
+    growth = np.exp(model.draw(rng, n_paths, steps))
+    if rebalance:
+        np.cumprod(growth @ weights, axis=1, out=values[:, 1:])
+    else:
+        np.cumprod(growth, axis=1, out=growth)
+        np.matmul(growth, weights, out=values[:, 1:])
+    return values
+
+
+def _chunk_paths(model, steps):
+    return max(1, CHUNK_ELEMENTS // (steps * model.n_assets))
+
+
+def _simulate_chunk(n_paths, steps, seed, rebalance, model=None, weights=None):
+    # Simula um bloco de caminhos (no pool, o modelo vem do inicializador)
+    if model is None:
+        model, weights = _WORKER
+    return simulate_paths(model, weights, n_paths, steps, np.random.default_rng(seed), rebalance)
+
+
+def _init_worker(model, weights):
+    global _WORKER
+    _WORKER = (model, weights)
+
+
+class BandHistogram:
+    """
+    Histograma do log do valor da carteira em cada passo
+
+    As classes são fixas, definidas pela faixa do primeiro bloco (com folga
+    de BAND_MARGIN); valores fora dela caem nas classes das pontas. Os
+    blocos seguintes só somam contagens, então os percentis saem sem
+    guardar os caminhos, com erro menor que a largura de uma classe.
+    """
+
+    __slots__ = ('lo', 'width', 'counts', 'total')
+
+    def __init__(self, values, bins=BAND_BINS):
+        """
+        Args:
+            values (np.ndarray): Primeiro bloco (caminhos x passos)
+            bins (int): Classes por passo
+        """
+        with np.errstate(divide='ignore'):
+            logs = np.log(values, dtype=np.float64)
+        lo, hi = logs.min(axis=0), logs.max(axis=0)
+        pad = (hi - lo) * BAND_MARGIN
+        self.lo = lo - pad
+        self.width = np.maximum((hi + pad - self.lo) / bins, 1e-9)
+        self.counts = np.zeros((values.shape[1], bins), dtype=np.int64)
+        self.total = 0
+        self.add(values)
+
+    def add(self, values):
+        """Soma as contagens de um bloco (caminhos x passos)"""
+        steps, bins = self.counts.shape
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = (np.log(values, dtype=np.float64) - self.lo) / self.width
+        idx = np.clip(np.nan_to_num(position, neginf=0.0), 0, bins - 1).astype(np.intp)
+        idx += np.arange(steps) * bins
+        self.counts += np.bincount(idx.ravel(), minlength=steps * bins).reshape(steps, bins)
+        self.total += len(values)
+
+    def percentiles(self, q):
+        """
+        Percentis de cada passo (interpolando dentro da classe)
+
+        Args:
+            q (tuple): Percentis (0 a 100)
+
+        Returns:
+            np.ndarray: (len(q), passos)
+        """
+        cum = np.cumsum(self.counts, axis=1)
+        rows = np.arange(len(cum))
+        out = np.empty((len(q), len(cum)))
+        for k, p in enumerate(q):
+            rank = p / 100 * (self.total - 1)
+            b = (cum <= rank).sum(axis=1)
+            before = np.where(b > 0, cum[rows, b - 1], 0)
+            frac = (rank - before + 0.5) / self.counts[rows, b]
+            out[k] = np.exp(self.lo + self.width * (b + frac))
+        return out
+
+
+class SimulationResult:
+    """
+    Resultado de uma simulação
+
+    Guarda as faixas de percentis de cada mês (do BandHistogram) e o valor
+    de todos os caminhos ao fim de cada ano (não a matriz completa de
+    caminhos).
+    """
+
+    __slots__ = ('model', 'weights', 'n_paths', 'years', 'rebalance', 'bands', 'yearly', 'elapsed', 'workers')
+
+    def __init__(self, model, weights, n_paths, years, rebalance, bands, yearly, elapsed, workers):
+        self.model = model
+        self.weights = weights
+        self.n_paths = n_paths
+        self.years = years
+        self.rebalance = rebalance
+        self.bands = bands
+        self.yearly = yearly
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def symbols(self):
+        return self.model.symbols
+
+    @property
+    def terminal(self):
+        """Valor final de cada caminho"""
+        return self.yearly[:, -1]
+
+    def bands_frame(self):
+        """
+        Faixas de percentis mês a mês
+
+        Returns:
+            pd.DataFrame: Índice = anos desde o início; colunas p5, p25, ...
+        """
+        steps = self.bands.shape[1]
+        return pd.DataFrame(self.bands.T, index=pd.Index(np.arange(steps) / STEPS_PER_YEAR, name='year'),
+                            columns=[f"p{p}" for p in PERCENTILES])
+
+    def risk(self, year=None, confidence=CONFIDENCE):
+        """
+        Estatísticas do retorno acumulado até um ano
+
+        VaR é a perda no percentil (1 - confidence) dos caminhos; CVaR
+        (expected shortfall) é a perda média dos caminhos além do VaR.
+
+        Args:
+            year (int): Ano do horizonte (None = final)
+            confidence (float): Nível de confiança (ex: 0.95)
+
+        Returns:
+            dict: median, mean, var, cvar, prob_loss, cagr_median
+        """
+        year = self.years if year is None else year
+        if not 1 <= year <= self.years:
+            raise ValueError(f"Ano fora do horizonte: {year} (1 a {self.years})")
+
+        returns = self.yearly[:, year].astype(np.float64) - 1.0
+        cutoff = np.quantile(returns, 1.0 - confidence)
+        median = float(np.median(returns))
+        return {
+            'median': median,
+            'mean': float(returns.mean()),
+            'var': float(-cutoff),
+            'cvar': float(-returns[returns <= cutoff].mean()),
+            'prob_loss': float((returns < 0).mean()),
+            'cagr_median': (1.0 + median) ** (1.0 / year) - 1.0,
+        }
+
+    def risk_table(self, confidence=CONFIDENCE):
+        """risk() de cada ano do horizonte como DataFrame"""
+        return pd.DataFrame([{'year': year, **self.risk(year, confidence)} for year in range(1, self.years + 1)])
+
+
+def simulate(model, weights, n_paths=10_000, years=10, seed=None, rebalance=True, workers=None):
+    """
+    Simula a carteira em blocos, distribuídos num pool de processos
+
+    Args:
+        model (ReturnModel): Modelo dos retornos
+        weights (array-like): Pesos dos ativos (normalizados para somar 1)
+        n_paths (int): Número de caminhos
+        years (int): Horizonte em anos
+        seed (int): Semente (None = aleatória)
+        rebalance (bool): Rebalanceamento mensal (False = buy and hold)
+        workers (int): Processos (padrão = número de CPUs; 1 = sem pool)
+
+    Returns:
+        SimulationResult: Resultado (memória: caminhos x anos em float32,
+            mais BAND_BINS contagens por mês)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (model.n_assets,) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Os pesos devem ser não negativos, um por ativo, com soma positiva")
+    if n_paths < 1 or years < 1:
+        raise ValueError("O número de caminhos e o horizonte devem ser positivos")
+    weights = weights / weights.sum()
+
+    steps = years * STEPS_PER_YEAR
+    chunk = _chunk_paths(model, steps)
+    sizes = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+
+    begin = time.perf_counter()
+
+    # De cada bloco (na ordem) ficam os valores de fim de ano e as contagens do histograma
+    yearly = np.empty((n_paths, years + 1), dtype=np.float32)
+    histogram = None
+    filled = 0
+
+    def collect(values):
+        nonlocal histogram, filled
+        yearly[filled:filled + len(values)] = values[:, ::STEPS_PER_YEAR]
+        filled += len(values)
+        if histogram is None:
+            histogram = BandHistogram(values)
+        else:
+            histogram.add(values)
+
+    if workers == 1:
+        for i, size in enumerate(sizes):
+            collect(_simulate_chunk(size, steps, seeds[i], rebalance, model, weights))
+    else:
+        # O modelo vai uma vez para cada processo; as tarefas só levam tamanho e semente
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                                 initializer=_init_worker, initargs=(model, weights)) as executor:
+            # No máximo 2 blocos por processo em andamento: os resultados não se acumulam
+            futures = deque()
+            for i, size in enumerate(sizes):
+                futures.append(executor.submit(_simulate_chunk, size, steps, seeds[i], rebalance))
+                if len(futures) >= 2 * workers:
+                    collect(futures.popleft().result())
+            while futures:
+                collect(futures.popleft().result())
+
+    bands = histogram.percentiles(PERCENTILES)
+    elapsed = time.perf_counter() - begin
+    return SimulationResult(model, weights, n_paths, years, rebalance, bands, yearly, elapsed, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação de Monte Carlo de uma carteira sobre o price store")
+    parser.add_argument('allocation', nargs='+', help="Ativos e pesos (ex: SPY=60 AGG=40)")
+    parser.add_argument('--method', choices=METHODS, default='bootstrap')
+    parser.add_argument('--paths', type=int, default=10_000, help="Número de caminhos")
+    parser.add_argument('--years', type=int, default=10, help="Horizonte em anos")
+    parser.add_argument('--history', type=float, help="Anos de histórico usados (padrão: todo o histórico em comum)")
+    parser.add_argument('--buy-and-hold', action='store_true', help="Sem rebalanceamento mensal")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, help="Processos do pool (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    allocation = {}
+    for item in args.allocation:
+        symbol, _, weight = item.partition('=')
+        allocation[symbol.upper()] = float(weight) if weight else 1.0
+
+    model = ReturnModel.from_store(PriceStore(), list(allocation), args.method, args.history)
+    result = simulate(model, list(allocation.values()), args.paths, args.years, args.seed,
+                      rebalance=not args.buy_and_hold, workers=args.workers)
+
+    table = result.risk_table()
+    print(table.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"✅ {result.n_paths:,} caminhos x {result.years * STEPS_PER_YEAR} meses x {model.n_assets} ativos "
+          f"em {result.elapsed:.2f}s ({result.workers} processos, histórico de {model.n_obs} pregões)")
+
+
+if __name__ == '__main__':
+    main()
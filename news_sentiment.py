@@ -0,0 +1,251 @@
+# news_sentiment.py
+"""
+Séries diárias de sentimento por ticker a partir das notícias armazenadas
+
+Os arrays ticker_sentiment de todas as notícias do NewsStore são lidos
+numa única consulta, em colunas (ticker, data, relevância, sentimento).
+O sentimento diário de cada ticker é a média dos scores ponderada pela
+relevância:
+
+    sentimento(t, d) = Σ relevância * score / Σ relevância
+
+calculada para todos os tickers e dias de uma vez (np.unique +
+np.bincount), sem laço por notícia.
+
+Para comparar com preços, cada dia de notícia é associado ao primeiro
+pregão do símbolo na mesma data ou depois (notícias de fim de semana caem
+na segunda-feira) e a série é unida aos retornos diários do PriceStore:
+retorno do pregão (fechamento anterior -> fechamento) e do pregão seguinte.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Relevância mínima de uma menção para entrar na média (menções de passagem
+# têm relevância próxima de zero)
+MIN_RELEVANCE = 0.1
+
+# Watchlists com resultado em memória (as usadas há mais tempo saem primeiro)
+MAX_WATCHLISTS = 32
+
+COLUMNS = ['ticker', 'date', 'sentiment', 'relevance', 'articles']
+
+
+def _group(codes, values, weights, n_groups):
+    # Somas por grupo: Σ peso * valor, Σ peso e contagem
+    return (np.bincount(codes, weights * values, minlength=n_groups),
+            np.bincount(codes, weights, minlength=n_groups),
+            np.bincount(codes, minlength=n_groups))
+
+
+def daily_sentiment(columns, min_relevance=MIN_RELEVANCE):
+    """
+    Sentimento diário ponderado pela relevância, para todos os tickers
+
+    Args:
+        columns (dict): Saída de NewsStore.ticker_sentiment()
+        min_relevance (float): Relevância mínima de uma menção
+
+    Returns:
+        pd.DataFrame: ticker, date, sentiment, relevance (soma), articles
+            (número de menções), ordenado por ticker e data
+    """
+    relevance = columns['relevance']
+    sentiment = columns['sentiment']
+    keep = np.isfinite(relevance) & np.isfinite(sentiment) & (relevance >= min_relevance) & (relevance > 0)
+    if not keep.any():
+        return pd.DataFrame(columns=COLUMNS)
+
+    tickers, ticker_codes = np.unique(columns['ticker'][keep].astype(str), return_inverse=True)
+    days = pd.to_datetime(pd.Series(columns['published'][keep]).str[:8], format='%Y%m%d').to_numpy()
+    day_values, day_codes = np.unique(days, return_inverse=True)
+
+    # Um código por (ticker, dia); os grupos existentes saem ordenados por ticker e dia
+    keys, codes = np.unique(ticker_codes.astype(np.int64) * len(day_values) + day_codes, return_inverse=True)
+    weighted, total, count = _group(codes, sentiment[keep], relevance[keep], len(keys))
+
+    return pd.DataFrame({
+        'ticker': tickers[keys // len(day_values)],
+        'date': day_values[keys % len(day_values)],
+        'sentiment': weighted / total,
+        'relevance': total,
+        'articles': count,
+    })
+
+
+def join_returns(daily, store):
+    """
+    Une o sentimento diário aos retornos dos pregões correspondentes
+
+    Dias de notícia sem pregão no mesmo dia são somados ao pregão seguinte
+    (a média continua ponderada pela relevância). Tickers sem preços no
+    store ficam de fora.
+
+    Args:
+        daily (pd.DataFrame): Saída de daily_sentiment()
+        store (PriceStore): Store de preços diários
+
+    Returns:
+        pd.DataFrame: ticker, date (pregão), sentiment, relevance, articles,
+            return e next_return (NaN quando não há pregão seguinte)
+    """
+    columns = COLUMNS + ['return', 'next_return']
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+
+    start = pd.Timestamp(daily['date'].min()) - pd.Timedelta(days=10)
+    panel = store.panel(daily['ticker'].unique(), start=start)
+    if not panel.symbols:
+        return pd.DataFrame(columns=columns)
+
+    close = panel['close']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.full(close.shape, np.nan)
+        returns[1:] = close[1:] / close[:-1] - 1.0
+
+    # Pregões válidos de cada símbolo (o painel tem a união dos calendários)
+    column_of = {symbol: j for j, symbol in enumerate(panel.symbols)}
+    rows = daily[daily['ticker'].isin(column_of)]
+    cols = rows['ticker'].map(column_of).to_numpy()
+    dates = panel.dates.astype('datetime64[D]')
+    positions = np.searchsorted(dates, rows['date'].to_numpy().astype('datetime64[D]'), side='left')
+
+    # next_valid[i, j] = primeiro pregão >= i em que o símbolo j tem barra (len(dates) = nenhum)
+    candidates = np.where(np.isfinite(close), np.arange(len(dates))[:, None], len(dates))
+    next_valid = np.minimum.accumulate(candidates[::-1], axis=0)[::-1]
+    in_range = positions < len(dates)
+    sessions = np.full(len(rows), len(dates))
+    sessions[in_range] = next_valid[positions[in_range], cols[in_range]]
+    has_session = sessions < len(dates)
+
+    rows, cols, sessions = rows[has_session], cols[has_session], sessions[has_session]
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Reagrupa por (símbolo, pregão)
+    keys, codes = np.unique(cols.astype(np.int64) * len(dates) + sessions, return_inverse=True)
+    relevance = rows['relevance'].to_numpy()
+    weighted, total, _ = _group(codes, rows['sentiment'].to_numpy(), relevance, len(keys))
+    articles = np.bincount(codes, rows['articles'].to_numpy(), minlength=len(keys)).astype(np.int64)
+    key_cols, key_sessions = keys // len(dates), keys % len(dates)
+
+    # Retorno do pregão seguinte em que o símbolo negociou
+    following = np.minimum(key_sessions + 1, len(dates) - 1)
+    following = next_valid[following, key_cols]
+    last = (key_sessions + 1 >= len(dates)) | (following >= len(dates))
+    next_return = np.where(last, np.nan, returns[np.minimum(following, len(dates) - 1), key_cols])
+
+    return pd.DataFrame({
+        'ticker': np.array(panel.symbols, dtype=object)[key_cols],
+        'date': pd.DatetimeIndex(panel.dates[key_sessions]),
+        'sentiment': weighted / total,
+        'relevance': total,
+        'articles': articles,
+        'return': returns[key_sessions, key_cols],
+        'next_return': next_return,
+    }).sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
+
+
+def _grouped_corr(codes, x, y, n_groups):
+    # Correlação de Pearson por grupo a partir de somas (pares com NaN ficam de fora)
+    both = np.isfinite(x) & np.isfinite(y)
+    codes, x, y = codes[both], x[both], y[both]
+    n = np.bincount(codes, minlength=n_groups)
+    sx, sy = np.bincount(codes, x, n_groups), np.bincount(codes, y, n_groups)
+    sxx, syy = np.bincount(codes, x * x, n_groups), np.bincount(codes, y * y, n_groups)
+    sxy = np.bincount(codes, x * y, n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+    return np.where(n >= 3, corr, np.nan)
+
+
+def sentiment_correlation(joined):
+    """
+    Correlação entre sentimento e retornos, por ticker
+
+    Args:
+        joined (pd.DataFrame): Saída de join_returns()
+
+    Returns:
+        pd.DataFrame: Índice = ticker; days, avg_sentiment (ponderado pela
+            relevância), corr_same_day e corr_next_day (NaN com menos de 3 dias)
+    """
+    if joined.empty:
+        return pd.DataFrame(columns=['days', 'avg_sentiment', 'corr_same_day', 'corr_next_day'])
+
+    tickers, codes = np.unique(joined['ticker'].to_numpy().astype(str), return_inverse=True)
+    sentiment = joined['sentiment'].to_numpy(dtype=np.float64)
+    weighted, total, days = _group(codes, sentiment, joined['relevance'].to_numpy(dtype=np.float64), len(tickers))
+    return pd.DataFrame({
+        'days': days,
+        'avg_sentiment': weighted / total,
+        'corr_same_day': _grouped_corr(codes, sentiment, joined['return'].to_numpy(dtype=np.float64), len(tickers)),
+        'corr_next_day': _grouped_corr(codes, sentiment, joined['next_return'].to_numpy(dtype=np.float64), len(tickers)),
+    }, index=pd.Index(tickers, name='ticker'))
+
+
+class SentimentEngine:
+    """
+    Sentimento por ticker (e contra preços) para uma lista de tickers
+
+    O resultado de cada lista fica em memória até o armazém de notícias ou
+    alguma série de preços mudar. As listas são texto livre digitado nas
+    sessões, então a memória é um LRU de no máximo max_entries listas,
+    seguro entre threads.
+    """
+
+    def __init__(self, news_store, price_store, min_relevance=MIN_RELEVANCE, max_entries=MAX_WATCHLISTS):
+        """
+        Args:
+            news_store (NewsStore): Notícias armazenadas
+            price_store (PriceStore): Preços diários
+            min_relevance (float): Relevância mínima de uma menção
+            max_entries (int): Watchlists com resultado em memória
+        """
+        self.news_store = news_store
+        self.price_store = price_store
+        self.min_relevance = min_relevance
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _version(self, tickers):
+        prices = tuple(self.price_store.version(t) for t in tickers)
+        return (self.news_store.version(), prices)
+
+    def watchlist(self, tickers, since=None):
+        """
+        Sentimento diário unido aos retornos de vários tickers
+
+        Args:
+            tickers (list): Tickers da watchlist
+            since: Data inicial (None = todas as notícias)
+
+        Returns:
+            tuple: (daily, joined) - daily_sentiment() com todos os dias de
+                notícia e join_returns() só dos tickers com preços
+        """
+        tickers = tuple(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+        key = (tickers, None if since is None else str(pd.Timestamp(since).date()))
+        version = self._version(tickers)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and cached[0] == version:
+                self._memory.move_to_end(key)
+                return cached[1]
+
+        # Calcula fora do lock (duas sessões com a mesma lista só duplicam trabalho)
+        daily = daily_sentiment(self.news_store.ticker_sentiment(tickers, since), self.min_relevance)
+        result = (daily, join_returns(daily, self.price_store))
+        with self._lock:
+            self._memory[key] = (version, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return result
+
+    def __len__(self):
+        return len(self._memory)
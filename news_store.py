@@ -0,0 +1,496 @@
+# news_store.py
+"""
+Armazém local de notícias (SQLite + FTS5) alimentado pelo NEWS_SENTIMENT
+
+Cada busca da página de notícias vira uma consulta incremental: a API só
+é chamada com time_from = horário da notícia mais recente já recebida
+para aquela combinação de tickers/tópicos (e no máximo uma vez a cada
+NEWS_POLL_MINUTES), da mais antiga para a mais recente, página por página,
+para não pular notícias quando chegaram mais que o limite da requisição.
+As notícias são gravadas uma única vez por URL.
+
+Tabelas:
+    articles         - uma linha por URL (título, resumo, fonte, data,
+                       sentimento geral), indexada por data e sentimento
+    article_tickers  - ticker_sentiment achatado (ticker, relevância,
+                       sentimento), chave (ticker, notícia)
+    article_topics   - tópicos (código da API, relevância)
+    articles_fts     - índice de texto completo de título e resumo
+
+Os filtros da página (tickers, tópicos, faixa de sentimento, texto,
+período) viram uma única consulta indexada, sem reler o feed.
+
+Uso:
+    python news_store.py --poll AAPL,MSFT --topics technology
+    python news_store.py --search "rate cut" --tickers AAPL
+"""
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import NEWS_DB, NEWS_POLL_LIMIT, NEWS_POLL_MINUTES, NEWS_POLL_PAGES
+from utils import safe_float
+
+# Tópicos do NEWS_SENTIMENT: código do parâmetro topics -> nome no feed
+TOPICS = {
+    'blockchain': 'Blockchain',
+    'earnings': 'Earnings',
+    'ipo': 'IPO',
+    'mergers_and_acquisitions': 'Mergers & Acquisitions',
+    'financial_markets': 'Financial Markets',
+    'economy_fiscal': 'Economy - Fiscal',
+    'economy_monetary': 'Economy - Monetary',
+    'economy_macro': 'Economy - Macro',
+    'energy_transportation': 'Energy & Transportation',
+    'finance': 'Finance',
+    'life_sciences': 'Life Sciences',
+    'manufacturing': 'Manufacturing',
+    'real_estate': 'Real Estate & Construction',
+    'retail_wholesale': 'Retail & Wholesale',
+    'technology': 'Technology',
+}
+_TOPIC_CODES = {name: code for code, name in TOPICS.items()}
+
+# Faixas de sentimento (mesmos limites do guia da página): nome -> condição SQL
+SENTIMENT_BANDS = {
+    'positive': "a.sentiment > 0.15",
+    'neutral': "a.sentiment BETWEEN -0.15 AND 0.15",
+    'negative': "a.sentiment < -0.15",
+}
+
+# Ordenações: nome -> ORDER BY
+SORTS = {
+    'recent': "a.published DESC",
+    'relevance': "relevance DESC, a.published DESC",
+    'sentiment_desc': "a.sentiment DESC, a.published DESC",
+    'sentiment_asc': "a.sentiment ASC, a.published DESC",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    summary TEXT,
+    source TEXT,
+    authors TEXT,
+    published TEXT NOT NULL,
+    sentiment REAL,
+    sentiment_label TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published, sentiment);
+CREATE INDEX IF NOT EXISTS articles_sentiment ON articles (sentiment);
+
+CREATE TABLE IF NOT EXISTS article_tickers (
+    ticker TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    relevance REAL,
+    sentiment REAL,
+    sentiment_label TEXT,
+    PRIMARY KEY (ticker, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_tickers_article ON article_tickers (article_id, relevance);
+
+CREATE TABLE IF NOT EXISTS article_topics (
+    topic TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    relevance REAL,
+    PRIMARY KEY (topic, article_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content='articles', content_rowid='id'
+);
+
+CREATE TABLE IF NOT EXISTS polls (
+    query TEXT PRIMARY KEY,
+    last_published TEXT,
+    polled_at REAL
+);
+"""
+
+
+def topic_code(name):
+    """Código da API de um tópico do feed (ex: 'Economy - Macro' -> 'economy_macro')"""
+    return _TOPIC_CODES.get(name, name.strip().lower().replace(' ', '_'))
+
+
+def _split(values):
+    # Aceita 'AAPL,MSFT' ou lista; devolve lista normalizada sem repetições
+    if values is None:
+        return []
+    if isinstance(values, str):
+        values = values.split(',')
+    return list(dict.fromkeys(v.strip() for v in values if v and v.strip()))
+
+
+def fts_query(text):
+    """
+    Converte o texto digitado numa consulta FTS5 segura
+
+    Cada palavra vira um termo entre aspas (todas precisam aparecer); um
+    '*' no fim da palavra busca por prefixo.
+
+    Returns:
+        str: Consulta MATCH (vazia se não há palavras)
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return " ".join(terms)
+
+
+class NewsStore:
+    """
+    Notícias armazenadas localmente, com ingestão incremental
+
+    Cada thread usa sua própria conexão, então a mesma instância pode ser
+    compartilhada entre sessões.
+    """
+
+    def __init__(self, path=NEWS_DB):
+        """
+        Args:
+            path (str | Path): Arquivo do banco
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Uma conexão por thread, reaproveitada; cada bloco é uma transação
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            yield conn
+
+    def ingest(self, feed):
+        """
+        Grava as notícias de um feed, ignorando URLs já armazenadas
+
+        Args:
+            feed (list): Lista 'feed' da resposta do NEWS_SENTIMENT
+
+        Returns:
+            int: Número de notícias novas
+        """
+        added = 0
+        with self._connect() as conn:
+            for item in feed:
+                url = item.get('url')
+                published = item.get('time_published')
+                if not url or not published:
+                    continue
+
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO articles (url, title, summary, source, authors, published, sentiment, sentiment_label)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, item.get('title'), item.get('summary'), item.get('source'),
+                     json.dumps(item.get('authors') or []), published,
+                     safe_float(item.get('overall_sentiment_score'), None), item.get('overall_sentiment_label'))
+                )
+                if not cursor.rowcount:
+                    continue
+
+                article_id = cursor.lastrowid
+                conn.execute("INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)",
+                             (article_id, item.get('title') or '', item.get('summary') or ''))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_tickers VALUES (?, ?, ?, ?, ?)",
+                    [(ts['ticker'].upper(), article_id, safe_float(ts.get('relevance_score'), None),
+                      safe_float(ts.get('ticker_sentiment_score'), None), ts.get('ticker_sentiment_label'))
+                     for ts in item.get('ticker_sentiment') or [] if ts.get('ticker')]
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_topics VALUES (?, ?, ?)",
+                    [(topic_code(t['topic']), article_id, safe_float(t.get('relevance_score'), None))
+                     for t in item.get('topics') or [] if t.get('topic')]
+                )
+                added += 1
+        return added
+
+    def poll(self, api, tickers=None, topics=None, limit=NEWS_POLL_LIMIT, min_interval=NEWS_POLL_MINUTES, force=False,
+             max_pages=NEWS_POLL_PAGES):
+        """
+        Busca na API só as notícias posteriores à última recebida
+
+        A primeira consulta traz as limit mais recentes. As seguintes pedem
+        as posteriores à última recebida em ordem cronológica (EARLIEST): se
+        a página vier cheia, a próxima começa onde ela terminou. A última
+        recebida avança a cada página, então uma consulta interrompida (erro
+        ou max_pages) continua de onde parou na próxima vez.
+
+        Args:
+            api (AlphaVantageAPI): Cliente da API
+            tickers (str | list): Tickers da consulta (ex: 'AAPL,MSFT')
+            topics (str | list): Códigos de tópicos (ex: 'technology')
+            limit (int): Máximo de notícias por requisição (até 1000)
+            min_interval (float): Minutos entre consultas iguais à API
+            force (bool): Consulta mesmo dentro do intervalo
+            max_pages (int): Máximo de requisições nesta consulta
+
+        Returns:
+            int: Número de notícias novas (0 se a consulta foi pulada)
+        """
+        tickers = [t.upper() for t in _split(tickers)]
+        topics = _split(topics)
+        query = f"{','.join(sorted(tickers))}|{','.join(sorted(topics))}"
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_published, polled_at FROM polls WHERE query = ?", (query,)).fetchone()
+        last_published, polled_at = row if row else (None, None)
+        if not force and polled_at is not None and time.time() - polled_at < min_interval * 60:
+            return 0
+
+        added = 0
+        for _ in range(max_pages):
+            # time_from tem resolução de minutos (YYYYMMDDTHHMM); as repetidas são descartadas pela URL
+            time_from = last_published[:13] if last_published else None
+            data = api.get_news_sentiment(
+                tickers=",".join(tickers) or None,
+                topics=",".join(topics) or None,
+                time_from=time_from,
+                limit=limit,
+                sort='EARLIEST' if time_from else None
+            )
+            if 'feed' not in data:
+                raise Exception(data.get('Information') or data.get('Error Message') or "No news returned by the API")
+
+            feed = data['feed']
+            added += self.ingest(feed)
+            newest = max([item.get('time_published') or '' for item in feed] + [last_published or ''])
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO polls VALUES (?, ?, ?)", (query, newest or None, time.time()))
+
+            # Página incompleta: não há mais nada. Sem time_from (primeira consulta) a API
+            # devolve as mais recentes; uma página cheia dentro do mesmo minuto não avança
+            if len(feed) < limit or not time_from or (newest or '')[:13] <= time_from:
+                break
+            last_published = newest
+        return added
+
+    def _where(self, tickers=None, topics=None, text=None, sentiment=None, since=None):
+        # Condições e parâmetros comuns a search() e summary()
+        clauses, params = [], []
+        tickers = [t.upper() for t in _split(tickers)]
+        if tickers:
+            clauses.append(f"a.id IN (SELECT article_id FROM article_tickers WHERE ticker IN ({', '.join('?' * len(tickers))}))")
+            params.extend(tickers)
+        topics = _split(topics)
+        if topics:
+            clauses.append(f"a.id IN (SELECT article_id FROM article_topics WHERE topic IN ({', '.join('?' * len(topics))}))")
+            params.extend(topics)
+        match = fts_query(text or '')
+        if match:
+            clauses.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            params.append(match)
+        if sentiment:
+            if sentiment not in SENTIMENT_BANDS:
+                raise ValueError(f"Faixa de sentimento inválida: {sentiment} (use {', '.join(SENTIMENT_BANDS)})")
+            clauses.append(SENTIMENT_BANDS[sentiment])
+        if since:
+            clauses.append("a.published >= ?")
+            params.append(pd.Timestamp(since).strftime('%Y%m%dT%H%M%S'))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params, tickers
+
+    def search(self, tickers=None, topics=None, text=None, sentiment=None, since=None, sort='recent', limit=None):
+        """
+        Notícias que atendem aos filtros
+
+        Tickers e tópicos aceitam qualquer um dos valores informados. Só a
+        ordenação por relevância calcula a relevância (maior entre os
+        tickers filtrados, ou entre todos sem filtro de tickers); a das
+        notícias exibidas vem de articles().
+
+        Args:
+            tickers (str | list): Tickers (ex: 'AAPL,MSFT')
+            topics (str | list): Códigos de tópicos
+            text (str): Palavras buscadas no título e no resumo
+            sentiment (str): 'positive', 'neutral' ou 'negative'
+            since: Data inicial (qualquer formato aceito pelo pandas)
+            sort (str): 'recent', 'relevance', 'sentiment_desc' ou 'sentiment_asc'
+            limit (int): Máximo de notícias (None = todas)
+
+        Returns:
+            pd.DataFrame: id, published, sentiment, relevance (NaN fora da
+                ordenação por relevância) - na ordem pedida
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Ordenação inválida: {sort} (use {', '.join(SORTS)})")
+
+        where, params, tickers = self._where(tickers, topics, text, sentiment, since)
+        relevance = "NULL"
+        if sort == 'relevance':
+            ticker_filter = f" AND t.ticker IN ({', '.join('?' * len(tickers))})" if tickers else ""
+            relevance = f"(SELECT MAX(t.relevance) FROM article_tickers t WHERE t.article_id = a.id{ticker_filter})"
+            params = tickers + params
+
+        # Sem a relevância, as outras ordenações leem só o índice (published, sentiment)
+        query = f"SELECT a.id, a.published, a.sentiment, {relevance} AS relevance FROM articles a{where} ORDER BY {SORTS[sort]}"
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return pd.DataFrame(rows, columns=['id', 'published', 'sentiment', 'relevance']).astype({'relevance': float})
+
+    def summary(self, tickers=None, topics=None, text=None, since=None):
+        """
+        Sentimento médio e contagem por faixa, numa única consulta
+
+        Returns:
+            dict: count, average, positive, neutral, negative
+        """
+        where, params, _ = self._where(tickers, topics, text, None, since)
+        query = ("SELECT COUNT(*), AVG(a.sentiment),"
+                 f" SUM({SENTIMENT_BANDS['positive']}), SUM({SENTIMENT_BANDS['neutral']}), SUM({SENTIMENT_BANDS['negative']})"
+                 f" FROM articles a{where}")
+        with self._connect() as conn:
+            count, average, positive, neutral, negative = conn.execute(query, params).fetchone()
+        return {'count': count, 'average': average,
+                'positive': positive or 0, 'neutral': neutral or 0, 'negative': negative or 0}
+
+    def articles(self, ids, tickers=None):
+        """
+        Notícias completas, na ordem dos ids
+
+        Args:
+            ids (list): Ids devolvidos por search()
+            tickers (str | list): Tickers da consulta (relevância = maior
+                entre eles; None = entre todos os tickers da notícia)
+
+        Returns:
+            list: Dicts no formato do feed da API (id, title, summary, url,
+                time_published, source, authors, overall_sentiment_score,
+                overall_sentiment_label, ticker_sentiment) mais relevance
+        """
+        ids = [int(i) for i in ids]
+        wanted = {t.upper() for t in _split(tickers)}
+        if not ids:
+            return []
+
+        marks = ', '.join('?' * len(ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, url, title, summary, source, authors, published, sentiment, sentiment_label"
+                f" FROM articles WHERE id IN ({marks})", ids
+            ).fetchall()
+            tickers = conn.execute(
+                "SELECT article_id, ticker, relevance, sentiment, sentiment_label FROM article_tickers"
+                f" WHERE article_id IN ({marks}) ORDER BY article_id, relevance DESC", ids
+            ).fetchall()
+
+        ticker_sentiment = {}
+        for article_id, ticker, relevance, sentiment, label in tickers:
+            ticker_sentiment.setdefault(article_id, []).append({
+                'ticker': ticker, 'relevance_score': relevance,
+                'ticker_sentiment_score': sentiment, 'ticker_sentiment_label': label,
+            })
+
+        by_id = {}
+        for article_id, url, title, summary, source, authors, published, sentiment, label in rows:
+            relevances = [ts['relevance_score'] for ts in ticker_sentiment.get(article_id, [])
+                          if ts['relevance_score'] is not None and (not wanted or ts['ticker'] in wanted)]
+            by_id[article_id] = {
+                'id': article_id, 'url': url, 'title': title, 'summary': summary, 'source': source,
+                'authors': json.loads(authors or '[]'), 'time_published': published,
+                'overall_sentiment_score': sentiment, 'overall_sentiment_label': label,
+                'ticker_sentiment': ticker_sentiment.get(article_id, []),
+                'relevance': max(relevances) if relevances else None,
+            }
+        return [by_id[i] for i in ids if i in by_id]
+
+    def ticker_sentiment(self, tickers=None, since=None):
+        """
+        ticker_sentiment de todas as notícias armazenadas, em colunas
+
+        Args:
+            tickers (str | list): Tickers (None = todos)
+            since: Data inicial (None = tudo)
+
+        Returns:
+            dict: ticker (object), published (str YYYYMMDDTHHMMSS),
+                relevance e sentiment (float64) - arrays NumPy de mesmo tamanho
+        """
+        clauses, params = [], []
+        tickers = [t.upper() for t in _split(tickers)]
+        if tickers:
+            clauses.append(f"t.ticker IN ({', '.join('?' * len(tickers))})")
+            params.extend(tickers)
+        if since:
+            clauses.append("a.published >= ?")
+            params.append(pd.Timestamp(since).strftime('%Y%m%dT%H%M%S'))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT t.ticker, a.published, t.relevance, t.sentiment"
+                f" FROM article_tickers t JOIN articles a ON a.id = t.article_id{where}", params
+            ).fetchall()
+
+        ticker, published, relevance, sentiment = zip(*rows) if rows else ((), (), (), ())
+        return {
+            'ticker': np.array(ticker, dtype=object),
+            'published': np.array(published, dtype=object),
+            'relevance': np.array(relevance, dtype=np.float64),
+            'sentiment': np.array(sentiment, dtype=np.float64),
+        }
+
+    def version(self):
+        """Muda sempre que uma notícia nova é gravada (maior id)"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def main(argv=None):
+    from alpha_vantage_api import AlphaVantageAPI
+    from cache_manager import CacheManager
+    from config import ALPHA_VANTAGE_API_KEY
+
+    parser = argparse.ArgumentParser(description="Armazém local de notícias")
+    parser.add_argument('--poll', metavar='TICKERS', nargs='?', const='', help="Busca notícias novas (tickers opcionais)")
+    parser.add_argument('--topics', help="Códigos de tópicos separados por vírgula")
+    parser.add_argument('--search', metavar='TEXT', help="Busca de texto no título e no resumo")
+    parser.add_argument('--tickers', help="Filtro de tickers da busca")
+    parser.add_argument('--limit', type=int, default=20, help="Notícias exibidas na busca")
+    args = parser.parse_args(argv)
+
+    store = NewsStore()
+    if args.poll is not None:
+        api = AlphaVantageAPI(ALPHA_VANTAGE_API_KEY, cache=CacheManager())
+        added = store.poll(api, args.poll or None, args.topics, force=True)
+        print(f"✅ {added} notícias novas ({len(store)} no armazém)")
+
+    if args.search is not None:
+        start = time.perf_counter()
+        found = store.search(args.tickers, args.topics, args.search, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for article in store.articles(found['id']):
+            print(f"{article['time_published'][:8]}  {article['overall_sentiment_score'] or 0:+.3f}  {article['title']}")
+        print(f"✅ {len(found)} notícias em {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,27 @@
 # overlap_calculator.py
 import pandas as pd
 from alpha_vantage_api import AlphaVantageAPI
+from holdings_store import HoldingsStore
 
 class OverlapCalculator:
-    def __init__(self, api_key=None):
-        self.api = AlphaVantageAPI(api_key)
+    def __init__(self, api_key=None, store=None, api=None):
+        self.api = api if api is not None else AlphaVantageAPI(api_key)
+        self.store = store if store is not None else HoldingsStore()
+
+    def load_holdings(self, symbol):
+        """
+        Retorna a carteira compacta de um ETF, buscando na API se necessário
+
+        Args:
+            symbol (str): Símbolo do ETF
+
+        Returns:
+            ETFHoldings: Carteira compacta ou None se o ETF não tem holdings
+        """
+        etf = self.store.get(symbol)
+        if etf is not None:
+            return etf
 
-    def get_etf_holdings(self, symbol):
-        """Extrai holdings de um ETF via Alpha Vantage"""
         try:
             profile = self.api.get_etf_profile(symbol)
 
@@ -16,24 +30,13 @@ class OverlapCalculator:
             print(f"Chaves disponíveis: {profile.keys() if profile else 'None'}")
 
             if 'holdings' in profile:
-                holdings = {}
                 for i, holding in enumerate(profile['holdings'][:3]):
                     print(f"\nHolding {i+1}:")
                     print(f"  Dados completos: {holding}")
-                    ticker = holding.get('symbol', '')
-                    weight = holding.get('weight', 0)
-                    print(f"  Ticker: {ticker}")
-                    print(f"  Weight (original): {weight} (tipo: {type(weight)})")
-
-                for holding in profile['holdings']:
-                    ticker = holding.get('symbol', '')
-                    weight = float(holding.get('weight', 0))
-                    holdings[ticker] = weight * 100
 
-                print(f"\nTotal de holdings encontrados: {len(holdings)}")
-                print(f"Primeiros 3 holdings processados: {dict(list(holdings.items())[:3])}")
-
-                return holdings
+                etf = self.store.add_profile(symbol, profile)
+                print(f"\nTotal de holdings encontrados: {len(etf) if etf else 0}")
+                return etf
 
             print("ERRO: Chave 'holdings' não encontrada na resposta")
             return None
@@ -42,6 +45,12 @@ class OverlapCalculator:
             print(f"ERRO ao buscar holdings: {str(e)}")
             raise Exception(f"Erro ao buscar holdings de {symbol}: {str(e)}")
 
+    def get_etf_holdings(self, symbol):
+        """Extrai holdings de um ETF via Alpha Vantage ({ticker: peso em %})"""
+        if self.load_holdings(symbol) is None:
+            return None
+        return self.store.to_dict(symbol)
+
     def calculate_overlap(self, etf_a, etf_b):
         """
         Calcula overlap entre dois ETFs (apenas os holdings, sem considerar peso no portfólio)
@@ -57,74 +66,24 @@ class OverlapCalculator:
         print(f"ETF A: {etf_a}")
         print(f"ETF B: {etf_b}")
 
-        holdings_a = self.get_etf_holdings(etf_a)
-        holdings_b = self.get_etf_holdings(etf_b)
+        holdings_a = self.load_holdings(etf_a)
+        holdings_b = self.load_holdings(etf_b)
 
         if not holdings_a or not holdings_b:
             raise ValueError("Não foi possível obter holdings dos ETFs")
 
-        # Encontra tickers comuns (interseção)
-        common_tickers = set(holdings_a.keys()) & set(holdings_b.keys())
-
-        overlap_weight = 0
-        common_holdings = []
+        # Interseção por merge dos arrays ordenados de IDs
+        result = self.store.overlap(etf_a, etf_b)
 
         print(f"\n=== CALCULANDO OVERLAP ===")
-        print(f"Holdings em {etf_a}: {len(holdings_a)}")
-        print(f"Holdings em {etf_b}: {len(holdings_b)}")
-        print(f"Holdings comuns: {len(common_tickers)}")
-
-        for i, ticker in enumerate(common_tickers):
-            weight_a = holdings_a[ticker]
-            weight_b = holdings_b[ticker]
-
-            # Overlap = peso mínimo entre os dois ETFs
-            overlap_amount = min(weight_a, weight_b)
-            overlap_weight += overlap_amount
-
-            # DEBUG: Mostra os primeiros 3 cálculos
-            if i < 3:
-                print(f"\nTicker: {ticker}")
-                print(f"  Peso em {etf_a}: {weight_a:.2f}%")
-                print(f"  Peso em {etf_b}: {weight_b:.2f}%")
-                print(f"  Overlap: min({weight_a:.2f}, {weight_b:.2f}) = {overlap_amount:.2f}%")
-
-            common_holdings.append({
-                'ticker': ticker,
-                'weight_in_a': weight_a,
-                'weight_in_b': weight_b,
-                'overlap': overlap_amount
-            })
-
-        # Ordena por overlap
-        common_holdings.sort(key=lambda x: x['overlap'], reverse=True)
-
-        # Calcula métricas
-        total_weight_a = sum(holdings_a.values())
-        total_weight_b = sum(holdings_b.values())
-
-        # % do ETF A que está no ETF B
-        overlap_a_in_b = (overlap_weight / total_weight_a * 100) if total_weight_a > 0 else 0
-
-        # % do ETF B que está no ETF A
-        overlap_b_in_a = (overlap_weight / total_weight_b * 100) if total_weight_b > 0 else 0
-
-        # Overlap médio
-        overlap_average = (overlap_a_in_b + overlap_b_in_a) / 2
+        print(f"Holdings em {etf_a}: {result['total_holdings_a']}")
+        print(f"Holdings em {etf_b}: {result['total_holdings_b']}")
+        print(f"Holdings comuns: {result['common_count']}")
 
         print(f"\n=== RESULTADO FINAL ===")
-        print(f"Peso total overlap: {overlap_weight:.2f}%")
-        print(f"% de {etf_a} que está em {etf_b}: {overlap_a_in_b:.2f}%")
-        print(f"% de {etf_b} que está em {etf_a}: {overlap_b_in_a:.2f}%")
-        print(f"Overlap médio: {overlap_average:.2f}%")
-
-        return {
-            'overlap_weight': overlap_weight,
-            'overlap_a_in_b': overlap_a_in_b,
-            'overlap_b_in_a': overlap_b_in_a,
-            'overlap_average': overlap_average,
-            'common_holdings': common_holdings,
-            'total_holdings_a': len(holdings_a),
-            'total_holdings_b': len(holdings_b),
-            'common_count': len(common_tickers)
-        }
+        print(f"Peso total overlap: {result['overlap_weight']:.2f}%")
+        print(f"% de {etf_a} que está em {etf_b}: {result['overlap_a_in_b']:.2f}%")
+        print(f"% de {etf_b} que está em {etf_a}: {result['overlap_b_in_a']:.2f}%")
+        print(f"Overlap médio: {result['overlap_average']:.2f}%")
+
+        return result
@@ -0,0 +1,78 @@
+# page_correlation_matrix.py
+"""
+Matriz de correlação entre os ETFs de um universo
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from app_common import get_covariance_engine, price_coverage
+from config import ETF_UNIVERSE
+from etf_list import list_universes, load_universe
+
+
+def render():
+    st.title("🔗 Correlation Matrix")
+
+    st.markdown("""
+    Correlation of daily returns across an ETF universe, computed from the local price history
+    (last 3 years, aligned by trading date).
+    """)
+
+    universes = list_universes()
+    universe_name = st.selectbox(
+        "ETF Universe",
+        options=universes,
+        index=universes.index(ETF_UNIVERSE) if ETF_UNIVERSE in universes else 0,
+        key="corr_universe"
+    )
+    corr_symbols = price_coverage(load_universe(universe_name), key="corr_download")
+
+    methods = {
+        "Sample": 'sample',
+        "EWMA (λ = 0.94)": 'ewma',
+        "Shrinkage (Ledoit-Wolf)": 'shrinkage'
+    }
+    method_label = st.radio("Estimator", list(methods), horizontal=True, key="corr_method")
+
+    if len(corr_symbols) < 2:
+        st.info("👆 At least two symbols with local price history are needed")
+    else:
+        result = get_covariance_engine().matrix(corr_symbols, methods[method_label])
+
+        if result.start is not None:
+            caption = f"{len(result.symbols)} ETFs · returns from {result.start.astype('datetime64[D]')} to {result.end.astype('datetime64[D]')}"
+            if result.shrinkage is not None:
+                caption += f" · shrinkage intensity {result.shrinkage:.2f}"
+            st.caption(caption)
+
+        corr_df = result.to_frame('corr')
+
+        fig = go.Figure(data=go.Heatmap(
+            z=corr_df.values,
+            x=corr_df.columns,
+            y=corr_df.index,
+            zmin=-1,
+            zmax=1,
+            colorscale='RdBu_r',
+            colorbar=dict(title='Correlation')
+        ))
+        fig.update_layout(
+            title=f'Correlation of Daily Returns ({method_label})',
+            height=max(500, 14 * len(result.symbols)),
+            yaxis=dict(autorange='reversed')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("🔗 Most Correlated Pairs")
+            st.dataframe(result.pairs(10), use_container_width=True, hide_index=True)
+        with col2:
+            st.subheader("🧩 Least Correlated Pairs")
+            st.dataframe(result.pairs(10, ascending=True), use_container_width=True, hide_index=True)
+
+        with st.expander("📋 Annualized Volatility"):
+            vol = pd.Series(np.sqrt(np.diag(result.cov) * 252) * 100, index=result.symbols, name='Volatility (%)')
+            st.dataframe(vol.sort_values(ascending=False).to_frame(), use_container_width=True)
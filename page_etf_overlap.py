@@ -0,0 +1,123 @@
+# page_etf_overlap.py
+"""
+Sobreposição de holdings entre dois ETFs
+"""
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from app_common import get_overlap_calculator
+from app_session import drop, hold, held
+from frame_memo import content_hash
+
+
+def render():
+    st.title("📊 ETF Overlap Analysis")
+
+    st.markdown("""
+    Compare two ETFs to see how much their holdings overlap.
+    This helps you avoid redundancy in your portfolio.
+    """)
+
+    # Inicializa session state
+    if 'overlap_result' not in st.session_state:
+        st.session_state.overlap_result = None
+    if 'overlap_etf_a_value' not in st.session_state:
+        st.session_state.overlap_etf_a_value = None
+    if 'overlap_etf_b_value' not in st.session_state:
+        st.session_state.overlap_etf_b_value = None
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+
+    with col1:
+        etf_a = st.text_input("First ETF", value="SPY", key="overlap_etf_a")
+
+    with col2:
+        etf_b = st.text_input("Second ETF", value="VOO", key="overlap_etf_b")
+
+    with col3:
+        st.write("")
+        st.write("")
+        if st.button("📊 Compare", key="overlap_compare"):
+            if etf_a and etf_b:
+                try:
+                    with st.spinner(f"Analyzing overlap between {etf_a} and {etf_b}..."):
+                        calculator = get_overlap_calculator()
+                        result = calculator.calculate_overlap(etf_a, etf_b)
+                        hold('overlap_result', ('overlap', etf_a.upper(), etf_b.upper(), content_hash(result)), result)
+                        st.session_state.overlap_etf_a_value = etf_a
+                        st.session_state.overlap_etf_b_value = etf_b
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+                    drop('overlap_result')
+            else:
+                st.warning("⚠️ Please enter both ETF symbols")
+
+    # Exibe resultado se existir
+    result = held('overlap_result')
+    if result:
+        etf_a_display = st.session_state.overlap_etf_a_value
+        etf_b_display = st.session_state.overlap_etf_b_value
+
+        # Métricas principais
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Overlap Weight", f"{result['overlap_weight']:.2f}%")
+        with col2:
+            st.metric(f"{etf_a_display} in {etf_b_display}", f"{result['overlap_a_in_b']:.2f}%")
+        with col3:
+            st.metric(f"{etf_b_display} in {etf_a_display}", f"{result['overlap_b_in_a']:.2f}%")
+        with col4:
+            st.metric("Average Overlap", f"{result['overlap_average']:.2f}%")
+
+        # Gráfico de overlap
+        st.subheader("📊 Overlap Visualization")
+
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            name=etf_a_display,
+            x=[etf_a_display],
+            y=[100],
+            marker_color='lightblue'
+        ))
+
+        fig.add_trace(go.Bar(
+            name=etf_b_display,
+            x=[etf_b_display],
+            y=[100],
+            marker_color='lightgreen'
+        ))
+
+        fig.add_trace(go.Bar(
+            name='Overlap',
+            x=['Overlap'],
+            y=[result['overlap_average']],
+            marker_color='orange'
+        ))
+
+        fig.update_layout(
+            title='ETF Composition Overlap',
+            yaxis_title='Percentage (%)',
+            height=400
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Top common holdings
+        st.subheader("🏢 Top Common Holdings")
+
+        common_df = pd.DataFrame(result['common_holdings'][:20])
+        common_df = common_df.round(2)
+
+        st.dataframe(common_df, use_container_width=True)
+
+        # Summary
+        st.info(f"""
+        **Summary:**
+        - Total holdings in {etf_a_display}: {result['total_holdings_a']}
+        - Total holdings in {etf_b_display}: {result['total_holdings_b']}
+        - Common holdings: {result['common_count']}
+        - Average overlap: {result['overlap_average']:.2f}%
+        """)
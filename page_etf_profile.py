@@ -0,0 +1,201 @@
+# page_etf_profile.py
+"""
+Perfil de um ETF: dados do fundo, setores, holdings e look-through dos fundamentos
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from app_common import api, get_fundamentals_store
+from app_session import drop, hold, held
+from config import ETF_UNIVERSE, LOOK_THROUGH_COVERAGE
+from etf_list import load_universe
+from frame_memo import content_hash
+from look_through import LookThrough
+from sector_exposure import ExposureEngine
+from utils import safe_float
+
+# Agregação de setores do universo (cache por versão dos perfis)
+@st.cache_resource
+def get_exposure_engine():
+    return ExposureEngine()
+
+# Look-through de ETFs: overviews dos holdings (pool compartilhado, grava no armazém)
+@st.cache_resource
+def get_look_through():
+    return LookThrough(api, warehouse=get_fundamentals_store())
+
+
+def render():
+    st.title("🔍 ETF Profile")
+
+    # Inicializa session state
+    if 'etf_profile_data' not in st.session_state:
+        st.session_state.etf_profile_data = None
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        symbol = st.text_input("Enter ETF Symbol", value="SPY", key="etf_profile_symbol")
+    with col2:
+        st.write("")
+        st.write("")
+        if st.button("🔍 Search", key="etf_profile_search"):
+            try:
+                with st.spinner(f"Loading data for {symbol}..."):
+                    # Sessões que buscam o mesmo perfil compartilham a mesma resposta
+                    profile = api.get_etf_profile(symbol)
+                    hold('etf_profile_data', ('etf_profile', content_hash(profile)), profile)
+                    st.session_state.etf_profile_symbol_searched = symbol
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+                drop('etf_profile_data')
+
+    # Exibe dados se existirem
+    data = held('etf_profile_data')
+    if data and 'net_assets' in data:
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            net_assets = safe_float(data.get('net_assets', 0))
+            st.metric("Net Assets", f"${net_assets/1e9:.2f}B" if net_assets > 0 else "N/A")
+        with col2:
+            expense_ratio = safe_float(data.get('net_expense_ratio', 0))
+            st.metric("Expense Ratio", f"{expense_ratio*100:.2f}%" if expense_ratio > 0 else "N/A")
+        with col3:
+            dividend_yield = safe_float(data.get('dividend_yield', 0))
+            st.metric("Dividend Yield", f"{dividend_yield*100:.2f}%" if dividend_yield > 0 else "N/A")
+        with col4:
+            st.metric("Inception Date", data.get('inception_date', 'N/A'))
+
+        # Sectors
+        if 'sectors' in data and data['sectors']:
+            st.subheader("📊 Sector Allocation")
+            sectors_df = pd.DataFrame(data['sectors'])
+
+            fig = go.Figure(data=[go.Pie(
+                labels=sectors_df['sector'],
+                values=sectors_df['weight'],
+                hole=0.3
+            )])
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Exposição vs benchmark, usando os perfis em cache do universo
+            searched = st.session_state.get('etf_profile_symbol_searched', symbol).upper()
+            universe_symbols = list(dict.fromkeys(load_universe(ETF_UNIVERSE) + [searched, 'SPY']))
+            exposure = get_exposure_engine().exposures(universe_symbols)
+
+            if searched in exposure and len(exposure) > 1:
+                st.subheader("📐 Sector Exposure vs Benchmark")
+
+                benchmarks = [s for s in exposure.symbols if s != searched]
+                benchmark = st.selectbox(
+                    "Benchmark",
+                    options=benchmarks,
+                    index=benchmarks.index('SPY') if 'SPY' in benchmarks else 0,
+                    key="etf_profile_benchmark"
+                )
+
+                diff = exposure.relative_to(benchmark).loc[searched] * 100
+                fig = go.Figure(data=[go.Bar(
+                    x=diff.values,
+                    y=diff.index,
+                    orientation='h',
+                    marker_color=['green' if v >= 0 else 'red' for v in diff.values]
+                )])
+                fig.update_layout(
+                    title=f'{searched} vs {benchmark} (percentage points)',
+                    xaxis_title='Over/Underweight (pp)',
+                    height=400,
+                    yaxis={'categoryorder': 'total ascending'}
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+                with st.expander(f"🌐 Most overweight ETFs vs {benchmark} ({len(exposure)} ETFs in cache)"):
+                    sector = st.selectbox("Sector", options=exposure.categories, key="etf_profile_sector_rank")
+                    ranking = exposure.most_overweight(sector, benchmark, top=10).round(2)
+                    ranking.columns = ['ETF', 'Weight (%)', f'{benchmark} Weight (%)', 'Overweight (pp)']
+                    st.dataframe(ranking, use_container_width=True, hide_index=True)
+
+        # Top Holdings
+        if 'holdings' in data and data['holdings']:
+            st.subheader("🏢 Top 10 Holdings")
+            holdings_df = pd.DataFrame(data['holdings'][:10])
+            holdings_df['weight'] = pd.to_numeric(holdings_df['weight'], errors='coerce').fillna(0) * 100
+
+            fig = go.Figure(data=[go.Bar(
+                x=holdings_df['weight'],
+                y=holdings_df['symbol'],
+                orientation='h',
+                text=holdings_df['weight'].round(2),
+                textposition='auto',
+            )])
+            fig.update_layout(
+                xaxis_title="Weight (%)",
+                yaxis_title="Symbol",
+                height=400,
+                yaxis={'categoryorder':'total ascending'}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(holdings_df[['symbol', 'description', 'weight']], use_container_width=True)
+
+            # Fundamentos do fundo agregados a partir dos overviews dos holdings
+            st.subheader("🔬 Fundamentals Look-Through")
+            searched = st.session_state.get('etf_profile_symbol_searched', symbol).upper()
+            holdings = {h.get('symbol'): h.get('weight') for h in data['holdings']}
+
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                coverage = st.slider("Weight coverage target (%)", min_value=10, max_value=100,
+                                     value=int(LOOK_THROUGH_COVERAGE * 100), step=5,
+                                     key="etf_look_through_coverage") / 100
+            with col2:
+                st.write("")
+                run_look_through = st.button("🔬 Compute", key="etf_look_through_run")
+
+            def show_look_through(result, container):
+                with container.container():
+                    metrics = result.metrics()
+                    cols = st.columns(4)
+                    labels = {'pe': "Weighted P/E", 'dividend_yield': "Dividend Yield", 'roe': "ROE",
+                              'revenue_growth': "Revenue Growth (YoY)"}
+                    for col, (name, label) in zip(cols, labels.items()):
+                        value, covered = metrics.loc[name, 'value'], metrics.loc[name, 'coverage']
+                        if np.isnan(value):
+                            text = "N/A"
+                        elif name == 'pe':
+                            text = f"{value:.1f}"
+                        else:
+                            text = f"{value * 100:.2f}%"
+                        col.metric(label, text, help=f"Holdings with data: {covered * 100:.1f}% of fund weight")
+
+                    st.progress(min(result.coverage / result.target, 1.0),
+                                text=f"{result.fetched}/{len(result.holdings)} holdings · "
+                                     f"{result.coverage * 100:.1f}% of fund weight covered "
+                                     f"(target {result.target * 100:.0f}%) · {result.elapsed:.1f}s")
+                    if result.done:
+                        table = result.holdings.reset_index()
+                        table['weight'] = table['weight'] * 100
+                        st.dataframe(table.round(4), hide_index=True, use_container_width=True)
+
+            placeholder = st.empty()
+            if run_look_through:
+                # Parciais a cada poucos instantes; os overviews em cache chegam primeiro
+                try:
+                    for result in get_look_through().run(searched, holdings, coverage):
+                        show_look_through(result, placeholder)
+                    hold('etf_look_through', ('look_through', searched, coverage), result, replace=True)
+                except Exception as e:
+                    st.error(f"❌ {str(e)}")
+            else:
+                result = held('etf_look_through')
+                if result is not None and result.symbol == searched:
+                    show_look_through(result, placeholder)
+                else:
+                    st.caption("Fetches each holding's company overview in weight order until the coverage target "
+                               "is reached (cached overviews are reused; others follow the API rate limit).")
+    elif data is not None:
+        st.error(f"❌ No data found for the symbol")
@@ -0,0 +1,449 @@
+# page_fundamentals.py
+"""
+Fundamentos de empresas: overview, demonstrativos e screens no armazém local
+"""
+import time
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from app_common import api, get_fundamentals_store, get_overlap_calculator
+from app_session import hold, held
+from frame_memo import FrameMemo
+from fundamentals_loader import FundamentalsLoader
+from fundamentals_store import OPERATORS
+
+# Fundamentos: as quatro requisições de um símbolo em paralelo (pool compartilhado)
+@st.cache_resource
+def get_fundamentals_loader():
+    return FundamentalsLoader(api, warehouse=get_fundamentals_store())
+
+# DataFrames convertidos das respostas da API (LRU por conteúdo, compartilhado entre sessões)
+@st.cache_resource
+def get_frame_memo():
+    return FrameMemo()
+
+frame_memo = get_frame_memo()
+
+
+def render():
+    st.title("💰 Company Fundamentals")
+
+    # Inicializa session state
+    if 'fund_data' not in st.session_state:
+        st.session_state.fund_data = None
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        symbol = st.text_input("Enter Stock Symbol", value="AAPL", key="fund_symbol")
+    with col2:
+        st.write("")
+        st.write("")
+        if st.button("🔍 Search", key="fund_search"):
+            # Dispara as quatro partes em paralelo; cada uma é exibida quando chega. As sessões
+            # que olham o mesmo símbolo passam a compartilhar o pacote mais recente
+            bundle = get_fundamentals_loader().load(symbol)
+            hold('fund_data', ('fundamentals', bundle.symbol), bundle, replace=True)
+
+    bundle = held('fund_data')
+    if bundle:
+        symbol = bundle.symbol
+
+        # Espera uma parte do pacote (o que já foi exibido continua na tela)
+        def fundamentals_part(part, label):
+            try:
+                with st.spinner(f"Loading {label} for {symbol}..."):
+                    return bundle.result(part)
+            except Exception as e:
+                st.error(f"❌ Error loading {label}: {str(e)}")
+                return {}
+
+        overview = fundamentals_part('overview', 'overview')
+
+        if not overview or 'Symbol' not in overview:
+            st.error(f"❌ No data found for {symbol}")
+        else:
+            # Company Overview
+            st.header(f"{overview.get('Name', symbol)}")
+
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.metric("Market Cap", f"${float(overview.get('MarketCapitalization', 0))/1e9:.2f}B")
+            with col2:
+                st.metric("P/E Ratio", overview.get('PERatio', 'N/A'))
+            with col3:
+                st.metric("EPS", overview.get('EPS', 'N/A'))
+            with col4:
+                st.metric("Dividend Yield", f"{float(overview.get('DividendYield', 0))*100:.2f}%")
+
+            # Tabs para diferentes relatórios
+            tab1, tab2, tab3, tab4, tab5 = st.tabs([
+                "📊 Overview", 
+                "💵 Income Statement", 
+                "📋 Balance Sheet",
+                "💰 Cash Flow",
+                "📈 Custom Chart"
+            ])
+
+            # TAB 1: Overview
+            with tab1:
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.subheader("Company Information")
+                    info_data = {
+                        "Sector": overview.get('Sector', 'N/A'),
+                        "Industry": overview.get('Industry', 'N/A'),
+                        "Exchange": overview.get('Exchange', 'N/A'),
+                        "Currency": overview.get('Currency', 'N/A'),
+                        "Country": overview.get('Country', 'N/A'),
+                    }
+                    st.dataframe(pd.DataFrame(info_data.items(), columns=['Field', 'Value']), hide_index=True, use_container_width=True)
+
+                with col2:
+                    st.subheader("Key Metrics")
+                    metrics_data = {
+                        "52 Week High": f"${overview.get('52WeekHigh', 'N/A')}",
+                        "52 Week Low": f"${overview.get('52WeekLow', 'N/A')}",
+                        "50 Day MA": f"${overview.get('50DayMovingAverage', 'N/A')}",
+                        "200 Day MA": f"${overview.get('200DayMovingAverage', 'N/A')}",
+                        "Beta": overview.get('Beta', 'N/A'),
+                    }
+                    st.dataframe(pd.DataFrame(metrics_data.items(), columns=['Metric', 'Value']), hide_index=True, use_container_width=True)
+
+                st.subheader("Description")
+                st.write(overview.get('Description', 'No description available'))
+
+            # TAB 2: Income Statement
+            with tab2:
+                income = fundamentals_part('income', 'income statement')
+                if 'annualReports' in income and income['annualReports']:
+                    # Já convertido (datas, valores em bilhões) no memo compartilhado
+                    df_income = frame_memo.reports('income', income)
+
+                    # Gráfico
+                    fig = go.Figure()
+
+                    fig.add_trace(go.Bar(
+                        x=df_income['fiscalDateEnding'],
+                        y=df_income['totalRevenue'],
+                        name='Total Revenue',
+                        marker_color='lightblue'
+                    ))
+
+                    fig.add_trace(go.Bar(
+                        x=df_income['fiscalDateEnding'],
+                        y=df_income['netIncome'],
+                        name='Net Income',
+                        marker_color='green'
+                    ))
+
+                    fig.update_layout(
+                        title='Revenue vs Net Income (Billions)',
+                        xaxis_title='Fiscal Year',
+                        yaxis_title='Amount (Billions USD)',
+                        barmode='group',
+                        height=400
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    # Tabela
+                    st.subheader("Annual Reports")
+                    display_cols = ['fiscalDateEnding', 'totalRevenue', 'grossProfit', 'operatingIncome', 'netIncome', 'ebitda']
+                    display_df = df_income[display_cols].copy()
+                    display_df.columns = ['Date', 'Revenue (B)', 'Gross Profit (B)', 'Operating Income (B)', 'Net Income (B)', 'EBITDA (B)']
+                    st.dataframe(display_df, hide_index=True, use_container_width=True)
+                else:
+                    st.warning("No income statement data available")
+
+            # TAB 3: Balance Sheet
+            with tab3:
+                balance = fundamentals_part('balance', 'balance sheet')
+                if 'annualReports' in balance and balance['annualReports']:
+                    # Já convertido (datas, valores em bilhões) no memo compartilhado
+                    df_balance = frame_memo.reports('balance', balance)
+
+                    # Gráfico
+                    fig = go.Figure()
+
+                    fig.add_trace(go.Bar(
+                        x=df_balance['fiscalDateEnding'],
+                        y=df_balance['totalAssets'],
+                        name='Total Assets',
+                        marker_color='blue'
+                    ))
+
+                    fig.add_trace(go.Bar(
+                        x=df_balance['fiscalDateEnding'],
+                        y=df_balance['totalLiabilities'],
+                        name='Total Liabilities',
+                        marker_color='red'
+                    ))
+
+                    fig.add_trace(go.Bar(
+                        x=df_balance['fiscalDateEnding'],
+                        y=df_balance['totalShareholderEquity'],
+                        name='Shareholder Equity',
+                        marker_color='green'
+                    ))
+
+                    fig.update_layout(
+                        title='Assets, Liabilities &amp; Equity (Billions)',
+                        xaxis_title='Fiscal Year',
+                        yaxis_title='Amount (Billions USD)',
+                        barmode='group',
+                        height=400
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    # Tabela
+                    st.subheader("Annual Reports")
+                    display_cols = ['fiscalDateEnding', 'totalAssets', 'totalLiabilities', 'totalShareholderEquity']
+                    display_df = df_balance[display_cols].copy()
+                    display_df.columns = ['Date', 'Total Assets (B)', 'Total Liabilities (B)', 'Shareholder Equity (B)']
+                    st.dataframe(display_df, hide_index=True, use_container_width=True)
+                else:
+                    st.warning("No balance sheet data available")
+
+            # TAB 4: Cash Flow
+            with tab4:
+                cashflow = fundamentals_part('cashflow', 'cash flow')
+                if 'annualReports' in cashflow and cashflow['annualReports']:
+                    # Já convertido (datas, valores em bilhões) no memo compartilhado
+                    df_cashflow = frame_memo.reports('cashflow', cashflow)
+
+                    # Gráfico
+                    fig = go.Figure()
+
+                    fig.add_trace(go.Bar(
+                        x=df_cashflow['fiscalDateEnding'],
+                        y=df_cashflow['operatingCashflow'],
+                        name='Operating Cash Flow',
+                        marker_color='green'
+                    ))
+
+                    fig.add_trace(go.Bar(
+                        x=df_cashflow['fiscalDateEnding'],
+                        y=df_cashflow['cashflowFromInvestment'],
+                        name='Investing Cash Flow',
+                        marker_color='blue'
+                    ))
+
+                    fig.add_trace(go.Bar(
+                        x=df_cashflow['fiscalDateEnding'],
+                        y=df_cashflow['cashflowFromFinancing'],
+                        name='Financing Cash Flow',
+                        marker_color='orange'
+                    ))
+
+                    fig.update_layout(
+                        title='Cash Flow Statement (Billions)',
+                        xaxis_title='Fiscal Year',
+                        yaxis_title='Amount (Billions USD)',
+                        barmode='group',
+                        height=400
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    # Tabela
+                    st.subheader("Annual Reports")
+                    display_cols = ['fiscalDateEnding', 'operatingCashflow', 'cashflowFromInvestment', 'cashflowFromFinancing']
+                    display_df = df_cashflow[display_cols].copy()
+                    display_df.columns = ['Date', 'Operating CF (B)', 'Investing CF (B)', 'Financing CF (B)']
+                    st.dataframe(display_df, hide_index=True, use_container_width=True)
+                else:
+                    st.warning("No cash flow data available")
+
+            # TAB 5: Custom Chart
+            with tab5:
+                st.subheader("📈 Create Your Custom Chart")
+                st.write("Select metrics from different reports to compare over time")
+
+                # Prepara dados disponíveis (os mesmos DataFrames das abas, sem nova conversão)
+                available_data = {}
+
+                if 'annualReports' in income and income['annualReports']:
+                    available_data['Income Statement'] = frame_memo.reports('income', income)
+
+                if 'annualReports' in balance and balance['annualReports']:
+                    available_data['Balance Sheet'] = frame_memo.reports('balance', balance)
+
+                if 'annualReports' in cashflow and cashflow['annualReports']:
+                    available_data['Cash Flow'] = frame_memo.reports('cashflow', cashflow)
+
+                if available_data:
+                    # Seleção de métricas
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        # Métricas do Income Statement
+                        income_metrics = {
+                            'Total Revenue': 'totalRevenue',
+                            'Gross Profit': 'grossProfit',
+                            'Operating Income': 'operatingIncome',
+                            'Net Income': 'netIncome',
+                            'EBITDA': 'ebitda',
+                            'Operating Expenses': 'operatingExpenses'
+                        }
+
+                        selected_income = st.multiselect(
+                            "Income Statement Metrics",
+                            options=list(income_metrics.keys()),
+                            default=['Total Revenue', 'Net Income'],
+                            key="custom_income"
+                        )
+
+                    with col2:
+                        # Métricas do Balance Sheet
+                        balance_metrics = {
+                            'Total Assets': 'totalAssets',
+                            'Total Liabilities': 'totalLiabilities',
+                            'Shareholder Equity': 'totalShareholderEquity',
+                            'Current Assets': 'totalCurrentAssets',
+                            'Current Liabilities': 'totalCurrentLiabilities'
+                        }
+
+                        selected_balance = st.multiselect(
+                            "Balance Sheet Metrics",
+                            options=list(balance_metrics.keys()),
+                            default=[],
+                            key="custom_balance"
+                        )
+
+                    # Métricas do Cash Flow
+                    cashflow_metrics = {
+                        'Operating Cash Flow': 'operatingCashflow',
+                        'Investing Cash Flow': 'cashflowFromInvestment',
+                        'Financing Cash Flow': 'cashflowFromFinancing'
+                    }
+
+                    selected_cashflow = st.multiselect(
+                        "Cash Flow Metrics",
+                        options=list(cashflow_metrics.keys()),
+                        default=[],
+                        key="custom_cashflow"
+                    )
+
+                    # Criar gráfico customizado
+                    if selected_income or selected_balance or selected_cashflow:
+                        fig = go.Figure()
+
+                        # Adiciona métricas do Income Statement
+                        if 'Income Statement' in available_data:
+                            df = available_data['Income Statement']
+
+                            for metric_name in selected_income:
+                                metric_col = income_metrics[metric_name]
+                                if metric_col in df.columns:
+                                    fig.add_trace(go.Scatter(
+                                        x=df['fiscalDateEnding'],
+                                        y=df[metric_col],
+                                        name=metric_name,
+                                        mode='lines+markers'
+                                    ))
+
+                        # Adiciona métricas do Balance Sheet
+                        if 'Balance Sheet' in available_data:
+                            df = available_data['Balance Sheet']
+
+                            for metric_name in selected_balance:
+                                metric_col = balance_metrics[metric_name]
+                                if metric_col in df.columns:
+                                    fig.add_trace(go.Scatter(
+                                        x=df['fiscalDateEnding'],
+                                        y=df[metric_col],
+                                        name=metric_name,
+                                        mode='lines+markers'
+                                    ))
+
+                        # Adiciona métricas do Cash Flow
+                        if 'Cash Flow' in available_data:
+                            df = available_data['Cash Flow']
+
+                            for metric_name in selected_cashflow:
+                                metric_col = cashflow_metrics[metric_name]
+                                if metric_col in df.columns:
+                                    fig.add_trace(go.Scatter(
+                                        x=df['fiscalDateEnding'],
+                                        y=df[metric_col],
+                                        name=metric_name,
+                                        mode='lines+markers'
+                                    ))
+
+                        fig.update_layout(
+                            title='Custom Financial Metrics Comparison',
+                            xaxis_title='Fiscal Year',
+                            yaxis_title='Amount (Billions USD)',
+                            height=500,
+                            hovermode='x unified'
+                        )
+
+                        st.plotly_chart(fig, use_container_width=True)
+                    else:
+                        st.info("👆 Select at least one metric to create a chart")
+                else:
+                    st.warning("No financial data available for custom charts")
+
+    # Screen entre as empresas já gravadas no armazém local
+    st.markdown("---")
+    with st.expander("🗄️ Screen Stored Companies"):
+        warehouse = get_fundamentals_store()
+        stored = warehouse.symbols()
+        st.caption(f"{len(stored)} companies in the local fundamentals warehouse. Every company you search is "
+                   "stored automatically; growth, margins and ROE come from the latest annual reports.")
+
+        if st.button("📥 Import cached fundamentals", key="fund_import_cache"):
+            with st.spinner("Importing cached API responses..."):
+                imported = warehouse.ingest_cache()
+            st.success(f"✅ Imported {imported} cached responses")
+            stored = warehouse.symbols()
+
+        conditions = st.data_editor(
+            pd.DataFrame({'Metric': ['PERatio', 'revenue_growth'], 'Operator': ['<', '>'], 'Value': [15.0, 0.10]}),
+            column_config={
+                'Metric': st.column_config.SelectboxColumn(
+                    options=sorted(set(warehouse.metrics()) | {'PERatio', 'revenue_growth'}), required=True),
+                'Operator': st.column_config.SelectboxColumn(options=list(OPERATORS), required=True),
+                'Value': st.column_config.NumberColumn(required=True),
+            },
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            key="fund_screen_conditions"
+        ).dropna()
+
+        col1, col2 = st.columns(2)
+        with col1:
+            scope = st.radio("Universe", ["All stored companies", "Holdings of an ETF"], horizontal=True,
+                             key="fund_screen_scope")
+        with col2:
+            screen_etf = st.text_input("ETF", value="SPY", key="fund_screen_etf",
+                                       disabled=scope != "Holdings of an ETF").strip().upper()
+
+        if st.button("🔎 Run Screen", key="fund_screen_run"):
+            universe = None
+            if scope == "Holdings of an ETF":
+                holdings = get_overlap_calculator().get_etf_holdings(screen_etf)
+                universe = list(holdings) if holdings else []
+                st.caption(f"{screen_etf}: {len(universe)} holdings, "
+                           f"{len(set(universe) & set(stored))} with stored fundamentals")
+
+            if not len(conditions):
+                st.warning("⚠️ Add at least one condition")
+            elif universe is not None and not universe:
+                st.warning(f"⚠️ No holdings available for {screen_etf}")
+            else:
+                start = time.perf_counter()
+                result = warehouse.screen(
+                    list(conditions[['Metric', 'Operator', 'Value']].itertuples(index=False, name=None)),
+                    universe,
+                    columns=['MarketCapitalization', 'DividendYield', 'roe']
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+                st.success(f"✅ {len(result)} companies match ({elapsed:.1f} ms)")
+                st.dataframe(result, hide_index=True, use_container_width=True)
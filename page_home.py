@@ -0,0 +1,48 @@
+# page_home.py
+"""
+Página inicial: apresentação das ferramentas
+"""
+import streamlit as st
+
+from config import APP_ICON, APP_TITLE
+
+
+def render():
+    st.title(f"{APP_ICON} {APP_TITLE}")
+
+    st.markdown("""
+    ## 👋 Welcome to ETF Analyzer Pro!
+
+    A comprehensive tool for analyzing ETFs, stocks, and market trends.
+
+    ### 🚀 Features:
+
+    - **🔍 ETF Profile**: View detailed information about any ETF
+    - **📊 ETF Overlap Analysis**: Compare holdings between two ETFs
+    - **💹 Price Analysis**: Analyze historical price data with interactive charts
+    - **📈 Technical Indicators**: View SMA, RSI, and other technical indicators
+    - **🧮 Technical Screener**: Scan a whole ETF universe for technical conditions
+    - **🔗 Correlation Matrix**: See which ETFs move together
+    - **⚖️ Portfolio Optimizer**: Efficient frontier, max-Sharpe and risk-parity allocations
+    - **🎲 Monte Carlo**: Simulated portfolio paths with percentile bands, VaR and CVaR
+    - **💰 Fundamentals**: Deep dive into company financials (Income, Balance Sheet, Cash Flow)
+    - **📰 Market News**: Real-time news with sentiment analysis
+    - **🔎 Symbol Search**: Find stock/ETF symbols by keywords
+
+    ### 📌 How to Use:
+
+    1. Select a tool from the **sidebar** (left menu)
+    2. Enter the stock/ETF symbol
+    3. Explore the data and insights!
+
+    ### 💡 Tips:
+
+    - Most features work with both **ETFs** and **individual stocks**
+    - Use the **Custom Chart** in Fundamentals to compare different metrics
+    - Check **News Sentiment** to gauge market mood
+    - **Overlap Analysis** helps avoid redundancy in your portfolio
+
+    ---
+
+    **Powered by Alpha Vantage API**
+    """)
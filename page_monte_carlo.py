@@ -0,0 +1,135 @@
+# page_monte_carlo.py
+"""
+Simulação de Monte Carlo de uma carteira
+"""
+import uuid
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from app_common import get_price_store, price_coverage
+from app_session import drop, hold, held
+import monte_carlo
+from monte_carlo import ReturnModel
+
+
+def render():
+    st.title("🎲 Monte Carlo Simulation")
+
+    st.markdown("""
+    Simulates thousands of future paths for an ETF mix using monthly returns drawn from the local price history.
+    Bootstrap resamples historical months (keeps fat tails and cross-asset moves); the normal model uses the
+    historical mean and covariance.
+    """)
+
+    st.subheader("🧺 Allocation")
+    allocation = st.data_editor(
+        pd.DataFrame({'Symbol': ['SPY', 'QQQ', 'AGG'], 'Weight (%)': [50.0, 20.0, 30.0]}),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key="mc_allocation"
+    )
+    allocation = allocation.dropna()
+    allocation = allocation[allocation['Weight (%)'] > 0]
+    weights = allocation.groupby(allocation['Symbol'].astype(str).str.strip().str.upper())['Weight (%)'].sum()
+    weights = weights[weights.index != '']
+    mc_symbols = price_coverage(list(weights.index), key="mc_download")
+
+    methods = {"Bootstrap (historical months)": 'bootstrap', "Multivariate normal": 'normal'}
+    histories = {"All common history": None, "Last 5 years": 5, "Last 10 years": 10, "Last 20 years": 20}
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        method_label = st.selectbox("Return Model", list(methods), key="mc_method")
+    with col2:
+        history_label = st.selectbox("History", list(histories), key="mc_history")
+    with col3:
+        n_paths = st.selectbox("Paths", [1000, 10000, 100000], index=1, format_func=lambda x: f"{x:,}", key="mc_paths")
+    with col4:
+        years = st.slider("Horizon (years)", min_value=1, max_value=30, value=10, key="mc_years")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        initial = st.number_input("Initial Investment ($)", min_value=100.0, value=10000.0, step=1000.0, key="mc_initial")
+    with col2:
+        confidence = st.selectbox("VaR Confidence", [0.90, 0.95, 0.99], index=1, format_func=lambda x: f"{x:.0%}",
+                                  key="mc_confidence")
+    with col3:
+        st.write("")
+        rebalance = st.checkbox("Rebalance monthly", value=True, key="mc_rebalance")
+
+    if st.button("🎲 Run Simulation", key="mc_run"):
+        if len(mc_symbols) < len(weights):
+            st.warning("⚠️ Download the missing prices first")
+        elif not len(weights):
+            st.warning("⚠️ Please enter at least one symbol with a positive weight")
+        else:
+            try:
+                with st.spinner(f"Simulating {n_paths:,} paths..."):
+                    model = ReturnModel.from_store(get_price_store(), list(weights.index), methods[method_label],
+                                                   histories[history_label])
+                    result = monte_carlo.simulate(model, weights.to_numpy(), n_paths, years, rebalance=rebalance)
+                    # Simulação aleatória: chave própria, sem compartilhamento
+                    hold('mc_result', ('monte_carlo', uuid.uuid4().hex), result)
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+                drop('mc_result')
+
+    result = held('mc_result')
+    if result is None:
+        st.info("👆 Set the allocation and click 'Run Simulation'")
+    else:
+        risk = result.risk(confidence=confidence)
+        bands = result.bands_frame() * initial
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(f"Median Value ({result.years}Y)", f"${initial * (1 + risk['median']):,.0f}",
+                    f"{risk['cagr_median'] * 100:.2f}% / year")
+        col2.metric(f"VaR {confidence:.0%} ({result.years}Y)", f"${initial * risk['var']:,.0f}", f"{-risk['var'] * 100:.1f}%")
+        col3.metric(f"CVaR {confidence:.0%} ({result.years}Y)", f"${initial * risk['cvar']:,.0f}", f"{-risk['cvar'] * 100:.1f}%")
+        col4.metric("Probability of Loss", f"{risk['prob_loss'] * 100:.1f}%")
+
+        # Faixas de percentis (5-95 e 25-75) em torno da mediana
+        fig = go.Figure()
+        for low, high, color in [('p5', 'p95', 'rgba(31, 119, 180, 0.15)'), ('p25', 'p75', 'rgba(31, 119, 180, 0.3)')]:
+            fig.add_trace(go.Scatter(x=bands.index, y=bands[high], mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=bands.index, y=bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+                                     fillcolor=color, name=f"{low[1:]}th-{high[1:]}th percentile"))
+        fig.add_trace(go.Scatter(x=bands.index, y=bands['p50'], mode='lines', name='Median',
+                                 line=dict(color='#1f77b4', width=2)))
+        fig.add_hline(y=initial, line_dash='dash', line_color='gray', line_width=1)
+        fig.update_layout(title=f'Simulated Portfolio Value ({result.n_paths:,} paths)', xaxis_title='Years',
+                          yaxis_title='Value ($)', height=500, hovermode='x unified')
+        st.plotly_chart(fig, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            # Histograma calculado aqui: só as barras vão para o navegador
+            counts, edges = np.histogram(result.terminal * initial, bins=80)
+            fig_hist = go.Figure(data=[go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, marker_color='lightblue')])
+            fig_hist.add_vline(x=initial * (1 - risk['var']), line_color='crimson', line_dash='dash',
+                               annotation_text=f"VaR {confidence:.0%}")
+            fig_hist.update_layout(title=f'Final Value Distribution ({result.years}Y)', xaxis_title='Value ($)',
+                                   yaxis_title='Paths', height=400, bargap=0)
+            st.plotly_chart(fig_hist, use_container_width=True)
+        with col2:
+            table = result.risk_table(confidence)
+            st.dataframe(pd.DataFrame({
+                'Year': table['year'],
+                'Median ($)': (initial * (1 + table['median'])).round(0),
+                f'VaR {confidence:.0%} ($)': (initial * table['var']).round(0),
+                f'CVaR {confidence:.0%} ($)': (initial * table['cvar']).round(0),
+                'P(Loss) %': (table['prob_loss'] * 100).round(1),
+            }), use_container_width=True, hide_index=True, height=400)
+
+        model = result.model
+        mix = ", ".join(f"{s} {w * 100:.0f}%" for s, w in zip(model.symbols, result.weights))
+        st.caption(f"{mix} · {model.method} model on {model.n_obs:,} common trading days "
+                   f"({pd.Timestamp(model.start):%Y-%m-%d} to {pd.Timestamp(model.end):%Y-%m-%d}) · "
+                   f"{'monthly rebalancing' if result.rebalance else 'buy and hold'} · "
+                   f"simulated in {result.elapsed:.2f}s on {result.workers} process(es). "
+                   "VaR and CVaR are losses from the initial value (negative means a gain).")
@@ -0,0 +1,337 @@
+# page_news.py
+"""
+Notícias com sentimento, armazenadas localmente, e sentimento por ticker contra preços
+"""
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from app_common import api, get_price_store, price_coverage
+from news_sentiment import SentimentEngine, sentiment_correlation
+from news_store import NewsStore
+from utils import sentiment_to_color, sentiment_to_emoji
+
+# Notícias armazenadas localmente (SQLite + FTS5, ingestão incremental)
+@st.cache_resource
+def get_news_store():
+    return NewsStore()
+
+# Resultados dos filtros da página de notícias (cache pela versão do armazém)
+@st.cache_resource(max_entries=32)
+def search_news(version, tickers=None, topics=None, text=None, sentiment=None, sort='recent'):
+    return get_news_store().search(tickers, topics, text, sentiment, sort=sort)
+
+@st.cache_resource(max_entries=32)
+def news_summary(version, tickers=None, topics=None):
+    return get_news_store().summary(tickers, topics)
+
+# Sentimento diário por ticker unido aos retornos (cache por versão das notícias e preços)
+@st.cache_resource
+def get_sentiment_engine():
+    return SentimentEngine(get_news_store(), get_price_store())
+
+
+def render():
+    st.title("📰 Market News &amp; Sentiment Analysis")
+
+    # Inicializa session state (consulta atual; as notícias ficam no armazém local)
+    if 'news_query' not in st.session_state:
+        st.session_state.news_query = None
+
+    news_store = get_news_store()
+
+    # Filtros
+    with st.expander("🔍 Filters", expanded=True):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            tickers_input = st.text_input(
+                "Stock Symbols (comma separated)",
+                value="AAPL,MSFT,GOOGL",
+                help="Enter stock symbols separated by commas",
+                key="news_tickers"
+            )
+
+        with col2:
+            topics_options = [
+                "blockchain",
+                "earnings",
+                "ipo",
+                "mergers_and_acquisitions",
+                "financial_markets",
+                "economy_fiscal",
+                "economy_monetary",
+                "economy_macro",
+                "energy_transportation",
+                "finance",
+                "life_sciences",
+                "manufacturing",
+                "real_estate",
+                "retail_wholesale",
+                "technology"
+            ]
+
+            selected_topics = st.multiselect(
+                "Topics",
+                options=topics_options,
+                default=["technology", "financial_markets"],
+                key="news_topics"
+            )
+
+        with col3:
+            page_size = st.slider(
+                "Articles per Page",
+                min_value=5,
+                max_value=50,
+                value=10,
+                step=5,
+                key="news_page_size"
+            )
+
+        if st.button("🔍 Search News", use_container_width=True, key="news_search"):
+            tickers = tickers_input if tickers_input else None
+            topics = ",".join(selected_topics) if selected_topics else None
+            try:
+                # Só as notícias posteriores à última recebida para esta consulta
+                with st.spinner("Loading news..."):
+                    added = news_store.poll(api, tickers=tickers, topics=topics)
+                if added:
+                    st.caption(f"📥 {added} new articles stored")
+            except Exception as e:
+                st.error(f"❌ Error loading news: {str(e)}")
+            st.session_state.news_query = {'tickers': tickers, 'topics': topics}
+
+    # Exibe notícias do armazém local para a consulta atual
+    query = st.session_state.news_query
+    stats = news_summary(news_store.version(), **query) if query is not None else None
+    if stats and stats['count']:
+        st.success(f"✅ {stats['count']} stored news articles match ({len(news_store)} in the local store)")
+
+        # Estatísticas gerais (uma única consulta agregada)
+        col1, col2, col3, col4 = st.columns(4)
+
+        if stats['average'] is not None:
+            with col1:
+                st.metric("Average Sentiment", f"{stats['average']:.3f}",
+                         delta=sentiment_to_emoji(stats['average']))
+            with col2:
+                st.metric("Positive News", stats['positive'],
+                         delta="😊")
+            with col3:
+                st.metric("Neutral News", stats['neutral'],
+                         delta="😐")
+            with col4:
+                st.metric("Negative News", stats['negative'],
+                         delta="😢")
+
+        # Sentimento diário por ticker (todas as notícias armazenadas) contra os retornos
+        with st.expander("📈 Ticker Sentiment vs Price"):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                watchlist_input = st.text_input(
+                    "Watchlist",
+                    value=query['tickers'] or "AAPL,MSFT,GOOGL",
+                    key="news_watchlist"
+                )
+            with col2:
+                periods = {"Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All stored news": None}
+                period = st.selectbox("Period", list(periods), index=1, key="news_sentiment_period")
+
+            watchlist = list(dict.fromkeys(t.strip().upper() for t in watchlist_input.split(',') if t.strip()))
+            since = None if periods[period] is None else pd.Timestamp.now().normalize() - pd.Timedelta(days=periods[period])
+            daily, joined = get_sentiment_engine().watchlist(watchlist, since)
+
+            if daily.empty:
+                st.info("No stored ticker sentiment for this watchlist yet - search news for these tickers first")
+            else:
+                fig = go.Figure()
+                for ticker, rows in daily.groupby('ticker'):
+                    fig.add_trace(go.Scatter(x=rows['date'], y=rows['sentiment'], name=ticker,
+                                             mode='lines+markers', customdata=rows['articles'],
+                                             hovertemplate="%{y:.3f} (%{customdata} mentions)"))
+                fig.add_hline(y=0.15, line_dash="dot", line_color="green")
+                fig.add_hline(y=-0.15, line_dash="dot", line_color="red")
+                fig.update_layout(title='Daily Relevance-Weighted Sentiment', yaxis_title='Sentiment',
+                                  height=400, hovermode='x unified')
+                st.plotly_chart(fig, use_container_width=True)
+
+                price_coverage(watchlist, key="news_sentiment_download")
+                if not joined.empty:
+                    ticker = st.selectbox("Compare with price", sorted(joined['ticker'].unique()),
+                                          key="news_sentiment_ticker")
+                    rows = joined[joined['ticker'] == ticker]
+
+                    fig = make_subplots(specs=[[{"secondary_y": True}]])
+                    fig.add_trace(go.Bar(
+                        x=rows['date'], y=rows['sentiment'], name='Sentiment',
+                        marker_color=['green' if v > 0.15 else 'red' if v < -0.15 else 'gray' for v in rows['sentiment']]
+                    ), secondary_y=False)
+                    fig.add_trace(go.Scatter(x=rows['date'], y=rows['return'] * 100, name='Same-day return (%)',
+                                             mode='markers'), secondary_y=True)
+                    fig.update_layout(title=f'{ticker}: Sentiment vs Daily Return', height=400, hovermode='x unified')
+                    fig.update_yaxes(title_text="Sentiment", secondary_y=False)
+                    fig.update_yaxes(title_text="Return (%)", secondary_y=True)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    table = sentiment_correlation(joined).round(3).reset_index()
+                    table.columns = ['Ticker', 'News Days', 'Avg Sentiment', 'Corr (same day)', 'Corr (next day)']
+                    st.dataframe(table, hide_index=True, use_container_width=True)
+                    st.caption("News days are matched to the first trading session on or after the publication date.")
+
+        st.divider()
+
+        # Filtros adicionais (aplicados na consulta ao armazém)
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            search_text = st.text_input(
+                "Search in title and summary",
+                help="All words must appear; end a word with * to match prefixes (e.g. merg*)",
+                key="news_text"
+            )
+        with col2:
+            sentiment_filter = st.selectbox(
+                "Filter by Sentiment",
+                options=["All", "Positive", "Neutral", "Negative"],
+                key="news_sentiment_filter"
+            )
+        with col3:
+            sort_by = st.selectbox(
+                "Sort by",
+                options=["Most Recent", "Most Relevant", "Sentiment (High to Low)", "Sentiment (Low to High)"],
+                key="news_sort"
+            )
+
+        sorts = {"Most Recent": 'recent', "Most Relevant": 'relevance',
+                 "Sentiment (High to Low)": 'sentiment_desc', "Sentiment (Low to High)": 'sentiment_asc'}
+        filters = dict(
+            query,
+            text=search_text.strip(),
+            sentiment=None if sentiment_filter == "All" else sentiment_filter.lower(),
+            sort=sorts[sort_by]
+        )
+        found = search_news(news_store.version(), **filters)
+
+        # Volta para a primeira página quando os filtros mudam
+        page_key = (tuple(sorted(filters.items())), page_size)
+        if st.session_state.get('news_page_key') != page_key:
+            st.session_state.news_page_key = page_key
+            st.session_state.news_page = 1
+
+        pages = max(1, -(-len(found) // page_size))
+        if pages > 1:
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                st.number_input("Page", min_value=1, max_value=pages, step=1, key="news_page")
+            with col2:
+                st.write("")
+                st.write("")
+                st.caption(f"of {pages}")
+        page = min(st.session_state.get('news_page', 1), pages)
+        first = (page - 1) * page_size
+
+        # Só os artigos da página são lidos e desenhados
+        page_rows = found.iloc[first:first + page_size]
+        filtered_news = news_store.articles(page_rows['id'], query['tickers'])
+
+        st.write(f"Showing {first + 1 if len(found) else 0}-{first + len(filtered_news)} of {len(found)} articles")
+
+        # Exibe notícias
+        for idx, article in enumerate(filtered_news, start=first):
+            sentiment_score = float(article.get('overall_sentiment_score') or 0)
+            sentiment_label = article.get('overall_sentiment_label') or 'Neutral'
+
+            with st.container():
+                col1, col2 = st.columns([4, 1])
+
+                with col1:
+                    st.subheader(f"{idx+1}. {article.get('title') or 'No title'}")
+
+                    # Metadata
+                    time_published = article.get('time_published', '')
+                    if time_published:
+                        try:
+                            dt = datetime.strptime(time_published, '%Y%m%dT%H%M%S')
+                            time_str = dt.strftime('%Y-%m-%d %H:%M')
+                        except:
+                            time_str = time_published
+                    else:
+                        time_str = "Unknown"
+
+                    source = article.get('source') or 'Unknown'
+                    authors = article.get('authors', [])
+                    author_str = ", ".join(authors) if authors else "Unknown"
+
+                    st.caption(f"📅 {time_str} | 📰 {source} | ✍️ {author_str}")
+
+                    # Summary
+                    summary = article.get('summary') or 'No summary available'
+                    st.write(summary[:300] + "..." if len(summary) > 300 else summary)
+
+                    # Tickers mencionados (mais relevantes primeiro)
+                    ticker_sentiment = article.get('ticker_sentiment', [])
+                    if ticker_sentiment:
+                        ticker_tags = []
+                        for ts in ticker_sentiment[:5]:  # Mostra até 5 tickers
+                            ticker = ts.get('ticker', '')
+                            relevance = float(ts.get('relevance_score') or 0)
+                            ticker_tags.append(f"`{ticker}` ({relevance:.2f})")
+                        st.markdown("**Tickers:** " + " ".join(ticker_tags))
+
+                    # Link
+                    url = article.get('url', '')
+                    if url:
+                        st.markdown(f"[🔗 Read full article]({url})")
+
+                with col2:
+                    # Sentiment badge
+                    sentiment_emoji = sentiment_to_emoji(sentiment_score)
+                    sentiment_color = sentiment_to_color(sentiment_score)
+
+                    st.markdown(f"""
+                    <div style='text-align: center; padding: 20px; background-color: {sentiment_color}; border-radius: 10px; color: white;'>
+                        <h1>{sentiment_emoji}</h1>
+                        <h3>{sentiment_label}</h3>
+                        <p style='font-size: 20px; margin: 0;'>{sentiment_score:.3f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    # Relevância: maior entre os tickers da consulta
+                    relevance = article['relevance']
+                    st.metric("Relevance", "N/A" if relevance is None else f"{relevance:.2f}")
+
+                st.divider()
+
+    elif query is not None:
+        st.warning("No news found for the selected filters")
+
+    else:
+        st.info("👆 Configure filters above and click 'Search News'")
+
+        # Exemplo de uso
+        with st.expander("ℹ️ How to use"):
+            st.markdown("""
+            ### News &amp; Sentiment Analysis
+
+            This page uses Alpha Vantage's News Sentiment API to provide:
+
+            1. **Real-time market news** from multiple sources
+            2. **Sentiment analysis** for each article
+            3. **Ticker-specific sentiment** scores
+            4. **Topic filtering** (technology, earnings, IPO, etc.)
+
+            #### Sentiment Score Guide:
+            - **> 0.35**: Very Positive 😊
+            - **0.15 to 0.35**: Positive 🙂
+            - **-0.15 to 0.15**: Neutral 😐
+            - **-0.35 to -0.15**: Negative 😟
+            - **< -0.35**: Very Negative 😢
+
+            #### Tips:
+            - Enter multiple tickers separated by commas (e.g., AAPL,MSFT,GOOGL)
+            - Select relevant topics to narrow down results
+            - Use filters to find positive/negative news quickly
+            - Check relevance scores to find most important articles
+            """)
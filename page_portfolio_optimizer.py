@@ -0,0 +1,149 @@
+# page_portfolio_optimizer.py
+"""
+Otimizador de carteiras: fronteira eficiente, máximo Sharpe e paridade de risco
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from app_common import get_covariance_engine, price_coverage
+from config import ETF_UNIVERSE
+from etf_list import list_universes, load_universe
+from portfolio_optimizer import PortfolioOptimizer, category_membership
+
+# Otimizador de carteiras por estimador (resultados em cache até o painel mudar)
+@st.cache_resource
+def get_portfolio_optimizer(method):
+    return PortfolioOptimizer(get_covariance_engine(), method)
+
+
+def render():
+    st.title("⚖️ Portfolio Optimizer")
+
+    st.markdown("""
+    Long-only allocations computed from the local price history (last 3 years of daily returns).
+    Expected returns are historical averages — treat the results as a starting point, not a forecast.
+    """)
+
+    universes = list_universes()
+    universe_name = st.selectbox(
+        "ETF Universe",
+        options=universes,
+        index=universes.index(ETF_UNIVERSE) if ETF_UNIVERSE in universes else 0,
+        key="opt_universe"
+    )
+    opt_symbols = price_coverage(load_universe(universe_name), key="opt_download")
+
+    methods = {
+        "Shrinkage (Ledoit-Wolf)": 'shrinkage',
+        "Sample": 'sample',
+        "EWMA (λ = 0.94)": 'ewma'
+    }
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        method_label = st.selectbox("Covariance Estimator", list(methods), key="opt_method")
+    with col2:
+        risk_free = st.number_input("Risk-free Rate (%)", min_value=0.0, max_value=20.0, value=4.0, step=0.25,
+                                    key="opt_risk_free") / 100
+    with col3:
+        max_weight = st.slider("Max Weight per ETF (%)", min_value=5, max_value=100, value=25, step=5,
+                               key="opt_max_weight") / 100
+
+    category_names, _ = category_membership(opt_symbols)
+    with st.expander("🗂️ Category Limits"):
+        st.caption("Minimum and maximum total weight of each category (applies to min-variance, max-Sharpe and the frontier)")
+        limits = st.data_editor(
+            pd.DataFrame({'Category': category_names, 'Min %': 0.0, 'Max %': 100.0}),
+            disabled=['Category'],
+            hide_index=True,
+            use_container_width=True,
+            key=f"opt_limits_{universe_name}"
+        )
+    category_bounds = {
+        row['Category']: (row['Min %'] / 100, row['Max %'] / 100)
+        for _, row in limits.iterrows()
+        if row['Min %'] > 0 or row['Max %'] < 100
+    }
+
+    if len(opt_symbols) < 2:
+        st.info("👆 At least two symbols with local price history are needed")
+    else:
+        optimizer = get_portfolio_optimizer(methods[method_label])
+        constraints = dict(risk_free=risk_free, max_weight=max_weight, category_bounds=category_bounds)
+
+        try:
+            frontier = optimizer.frontier(opt_symbols, **constraints)
+            portfolios = {
+                "Maximum Sharpe": optimizer.max_sharpe(opt_symbols, **constraints),
+                "Minimum Variance": optimizer.min_variance(opt_symbols, **constraints),
+                "Risk Parity": optimizer.risk_parity(opt_symbols, risk_free=risk_free),
+                "Risk Parity (equal per category)": optimizer.risk_parity(opt_symbols, by_category=True, risk_free=risk_free),
+            }
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+            st.stop()
+
+        used, mu, cov = optimizer.inputs(opt_symbols)
+        if len(used) < len(opt_symbols):
+            st.caption(f"⚠️ {len(opt_symbols) - len(used)} symbols excluded (not enough history in the window)")
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=frontier.volatility * 100, y=frontier.returns * 100, mode='lines', name='Efficient Frontier',
+            line=dict(color='#1f77b4', width=3),
+            hovertemplate='Volatility %{x:.2f}%<br>Return %{y:.2f}%<extra></extra>'
+        ))
+        fig.add_trace(go.Scatter(
+            x=np.sqrt(np.diag(cov)) * 100, y=mu * 100, mode='markers+text', name='ETFs', text=used,
+            textposition='top center', marker=dict(size=7, color='lightgray'),
+            hovertemplate='%{text}<br>Volatility %{x:.2f}%<br>Return %{y:.2f}%<extra></extra>'
+        ))
+        markers = {"Maximum Sharpe": ('star', 'gold'), "Minimum Variance": ('diamond', 'green'),
+                   "Risk Parity": ('square', 'purple'), "Risk Parity (equal per category)": ('square-open', 'purple')}
+        for name, portfolio in portfolios.items():
+            symbol, color = markers[name]
+            fig.add_trace(go.Scatter(
+                x=[portfolio.volatility * 100], y=[portfolio.expected_return * 100], mode='markers', name=name,
+                marker=dict(symbol=symbol, size=16, color=color, line=dict(width=1, color='black'))
+            ))
+        fig.update_layout(
+            title='Efficient Frontier (annualized)',
+            xaxis_title='Volatility (%)',
+            yaxis_title='Expected Return (%)',
+            height=550,
+            hovermode='closest'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("📋 Allocation")
+        choice = st.radio("Portfolio", list(portfolios) + ["Frontier point"], horizontal=True, key="opt_portfolio")
+        if choice == "Frontier point":
+            point = st.slider("Frontier point (lowest → highest return)", 1, len(frontier), len(frontier) // 2,
+                              key="opt_point")
+            selected = frontier.portfolio(point - 1)
+        else:
+            selected = portfolios[choice]
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Expected Return", f"{selected.expected_return * 100:.2f}%")
+        col2.metric("Volatility", f"{selected.volatility * 100:.2f}%")
+        col3.metric("Sharpe Ratio", f"{selected.sharpe:.2f}")
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            table = selected.to_frame()
+            table['weight'] = table['weight'] * 100
+            table['risk_contribution'] = table['risk_contribution'] * 100
+            st.dataframe(
+                table.rename(columns={'symbol': 'Symbol', 'category': 'Category', 'weight': 'Weight (%)',
+                                      'risk_contribution': 'Risk Contribution (%)'}).round(2),
+                use_container_width=True,
+                hide_index=True
+            )
+        with col2:
+            by_category = selected.by_category()
+            fig = go.Figure(data=[go.Pie(labels=by_category.index, values=by_category['weight'], hole=0.4)])
+            fig.update_layout(title='Weight by Category', height=400)
+            st.plotly_chart(fig, use_container_width=True)
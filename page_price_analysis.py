@@ -0,0 +1,457 @@
+# page_price_analysis.py
+"""
+Análise de preços: histórico diário, barras intraday, estatísticas e beta móveis
+"""
+from datetime import datetime, timedelta
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from app_common import api, get_price_store, load_daily_prices, store_daily_prices
+from app_session import hold, held
+from chart_downsampling import aggregate_ohlc, figure_stats, line_trace
+from config import INTRADAY_INTERVALS, WEBGL_POINT_THRESHOLD
+from intraday_buffer import IntradayBuffers, market_open
+from rolling_beta import BENCHMARK, BetaEngine, WINDOWS as BETA_WINDOWS
+from rolling_stats import RETURN_HORIZONS, RollingStats
+
+# Barras intraday recentes em memória (as antigas vão para o price store)
+@st.cache_resource
+def get_intraday_buffers():
+    return IntradayBuffers(get_price_store())
+
+# Busca as barras intraday de um símbolo (a resposta fica em cache até a próxima barra)
+def load_intraday_prices(symbol, interval):
+    buffers = get_intraday_buffers()
+
+    # Últimos 30 dias só quando não há nada local; depois bastam as últimas 100 barras,
+    # a não ser que elas não alcancem a última barra local (as do meio se perderiam)
+    local = buffers.last(symbol, interval)
+    data = api.get_time_series_intraday(symbol, interval, 'compact' if local is not None else 'full')
+    if local is not None and buffers.leaves_gap(symbol, interval, data):
+        data = api.get_time_series_intraday(symbol, interval, 'full')
+
+    if f"Time Series ({interval})" not in data:
+        raise Exception(data.get('Information') or data.get('Error Message') or f"No intraday data available for {symbol}")
+
+    return buffers.update(symbol, interval, data)
+
+# Gráfico intraday: roda como fragment (só ele é refeito a cada barra) e lê do
+# buffer apenas as barras a partir da última já exibida. A janela exibida fica no
+# PayloadStore (sessões no mesmo ponto compartilham o DataFrame) e a sessão guarda só a chave
+def intraday_chart(symbol, interval):
+    try:
+        load_intraday_prices(symbol, interval)
+    except Exception as e:
+        st.warning(f"⚠️ {str(e)}")
+
+    buffers = get_intraday_buffers()
+    slot = f"intraday_view_{symbol}_{interval}"
+    view = held(slot)
+    if view is None or not len(view):
+        view = buffers.since(symbol, interval)
+    else:
+        # A última barra exibida pode ter mudado (candle em formação): relê a partir dela
+        fresh = buffers.since(symbol, interval, view.index[-1])
+        if len(fresh):
+            view = pd.concat([view.iloc[:-1], fresh]).iloc[-buffers.capacity:]
+    if len(view):
+        # Barras fechadas não mudam: o intervalo e a última barra identificam o conteúdo
+        key = ('intraday_view', symbol, interval, view.index[0], view.index[-1], tuple(view.iloc[-1].tolist()))
+        view = hold(slot, key, view)
+
+    if not len(view):
+        st.info(f"💡 No intraday bars for {symbol} yet")
+        return
+
+    fig = go.Figure(data=[go.Candlestick(x=view.index, open=view['Open'], high=view['High'],
+                                         low=view['Low'], close=view['Close'], name=symbol)])
+    fig.update_layout(title=f'{symbol} {interval} Bars', yaxis_title='Price (USD)', xaxis_title='Time (US/Eastern)',
+                      height=400, xaxis_rangeslider_visible=False)
+    st.plotly_chart(fig, use_container_width=True)
+
+    stored = get_price_store().length(symbol, interval)
+    st.caption(f"Last {len(view)} bars in memory (through {view.index[-1]:%Y-%m-%d %H:%M}); "
+               f"{stored} older bars in the local store. Updated {datetime.now():%H:%M:%S}.")
+
+# Estatísticas móveis por símbolo (cache por versão da série no price store)
+@st.cache_resource
+def get_rolling_stats():
+    return RollingStats(get_price_store())
+
+# Beta/correlação/alfa móveis contra um benchmark (cache por versão das séries)
+@st.cache_resource
+def get_beta_engine(benchmark):
+    return BetaEngine(get_price_store(), benchmark)
+
+
+def render():
+    st.title("💹 Price Analysis")
+
+    # Inicializa session state
+    if 'price_data' not in st.session_state:
+        st.session_state.price_data = None
+    if 'price_symbol_searched' not in st.session_state:
+        st.session_state.price_symbol_searched = None
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+
+    with col1:
+        symbol_input = st.text_input("Enter Symbol", value="AAPL", key="price_symbol_input")
+
+    with col2:
+        outputsize = st.selectbox("Data Range", ["compact", "full"], key="price_range_select")
+
+    with col3:
+        benchmark = st.text_input("Benchmark", value=BENCHMARK, key="price_benchmark").strip().upper() or BENCHMARK
+
+    with col4:
+        st.write("")
+        st.write("")
+        if st.button("📈 Analyze", key="price_analyze_btn"):
+            if symbol_input:
+                try:
+                    with st.spinner(f"Loading price data for {symbol_input}..."):
+                        data = api.get_time_series_daily(symbol_input, outputsize)
+
+                        # Verifica se há dados válidos
+                        if 'Time Series (Daily)' in data:
+                            store_daily_prices(symbol_input, data)
+                            st.session_state.price_data = {'symbol': symbol_input.upper(), 'outputsize': outputsize}
+                            st.session_state.price_symbol_searched = symbol_input.upper()
+                        elif 'Information' in data:
+                            st.error(f"⚠️ API Message: {data['Information']}")
+                            st.info("💡 This usually means rate limit reached. Please wait 1 minute and try again.")
+                            st.session_state.price_data = None
+                        elif 'Error Message' in data:
+                            st.error(f"❌ {data['Error Message']}")
+                            st.session_state.price_data = None
+                        elif 'Note' in data:
+                            st.error(f"⚠️ Rate limit reached. Please wait 1 minute and try again.")
+                            st.session_state.price_data = None
+                        else:
+                            st.error(f"❌ Unexpected API response. Keys received: {list(data.keys())}")
+                            st.session_state.price_data = None
+
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+                    st.session_state.price_data = None
+            else:
+                st.warning("⚠️ Please enter a symbol")
+
+    # Exibe dados se existirem
+    if st.session_state.price_data is not None:
+        price_request = st.session_state.price_data
+        series = get_price_store().read(price_request['symbol'])
+
+        if series is not None:
+            symbol_display = st.session_state.price_symbol_searched
+
+            try:
+                # 'compact' mostra as últimas 100 barras, como a API
+                if price_request['outputsize'] == 'compact':
+                    series = series[-100:]
+
+                df = series.to_frame()
+
+                # Verifica se há dados suficientes
+                if len(df) < 2:
+                    st.error("❌ Insufficient data for analysis")
+                else:
+                    # Métricas (estatísticas móveis pré-calculadas sobre todo o histórico do store)
+                    stats = get_rolling_stats().get(price_request['symbol'])
+                    latest = stats.iloc[-1]
+
+                    # Beta contra o benchmark (baixa o histórico do benchmark na primeira vez)
+                    failed_benchmarks = st.session_state.setdefault('price_benchmark_failed', set())
+                    if benchmark not in get_price_store() and benchmark not in failed_benchmarks:
+                        try:
+                            with st.spinner(f"Loading benchmark {benchmark}..."):
+                                load_daily_prices(benchmark)
+                        except Exception as e:
+                            failed_benchmarks.add(benchmark)
+                            st.warning(f"⚠️ Benchmark {benchmark} unavailable: {str(e)}")
+                    beta = get_beta_engine(benchmark).get(price_request['symbol'])
+                    beta_latest = beta.iloc[-1] if beta is not None and len(beta) else None
+
+                    current_price = df['Close'].iloc[-1]
+                    prev_price = df['Close'].iloc[-2]
+                    change = current_price - prev_price
+                    change_pct = (change / prev_price) * 100
+
+                    col1, col2, col3, col4 = st.columns(4)
+
+                    with col1:
+                        st.metric("Current Price", f"${current_price:.2f}", f"{change:.2f} ({change_pct:.2f}%)")
+                    with col2:
+                        st.metric("High (52w)", f"${latest['high_52w']:.2f}")
+                    with col3:
+                        st.metric("Low (52w)", f"${latest['low_52w']:.2f}")
+                    with col4:
+                        st.metric("Avg Volume", f"{latest['avg_volume']/1e6:.2f}M")
+
+                    # Gráfico de preços (reduzido à resolução do gráfico antes de enviar ao navegador)
+                    st.subheader(f"📊 {symbol_display} Price Chart")
+
+                    col1, col2 = st.columns([1, 3])
+                    with col1:
+                        chart_type = st.radio("Chart Type", ["Candlestick", "Line"], horizontal=True, key="price_chart_type")
+                    with col2:
+                        first_date, last_date = df.index[0].to_pydatetime(), df.index[-1].to_pydatetime()
+                        view_start, view_end = st.slider(
+                            "Visible Range",
+                            min_value=first_date,
+                            max_value=last_date,
+                            value=(first_date, last_date),
+                            format="YYYY-MM-DD",
+                            key=f"price_view_{symbol_display}_{price_request['outputsize']}"
+                        )
+
+                    view_df = df.loc[view_start:view_end]
+                    if len(view_df) < 2:
+                        view_df = df
+                    candles, bars_per_candle = aggregate_ohlc(view_df)
+
+                    fig = go.Figure()
+                    if chart_type == "Candlestick":
+                        fig.add_trace(go.Candlestick(
+                            x=candles.index,
+                            open=candles['Open'],
+                            high=candles['High'],
+                            low=candles['Low'],
+                            close=candles['Close'],
+                            name=symbol_display
+                        ))
+                    else:
+                        fig.add_trace(line_trace(
+                            view_df.index,
+                            view_df['Close'],
+                            mode='lines',
+                            name=symbol_display,
+                            line=dict(color='#1f77b4', width=1.5)
+                        ))
+
+                    fig.update_layout(
+                        title=f'{symbol_display} Price Chart',
+                        yaxis_title='Price (USD)',
+                        xaxis_title='Date',
+                        height=500,
+                        xaxis_rangeslider_visible=False
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    if chart_type == "Candlestick" and bars_per_candle > 1:
+                        st.caption(f"Each candle aggregates {bars_per_candle} trading days. Narrow the visible range for daily candles.")
+
+                    # Volume (mesmos grupos dos candles)
+                    st.subheader("📊 Trading Volume")
+
+                    fig_vol = go.Figure(data=[go.Bar(
+                        x=candles.index,
+                        y=candles['Volume'],
+                        marker_color='lightblue',
+                        name='Volume'
+                    )])
+
+                    fig_vol.update_layout(
+                        title='Trading Volume' if bars_per_candle == 1 else f'Trading Volume ({bars_per_candle}-day totals)',
+                        yaxis_title='Volume',
+                        xaxis_title='Date',
+                        height=300
+                    )
+
+                    st.plotly_chart(fig_vol, use_container_width=True)
+
+                    with st.expander("⚙️ Chart Performance"):
+                        reduced = [figure_stats(fig), figure_stats(fig_vol)]
+                        rows = [{
+                            'Chart': 'Reduced',
+                            'Points': sum(x['points'] for x in reduced),
+                            'Payload (KB)': sum(x['bytes'] for x in reduced) / 1024,
+                            'Serialize (ms)': sum(x['serialize_ms'] for x in reduced)
+                        }]
+
+                        # Figuras sem redução, só para comparação
+                        if st.checkbox("Compare with full resolution", key="price_compare_full"):
+                            if chart_type == "Candlestick":
+                                full_trace = go.Candlestick(x=view_df.index, open=view_df['Open'], high=view_df['High'],
+                                                            low=view_df['Low'], close=view_df['Close'])
+                            else:
+                                full_trace = go.Scatter(x=view_df.index, y=view_df['Close'], mode='lines')
+                            full = [figure_stats(go.Figure(data=[full_trace], layout=fig.layout)),
+                                    figure_stats(go.Figure(data=[go.Bar(x=view_df.index, y=view_df['Volume'])], layout=fig_vol.layout))]
+                            rows.append({
+                                'Chart': 'Full resolution',
+                                'Points': sum(x['points'] for x in full),
+                                'Payload (KB)': sum(x['bytes'] for x in full) / 1024,
+                                'Serialize (ms)': sum(x['serialize_ms'] for x in full)
+                            })
+
+                        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                        st.caption(f"Line charts switch to WebGL above {WEBGL_POINT_THRESHOLD} points.")
+
+                    # Barras intraday (atualização ao vivo durante o pregão)
+                    st.subheader("⏱️ Intraday")
+
+                    col1, col2 = st.columns([1, 3])
+                    with col1:
+                        intraday_interval = st.selectbox("Interval", list(INTRADAY_INTERVALS), index=1, key="price_intraday_interval")
+                    with col2:
+                        st.write("")
+                        show_intraday = st.toggle("Show intraday bars (refreshes every bar while the market is open)",
+                                                  key="price_intraday_show")
+
+                    if show_intraday:
+                        live = market_open()
+                        run_every = timedelta(minutes=INTRADAY_INTERVALS[intraday_interval]) if live else None
+                        st.fragment(intraday_chart, run_every=run_every)(price_request['symbol'], intraday_interval)
+                        if not live:
+                            st.caption("Market closed: live updates resume at the next regular session.")
+
+                    # Estatísticas adicionais
+                    st.subheader("📊 Price Statistics")
+
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.markdown("**Recent Performance:**")
+
+                        for label, column in [("5 Day Return", 'return_5d'), ("1 Month Return", 'return_1m'),
+                                              ("3 Month Return", 'return_3m')]:
+                            if pd.notna(latest[column]):
+                                st.metric(label, f"{latest[column] * 100:.2f}%")
+
+                    with col2:
+                        st.markdown("**Volatility:**")
+                        if pd.notna(latest['volatility']):
+                            st.metric("20-Day Volatility (Annualized)", f"{latest['volatility'] * 100:.2f}%")
+
+                        st.metric("Avg Daily Range", f"{latest['avg_range'] * 100:.2f}%")
+
+                        # Beta e correlação de 1 ano contra o benchmark
+                        if beta_latest is not None and pd.notna(beta_latest['beta_1y']):
+                            st.metric(f"Beta vs {benchmark} (1Y)", f"{beta_latest['beta_1y']:.2f}")
+                            st.metric(f"Correlation vs {benchmark} (1Y)", f"{beta_latest['corr_1y']:.2f}")
+
+                    # Estatísticas ao longo do tempo (mesmo intervalo visível do gráfico de preços)
+                    st.subheader("📉 Rolling Statistics")
+
+                    view_stats = stats.loc[view_df.index[0]:view_df.index[-1]]
+                    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🌊 Drawdown", "📈 Volatility", "📏 52-Week Range", "🔁 Returns",
+                                                            f"📐 Beta vs {benchmark}"])
+
+                    with tab1:
+                        fig_dd = go.Figure()
+                        fig_dd.add_trace(line_trace(view_stats.index, view_stats['drawdown'] * 100, mode='lines',
+                                                    name='Drawdown', fill='tozeroy', line=dict(color='crimson', width=1)))
+                        fig_dd.update_layout(title='Underwater Curve (% below previous peak)', yaxis_title='Drawdown (%)',
+                                             xaxis_title='Date', height=350)
+                        st.plotly_chart(fig_dd, use_container_width=True)
+                        st.caption(f"Max drawdown in stored history: {latest['max_drawdown'] * 100:.2f}%")
+
+                    with tab2:
+                        fig_vol20 = go.Figure()
+                        fig_vol20.add_trace(line_trace(view_stats.index, view_stats['volatility'] * 100, mode='lines',
+                                                       name='20-Day Volatility', line=dict(color='darkorange', width=1.5)))
+                        fig_vol20.add_trace(line_trace(view_stats.index, view_stats['avg_range'] * 100, mode='lines',
+                                                       name='Avg Daily Range', line=dict(color='gray', width=1), yaxis='y2'))
+                        fig_vol20.update_layout(title='Annualized 20-Day Volatility', yaxis_title='Volatility (%)',
+                                                yaxis2=dict(title='Avg Daily Range (%)', overlaying='y', side='right'),
+                                                xaxis_title='Date', height=350)
+                        st.plotly_chart(fig_vol20, use_container_width=True)
+
+                    with tab3:
+                        fig_range = go.Figure()
+                        for column, name, color in [('high_52w', 'High (52w)', 'green'), ('low_52w', 'Low (52w)', 'red')]:
+                            fig_range.add_trace(line_trace(view_stats.index, view_stats[column], mode='lines', name=name,
+                                                           line=dict(color=color, width=1, dash='dot')))
+                        fig_range.add_trace(line_trace(view_df.index, view_df['Close'], mode='lines', name='Close',
+                                                       line=dict(color='#1f77b4', width=1.5)))
+                        fig_range.update_layout(title='52-Week High / Low', yaxis_title='Price (USD)', xaxis_title='Date', height=350)
+                        st.plotly_chart(fig_range, use_container_width=True)
+
+                    with tab4:
+                        horizon = st.radio("Horizon", list(RETURN_HORIZONS), index=2, horizontal=True, key="price_return_horizon")
+                        fig_ret = go.Figure()
+                        fig_ret.add_trace(line_trace(view_stats.index, view_stats[f"return_{horizon}"] * 100, mode='lines',
+                                                     name=f'{horizon} Return', line=dict(color='purple', width=1)))
+                        fig_ret.add_hline(y=0, line_color='gray', line_width=1)
+                        fig_ret.update_layout(title=f'Rolling {horizon} Return', yaxis_title='Return (%)', xaxis_title='Date', height=350)
+                        st.plotly_chart(fig_ret, use_container_width=True)
+
+                    with tab5:
+                        if beta is None:
+                            st.info(f"💡 Beta needs local price history for both {price_request['symbol']} and {benchmark}")
+                        else:
+                            statistics = {"Beta": ('beta', 1), "Correlation": ('corr', 1), "Alpha (annualized %)": ('alpha', 100)}
+                            statistic = st.radio("Statistic", list(statistics), horizontal=True, key="price_beta_stat")
+                            column, scale = statistics[statistic]
+
+                            view_beta = beta.loc[view_df.index[0]:view_df.index[-1]]
+                            fig_beta = go.Figure()
+                            for (name, window), color in zip(BETA_WINDOWS.items(), ['lightsalmon', 'darkorange', 'darkred']):
+                                fig_beta.add_trace(line_trace(view_beta.index, view_beta[f"{column}_{name}"] * scale, mode='lines',
+                                                              name=f'{name} ({window} days)', line=dict(color=color, width=1.5)))
+                            if column == 'beta':
+                                fig_beta.add_hline(y=1, line_dash='dash', line_color='gray', line_width=1)
+                            else:
+                                fig_beta.add_hline(y=0, line_color='gray', line_width=1)
+                            fig_beta.update_layout(title=f'Rolling {statistic} vs {benchmark}', yaxis_title=statistic,
+                                                   xaxis_title='Date', height=350)
+                            st.plotly_chart(fig_beta, use_container_width=True)
+
+                            if beta_latest is not None:
+                                st.dataframe(pd.DataFrame({
+                                    'Window': [f'{name} ({window} days)' for name, window in BETA_WINDOWS.items()],
+                                    'Beta': [beta_latest[f'beta_{name}'] for name in BETA_WINDOWS],
+                                    'Correlation': [beta_latest[f'corr_{name}'] for name in BETA_WINDOWS],
+                                    'Alpha (%)': [beta_latest[f'alpha_{name}'] * 100 for name in BETA_WINDOWS],
+                                }).round(3), use_container_width=True, hide_index=True)
+                                st.caption(f"Latest values as of {beta.index[-1]:%Y-%m-%d}. Alpha is Jensen's alpha without a risk-free rate: "
+                                           "average return minus beta times the benchmark average, annualized.")
+
+                    # Tabela de dados recentes
+                    with st.expander("📋 Recent Price Data"):
+                        recent_df = df.tail(10).copy()
+                        recent_df = recent_df.sort_index(ascending=False)
+                        recent_df['Date'] = recent_df.index.strftime('%Y-%m-%d')
+                        recent_df = recent_df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
+                        recent_df['Volume'] = recent_df['Volume'].apply(lambda x: f"{x/1e6:.2f}M")
+
+                        for col in ['Open', 'High', 'Low', 'Close']:
+                            recent_df[col] = recent_df[col].apply(lambda x: f"${x:.2f}")
+
+                        st.dataframe(recent_df, use_container_width=True, hide_index=True)
+
+            except Exception as e:
+                st.error(f"❌ Error processing data: {str(e)}")
+                st.info("💡 Please try again or contact support if the issue persists")
+        else:
+            st.error(f"❌ No price data available")
+    else:
+        st.info("👆 Enter a stock or ETF symbol and click 'Analyze' to view price data")
+
+        with st.expander("💡 Examples"):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("""
+                **Popular Stocks:**
+                - AAPL (Apple)
+                - MSFT (Microsoft)
+                - GOOGL (Google)
+                - TSLA (Tesla)
+                - AMZN (Amazon)
+                """)
+
+            with col2:
+                st.markdown("""
+                **Popular ETFs:**
+                - SPY (S&P 500)
+                - QQQ (Nasdaq 100)
+                - VTI (Total Market)
+                - IWM (Small Cap)
+                - XLK (Technology)
+                """)
@@ -0,0 +1,338 @@
+# page_symbol_search.py
+"""
+Busca de símbolos e dos ETFs que contêm uma ação
+"""
+import streamlit as st
+import pandas as pd
+
+from app_common import api, get_price_store, store_daily_prices
+from config import ETF_UNIVERSE
+from etf_list import ETF_CATEGORIES, OPTIMIZED_ETFS, list_universes, load_universe
+from utils import safe_float
+
+
+def render():
+    st.title("🔎 ETF Finder")
+
+    st.markdown("""
+    Find which major ETFs hold a specific stock and see their details.
+    By default it searches **50 optimized ETFs** (no redundancies like SPY/VOO/IVV).
+    """)
+
+    # Universo de ETFs (universos maiores podem ser pré-carregados com etf_crawler.py)
+    universes = list_universes()
+    universe_name = st.selectbox(
+        "ETF Universe",
+        options=universes,
+        index=universes.index(ETF_UNIVERSE) if ETF_UNIVERSE in universes else 0,
+        key="etf_finder_universe"
+    )
+    etf_universe = load_universe(universe_name)
+
+    # Inicializa session state
+    if 'etf_finder_results' not in st.session_state:
+        st.session_state.etf_finder_results = None
+    if 'etf_finder_prices' not in st.session_state:
+        st.session_state.etf_finder_prices = {}
+    if 'etf_finder_searching' not in st.session_state:
+        st.session_state.etf_finder_searching = False
+
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        stock_symbol = st.text_input(
+            "Enter Stock Symbol", 
+            value="AAPL", 
+            key="etf_finder_symbol",
+            help="Enter a stock symbol to find which ETFs hold it"
+        )
+
+    with col2:
+        st.write("")
+        st.write("")
+        if st.button("🔍 Find ETFs", key="etf_finder_search"):
+            if stock_symbol:
+                st.session_state.etf_finder_searching = True
+                try:
+                    # Aviso sobre o tempo
+                    st.info(f"⏳ Searching {stock_symbol.upper()} in {len(etf_universe)} ETFs... Uncached profiles are limited by the API rate (5 requests/minute), up to ~{len(etf_universe) / 5:.0f} minutes.")
+
+                    progress_bar = st.progress(0)
+                    status_text = st.empty()
+                    results_counter = st.empty()
+
+                    # Busca nos ETFs otimizados
+                    results = []
+                    total_etfs = len(etf_universe)
+
+                    for idx, etf in enumerate(etf_universe):
+                        try:
+                            status_text.text(f"🔍 Searching in {etf}... ({idx+1}/{total_etfs})")
+                            progress_bar.progress((idx + 1) / total_etfs)
+
+                            data = api.get_etf_profile(etf)
+
+                            if 'holdings' in data and data['holdings']:
+                                for holding in data['holdings']:
+                                    if holding.get('symbol', '').upper() == stock_symbol.upper():
+                                        results.append({
+                                            'etf_symbol': etf,
+                                            'etf_name': data.get('name', 'N/A'),
+                                            'net_assets': data.get('net_assets', 0),
+                                            'expense_ratio': data.get('net_expense_ratio', 0),
+                                            'dividend_yield': data.get('dividend_yield', 0),
+                                            'description': data.get('description', 'N/A'),
+                                            'holding_weight': holding.get('weight', 0),
+                                            'holding_shares': holding.get('shares', 0)
+                                        })
+                                        results_counter.success(f"✅ Found in {len(results)} ETFs so far!")
+                                        break
+                        except Exception as e:
+                            continue
+
+                    progress_bar.empty()
+                    status_text.empty()
+                    results_counter.empty()
+
+                    st.session_state.etf_finder_results = results
+                    st.session_state.etf_finder_symbol = stock_symbol.upper()
+                    st.session_state.etf_finder_searching = False
+
+                    # Busca preços dos ETFs encontrados
+                    if results:
+                        with st.spinner("📊 Fetching current prices..."):
+                            st.session_state.etf_finder_prices = {}
+                            for result in results:
+                                try:
+                                    etf_sym = result['etf_symbol']
+                                    price_data = api.get_time_series_daily(etf_sym, outputsize='compact')
+                                    if 'Time Series (Daily)' in price_data:
+                                        store_daily_prices(etf_sym, price_data)
+                                        latest_price = float(get_price_store().read(etf_sym).close[-1])
+                                        st.session_state.etf_finder_prices[etf_sym] = latest_price
+                                except:
+                                    st.session_state.etf_finder_prices[etf_sym] = None
+
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+                    st.session_state.etf_finder_results = None
+                    st.session_state.etf_finder_searching = False
+            else:
+                st.warning("⚠️ Please enter a stock symbol")
+
+    # Exibe resultados se existirem
+    if st.session_state.etf_finder_results is not None and not st.session_state.etf_finder_searching:
+        results = st.session_state.etf_finder_results
+        stock_symbol = st.session_state.etf_finder_symbol
+
+        if len(results) > 0:
+            # Ordena por market cap (net assets)
+            results_sorted = sorted(results, key=lambda x: safe_float(x['net_assets'], 0), reverse=True)
+
+            # Pega os top 5
+            top_5 = results_sorted[:5]
+
+            st.success(f"✅ Found {len(results)} ETFs holding **{stock_symbol}**. Showing **Top 5 by Market Cap**:")
+
+            st.markdown("---")
+
+            # Exibe cada ETF dos Top 5
+            for idx, etf in enumerate(top_5, 1):
+                with st.container():
+                    # Cabeçalho com ranking
+                    col_rank, col_title = st.columns([1, 11])
+                    with col_rank:
+                        st.markdown(f"<h2 style='color: #1f77b4;'>#{idx}</h2>", unsafe_allow_html=True)
+                    with col_title:
+                        st.subheader(f"{etf['etf_symbol']} - {etf['etf_name']}")
+
+                    # Métricas principais
+                    col1, col2, col3, col4, col5 = st.columns(5)
+
+                    with col1:
+                        price = st.session_state.etf_finder_prices.get(etf['etf_symbol'])
+                        if price:
+                            st.metric("💵 Price", f"${price:.2f}")
+                        else:
+                            st.metric("💵 Price", "N/A")
+
+                    with col2:
+                        net_assets = safe_float(etf['net_assets'])
+                        if net_assets > 0:
+                            st.metric("💰 Market Cap", f"${net_assets/1e9:.2f}B")
+                        else:
+                            st.metric("💰 Market Cap", "N/A")
+
+                    with col3:
+                        div_yield = safe_float(etf['dividend_yield'])
+                        if div_yield > 0:
+                            st.metric("📊 Dividend Yield", f"{div_yield*100:.2f}%")
+                        else:
+                            st.metric("📊 Dividend Yield", "N/A")
+
+                    with col4:
+                        expense = safe_float(etf['expense_ratio'])
+                        if expense > 0:
+                            st.metric("💸 Expense Ratio", f"{expense*100:.2f}%")
+                        else:
+                            st.metric("💸 Expense Ratio", "N/A")
+
+                    with col5:
+                        weight = safe_float(etf['holding_weight'])
+                        if weight > 0:
+                            st.metric(f"📈 {stock_symbol} Weight", f"{weight*100:.2f}%")
+                        else:
+                            st.metric(f"📈 {stock_symbol} Weight", "N/A")
+
+                    # Descrição
+                    if etf['description'] and etf['description'] != 'N/A' and len(etf['description']) > 10:
+                        with st.expander("📄 ETF Description"):
+                            st.write(etf['description'])
+
+                    st.markdown("---")
+
+            # Tabela comparativa dos Top 5
+            st.subheader("📊 Top 5 Comparison Table")
+
+            comparison_data = []
+            for etf in top_5:
+                comparison_data.append({
+                    'Rank': f"#{top_5.index(etf) + 1}",
+                    'ETF': etf['etf_symbol'],
+                    'Name': etf['etf_name'][:35] + '...' if len(etf['etf_name']) > 35 else etf['etf_name'],
+                    'Price': f"${st.session_state.etf_finder_prices.get(etf['etf_symbol'], 0):.2f}" if st.session_state.etf_finder_prices.get(etf['etf_symbol']) else "N/A",
+                    'Market Cap': f"${safe_float(etf['net_assets'])/1e9:.2f}B",
+                    'DY': f"{safe_float(etf['dividend_yield'])*100:.2f}%",
+                    'Fee': f"{safe_float(etf['expense_ratio'])*100:.2f}%",
+                    f'{stock_symbol} Weight': f"{safe_float(etf['holding_weight'])*100:.2f}%"
+                })
+
+            df_comparison = pd.DataFrame(comparison_data)
+            st.dataframe(df_comparison, use_container_width=True, hide_index=True)
+
+            # Mostrar todos os ETFs encontrados (se mais de 5)
+            if len(results) > 5:
+                st.markdown("---")
+                with st.expander(f"📋 View all {len(results)} ETFs holding {stock_symbol}"):
+                    all_data = []
+                    for idx, etf in enumerate(results_sorted, 1):
+                        all_data.append({
+                            'Rank': f"#{idx}",
+                            'ETF': etf['etf_symbol'],
+                            'Name': etf['etf_name'][:40] + '...' if len(etf['etf_name']) > 40 else etf['etf_name'],
+                            'Market Cap': f"${safe_float(etf['net_assets'])/1e9:.2f}B",
+                            'DY': f"{safe_float(etf['dividend_yield'])*100:.2f}%",
+                            'Fee': f"{safe_float(etf['expense_ratio'])*100:.2f}%",
+                            f'{stock_symbol} Weight': f"{safe_float(etf['holding_weight'])*100:.2f}%"
+                        })
+
+                    df_all = pd.DataFrame(all_data)
+                    st.dataframe(df_all, use_container_width=True, hide_index=True)
+
+            # Download dos resultados
+            st.markdown("---")
+            col1, col2, col3 = st.columns([1, 1, 2])
+            with col1:
+                csv = df_all.to_csv(index=False) if len(results) > 5 else df_comparison.to_csv(index=False)
+                st.download_button(
+                    label="📥 Download Results (CSV)",
+                    data=csv,
+                    file_name=f"{stock_symbol}_etf_holdings.csv",
+                    mime="text/csv"
+                )
+
+        else:
+            st.warning(f"❌ No ETFs found holding **{stock_symbol}**")
+            st.info("💡 Try searching for a more popular stock (e.g., AAPL, MSFT, GOOGL, NVDA, TSLA)")
+
+    elif not st.session_state.etf_finder_searching:
+        st.info("👆 Enter a stock symbol and click 'Find ETFs' to see which major ETFs hold it")
+
+        # Informações sobre a busca
+        with st.expander("ℹ️ About this search", expanded=True):
+            st.markdown(f"""
+            ### How it works:
+
+            This tool searches through **{len(OPTIMIZED_ETFS)} carefully selected ETFs** (no redundancies like SPY/VOO/IVV).
+
+            #### Why 50 ETFs instead of 100?
+            - ✅ **No duplicates**: Only SPY (not VOO, IVV) - same index, different providers
+            - ✅ **Better coverage**: Includes all sectors, sizes, and strategies
+            - ✅ **Faster search**: ~10 minutes instead of 20-30 minutes
+            - ✅ **More relevant results**: Each ETF represents a unique strategy
+
+            #### ETF Categories Covered:
+            """)
+
+            for category, etfs in ETF_CATEGORIES.items():
+                st.markdown(f"**{category}:** {len(etfs)} ETFs")
+
+            st.markdown("""
+            #### ⏱️ Search Time:
+            - Due to API rate limits (5 requests/minute), searching takes approximately **10 minutes**
+            - The search shows real-time progress
+            - Results include current prices and detailed metrics
+
+            #### 📊 Results Show:
+            - **Top 5 ETFs** by market capitalization
+            - Current price, market cap, dividend yield, expense ratio
+            - Weight of your stock in each ETF
+            - Full description of each ETF
+            - Comparison table for easy analysis
+            - Option to download results as CSV
+            """)
+
+        # Exemplos
+        with st.expander("💡 Popular Stocks to Try"):
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.markdown("""
+                **🖥️ Technology:**
+                - AAPL (Apple)
+                - MSFT (Microsoft)
+                - GOOGL (Google)
+                - NVDA (NVIDIA)
+                - TSLA (Tesla)
+                - META (Meta)
+                - AMZN (Amazon)
+                - NFLX (Netflix)
+                """)
+
+            with col2:
+                st.markdown("""
+                **💰 Finance:**
+                - JPM (JPMorgan)
+                - BAC (Bank of America)
+                - WFC (Wells Fargo)
+                - GS (Goldman Sachs)
+                - MS (Morgan Stanley)
+                - C (Citigroup)
+                - V (Visa)
+                - MA (Mastercard)
+                """)
+
+            with col3:
+                st.markdown("""
+                **🏥 Healthcare:**
+                - JNJ (Johnson & Johnson)
+                - UNH (UnitedHealth)
+                - PFE (Pfizer)
+                - ABBV (AbbVie)
+                - TMO (Thermo Fisher)
+                - LLY (Eli Lilly)
+                - MRK (Merck)
+                - ABT (Abbott)
+                """)
+
+            st.markdown("""
+            **⚡ Energy & Others:**
+            - XOM (Exxon Mobil)
+            - CVX (Chevron)
+            - KO (Coca-Cola)
+            - PEP (PepsiCo)
+            - WMT (Walmart)
+            - DIS (Disney)
+            - NKE (Nike)
+            - BA (Boeing)
+            """)
@@ -0,0 +1,337 @@
+# page_technical_indicators.py
+"""
+Indicadores técnicos e backtest de estratégias
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from app_common import api, get_price_store, load_daily_prices
+import backtest
+from chart_downsampling import line_trace
+import indicators
+from indicators import resample_ohlcv
+
+
+def render():
+    st.title("📈 Technical Indicators")
+
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        symbol = st.text_input("Enter Symbol", value="AAPL", key="tech_symbol")
+
+    with col2:
+        st.write("")
+        st.write("")
+        analyze_button = st.button("📊 Analyze", key="tech_analyze")
+
+    if analyze_button and symbol:
+        try:
+            with st.spinner(f"Loading daily prices for {symbol}..."):
+                load_daily_prices(symbol)
+            st.session_state.tech_symbol_loaded = symbol.upper()
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+
+    if 'tech_symbol_loaded' in st.session_state:
+        symbol = st.session_state.tech_symbol_loaded
+        series = get_price_store().read(symbol)
+
+        if series is None:
+            st.error("❌ No price data available")
+        else:
+            # Indicadores calculados localmente a partir do price store
+            interval = st.selectbox("Interval", ["daily", "weekly", "monthly"], key="tech_interval")
+            df = resample_ohlcv(series.to_frame(), interval)
+            close = df['Close'].to_numpy()
+
+            st.caption(f"{len(df)} {interval} bars from {df.index[0]:%Y-%m-%d} to {df.index[-1]:%Y-%m-%d}")
+
+            tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📈 SMA", "📊 RSI", "📉 MACD", "📏 Bollinger Bands", "🌡️ ATR", "🧪 Backtest"])
+
+            # SMA Tab
+            with tab1:
+                st.subheader("Simple Moving Average (SMA)")
+
+                sma_period = st.slider("SMA Period", 5, 200, 20, key="sma_period")
+                df_sma = pd.DataFrame({'SMA': indicators.sma(close, sma_period)}, index=df.index).dropna()
+
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=df.index,
+                    y=df['Close'],
+                    mode='lines',
+                    name='Close',
+                    line=dict(color='lightgray', width=1)
+                ))
+                fig.add_trace(go.Scatter(
+                    x=df_sma.index,
+                    y=df_sma['SMA'],
+                    mode='lines',
+                    name=f'SMA {sma_period}',
+                    line=dict(color='blue', width=2)
+                ))
+
+                fig.update_layout(
+                    title=f'{symbol} - SMA {sma_period}',
+                    xaxis_title='Date',
+                    yaxis_title='Price (USD)',
+                    height=500
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+                st.dataframe(df_sma.tail(20), use_container_width=True)
+
+            # RSI Tab
+            with tab2:
+                st.subheader("Relative Strength Index (RSI)")
+
+                rsi_period = st.slider("RSI Period", 5, 50, 14, key="rsi_period")
+                df_rsi = pd.DataFrame({'RSI': indicators.rsi(close, rsi_period)}, index=df.index).dropna()
+
+                if df_rsi.empty:
+                    st.warning("⚠️ Not enough data for this RSI period")
+                else:
+                    fig = go.Figure()
+
+                    fig.add_trace(go.Scatter(
+                        x=df_rsi.index,
+                        y=df_rsi['RSI'],
+                        mode='lines',
+                        name='RSI',
+                        line=dict(color='purple', width=2)
+                    ))
+
+                    # Linhas de referência
+                    fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
+                    fig.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
+
+                    fig.update_layout(
+                        title=f'{symbol} - RSI {rsi_period}',
+                        xaxis_title='Date',
+                        yaxis_title='RSI Value',
+                        height=500,
+                        yaxis=dict(range=[0, 100])
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    # Interpretação
+                    current_rsi = df_rsi['RSI'].iloc[-1]
+
+                    if current_rsi > 70:
+                        st.warning(f"⚠️ RSI is {current_rsi:.2f} - **Overbought** territory")
+                    elif current_rsi < 30:
+                        st.success(f"✅ RSI is {current_rsi:.2f} - **Oversold** territory")
+                    else:
+                        st.info(f"ℹ️ RSI is {current_rsi:.2f} - **Neutral** territory")
+
+                    st.dataframe(df_rsi.tail(20), use_container_width=True)
+
+            # MACD Tab
+            with tab3:
+                st.subheader("MACD")
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    macd_fast = st.slider("Fast EMA", 2, 50, 12, key="macd_fast")
+                with col2:
+                    macd_slow = st.slider("Slow EMA", 5, 100, 26, key="macd_slow")
+                with col3:
+                    macd_signal = st.slider("Signal", 2, 50, 9, key="macd_signal")
+
+                macd_line, signal_line, hist = indicators.macd(close, macd_fast, macd_slow, macd_signal)
+
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=df.index, y=hist, name='Histogram', marker_color='lightgray'))
+                fig.add_trace(go.Scatter(x=df.index, y=macd_line, mode='lines', name='MACD', line=dict(color='blue')))
+                fig.add_trace(go.Scatter(x=df.index, y=signal_line, mode='lines', name='Signal', line=dict(color='orange')))
+
+                fig.update_layout(
+                    title=f'{symbol} - MACD ({macd_fast}, {macd_slow}, {macd_signal})',
+                    xaxis_title='Date',
+                    yaxis_title='MACD',
+                    height=500
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            # Bollinger Tab
+            with tab4:
+                st.subheader("Bollinger Bands")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    bb_period = st.slider("Period", 5, 100, 20, key="bb_period")
+                with col2:
+                    bb_std = st.slider("Standard Deviations", 1.0, 3.0, 2.0, 0.5, key="bb_std")
+
+                upper, middle, lower = indicators.bollinger(close, bb_period, bb_std)
+
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(x=df.index, y=upper, mode='lines', name='Upper', line=dict(color='gray', width=1)))
+                fig.add_trace(go.Scatter(x=df.index, y=lower, mode='lines', name='Lower', line=dict(color='gray', width=1),
+                                         fill='tonexty', fillcolor='rgba(128, 128, 128, 0.1)'))
+                fig.add_trace(go.Scatter(x=df.index, y=middle, mode='lines', name=f'SMA {bb_period}', line=dict(color='blue')))
+                fig.add_trace(go.Scatter(x=df.index, y=df['Close'], mode='lines', name='Close', line=dict(color='black', width=1)))
+
+                fig.update_layout(
+                    title=f'{symbol} - Bollinger Bands ({bb_period}, {bb_std})',
+                    xaxis_title='Date',
+                    yaxis_title='Price (USD)',
+                    height=500
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            # ATR Tab
+            with tab5:
+                st.subheader("Average True Range (ATR)")
+
+                atr_period = st.slider("ATR Period", 5, 50, 14, key="atr_period")
+                atr_values = indicators.atr(df['High'].to_numpy(), df['Low'].to_numpy(), close, atr_period)
+
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(x=df.index, y=atr_values, mode='lines', name='ATR', line=dict(color='firebrick', width=2)))
+
+                fig.update_layout(
+                    title=f'{symbol} - ATR {atr_period}',
+                    xaxis_title='Date',
+                    yaxis_title='ATR (USD)',
+                    height=400
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            # Backtest Tab (sempre sobre barras diárias)
+            with tab6:
+                st.subheader("Strategy Backtest")
+                st.caption("Signals are taken at the close and traded from the next day, on daily bars. Costs are charged on every position change.")
+
+                col1, col2 = st.columns([2, 1])
+                with col1:
+                    strategy_label = st.radio("Strategy", ["SMA Crossover", "RSI Mean Reversion"], horizontal=True, key="bt_strategy")
+                with col2:
+                    cost_bps = st.number_input("Cost per trade (bps)", 0.0, 100.0, 5.0, step=1.0, key="bt_cost")
+
+                if strategy_label == "SMA Crossover":
+                    strategy = 'sma_cross'
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        fast = st.slider("Fast SMA", 5, 100, 20, key="bt_fast")
+                    with col2:
+                        slow = st.slider("Slow SMA", 20, 200, 50, key="bt_slow")
+                    params = {'fast': fast, 'slow': slow}
+                    label = f"SMA {fast}/{slow}"
+                else:
+                    strategy = 'rsi'
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        bt_period = st.slider("RSI Period", 2, 30, 14, key="bt_rsi_period")
+                    with col2:
+                        lower = st.slider("Buy below", 5, 50, 30, key="bt_lower")
+                    with col3:
+                        upper = st.slider("Sell above", 50, 95, 70, key="bt_upper")
+                    params = {'period': bt_period, 'lower': lower, 'upper': upper}
+                    label = f"RSI {bt_period} ({lower}/{upper})"
+
+                daily_close = np.asarray(series.close, dtype=np.float64)
+                daily_index = pd.DatetimeIndex(np.asarray(series.index))
+
+                if strategy == 'sma_cross' and fast >= slow:
+                    st.warning("⚠️ The fast SMA must be shorter than the slow SMA")
+                else:
+                    bt_returns, bt_positions, bt_stats = backtest.backtest(daily_close, strategy, cost_bps, **params)
+                    # Buy & hold: comprado desde o primeiro dia
+                    hold_returns = np.zeros(len(daily_close))
+                    hold_returns[1:] = daily_close[1:] / daily_close[:-1] - 1.0
+                    hold_stats = backtest.performance(hold_returns[:, None])
+
+                    fig = go.Figure()
+                    fig.add_trace(line_trace(daily_index, np.cumprod(1 + bt_returns[:, 0]), mode='lines', name=label,
+                                             line=dict(color='blue', width=2)))
+                    fig.add_trace(line_trace(daily_index, np.cumprod(1 + hold_returns), mode='lines', name='Buy & Hold',
+                                             line=dict(color='lightgray', width=1)))
+                    fig.update_layout(
+                        title=f'{symbol} - Growth of $1',
+                        xaxis_title='Date',
+                        yaxis_title='Equity',
+                        height=450
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    rows = []
+                    for name, stats in [(label, bt_stats), ('Buy & Hold', hold_stats)]:
+                        rows.append({
+                            'Strategy': name,
+                            'Total Return (%)': stats['total_return'][0] * 100,
+                            'CAGR (%)': stats['cagr'][0] * 100,
+                            'Volatility (%)': stats['volatility'][0] * 100,
+                            'Sharpe': stats['sharpe'][0],
+                            'Max Drawdown (%)': stats['max_drawdown'][0] * 100,
+                            'Trades': int(stats['trades'][0]) if 'trades' in stats else 1,
+                            'Time in Market (%)': stats['exposure'][0] * 100 if 'exposure' in stats else 100.0
+                        })
+                    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+                # Varredura de todas as combinações da grade padrão (vetorizada, um único símbolo)
+                if st.button("🔍 Run Parameter Sweep", key="bt_sweep"):
+                    grid = backtest.parameter_grid(strategy)
+                    with st.spinner(f"Testing {len(next(iter(grid.values())))} parameter combinations..."):
+                        _, _, sweep_stats = backtest.backtest(daily_close, strategy, cost_bps, **grid)
+                    sweep_df = pd.DataFrame({**grid, **sweep_stats})
+
+                    if strategy == 'sma_cross':
+                        heat = sweep_df.pivot(index='slow', columns='fast', values='sharpe')
+                        title, x_title, y_title = 'Sharpe Ratio by SMA Pair', 'Fast SMA', 'Slow SMA'
+                    else:
+                        sweep_df = sweep_df[sweep_df['period'] == sweep_df.loc[sweep_df['sharpe'].idxmax(), 'period']]
+                        heat = sweep_df.pivot(index='upper', columns='lower', values='sharpe')
+                        title = f"Sharpe Ratio by RSI Levels (period {sweep_df['period'].iloc[0]})"
+                        x_title, y_title = 'Buy below', 'Sell above'
+
+                    fig = go.Figure(data=go.Heatmap(z=heat.values, x=heat.columns, y=heat.index,
+                                                    colorscale='RdYlGn', colorbar=dict(title='Sharpe')))
+                    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, height=450)
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    st.markdown("**Top 10 combinations by Sharpe:**")
+                    st.dataframe(sweep_df.sort_values('sharpe', ascending=False).head(10), use_container_width=True, hide_index=True)
+                    st.caption("⚠️ The best in-sample parameters usually overstate future performance.")
+
+            # Validação contra os indicadores da API
+            with st.expander("🔬 Validate against Alpha Vantage"):
+                st.caption("Fetches SMA and RSI from the API (2 requests) and compares them with the local values. "
+                           "Alpha Vantage uses dividend/split-adjusted closes, so values only match after the last corporate action.")
+
+                if st.button("Run validation", key="tech_validate"):
+                    try:
+                        with st.spinner("Loading SMA and RSI from Alpha Vantage..."):
+                            checks = [
+                                ('SMA', sma_period, api.get_sma(symbol, interval=interval, time_period=sma_period),
+                                 pd.Series(indicators.sma(close, sma_period), index=df.index), 0),
+                                ('RSI', rsi_period, api.get_rsi(symbol, interval=interval, time_period=rsi_period),
+                                 pd.Series(indicators.rsi(close, rsi_period), index=df.index), 250),
+                            ]
+
+                        rows = []
+                        for name, period, payload, local, warmup in checks:
+                            if f"Technical Analysis: {name}" not in payload:
+                                st.error(f"❌ No {name} data returned by the API")
+                                continue
+                            result = indicators.compare_with_alpha_vantage(local, payload, name, warmup=warmup)
+                            rows.append({
+                                'Indicator': f"{name} {period}",
+                                'Points': result['points'],
+                                'Max Abs Diff': result['max_abs_diff'],
+                                'Max Rel Diff': result['max_rel_diff'],
+                                'Matching Since': result['matching_since']
+                            })
+
+                        if rows:
+                            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                    except Exception as e:
+                        st.error(f"❌ Error: {str(e)}")
@@ -0,0 +1,89 @@
+# page_technical_screener.py
+"""
+Screener técnico sobre um universo de ETFs
+"""
+import streamlit as st
+
+from app_common import get_price_store, price_coverage
+from config import ETF_UNIVERSE
+from etf_list import list_universes, load_universe
+from screener import PANEL_COLUMNS, Screener
+
+# Painel alinhado do screener, recriado quando algum símbolo ganha barras novas
+@st.cache_resource(max_entries=4)
+def get_screener(symbols, versions):
+    return Screener(get_price_store().panel(symbols, PANEL_COLUMNS))
+
+
+def render():
+    st.title("🧮 Technical Screener")
+
+    st.markdown("""
+    Scan a whole universe for technical conditions using the local price history.
+    Conditions are evaluated for all symbols at once on their latest bar.
+    """)
+
+    universes = list_universes()
+    universe_name = st.selectbox(
+        "ETF Universe",
+        options=universes + ["Custom watchlist"],
+        index=universes.index(ETF_UNIVERSE) if ETF_UNIVERSE in universes else 0,
+        key="screener_universe"
+    )
+    if universe_name == "Custom watchlist":
+        watchlist = st.text_input("Symbols (comma separated)", value="SPY, QQQ, IWM, TLT, GLD", key="screener_watchlist")
+        screener_symbols = list(dict.fromkeys(s.strip().upper() for s in watchlist.split(',') if s.strip()))
+    else:
+        screener_symbols = load_universe(universe_name)
+
+    store = get_price_store()
+    price_coverage(screener_symbols, key="screener_download")
+
+    examples = {
+        "Oversold (RSI < 30)": ("rsi(14) < 30", "rsi(14)", True),
+        "Crossed above SMA 200": ("cross_above(close, sma(200))", "change(close, 21)", False),
+        "52-week high": ("close >= high_52w", "change(close, 63)", False),
+        "Below SMA 50 and SMA 200": ("close < sma(50) and close < sma(200)", "rsi(14)", True),
+        "Volume spike": ("volume > 2 * sma(volume, 20)", "volume / sma(volume, 20)", False),
+    }
+    example = st.selectbox("Example", list(examples), key="screener_example")
+    default_condition, default_rank, default_ascending = examples[example]
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        conditions = st.text_area(
+            "Conditions (one per line, all must match)",
+            value=default_condition,
+            key=f"screener_conditions_{example}",
+            help="Names: open, high, low, close, volume, high_52w, low_52w. "
+                 "Functions: sma, ema, rsi, max, min, change, prev, cross_above, cross_below, abs. "
+                 "Combine with and / or / not."
+        )
+    with col2:
+        rank_by = st.text_input("Rank by", value=default_rank, key=f"screener_rank_{example}")
+    with col3:
+        ascending = st.checkbox("Ascending", value=default_ascending, key=f"screener_ascending_{example}")
+
+    if st.button("🧮 Run Screener", key="screener_run"):
+        available = tuple(s for s in screener_symbols if s in store)
+        lines = [line.strip() for line in conditions.splitlines() if line.strip()]
+
+        if not available:
+            st.warning("⚠️ No symbols with local price history")
+        elif not lines:
+            st.warning("⚠️ Enter at least one condition")
+        else:
+            try:
+                screener = get_screener(available, tuple(store.version(s) for s in available))
+                table = screener.screen(
+                    lines,
+                    rank_by=rank_by.strip() or None,
+                    ascending=ascending,
+                    columns={'RSI 14': 'rsi(14)', '1M Return %': 'change(close, 21) * 100'}
+                )
+
+                st.success(f"✅ {len(table)} of {len(available)} symbols match")
+                if len(table):
+                    st.dataframe(table, use_container_width=True, hide_index=True)
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
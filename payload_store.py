@@ -0,0 +1,274 @@
+# payload_store.py
+"""
+Payloads das sessões num repositório único do processo, com contagem de referências
+
+Cada sessão do Streamlit guardava no session_state a própria cópia das
+respostas e resultados (perfil do ETF, fundamentos, overlap...): com
+várias sessões olhando o mesmo SPY, a memória crescia com o número de
+usuários. Aqui cada valor é guardado uma vez, sob uma chave que identifica
+o conteúdo, e as sessões guardam só a chave; o valor é liberado quando a
+última sessão que aponta para ele o solta.
+
+A memória de cada sessão (soma dos valores que ela referencia) tem um
+limite: ao passar dele, as referências usadas há mais tempo são soltas.
+Sessões sem atividade por um tempo são descartadas por inteiro (o
+Streamlit não avisa quando uma aba é fechada).
+
+Os valores são compartilhados e imutáveis: quem precisar alterá-los deve
+trabalhar numa cópia.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config import SESSION_IDLE_MINUTES, SESSION_STATE_BYTES
+
+# Intervalo mínimo entre varreduras de sessões ociosas (segundos)
+EVICT_INTERVAL = 60
+
+
+def deep_size(value):
+    """
+    Memória aproximada de um valor, somando tudo o que ele referencia
+
+    DataFrames e arrays contam os próprios buffers (arquivos mapeados em
+    memória não contam); Futures contam o resultado, se já terminaram.
+
+    Args:
+        value: Valor a medir
+
+    Returns:
+        int: Bytes
+    """
+    # pandas/numpy só entram se já foram importados (sem eles não há DataFrames
+    # nem arrays a medir); importá-los aqui pesaria no primeiro carregamento do app
+    pd = sys.modules.get('pandas')
+    np = sys.modules.get('numpy')
+
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        if pd is not None and isinstance(obj, pd.DataFrame):
+            total += int(obj.memory_usage(index=True, deep=True).sum())
+        elif pd is not None and isinstance(obj, (pd.Series, pd.Index)):
+            total += int(obj.memory_usage(deep=True))
+        elif np is not None and isinstance(obj, np.ndarray):
+            # Arrays donos do buffer já o incluem no getsizeof; views contam o array de origem
+            total += sys.getsizeof(obj)
+            if obj.base is not None and not isinstance(obj, np.memmap):
+                stack.append(obj.base)
+        elif isinstance(obj, dict):
+            total += sys.getsizeof(obj)
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(obj)
+            stack.extend(obj)
+        elif isinstance(obj, Future):
+            total += sys.getsizeof(obj)
+            if obj.done() and not obj.cancelled() and obj.exception() is None:
+                stack.append(obj.result())
+        else:
+            total += sys.getsizeof(obj)
+            slots = getattr(type(obj), '__slots__', ())
+            stack.extend(getattr(obj, name) for name in slots if hasattr(obj, name))
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+    return total
+
+
+def _finished(value):
+    # Valores em andamento (ex: FundamentalsBundle) são medidos de novo quando terminam
+    done = getattr(value, 'done', None)
+    return not callable(done) or done()
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'final', 'refs')
+
+    def __init__(self, value):
+        self.value = value
+        self.size = deep_size(value)
+        self.final = _finished(value)
+        self.refs = 0
+
+
+class _Session:
+    __slots__ = ('slots', 'last_seen')
+
+    def __init__(self, now):
+        self.slots = OrderedDict()  # slot -> chave, do uso mais antigo ao mais recente
+        self.last_seen = now
+
+
+class PayloadStore:
+    """
+    Valores imutáveis compartilhados entre sessões, referenciados por chave
+
+    Cada sessão aponta cada um dos seus slots (ex: 'etf_profile_data') para
+    no máximo uma chave. Seguro entre threads.
+    """
+
+    def __init__(self, session_bytes=SESSION_STATE_BYTES, idle_seconds=SESSION_IDLE_MINUTES * 60):
+        """
+        Args:
+            session_bytes (int): Memória máxima referenciada por uma sessão
+            idle_seconds (float): Tempo sem atividade até a sessão ser descartada
+        """
+        self.session_bytes = session_bytes
+        self.idle_seconds = idle_seconds
+        self._entries = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def put(self, session_id, slot, key, value, replace=False):
+        """
+        Aponta o slot da sessão para o valor guardado sob key
+
+        Se a chave já existe, o valor guardado é reaproveitado (o argumento
+        é descartado), a não ser com replace=True: aí o novo valor substitui
+        o antigo para todas as sessões que apontam para a chave.
+
+        Args:
+            session_id (str): Identificador da sessão
+            slot (str): Nome do slot na sessão
+            key (tuple): Chave do conteúdo (hashable)
+            value: Valor a guardar
+            replace (bool): Substitui o valor de uma chave existente
+
+        Returns:
+            O valor guardado sob a chave (compartilhado - não deve ser alterado)
+        """
+        # Mede fora do lock (valores grandes levam alguns milissegundos)
+        entry = _Entry(value)
+        with self._lock:
+            session = self._session(session_id)
+            current = self._entries.get(key)
+            if current is None:
+                self._entries[key] = current = entry
+            elif replace and current.value is not value:
+                current.value, current.size, current.final = entry.value, entry.size, entry.final
+
+            if session.slots.get(slot) != key:
+                self._release(session, slot)
+                session.slots[slot] = key
+                current.refs += 1
+            session.slots.move_to_end(slot)
+            self._enforce_budget(session)
+            return current.value
+
+    def get(self, session_id, slot, key=None):
+        """
+        Valor para o qual o slot da sessão aponta
+
+        Args:
+            session_id (str): Identificador da sessão
+            slot (str): Nome do slot
+            key (tuple): Chave esperada (None = qualquer uma)
+
+        Returns:
+            O valor, ou None se o slot foi solto (limite de memória ou sessão
+            ociosa) ou aponta para outra chave
+        """
+        with self._lock:
+            session = self._session(session_id)
+            current = session.slots.get(slot)
+            if current is None or (key is not None and current != key):
+                return None
+            session.slots.move_to_end(slot)
+            entry = self._entries[current]
+            if not entry.final and _finished(entry.value):
+                entry.size = deep_size(entry.value)
+                entry.final = True
+                self._enforce_budget(session)
+            return entry.value
+
+    def release(self, session_id, slot):
+        """Solta a referência de um slot da sessão"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._release(session, slot)
+
+    def touch(self, session_id):
+        """
+        Marca a sessão como ativa e, no máximo a cada EVICT_INTERVAL
+        segundos, descarta as sessões ociosas
+        """
+        with self._lock:
+            self._session(session_id)
+        if time.monotonic() - self._last_sweep >= EVICT_INTERVAL:
+            self.evict_idle()
+
+    def evict_idle(self, now=None):
+        """
+        Descarta as sessões sem atividade há mais de idle_seconds
+
+        Args:
+            now (float): Instante de referência (time.monotonic(); None = agora)
+
+        Returns:
+            int: Número de sessões descartadas
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            idle = [sid for sid, s in self._sessions.items() if now - s.last_seen > self.idle_seconds]
+            for sid in idle:
+                session = self._sessions.pop(sid)
+                for slot in list(session.slots):
+                    self._release(session, slot)
+        return len(idle)
+
+    def session_nbytes(self, session_id):
+        """Memória referenciada pela sessão (valores compartilhados contam inteiros)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return 0 if session is None else self._session_bytes(session)
+
+    def _session(self, session_id):
+        # Sessão existente (marcada como ativa) ou nova
+        now = time.monotonic()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(now)
+        session.last_seen = now
+        return session
+
+    def _session_bytes(self, session):
+        return sum(self._entries[key].size for key in set(session.slots.values()))
+
+    def _release(self, session, slot):
+        key = session.slots.pop(slot, None)
+        if key is None:
+            return
+        entry = self._entries[key]
+        entry.refs -= 1
+        if entry.refs <= 0:
+            del self._entries[key]
+
+    def _enforce_budget(self, session):
+        # Solta os slots usados há mais tempo; o mais recente fica mesmo acima do limite
+        while len(session.slots) > 1 and self._session_bytes(session) > self.session_bytes:
+            self._release(session, next(iter(session.slots)))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def sessions(self):
+        return len(self._sessions)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
@@ -0,0 +1,648 @@
+# portfolio_optimizer.py
+"""
+Otimização de carteiras de ETFs a partir do histórico local de preços
+
+Retornos esperados e covariância vêm do CovarianceEngine (mesma janela de
+3 anos da matriz de correlação). Todas as carteiras são long-only e aceitam
+limites por ativo e por categoria de ETF_CATEGORIES.
+
+Carteiras:
+    min_variance  - menor volatilidade possível
+    max_sharpe    - maior retorno por unidade de risco (carteira tangente)
+    frontier      - fronteira eficiente entre as duas pontas
+    risk_parity   - cada ativo (ou categoria) contribui igualmente para o risco
+
+A fronteira não é resolvida ponto a ponto: a partir da carteira de menor
+variância, o conjunto de restrições ativas é acompanhado enquanto a
+aversão ao risco diminui (como no Critical Line Algorithm de Markowitz).
+Entre duas carteiras de canto os pesos variam linearmente, então os 100
+pontos e a carteira tangente saem dos cantos por interpolação vetorizada.
+"""
+import numpy as np
+import pandas as pd
+
+from covariance import YEAR_BARS
+from etf_list import ETF_CATEGORIES
+
+# Pontos da fronteira eficiente
+FRONTIER_POINTS = 100
+
+# Observações mínimas de um ativo para entrar na otimização
+MIN_OBSERVATIONS = 60
+
+# Categoria dos símbolos que não estão em ETF_CATEGORIES
+OTHER_CATEGORY = 'Other'
+
+
+def category_membership(symbols, categories=ETF_CATEGORIES):
+    """
+    Categoria de cada símbolo
+
+    Args:
+        symbols (list): Símbolos
+        categories (dict): Categoria -> símbolos
+
+    Returns:
+        tuple: (nomes das categorias presentes, matriz (n_símbolos, n_categorias) de 0/1)
+    """
+    lookup = {s: name for name, members in categories.items() for s in members}
+    labels = [lookup.get(s, OTHER_CATEGORY) for s in symbols]
+    names = list(dict.fromkeys(labels))
+    membership = np.zeros((len(symbols), len(names)))
+    membership[np.arange(len(symbols)), [names.index(label) for label in labels]] = 1.0
+    return names, membership
+
+
+def weight_constraints(symbols, min_weight=0.0, max_weight=1.0, category_bounds=None, categories=ETF_CATEGORIES):
+    """
+    Restrições lineares l <= Aw <= u de uma carteira long-only
+
+    Limites já implicados pelos demais (ex: teto de 100%, piso de categoria
+    abaixo da soma dos pisos dos ativos) ficam infinitos.
+
+    Args:
+        symbols (list): Símbolos
+        min_weight (float): Peso mínimo de cada ativo (>= 0)
+        max_weight (float): Peso máximo de cada ativo
+        category_bounds (dict): Categoria -> (peso mínimo, peso máximo) da soma dos ativos da categoria
+        categories (dict): Categoria -> símbolos
+
+    Returns:
+        tuple: (A, l, u) - a primeira linha é o orçamento (soma dos pesos = 1)
+    """
+    n = len(symbols)
+    if min_weight < 0:
+        raise ValueError("Peso mínimo negativo: apenas carteiras long-only são suportadas")
+    if min_weight > max_weight or n * min_weight > 1 + 1e-9 or n * max_weight < 1 - 1e-9:
+        raise ValueError(f"Limites por ativo inviáveis para {n} ativos: mínimo {min_weight:.2%}, máximo {max_weight:.2%}")
+
+    rows = [np.ones((1, n)), np.eye(n)]
+    lower = [[1.0], np.full(n, min_weight)]
+    upper = [[1.0], np.full(n, max_weight if max_weight < 1 else np.inf)]
+
+    if category_bounds:
+        names, membership = category_membership(symbols, categories)
+        total_min = 0.0
+        for name, (low, high) in category_bounds.items():
+            if name not in names:
+                if low > 0:
+                    raise ValueError(f"Categoria sem ativos na carteira: {name}")
+                continue
+            if low > high:
+                raise ValueError(f"Limites inviáveis para a categoria {name}: {low:.2%} > {high:.2%}")
+            total_min += low
+            members = membership[:, names.index(name)]
+            size = members.sum()
+            rows.append(members[None, :])
+            lower.append([low if low > size * min_weight else -np.inf])
+            upper.append([high if high < min(1.0, size * max_weight) else np.inf])
+        if total_min > 1 + 1e-9:
+            raise ValueError(f"A soma dos pesos mínimos por categoria passa de 100% ({total_min:.2%})")
+
+    return np.vstack(rows), np.concatenate(lower), np.concatenate(upper)
+
+
+def _standard_form(constraints):
+    # Igualdades primeiro, depois uma desigualdade Cx >= b por limite finito
+    A, l, u = constraints
+    equality = l == u
+    has_low = ~equality & np.isfinite(l)
+    has_high = ~equality & np.isfinite(u)
+    C = np.vstack([A[equality], A[has_low], -A[has_high]])
+    b = np.concatenate([l[equality], l[has_low], -u[has_high]])
+    return C, b, int(equality.sum())
+
+
+def _kkt_solve(G, C, active, rhs_x, rhs_c):
+    # Sistema do conjunto ativo: Gx - Nu = rhs_x, N'x = rhs_c (N = linhas ativas de C)
+    n, k = len(G), len(active)
+    N = C[active].T
+    K = np.zeros((n + k, n + k))
+    K[:n, :n] = G
+    K[:n, n:] = -N
+    K[n:, :n] = N.T
+    sol = np.linalg.solve(K, np.concatenate([rhs_x, rhs_c]))
+    return sol[:n], sol[n:]
+
+
+def solve_qp(G, a, C, b, n_eq, tol=1e-10):
+    """
+    Resolve min 1/2 x'Gx + a'x  sujeito a  C[:n_eq]x = b[:n_eq], C[n_eq:]x >= b[n_eq:]
+
+    Método dual de Goldfarb-Idnani: parte do mínimo sem restrições de
+    desigualdade e acrescenta a restrição mais violada a cada passo; não
+    precisa de ponto inicial viável e termina na solução exata.
+
+    Args:
+        G (np.ndarray): (n, n) positiva definida
+        a (np.ndarray): (n,)
+        C (np.ndarray): (m, n) restrições (igualdades primeiro)
+        b (np.ndarray): (m,)
+        n_eq (int): Número de igualdades
+        tol (float): Tolerância de violação
+
+    Returns:
+        tuple: (x, índices das restrições ativas, multiplicadores das ativas)
+    """
+    active = list(range(n_eq))
+    x, u = _kkt_solve(G, C, active, -a, b[active])
+
+    for _ in range(10 * (len(C) + len(G))):
+        slack = C @ x - b
+        slack[active] = 0.0
+        p = int(np.argmin(slack))
+        if slack[p] >= -tol:
+            return x, active, u
+
+        u_p = 0.0
+        while True:
+            # Direção primal (z) e dual (r) ao forçar a restrição p
+            z, r = _kkt_solve(G, C, active, C[p], np.zeros(len(active)))
+            r = -r
+            t_dual, drop = np.inf, None
+            candidates = np.flatnonzero(r[n_eq:] > tol) + n_eq
+            if len(candidates):
+                ratios = u[candidates] / r[candidates]
+                drop = candidates[np.argmin(ratios)]
+                t_dual = ratios.min()
+            step = z @ C[p]
+            t_primal = -(C[p] @ x - b[p]) / step if step > tol else np.inf
+
+            t = min(t_dual, t_primal)
+            if not np.isfinite(t):
+                raise ValueError("Restrições inviáveis: não existe carteira que atenda a todos os limites")
+            if np.isfinite(t_primal):
+                x = x + t * z
+            u = u - t * r
+            u_p += t
+
+            if t_primal <= t_dual:
+                active.append(p)
+                u = np.append(u, u_p)
+                break
+            del active[drop]
+            u = np.delete(u, drop)
+
+    raise ValueError("Otimização não convergiu")
+
+
+def frontier_corners(mu, cov, constraints, tol=1e-10):
+    """
+    Carteiras de canto da fronteira eficiente
+
+    Minimiza 1/2 w'Σw - t·mu'w para t crescendo de 0 (menor variância) até
+    o retorno máximo. Com o conjunto ativo fixo, pesos e multiplicadores
+    são afins em t; cada canto é onde uma restrição entra (limite atingido)
+    ou sai (multiplicador zera) do conjunto ativo.
+
+    Args:
+        mu (np.ndarray): Retornos esperados
+        cov (np.ndarray): Covariância (positiva definida)
+        constraints (tuple): Saída de weight_constraints
+
+    Returns:
+        np.ndarray: Pesos dos cantos (k, n), em ordem crescente de retorno
+    """
+    C, b, n_eq = _standard_form(constraints)
+    G = cov / np.diag(cov).mean()
+    mu_scaled = mu / max(np.abs(mu).max(), 1e-12)
+    x, active, _ = solve_qp(G, np.zeros(len(mu)), C, b, n_eq)
+
+    corners = [x]
+    t = 0.0
+    entered = left = None
+    for _ in range(4 * (len(C) + len(mu))):
+        k = len(active)
+        try:
+            xs, us = _kkt_solve(G, C, active, np.column_stack([np.zeros(len(mu)), mu_scaled]),
+                                np.column_stack([b[active], np.zeros(k)]))
+        except np.linalg.LinAlgError:
+            break
+        x0, x1 = xs[:, 0], xs[:, 1]
+        u0, u1 = us[:, 0], us[:, 1]
+
+        # Restrição inativa atingida: C_i(x0 + t·x1) = b_i com folga diminuindo
+        inactive = np.setdiff1d(np.arange(len(C)), active)
+        slope = C[inactive] @ x1
+        hit = (slope < -tol) & (inactive != left)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_enter = np.where(hit, (b[inactive] - C[inactive] @ x0) / slope, np.inf)
+
+        # Multiplicador de desigualdade ativa chega a zero
+        ineq = np.arange(n_eq, k)
+        falling = (u1[ineq] < -tol) & (np.array(active)[ineq] != entered)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_leave = np.where(falling, -u0[ineq] / u1[ineq], np.inf)
+
+        t_in = np.maximum(t_enter.min(), t) if len(t_enter) else np.inf
+        t_out = np.maximum(t_leave.min(), t) if len(t_leave) else np.inf
+        if not np.isfinite(min(t_in, t_out)):
+            break
+
+        if t_in <= t_out:
+            t = t_in
+            entered, left = int(inactive[np.argmin(t_enter)]), None
+            active = active + [entered]
+        else:
+            t = t_out
+            left, entered = active[int(ineq[np.argmin(t_leave)])], None
+            active = [i for i in active if i != left]
+        corners.append(x0 + t * x1)
+
+    corners = np.array(corners)
+    # Cantos repetidos (restrições que entram e saem no mesmo t)
+    returns = corners @ mu
+    keep = np.append(np.diff(returns) > 1e-12 * max(1.0, np.abs(returns).max()), True)
+    keep[0] = True
+    return corners[keep]
+
+
+def _clean_weights(weights, lower=0.0):
+    # Remove o ruído numérico (pesos de 1e-15, soma 0.9999999999)
+    weights = np.maximum(weights, lower)
+    weights[weights < lower + 1e-9] = lower
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+def portfolio_stats(weights, mu, cov, risk_free=0.0):
+    """
+    Retorno, volatilidade e Sharpe de uma ou várias carteiras
+
+    Args:
+        weights (np.ndarray): (n,) ou (k, n)
+        mu (np.ndarray): Retornos esperados anualizados
+        cov (np.ndarray): Covariância anualizada
+        risk_free (float): Taxa livre de risco anual
+
+    Returns:
+        tuple: (retorno, volatilidade, sharpe)
+    """
+    ret = weights @ mu
+    vol = np.sqrt(np.maximum(np.einsum('...i,ij,...j->...', weights, cov, weights), 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (ret - risk_free) / vol
+    return ret, vol, sharpe
+
+
+def risk_contributions(weights, cov):
+    """
+    Fração do risco da carteira atribuída a cada ativo (soma 1)
+    """
+    marginal = cov @ weights
+    total = weights @ marginal
+    return weights * marginal / total if total > 0 else np.zeros_like(weights)
+
+
+def min_variance(cov, constraints):
+    """
+    Carteira de menor variância
+
+    Args:
+        cov (np.ndarray): Covariância
+        constraints (tuple): Saída de weight_constraints
+
+    Returns:
+        np.ndarray: Pesos
+    """
+    C, b, n_eq = _standard_form(constraints)
+    x, _, _ = solve_qp(cov / np.diag(cov).mean(), np.zeros(len(cov)), C, b, n_eq)
+    return _clean_weights(x, constraints[1][1])
+
+
+def efficient_frontier(mu, cov, constraints, n_points=FRONTIER_POINTS, corners=None):
+    """
+    Fronteira eficiente com retornos-alvo igualmente espaçados
+
+    Args:
+        mu (np.ndarray): Retornos esperados
+        cov (np.ndarray): Covariância
+        constraints (tuple): Saída de weight_constraints
+        n_points (int): Pontos da fronteira
+        corners (np.ndarray): Cantos já calculados (frontier_corners)
+
+    Returns:
+        np.ndarray: Pesos (n_points, n), do menor ao maior retorno
+    """
+    corners = frontier_corners(mu, cov, constraints) if corners is None else corners
+    if len(corners) == 1:
+        return np.repeat(_clean_weights(corners, constraints[1][1]), n_points, axis=0)
+
+    returns = corners @ mu
+    targets = np.linspace(returns[0], returns[-1], n_points)
+    segment = np.clip(np.searchsorted(returns, targets, side='right') - 1, 0, len(corners) - 2)
+    frac = (targets - returns[segment]) / (returns[segment + 1] - returns[segment])
+    weights = corners[segment] + frac[:, None] * (corners[segment + 1] - corners[segment])
+    return _clean_weights(weights, constraints[1][1])
+
+
+def max_sharpe(mu, cov, constraints, risk_free=0.0, corners=None):
+    """
+    Carteira tangente (maior Sharpe)
+
+    A carteira de maior Sharpe está na fronteira; em cada segmento entre
+    dois cantos, w(s) = w_a + s·(w_b - w_a), e a derivada do Sharpe em s
+    se anula num único ponto com fórmula fechada.
+
+    Args:
+        mu (np.ndarray): Retornos esperados
+        cov (np.ndarray): Covariância
+        constraints (tuple): Saída de weight_constraints
+        risk_free (float): Taxa livre de risco anual
+        corners (np.ndarray): Cantos já calculados (frontier_corners)
+
+    Returns:
+        np.ndarray: Pesos
+    """
+    corners = frontier_corners(mu, cov, constraints) if corners is None else corners
+    if corners[-1] @ mu <= risk_free:
+        raise ValueError("Nenhuma carteira tem retorno esperado acima da taxa livre de risco")
+
+    start, delta = corners[:-1], np.diff(corners, axis=0)
+    excess, d_excess = start @ mu - risk_free, delta @ mu
+    var = np.einsum('ki,ij,kj->k', start, cov, start)
+    cross = np.einsum('ki,ij,kj->k', start, cov, delta)
+    d_var = np.einsum('ki,ij,kj->k', delta, cov, delta)
+
+    # d/ds [e(s) / sqrt(v(s))] = 0  ->  (d_e·v_a - e_a·c) + s·(c·d_e - e_a·d_v) = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = (excess * cross - d_excess * var) / (cross * d_excess - excess * d_var)
+    s = np.clip(np.nan_to_num(s, nan=0.0, posinf=0.0, neginf=0.0), 0.0, 1.0)
+
+    candidates = np.vstack([corners, start + s[:, None] * delta])
+    _, _, sharpe = portfolio_stats(candidates, mu, cov, risk_free)
+    return _clean_weights(candidates[np.nanargmax(sharpe)], constraints[1][1])
+
+
+def risk_budgets(symbols, by_category=False, categories=ETF_CATEGORIES):
+    """
+    Orçamento de risco de cada ativo
+
+    Args:
+        symbols (list): Símbolos
+        by_category (bool): Divide o risco igualmente entre as categorias e, dentro de cada uma, entre os ativos
+
+    Returns:
+        np.ndarray: Orçamentos (soma 1)
+    """
+    n = len(symbols)
+    if not by_category:
+        return np.full(n, 1.0 / n)
+    _, membership = category_membership(symbols, categories)
+    per_category = membership / membership.sum(axis=0) / membership.shape[1]
+    return per_category.sum(axis=1)
+
+
+def risk_parity(cov, budgets=None, tol=1e-10, max_iter=100):
+    """
+    Carteira de paridade de risco (contribuição ao risco = orçamento)
+
+    Resolve min 1/2 y'Σy - Σ b_i log(y_i) por Newton (problema estritamente
+    convexo, ~10 iterações) e normaliza w = y / Σy (Spinu, 2013).
+
+    Args:
+        cov (np.ndarray): Covariância
+        budgets (np.ndarray): Orçamentos de risco (padrão = iguais)
+        tol (float): Tolerância da norma do gradiente
+        max_iter (int): Máximo de iterações
+
+    Returns:
+        np.ndarray: Pesos
+    """
+    n = len(cov)
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=np.float64)
+    y = b / np.sqrt(np.diag(cov))
+    y /= np.sqrt(y @ cov @ y)
+
+    for _ in range(max_iter):
+        grad = cov @ y - b / y
+        if np.abs(grad).max() < tol:
+            break
+        step = np.linalg.solve(cov + np.diag(b / y ** 2), grad)
+        # Passo amortecido para manter y > 0
+        t = 1.0
+        while np.any(y - t * step <= 0):
+            t *= 0.5
+        y = y - t * step
+
+    return y / y.sum()
+
+
+class Portfolio:
+    """
+    Carteira otimizada com estatísticas anualizadas
+    """
+
+    __slots__ = ('name', 'symbols', 'weights', 'expected_return', 'volatility', 'sharpe', 'risk_contributions')
+
+    def __init__(self, name, symbols, weights, mu, cov, risk_free=0.0):
+        self.name = name
+        self.symbols = list(symbols)
+        self.weights = weights
+        self.expected_return, self.volatility, self.sharpe = (float(v) for v in portfolio_stats(weights, mu, cov, risk_free))
+        self.risk_contributions = risk_contributions(weights, cov)
+
+    def to_frame(self, min_weight=1e-4, categories=ETF_CATEGORIES):
+        """
+        Pesos e contribuições ao risco (ativos com peso relevante)
+
+        Returns:
+            pd.DataFrame: symbol, category, weight, risk_contribution (ordenado por peso)
+        """
+        names, membership = category_membership(self.symbols, categories)
+        df = pd.DataFrame({
+            'symbol': self.symbols,
+            'category': [names[k] for k in membership.argmax(axis=1)],
+            'weight': self.weights,
+            'risk_contribution': self.risk_contributions,
+        })
+        return df[df['weight'] >= min_weight].sort_values('weight', ascending=False, kind='stable').reset_index(drop=True)
+
+    def by_category(self, categories=ETF_CATEGORIES):
+        """
+        Pesos e contribuições ao risco somados por categoria
+        """
+        return self.to_frame(0.0, categories).groupby('category')[['weight', 'risk_contribution']].sum() \
+            .sort_values('weight', ascending=False)
+
+
+class EfficientFrontier:
+    """
+    Pontos da fronteira eficiente (pesos e estatísticas anualizadas)
+    """
+
+    __slots__ = ('symbols', 'weights', 'corners', 'returns', 'volatility', 'sharpe', '_mu', '_cov', '_risk_free')
+
+    def __init__(self, symbols, weights, corners, mu, cov, risk_free=0.0):
+        self.symbols = list(symbols)
+        self.weights = weights
+        self.corners = corners
+        self.returns, self.volatility, self.sharpe = portfolio_stats(weights, mu, cov, risk_free)
+        self._mu, self._cov, self._risk_free = mu, cov, risk_free
+
+    def __len__(self):
+        return len(self.weights)
+
+    def to_frame(self):
+        """
+        Returns:
+            pd.DataFrame: expected_return, volatility, sharpe por ponto
+        """
+        return pd.DataFrame({'expected_return': self.returns, 'volatility': self.volatility, 'sharpe': self.sharpe})
+
+    def portfolio(self, i):
+        """
+        Carteira do ponto i da fronteira
+        """
+        return Portfolio(f"Frontier #{i + 1}", self.symbols, self.weights[i], self._mu, self._cov, self._risk_free)
+
+
+class PortfolioOptimizer:
+    """
+    Otimizações de um universo com cache até o painel de preços mudar
+
+    Retornos esperados são a média histórica dos retornos diários na janela
+    do CovarianceEngine (anualizada); a covariância vem do estimador
+    escolhido ('shrinkage' por padrão, sempre positiva definida).
+    """
+
+    def __init__(self, engine, method='shrinkage'):
+        """
+        Args:
+            engine (CovarianceEngine): Motor de covariância
+            method (str): Estimador da covariância ('sample', 'ewma' ou 'shrinkage')
+        """
+        self.engine = engine
+        self.method = method
+        self._inputs = {}
+        self._results = {}
+
+    def inputs(self, symbols):
+        """
+        Retornos esperados e covariância anualizados
+
+        Ativos com menos de MIN_OBSERVATIONS retornos na janela são excluídos.
+
+        Args:
+            symbols (list): Símbolos
+
+        Returns:
+            tuple: (símbolos usados, mu, covariância)
+        """
+        key = tuple(dict.fromkeys(s.upper() for s in symbols))
+        version = self.engine.panel_version(key)
+        cached = self._inputs.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        state, used, _ = self.engine.state(key)
+        matrix = self.engine.matrix(used, self.method)
+        count = np.diag(state.count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mu = np.diag(state.sum_x) / count * YEAR_BARS
+        cov = matrix.cov * YEAR_BARS
+
+        ok = (count >= MIN_OBSERVATIONS) & np.isfinite(mu) & np.isfinite(np.diag(cov))
+        keep = np.flatnonzero(ok)
+        cov = cov[np.ix_(keep, keep)]
+        if self.method != 'shrinkage' and len(keep):
+            cov = _nearest_psd(cov)
+
+        result = ([used[k] for k in keep], mu[keep], cov)
+        self._inputs[key] = (version, result)
+        return result
+
+    def _cached(self, kind, symbols, params, compute):
+        symbols, mu, cov = self.inputs(symbols)
+        if len(symbols) < 2:
+            raise ValueError("São necessários pelo menos 2 ativos com histórico suficiente")
+        key = (kind, tuple(symbols), self.method, params)
+        version = self.engine.panel_version(symbols)
+        cached = self._results.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = compute(symbols, mu, cov)
+        self._results[key] = (version, result)
+        return result
+
+    @staticmethod
+    def _params(risk_free=0.0, min_weight=0.0, max_weight=1.0, category_bounds=None, **extra):
+        bounds = tuple(sorted((category_bounds or {}).items()))
+        return (risk_free, min_weight, max_weight, bounds) + tuple(sorted(extra.items()))
+
+    def _corners(self, symbols, min_weight, max_weight, category_bounds):
+        # Cantos compartilhados pela fronteira e pela carteira tangente
+        def compute(symbols, mu, cov):
+            return frontier_corners(mu, cov, weight_constraints(symbols, min_weight, max_weight, category_bounds))
+
+        return self._cached('corners', symbols, self._params(0.0, min_weight, max_weight, category_bounds), compute)
+
+    def min_variance(self, symbols, risk_free=0.0, min_weight=0.0, max_weight=1.0, category_bounds=None):
+        """
+        Carteira de menor variância
+
+        Returns:
+            Portfolio: Carteira
+        """
+        def compute(symbols, mu, cov):
+            constraints = weight_constraints(symbols, min_weight, max_weight, category_bounds)
+            return Portfolio("Minimum Variance", symbols, min_variance(cov, constraints), mu, cov, risk_free)
+
+        return self._cached('min_variance', symbols, self._params(risk_free, min_weight, max_weight, category_bounds), compute)
+
+    def max_sharpe(self, symbols, risk_free=0.0, min_weight=0.0, max_weight=1.0, category_bounds=None):
+        """
+        Carteira de maior Sharpe
+
+        Returns:
+            Portfolio: Carteira
+        """
+        def compute(symbols, mu, cov):
+            constraints = weight_constraints(symbols, min_weight, max_weight, category_bounds)
+            corners = self._corners(symbols, min_weight, max_weight, category_bounds)
+            weights = max_sharpe(mu, cov, constraints, risk_free, corners)
+            return Portfolio("Maximum Sharpe", symbols, weights, mu, cov, risk_free)
+
+        return self._cached('max_sharpe', symbols, self._params(risk_free, min_weight, max_weight, category_bounds), compute)
+
+    def frontier(self, symbols, n_points=FRONTIER_POINTS, risk_free=0.0, min_weight=0.0, max_weight=1.0,
+                 category_bounds=None):
+        """
+        Fronteira eficiente
+
+        Returns:
+            EfficientFrontier: Pontos da fronteira
+        """
+        def compute(symbols, mu, cov):
+            constraints = weight_constraints(symbols, min_weight, max_weight, category_bounds)
+            corners = self._corners(symbols, min_weight, max_weight, category_bounds)
+            weights = efficient_frontier(mu, cov, constraints, n_points, corners)
+            return EfficientFrontier(symbols, weights, corners, mu, cov, risk_free)
+
+        params = self._params(risk_free, min_weight, max_weight, category_bounds, n_points=n_points)
+        return self._cached('frontier', symbols, params, compute)
+
+    def risk_parity(self, symbols, by_category=False, risk_free=0.0):
+        """
+        Carteira de paridade de risco (sem limites de peso)
+
+        Args:
+            by_category (bool): Risco igual por categoria em vez de por ativo
+
+        Returns:
+            Portfolio: Carteira
+        """
+        def compute(symbols, mu, cov):
+            weights = risk_parity(cov, risk_budgets(symbols, by_category))
+            name = "Risk Parity (categories)" if by_category else "Risk Parity"
+            return Portfolio(name, symbols, weights, mu, cov, risk_free)
+
+        return self._cached('risk_parity', symbols, self._params(risk_free, by_category=by_category), compute)
+
+
+def _nearest_psd(cov, floor=1e-8):
+    # Covariância por pares completos pode não ser positiva definida
+    values, vectors = np.linalg.eigh((cov + cov.T) / 2)
+    floor = floor * values.max()
+    if values.min() >= floor:
+        return cov
+    return (vectors * np.maximum(values, floor)) @ vectors.T
@@ -0,0 +1,507 @@
+# price_store.py
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import INTRADAY_INTERVALS, PRICE_STORE_DIR, PRICE_STORE_OPEN_SYMBOLS
+from utils import ffill
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Nomes das colunas usados nos DataFrames do app
+FRAME_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+# Campos do JSON da Alpha Vantage
+AV_FIELDS = ('1. open', '2. high', '3. low', '4. close', '5. volume')
+
+
+class PriceGapError(ValueError):
+    """
+    As barras recebidas começam depois da barra seguinte à última armazenada
+
+    Gravá-las deixaria um buraco permanente na série (ex: resposta 'compact'
+    de um símbolo sem atualização há mais de 100 pregões); quem chamou deve
+    buscar o histórico completo.
+    """
+
+
+class PriceSeries:
+    """
+    Série OHLCV de um símbolo (views dos arquivos mapeados em memória)
+
+    index é datetime64[s]; as colunas são float64. Fatiar uma série não
+    copia dados.
+    """
+
+    __slots__ = ('symbol', 'index', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol, index, columns):
+        self.symbol = symbol
+        self.index = index
+        for col in PRICE_COLUMNS:
+            setattr(self, col, columns[col])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, key):
+        """Fatia a série por posição (ex: series[-252:])"""
+        return PriceSeries(self.symbol, self.index[key], {c: getattr(self, c)[key] for c in PRICE_COLUMNS})
+
+    def to_frame(self):
+        """
+        Converte para DataFrame com as colunas Open, High, Low, Close, Volume
+
+        Returns:
+            pd.DataFrame: Índice DatetimeIndex em ordem crescente
+        """
+        return pd.DataFrame(
+            {FRAME_COLUMNS[c]: np.asarray(getattr(self, c)) for c in PRICE_COLUMNS},
+            index=pd.DatetimeIndex(np.asarray(self.index))
+        )
+
+
+class PricePanel:
+    """
+    Painel datas x símbolos alinhado pelo calendário
+
+    Cada coluna (close, high, ...) é um array 2-D (n_datas, n_símbolos) com
+    NaN onde o símbolo não tem barra naquela data.
+    """
+
+    __slots__ = ('dates', 'symbols', 'columns')
+
+    def __init__(self, dates, symbols, columns):
+        self.dates = dates
+        self.symbols = list(symbols)
+        self.columns = columns
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __len__(self):
+        return len(self.dates)
+
+    def last_valid(self, column='close'):
+        """
+        Posição da última barra válida de cada símbolo (-1 se não houver)
+        """
+        valid = np.isfinite(self.columns[column])
+        n = len(self.dates)
+        return np.where(valid.any(axis=0), n - 1 - valid[::-1].argmax(axis=0), -1)
+
+    def ffill(self):
+        """
+        Painel com as lacunas preenchidas pelo último valor de cada símbolo
+
+        Returns:
+            PricePanel: Novo painel (NaN só antes da primeira barra)
+        """
+        return PricePanel(self.dates, self.symbols, {c: ffill(v) for c, v in self.columns.items()})
+
+    def to_frame(self, column='close'):
+        """Uma coluna do painel como DataFrame (índice = datas, colunas = símbolos)"""
+        return pd.DataFrame(self.columns[column], index=pd.DatetimeIndex(self.dates), columns=self.symbols)
+
+
+class PriceStore:
+    """
+    Armazenamento colunar local de séries OHLCV
+
+    Cada símbolo tem um diretório com um arquivo binário por coluna
+    (index.i8 com timestamps em segundos e <coluna>.f8 em float64). As
+    leituras usam np.memmap, então várias sessões/processos compartilham as
+    mesmas páginas pelo cache do sistema operacional. Novas barras são
+    apenas anexadas ao final dos arquivos.
+
+    Cada memmap mantém um descritor de arquivo aberto (6 por símbolo), então
+    só os max_open símbolos usados mais recentemente ficam mapeados; o
+    descritor de um símbolo descartado fecha quando a última view dele
+    deixa de existir.
+    """
+
+    def __init__(self, root=PRICE_STORE_DIR, max_open=PRICE_STORE_OPEN_SYMBOLS):
+        """
+        Inicializa o store
+
+        Args:
+            root (str | Path): Diretório raiz dos arquivos
+            max_open (int): Símbolos mantidos mapeados em memória
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open = max_open
+        self._maps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, symbol, interval):
+        symbol = symbol.upper()
+        return symbol if interval == 'daily' else f"{symbol}@{interval}"
+
+    def _dir(self, symbol, interval='daily'):
+        return self.root / self._key(symbol, interval)
+
+    def __contains__(self, symbol):
+        return self.length(symbol) > 0
+
+    def symbols(self, interval='daily'):
+        """Lista os símbolos com dados no store"""
+        if interval == 'daily':
+            return sorted(p.name for p in self.root.iterdir() if p.is_dir() and '@' not in p.name)
+        suffix = f"@{interval}"
+        return sorted(p.name[:-len(suffix)] for p in self.root.iterdir() if p.name.endswith(suffix))
+
+    def length(self, symbol, interval='daily'):
+        """Número de barras armazenadas"""
+        try:
+            return os.stat(self._dir(symbol, interval) / 'index.i8').st_size // 8
+        except OSError:
+            return 0
+
+    def version(self, symbol, interval='daily'):
+        """
+        Versão dos dados de um símbolo (muda a cada escrita)
+
+        Returns:
+            tuple: (número de barras, mtime do índice) ou None
+        """
+        try:
+            stat = os.stat(self._dir(symbol, interval) / 'index.i8')
+        except OSError:
+            return None
+        return (stat.st_size // 8, stat.st_mtime_ns)
+
+    def _mapped(self, symbol, interval):
+        # Reaproveita os memmaps enquanto os arquivos não mudarem
+        key = self._key(symbol, interval)
+        version = self.version(symbol, interval)
+        if version is None or version[0] == 0:
+            return None
+
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == version:
+                self._maps.move_to_end(key)
+                return cached[1]
+
+        n = version[0]
+        path = self._dir(symbol, interval)
+        index = np.memmap(path / 'index.i8', dtype='<i8', mode='r', shape=(n,))
+        columns = {c: np.memmap(path / f"{c}.f8", dtype='<f8', mode='r', shape=(n,)) for c in PRICE_COLUMNS}
+
+        mapped = (index, columns)
+        with self._lock:
+            self._maps[key] = (version, mapped)
+            self._maps.move_to_end(key)
+            while len(self._maps) > self.max_open:
+                self._maps.popitem(last=False)
+        return mapped
+
+    def read(self, symbol, start=None, end=None, interval='daily'):
+        """
+        Lê um intervalo de datas sem copiar dados
+
+        Args:
+            symbol (str): Símbolo
+            start: Data inicial inclusiva (str, datetime ou datetime64; None = início)
+            end: Data final inclusiva (None = fim)
+            interval (str): 'daily' ou intervalo intraday (ex: '5min')
+
+        Returns:
+            PriceSeries: Série (views dos memmaps) ou None se não houver dados
+        """
+        mapped = self._mapped(symbol, interval)
+        if mapped is None:
+            return None
+
+        index, columns = mapped
+        lo = 0 if start is None else int(np.searchsorted(index, _to_seconds(start), side='left'))
+        hi = len(index) if end is None else int(np.searchsorted(index, _to_seconds(end), side='right'))
+
+        return PriceSeries(
+            symbol.upper(),
+            index[lo:hi].view('datetime64[s]'),
+            {c: columns[c][lo:hi] for c in PRICE_COLUMNS}
+        )
+
+    def read_after(self, symbol, after, interval='daily'):
+        """
+        Lê apenas as barras posteriores a um timestamp
+
+        Ao contrário de read(), não mapeia a série inteira: lê o índice e só
+        o final de cada coluna. É o caminho barato para atualizações
+        incrementais de muitos símbolos.
+
+        Args:
+            symbol (str): Símbolo
+            after: Timestamp exclusivo (segundos int64, str ou datetime64)
+            interval (str): 'daily' ou intervalo intraday
+
+        Returns:
+            PriceSeries: Barras novas (cópias) ou None se não houver dados
+        """
+        path = self._dir(symbol, interval)
+        try:
+            index = np.fromfile(path / 'index.i8', dtype='<i8')
+        except OSError:
+            return None
+
+        lo = int(np.searchsorted(index, _to_seconds(after), side='right'))
+        count = len(index) - lo
+        columns = {c: np.fromfile(path / f"{c}.f8", dtype='<f8', count=count, offset=lo * 8) for c in PRICE_COLUMNS}
+        return PriceSeries(symbol.upper(), index[lo:].view('datetime64[s]'), columns)
+
+    def to_frame(self, symbol, start=None, end=None, interval='daily'):
+        """
+        Lê um intervalo como DataFrame (Open, High, Low, Close, Volume)
+
+        Returns:
+            pd.DataFrame: Dados ou None se o símbolo não está no store
+        """
+        series = self.read(symbol, start, end, interval)
+        return series.to_frame() if series is not None else None
+
+    def state_path(self, symbol, name, interval='daily'):
+        """
+        Caminho de um arquivo auxiliar guardado junto da série (ex: estado
+        de indicadores)
+
+        Returns:
+            Path: Caminho do arquivo ou None se o símbolo não está no store
+        """
+        path = self._dir(symbol, interval)
+        return path / name if path.is_dir() else None
+
+    def panel(self, symbols, columns=('close',), start=None, end=None, fill=None, interval='daily'):
+        """
+        Monta um painel alinhado de vários símbolos
+
+        As datas são a união dos calendários de todos os símbolos; sem
+        preenchimento, datas ausentes de um símbolo ficam NaN.
+
+        Args:
+            symbols (list): Símbolos (os que não estão no store são ignorados)
+            columns (tuple): Colunas do painel (ex: ('close', 'high', 'low'))
+            start: Data inicial inclusiva (None = início)
+            end: Data final inclusiva (None = fim)
+            fill (str): 'ffill' repete o último valor nas lacunas (feriados
+                locais, dados desatualizados); None mantém NaN
+            interval (str): 'daily' ou intervalo intraday
+
+        Returns:
+            PricePanel: Painel (vazio se nenhum símbolo tiver dados)
+        """
+        # Copia as colunas de cada símbolo logo após a leitura: assim não ficam
+        # views (e descritores de arquivo) de todos os símbolos ao mesmo tempo
+        loaded = []
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            series = self.read(symbol, start, end, interval)
+            if series is not None and len(series):
+                loaded.append((series.symbol, np.array(series.index), {c: np.array(getattr(series, c)) for c in columns}))
+            del series
+
+        if not loaded:
+            return PricePanel(np.array([], dtype='datetime64[s]'), [], {c: np.empty((0, 0)) for c in columns})
+
+        dates = np.unique(np.concatenate([index for _, index, _ in loaded]))
+        data = {c: np.full((len(dates), len(loaded)), np.nan) for c in columns}
+        for j, (_, index, values) in enumerate(loaded):
+            rows = np.searchsorted(dates, index)
+            for c in columns:
+                data[c][rows, j] = values[c]
+
+        panel = PricePanel(dates, [symbol for symbol, _, _ in loaded], data)
+        return panel.ffill() if fill == 'ffill' else panel
+
+    def last_timestamp(self, symbol, interval='daily'):
+        """Timestamp da última barra (datetime64[s]) ou None"""
+        mapped = self._mapped(symbol, interval)
+        if mapped is None:
+            return None
+        return mapped[0][-1:].view('datetime64[s]')[0]
+
+    def append(self, symbol, index, columns, interval='daily', contiguous=False):
+        """
+        Grava barras novas
+
+        Barras posteriores à última armazenada são anexadas ao final dos
+        arquivos e a última barra é atualizada no lugar (o candle do dia muda
+        até o fechamento). Só quando chegam datas antigas que ainda não estão
+        no store (histórico mais longo) a série inteira é regravada.
+
+        Args:
+            symbol (str): Símbolo
+            index (array-like): Timestamps (datetime64 ou segundos int64), crescentes
+            columns (dict): Arrays de open, high, low, close, volume
+            interval (str): 'daily' ou intervalo intraday
+            contiguous (bool): Exige que as barras comecem até a barra seguinte
+                à última armazenada (ver gap)
+
+        Returns:
+            int: Número de barras novas
+
+        Raises:
+            PriceGapError: Com contiguous=True, se as barras deixariam um
+                buraco depois da última armazenada (nada é gravado)
+        """
+        index = _to_seconds(index)
+        if len(index) == 0:
+            return 0
+
+        columns = {c: np.asarray(columns[c], dtype='<f8') for c in PRICE_COLUMNS}
+        mapped = self._mapped(symbol, interval)
+
+        if mapped is None:
+            self._write(symbol, index, columns, interval)
+            return len(index)
+
+        old_index, old_columns = mapped
+        last = old_index[-1]
+        new = index > last
+
+        if contiguous and index[0] > _next_bar(last, interval):
+            raise PriceGapError(f"Faltam barras de {symbol.upper()} entre {last.astype('datetime64[s]')} "
+                                f"e {index[0].astype('datetime64[s]')}")
+
+        # Histórico anterior ao armazenado - mescla e regrava tudo
+        if index[0] < old_index[0] or (~new).sum() > np.isin(index[~new], old_index).sum():
+            merged_index = np.union1d(old_index, index)
+            pos_old = np.searchsorted(merged_index, old_index)
+            pos_new = np.searchsorted(merged_index, index)
+            merged = {}
+            for c in PRICE_COLUMNS:
+                merged[c] = np.empty(len(merged_index), dtype='<f8')
+                merged[c][pos_old] = old_columns[c]
+                merged[c][pos_new] = columns[c]
+            self._write(symbol, merged_index, merged, interval)
+            return len(merged_index) - len(old_index)
+
+        # Atualiza a última barra armazenada, se ela veio de novo
+        same_last = index == last
+        if same_last.any():
+            pos = np.flatnonzero(same_last)[-1]
+            n = len(old_index)
+            changed = False
+            for c in PRICE_COLUMNS:
+                if old_columns[c][-1] != columns[c][pos]:
+                    column = np.memmap(self._dir(symbol, interval) / f"{c}.f8", dtype='<f8', mode='r+', shape=(n,))
+                    column[-1] = columns[c][pos]
+                    column.flush()
+                    del column
+                    changed = True
+
+            # A versão vem do índice: atualiza o mtime para invalidar os caches derivados
+            if changed:
+                os.utime(self._dir(symbol, interval) / 'index.i8')
+
+        if not new.any():
+            return 0
+
+        # Caso comum: só anexa. As colunas são gravadas antes do índice, então
+        # um leitor concorrente nunca vê um índice maior que as colunas.
+        path = self._dir(symbol, interval)
+        for c in PRICE_COLUMNS:
+            with open(path / f"{c}.f8", 'ab') as f:
+                f.write(columns[c][new].tobytes())
+        with open(path / 'index.i8', 'ab') as f:
+            f.write(index[new].astype('<i8').tobytes())
+
+        self._write_meta(symbol, interval)
+        return int(new.sum())
+
+    def _write(self, symbol, index, columns, interval):
+        path = self._dir(symbol, interval)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # Libera os memmaps antes de substituir os arquivos
+        with self._lock:
+            self._maps.pop(self._key(symbol, interval), None)
+
+        for name, array, dtype in [(f"{c}.f8", columns[c], '<f8') for c in PRICE_COLUMNS] + \
+                                  [('index.i8', index, '<i8')]:
+            fd, tmp_path = tempfile.mkstemp(dir=path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.asarray(array, dtype=dtype).tofile(f)
+                os.replace(tmp_path, path / name)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        self._write_meta(symbol, interval)
+
+    def _write_meta(self, symbol, interval):
+        last = self.last_timestamp(symbol, interval)
+        meta = {
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'rows': self.length(symbol, interval),
+            'last': str(last) if last is not None else None
+        }
+        with open(self._dir(symbol, interval) / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def upsert_daily(self, symbol, payload):
+        """
+        Grava a resposta de TIME_SERIES_DAILY da Alpha Vantage
+
+        Args:
+            symbol (str): Símbolo
+            payload (dict): Resposta da API com 'Time Series (Daily)'
+
+        Returns:
+            int: Número de barras novas
+
+        Raises:
+            PriceGapError: Se a resposta começa depois do pregão seguinte ao
+                último armazenado (buscar a resposta 'full')
+        """
+        index, columns = parse_time_series(payload['Time Series (Daily)'])
+        return self.append(symbol, index, columns, contiguous=True)
+
+
+def parse_time_series(series):
+    """
+    Converte o dict {data: {'1. open': ...}} da Alpha Vantage em arrays
+
+    Args:
+        series (dict): Bloco 'Time Series (...)' da resposta
+
+    Returns:
+        tuple: (índice em segundos int64 crescente, dict de colunas float64)
+    """
+    index = np.array(list(series.keys()), dtype='datetime64[s]').astype('<i8')
+    values = np.array([[bar.get(f, 'nan') for f in AV_FIELDS] for bar in series.values()], dtype=np.float64)
+
+    order = np.argsort(index, kind='stable')
+    index = index[order]
+    values = values[order]
+
+    return index, {c: values[:, i] for i, c in enumerate(PRICE_COLUMNS)}
+
+
+def _next_bar(last, interval):
+    # Timestamp (segundos) da barra seguinte a last: próximo dia útil para séries
+    # diárias (feriados contam como buraco e só custam uma busca 'full'), last +
+    # intervalo para intraday
+    if interval == 'daily':
+        day = np.datetime64(int(last), 's').astype('datetime64[D]')
+        return np.busday_offset(day, 1, roll='forward').astype('datetime64[s]').astype('<i8')
+    return last + INTRADAY_INTERVALS[interval] * 60
+
+
+def _to_seconds(value):
+    # Aceita datas como str/datetime/Timestamp/datetime64 ou segundos int64
+    array = np.asarray(value)
+    if array.dtype.kind in 'iu':
+        return array.astype('<i8')
+    if array.dtype.kind != 'M':
+        array = np.asarray(pd.to_datetime(value).to_numpy() if array.ndim else pd.Timestamp(value).to_datetime64())
+    return array.astype('datetime64[s]').astype('<i8')
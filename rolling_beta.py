@@ -0,0 +1,293 @@
+# rolling_beta.py
+"""
+Beta, correlação e alfa móveis em relação a um benchmark
+
+Os retornos de todos os símbolos são alinhados ao calendário do benchmark
+e as estatísticas de cada janela saem de somas acumuladas (n, Σx, Σy, Σx²,
+Σy², Σxy): uma janela é a diferença de duas posições da soma, então todas
+as janelas de todos os símbolos custam algumas operações vetorizadas, sem
+uma regressão por janela.
+
+O resultado de cada símbolo fica em cache em memória e num arquivo .npz no
+diretório do símbolo no PriceStore, válido enquanto nem a série nem o
+benchmark mudarem.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from covariance import return_panel
+from price_store import PricePanel, PriceStore
+
+# Benchmark padrão
+BENCHMARK = 'SPY'
+
+# Janelas: nome -> pregões
+WINDOWS = {
+    '3m': 63,
+    '6m': 126,
+    '1y': 252,
+}
+
+# Pregões por ano (anualização do alfa)
+YEAR_BARS = 252
+
+STATS = ('beta', 'corr', 'alpha')
+
+
+def _cumsum(values):
+    # Soma acumulada com uma linha de zeros no início (janela = diferença de duas linhas)
+    csum = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=csum[1:])
+    return csum
+
+
+def compute_rolling_beta(benchmark_returns, returns, windows=WINDOWS):
+    """
+    Beta, correlação e alfa móveis de vários ativos contra um benchmark
+
+    Janelas com algum retorno ausente (do ativo ou do benchmark) ficam NaN.
+    O alfa é o de Jensen sem taxa livre de risco: média dos retornos do
+    ativo menos beta vezes a média do benchmark, anualizada.
+
+    Args:
+        benchmark_returns (np.ndarray): Retornos diários do benchmark (n,)
+        returns (np.ndarray): Retornos diários dos ativos (n, m)
+        windows (dict): Nome -> tamanho da janela
+
+    Returns:
+        dict: (estatística, janela) -> np.ndarray (n, m)
+    """
+    x = np.asarray(benchmark_returns, dtype=np.float64)[:, None]
+    y = np.asarray(returns, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+
+    # Centraliza antes de acumular para evitar cancelamento numérico nas somas longas
+    counts = np.maximum(valid.sum(axis=0), 1)
+    x_mean = np.where(valid, x, 0.0).sum(axis=0) / counts
+    y_mean = np.where(valid, y, 0.0).sum(axis=0) / counts
+    xc = np.where(valid, x - x_mean, 0.0)
+    yc = np.where(valid, y - y_mean, 0.0)
+
+    # As somas acumuladas servem para todas as janelas
+    sums = {name: _cumsum(values) for name, values in
+            (('n', valid.astype(np.float64)), ('x', xc), ('y', yc), ('xx', xc * xc), ('yy', yc * yc), ('xy', xc * yc))}
+
+    result = {}
+    for name, window in windows.items():
+        stats = {stat: np.full(y.shape, np.nan) for stat in STATS}
+        if window <= len(y):
+            n, sx, sy, sxx, syy, sxy = (sums[k][window:] - sums[k][:-window] for k in ('n', 'x', 'y', 'xx', 'yy', 'xy'))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cov = sxy - sx * sy / n
+                var_x = sxx - sx * sx / n
+                var_y = syy - sy * sy / n
+                beta = cov / var_x
+                corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+                alpha = ((sy / n + y_mean) - beta * (sx / n + x_mean)) * YEAR_BARS
+
+            full = n == window
+            for stat, values in (('beta', beta), ('corr', corr), ('alpha', alpha)):
+                stats[stat][window - 1:] = np.where(full, values, np.nan)
+
+        for stat in STATS:
+            result[(stat, name)] = stats[stat]
+    return result
+
+
+def benchmark_returns(store, benchmark, symbols):
+    """
+    Retornos alinhados ao calendário do benchmark
+
+    Args:
+        store (PriceStore): Store de preços
+        benchmark (str): Símbolo do benchmark
+        symbols (list): Símbolos
+
+    Returns:
+        tuple: (datas, retornos do benchmark, retornos dos ativos (n, m), símbolos)
+    """
+    panel = store.panel([benchmark] + [s for s in symbols if s != benchmark])
+    close = panel['close']
+    if close.size == 0 or panel.symbols[0] != benchmark:
+        return panel.dates[:0], np.empty(0), np.empty((0, 0)), []
+
+    rows = np.isfinite(close[:, 0])
+    aligned = PricePanel(panel.dates[rows], panel.symbols, {'close': close[rows]})
+    dates, returns = return_panel(aligned, min_coverage=0.0)
+    return dates, returns[:, 0], returns, list(aligned.symbols)
+
+
+class BetaEngine:
+    """
+    Beta/correlação/alfa móveis por símbolo, com cache por versão
+
+    get() atende a página de preços (um símbolo); refresh() calcula todos
+    os símbolos do store numa única passada e grava o cache de cada um.
+    """
+
+    def __init__(self, store, benchmark=BENCHMARK, windows=WINDOWS):
+        """
+        Args:
+            store (PriceStore): Store de preços
+            benchmark (str): Símbolo do benchmark
+            windows (dict): Nome -> tamanho da janela
+        """
+        self.store = store
+        self.benchmark = benchmark.upper()
+        self.windows = dict(windows)
+        self._memory = {}
+
+    @property
+    def file_name(self):
+        return f"beta_{self.benchmark}.npz"
+
+    def _version(self, symbol):
+        symbol_version = self.store.version(symbol)
+        benchmark_version = self.store.version(self.benchmark)
+        if symbol_version is None or benchmark_version is None:
+            return None
+        return tuple(symbol_version) + tuple(benchmark_version) + tuple(self.windows.values())
+
+    def get(self, symbol):
+        """
+        Estatísticas móveis de um símbolo contra o benchmark
+
+        Args:
+            symbol (str): Símbolo
+
+        Returns:
+            pd.DataFrame: Colunas beta_<janela>, corr_<janela>, alpha_<janela>
+                nas datas em que o símbolo tem retorno; None se o símbolo
+                ou o benchmark não estão no store
+        """
+        symbol = symbol.upper()
+        version = self._version(symbol)
+        if version is None:
+            return None
+
+        cached = self._memory.get(symbol)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        path = self.store.state_path(symbol, self.file_name)
+        frame = self._load(path, version)
+        if frame is None:
+            frames = self._compute([symbol])
+            frame = frames.get(symbol)
+            if frame is None:
+                return None
+            self._save(path, version, frame)
+
+        self._memory[symbol] = (version, frame)
+        return frame
+
+    def refresh(self, symbols=None):
+        """
+        Recalcula todos os símbolos desatualizados de uma vez
+
+        Args:
+            symbols (list): Símbolos (None = todos do store)
+
+        Returns:
+            int: Símbolos recalculados
+        """
+        pending = {}
+        for symbol in symbols or self.store.symbols():
+            symbol = symbol.upper()
+            version = self._version(symbol)
+            path = self.store.state_path(symbol, self.file_name)
+            if version is None or path is None or self._is_current(path, version):
+                continue
+            pending[symbol] = (version, path)
+
+        frames = self._compute(list(pending))
+        for symbol, frame in frames.items():
+            version, path = pending[symbol]
+            self._save(path, version, frame)
+            self._memory[symbol] = (version, frame)
+        return len(frames)
+
+    def latest(self, symbols, window='1y'):
+        """
+        Última beta/correlação/alfa de vários símbolos
+
+        Args:
+            symbols (list): Símbolos
+            window (str): Nome da janela
+
+        Returns:
+            pd.DataFrame: symbol, beta, corr, alpha
+        """
+        rows = []
+        for symbol in symbols:
+            frame = self.get(symbol)
+            if frame is None or not len(frame):
+                continue
+            last = frame.iloc[-1]
+            rows.append({'symbol': symbol.upper(), **{stat: last[f"{stat}_{window}"] for stat in STATS}})
+        return pd.DataFrame(rows, columns=['symbol', *STATS])
+
+    def _compute(self, symbols):
+        dates, bench, returns, loaded = benchmark_returns(self.store, self.benchmark, symbols)
+        if not len(dates):
+            return {}
+
+        stats = compute_rolling_beta(bench, returns, self.windows)
+        columns = [f"{stat}_{name}" for name in self.windows for stat in STATS]
+        cube = np.stack([stats[(stat, name)] for name in self.windows for stat in STATS], axis=1)
+        index = pd.DatetimeIndex(dates)
+
+        wanted = set(symbols)
+        frames = {}
+        for j, symbol in enumerate(loaded):
+            if symbol not in wanted:
+                continue
+            has_return = np.isfinite(returns[:, j])
+            frames[symbol] = pd.DataFrame(cube[has_return, :, j], index=index[has_return], columns=columns)
+        return frames
+
+    def _is_current(self, path, version):
+        # Lê só a versão (o npz carrega cada array sob demanda)
+        try:
+            with np.load(path) as data:
+                return tuple(data['version'].tolist()) == tuple(version)
+        except (OSError, KeyError, ValueError, TypeError):
+            return False
+
+    def _load(self, path, version):
+        try:
+            with np.load(path) as data:
+                if tuple(data['version'].tolist()) != tuple(version):
+                    return None
+                return pd.DataFrame(data['values'], index=pd.DatetimeIndex(data['index']),
+                                    columns=data['columns'].tolist())
+        except (OSError, KeyError, ValueError, TypeError):
+            return None
+
+    def _save(self, path, version, frame):
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=np.array(version, dtype=np.int64), index=frame.index.to_numpy(),
+                         columns=np.array(frame.columns, dtype=str), values=frame.to_numpy())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def main():
+    store = PriceStore()
+    engine = BetaEngine(store)
+    start = time.perf_counter()
+    count = engine.refresh()
+    print(f"✅ Beta vs {engine.benchmark}: {count} símbolos atualizados em {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
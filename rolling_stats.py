@@ -0,0 +1,160 @@
+# rolling_stats.py
+"""
+Estatísticas móveis de preço calculadas para a série inteira
+
+Máxima/mínima de 52 semanas, volatilidade, amplitude média, drawdown e
+retornos em vários horizontes são calculados de uma vez por símbolo e
+guardados junto da série no PriceStore; enquanto a série não muda, os
+gráficos dessas métricas custam uma leitura de arquivo.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import indicators
+
+# Pregões por período
+YEAR_BARS = 252
+MONTH_BARS = 21
+
+# Horizontes de retorno: nome -> barras
+RETURN_HORIZONS = {
+    '1d': 1,
+    '5d': 5,
+    '1m': MONTH_BARS,
+    '3m': 3 * MONTH_BARS,
+    '6m': 6 * MONTH_BARS,
+    '1y': YEAR_BARS,
+}
+
+STATS_FILE = 'rolling_stats.npz'
+
+
+def _with_warmup(rolling, expanding, period):
+    # Antes de completar a janela usa todo o histórico disponível
+    out = rolling.copy()
+    out[:period - 1] = expanding[:period - 1]
+    return out
+
+
+def compute_rolling_stats(series, vol_window=20, range_window=20):
+    """
+    Calcula todas as estatísticas móveis de uma série
+
+    Máximas, mínimas e médias usam o histórico disponível enquanto a janela
+    não está completa (como tail() fazia na página); a volatilidade fica
+    NaN até ter vol_window retornos.
+
+    Args:
+        series (PriceSeries): Série OHLCV
+        vol_window (int): Janela da volatilidade (retornos)
+        range_window (int): Janela da amplitude e do volume médios
+
+    Returns:
+        pd.DataFrame: Uma linha por barra; retornos, drawdown e volatilidade em fração
+    """
+    high = np.asarray(series.high, dtype=np.float64)
+    low = np.asarray(series.low, dtype=np.float64)
+    close = np.asarray(series.close, dtype=np.float64)
+    volume = np.asarray(series.volume, dtype=np.float64)
+    n = len(close)
+    counts = np.arange(1, n + 1)
+
+    stats = {
+        'high_52w': _with_warmup(indicators.rolling_max(high, YEAR_BARS), np.maximum.accumulate(high), YEAR_BARS),
+        'low_52w': _with_warmup(indicators.rolling_min(low, YEAR_BARS), np.minimum.accumulate(low), YEAR_BARS),
+    }
+
+    returns = np.full(n, np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1.0
+    stats['volatility'] = indicators.rolling_std(returns, vol_window, ddof=1) * np.sqrt(YEAR_BARS)
+
+    daily_range = (high - low) / close
+    stats['avg_range'] = _with_warmup(indicators.sma(daily_range, range_window),
+                                      np.cumsum(daily_range) / counts, range_window)
+    stats['avg_volume'] = _with_warmup(indicators.sma(volume, range_window),
+                                       np.cumsum(volume) / counts, range_window)
+
+    # Curva submersa: queda em relação ao topo anterior
+    peak = np.maximum.accumulate(close)
+    stats['drawdown'] = close / peak - 1.0
+    stats['max_drawdown'] = np.minimum.accumulate(stats['drawdown'])
+
+    for name, bars in RETURN_HORIZONS.items():
+        ret = np.full(n, np.nan)
+        if bars < n:
+            ret[bars:] = close[bars:] / close[:-bars] - 1.0
+        stats[f"return_{name}"] = ret
+
+    return pd.DataFrame(stats, index=pd.DatetimeIndex(np.asarray(series.index)))
+
+
+class RollingStats:
+    """
+    Estatísticas móveis com cache por versão da série no PriceStore
+
+    O resultado fica em memória e em rolling_stats.npz no diretório do
+    símbolo; só é recalculado quando a série ganha ou altera barras.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (PriceStore): Store de preços
+        """
+        self.store = store
+        self._memory = {}
+
+    def get(self, symbol):
+        """
+        Estatísticas móveis de um símbolo
+
+        Args:
+            symbol (str): Símbolo
+
+        Returns:
+            pd.DataFrame: Saída de compute_rolling_stats ou None se o símbolo não está no store
+        """
+        symbol = symbol.upper()
+        version = self.store.version(symbol)
+        if version is None:
+            return None
+
+        cached = self._memory.get(symbol)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        path = self.store.state_path(symbol, STATS_FILE)
+        stats = self._load(path, version)
+        if stats is None:
+            stats = compute_rolling_stats(self.store.read(symbol))
+            self._save(path, version, stats)
+
+        self._memory[symbol] = (version, stats)
+        return stats
+
+    def _load(self, path, version):
+        try:
+            with np.load(path) as data:
+                if tuple(data['version'].tolist()) != tuple(version):
+                    return None
+                return pd.DataFrame(
+                    {name: data[name] for name in data['columns'].tolist()},
+                    index=pd.DatetimeIndex(data['index'])
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, path, version, stats):
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=np.array(version, dtype=np.int64), index=stats.index.to_numpy(),
+                         columns=np.array(stats.columns, dtype=str), **{c: stats[c].to_numpy() for c in stats.columns})
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
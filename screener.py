@@ -0,0 +1,311 @@
+# screener.py
+"""
+Screener técnico de vários símbolos sobre um painel de preços 2-D
+
+As condições são expressões avaliadas de uma vez para todos os símbolos
+(cada termo é um array datas x símbolos) e o resultado é lido na última
+barra de cada símbolo. Exemplos:
+
+    rsi(14) < 30
+    cross_above(close, sma(200))
+    close >= high_52w and volume > 2 * sma(volume, 20)
+    change(close, 21) > 0.05 or not (close > ema(50))
+
+Nomes disponíveis: open, high, low, close, volume, high_52w, low_52w.
+Funções: sma, ema, rsi, max, min, change, prev, cross_above, cross_below,
+abs. Funções de indicador aceitam o período sozinho (aplicado ao close):
+sma(200) == sma(close, 200). Condições são combinadas com and/or/not.
+
+Uso:
+    python screener.py "rsi(14) < 30" --universe optimized --rank-by "rsi(14)"
+"""
+import argparse
+import ast
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from config import ETF_UNIVERSE
+from etf_list import load_universe
+from price_store import PriceStore
+
+# Colunas do painel usadas pelo screener
+PANEL_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Pregões em 52 semanas
+YEAR_BARS = 252
+
+
+def _prev(x, n=1):
+    # Valor n barras antes (NaN nas primeiras n posições)
+    n = int(n)
+    out = np.full(x.shape, np.nan)
+    if n < len(x):
+        out[n:] = x[:len(x) - n]
+    return out
+
+
+def _change(x, n=1):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return x / _prev(x, n) - 1.0
+
+
+def _cross_above(a, b):
+    a, b = np.broadcast_arrays(a, b)
+    return (a > b) & (_prev(a) <= _prev(b))
+
+
+def _cross_below(a, b):
+    a, b = np.broadcast_arrays(a, b)
+    return (a < b) & (_prev(a) >= _prev(b))
+
+
+# Funções disponíveis nas expressões
+FUNCTIONS = {
+    'sma': indicators.sma,
+    'ema': indicators.ema,
+    'rsi': indicators.rsi,
+    'max': indicators.rolling_max,
+    'min': indicators.rolling_min,
+    'change': _change,
+    'prev': _prev,
+    'cross_above': _cross_above,
+    'cross_below': _cross_below,
+    'abs': np.abs,
+}
+
+# Funções que podem ser chamadas só com o período (série = close)
+_PERIOD_FUNCTIONS = {'sma', 'ema', 'rsi', 'max', 'min', 'change', 'prev'}
+
+_COMPARE = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+    ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+
+_BINARY = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide,
+}
+
+
+class Screener:
+    """
+    Avaliador de expressões sobre um PricePanel
+
+    Subexpressões repetidas (ex: sma(200) em duas condições) são calculadas
+    uma única vez por screener.
+    """
+
+    def __init__(self, panel):
+        """
+        Args:
+            panel (PricePanel): Painel com as colunas de PANEL_COLUMNS, sem
+                preenchimento (as lacunas são preenchidas aqui)
+        """
+        # A última barra real de cada símbolo vem do painel antes do preenchimento
+        self.last = panel.last_valid('close')
+        self.panel = panel.ffill()
+        self._memo = {}
+
+    def evaluate(self, expression):
+        """
+        Avalia uma expressão em todas as datas e símbolos
+
+        Args:
+            expression (str): Expressão (ver docstring do módulo)
+
+        Returns:
+            np.ndarray: Array (n_datas, n_símbolos) - bool para condições
+        """
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Expressão inválida: {expression} ({e.msg})")
+        return self._eval(tree.body)
+
+    def latest(self, expression):
+        """
+        Valor da expressão na última barra válida de cada símbolo
+
+        Returns:
+            np.ndarray: Um valor por símbolo (NaN/False sem dados)
+        """
+        values = np.asarray(self.evaluate(expression))
+        if values.ndim == 0:
+            return np.full(len(self.panel.symbols), values)
+
+        cols = np.arange(values.shape[1])
+        out = values[np.maximum(self.last, 0), cols]
+        if values.dtype == bool:
+            return out & (self.last >= 0)
+        return np.where(self.last >= 0, out, np.nan)
+
+    def screen(self, conditions, rank_by=None, ascending=True, columns=None):
+        """
+        Filtra os símbolos que atendem a todas as condições na última barra
+
+        Args:
+            conditions (list | str): Uma ou mais condições (combinadas com "e")
+            rank_by (str): Expressão usada para ordenar (ex: 'rsi(14)')
+            ascending (bool): Ordem crescente de rank_by
+            columns (dict): Colunas extras {nome: expressão}
+
+        Returns:
+            pd.DataFrame: rank, symbol, date, close, colunas extras e rank_by
+        """
+        if isinstance(conditions, str):
+            conditions = [conditions]
+
+        mask = self.last >= 0
+        for condition in conditions:
+            matched = self.latest(condition)
+            if matched.dtype != bool:
+                raise ValueError(f"A condição não é um teste verdadeiro/falso: {condition}")
+            mask &= matched
+
+        close = self.panel['close']
+        cols = np.arange(close.shape[1])
+        last = np.maximum(self.last, 0)
+        table = pd.DataFrame({
+            'symbol': self.panel.symbols,
+            'date': pd.DatetimeIndex(self.panel.dates[last]) if len(self.panel) else pd.DatetimeIndex([]),
+            'close': close[last, cols] if len(self.panel) else np.array([]),
+        })
+        for name, expression in (columns or {}).items():
+            table[name] = self.latest(expression)
+        if rank_by:
+            table[rank_by] = self.latest(rank_by)
+
+        table = table[mask]
+        if rank_by:
+            table = table.sort_values(rank_by, ascending=ascending, kind='stable', na_position='last')
+
+        table = table.reset_index(drop=True)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table
+
+    def _eval(self, node):
+        key = ast.dump(node)
+        if key not in self._memo:
+            self._memo[key] = self._compute(node)
+        return self._memo[key]
+
+    def _compute(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            return float(node.value)
+
+        if isinstance(node, ast.Name):
+            return self._name(node.id)
+
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._eval(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, self._eval(value))
+            return result
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(operand)
+            if isinstance(node.op, ast.USub):
+                return -operand
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return _BINARY[type(node.op)](self._eval(node.left), self._eval(node.right))
+
+        if isinstance(node, ast.Compare):
+            # Comparações encadeadas: 30 < rsi(14) < 70
+            result, left = True, self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARE:
+                    break
+                right = self._eval(comparator)
+                with np.errstate(invalid='ignore'):
+                    result = np.logical_and(result, _COMPARE[type(op)](left, right))
+                left = right
+            else:
+                return result
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            return self._call(node.func.id, node.args)
+
+        raise ValueError(f"Expressão não suportada: {ast.unparse(node)}")
+
+    def _name(self, name):
+        if name in PANEL_COLUMNS:
+            return self.panel[name]
+        if name == 'high_52w':
+            return indicators.rolling_max(self.panel['high'], YEAR_BARS)
+        if name == 'low_52w':
+            return indicators.rolling_min(self.panel['low'], YEAR_BARS)
+        raise ValueError(f"Nome desconhecido: {name}")
+
+    def _call(self, name, args):
+        if name not in FUNCTIONS:
+            raise ValueError(f"Função desconhecida: {name}")
+
+        # sma(200) -> sma(close, 200)
+        if name in _PERIOD_FUNCTIONS and len(args) == 1 and isinstance(args[0], ast.Constant):
+            args = [ast.Name(id='close', ctx=ast.Load())] + list(args)
+
+        values = [self._eval(arg) for arg in args]
+        if name in _PERIOD_FUNCTIONS:
+            if len(values) != 2 or not isinstance(values[1], float) or values[1] < 1:
+                raise ValueError(f"{name}() espera (série, período)")
+            return FUNCTIONS[name](values[0], int(values[1]))
+
+        try:
+            return FUNCTIONS[name](*values)
+        except TypeError:
+            raise ValueError(f"Argumentos inválidos para {name}()")
+
+
+def load_screener(symbols, store=None, years=None):
+    """
+    Carrega o painel alinhado dos símbolos e cria o screener
+
+    Args:
+        symbols (list): Símbolos (os que não estão no price store são ignorados)
+        store (PriceStore): Store de preços (padrão = PriceStore())
+        years (int): Limita o histórico aos últimos N anos (None = tudo)
+
+    Returns:
+        Screener: Screener sobre o painel
+    """
+    store = store or PriceStore()
+    start = None
+    if years:
+        start = np.datetime64('today', 'D') - np.timedelta64(int(years * 366), 'D')
+    return Screener(store.panel(symbols, PANEL_COLUMNS, start=start))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screener técnico sobre o price store local")
+    parser.add_argument('conditions', nargs='+', help="Condições (ex: \"rsi(14) < 30\")")
+    parser.add_argument('--universe', default=ETF_UNIVERSE, help="Universo ou arquivo de símbolos")
+    parser.add_argument('--rank-by', help="Expressão de ordenação (ex: \"rsi(14)\")")
+    parser.add_argument('--descending', action='store_true', help="Ordena do maior para o menor")
+    parser.add_argument('--years', type=int, help="Histórico usado (anos)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    screener = load_screener(load_universe(args.universe), years=args.years)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = screener.screen(args.conditions, args.rank_by, ascending=not args.descending)
+    elapsed = time.perf_counter() - start
+
+    print(f"📦 Painel {len(screener.panel)} x {len(screener.panel.symbols)} carregado em {load_time:.3f}s")
+    print(table.to_string(index=False) if len(table) else "Nenhum símbolo atende às condições")
+    print(f"✅ {len(table)} de {len(screener.panel.symbols)} símbolos em {elapsed:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+# sector_exposure.py
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cache_manager import CacheManager
+from config import CACHE_DIR
+from utils import safe_float
+
+# Campos de alocação presentes no ETF_PROFILE: (lista, chave do nome)
+EXPOSURE_FIELDS = {
+    'sectors': 'sector',
+    'countries': 'country',
+}
+
+
+class ExposureTable:
+    """
+    Matriz de exposição ETFs x categorias (setores ou países)
+
+    Os pesos são frações (0.35 = 35%). Linhas = ETFs, colunas = categorias.
+    """
+
+    __slots__ = ('symbols', 'categories', 'matrix', '_rows')
+
+    def __init__(self, symbols, categories, matrix):
+        self.symbols = list(symbols)
+        self.categories = list(categories)
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self._rows = {s: i for i, s in enumerate(self.symbols)}
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._rows
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def row(self, symbol):
+        """Exposição de um ETF (array na ordem de categories)"""
+        return self.matrix[self._rows[symbol.upper()]]
+
+    def to_frame(self, percent=True):
+        """
+        Converte para DataFrame (índice = ETFs, colunas = categorias)
+
+        Args:
+            percent (bool): Retorna os pesos em % em vez de fração
+        """
+        return pd.DataFrame(self.matrix * (100 if percent else 1), index=self.symbols, columns=self.categories)
+
+    def portfolio(self, weights):
+        """
+        Exposição agregada de uma carteira de ETFs
+
+        Args:
+            weights (dict): {ETF: peso na carteira} - normalizado para somar 1;
+                ETFs fora da tabela são ignorados
+
+        Returns:
+            pd.Series: Exposição por categoria (fração), em ordem decrescente
+        """
+        w = np.zeros(len(self.symbols))
+        for symbol, weight in weights.items():
+            idx = self._rows.get(symbol.upper())
+            if idx is not None:
+                w[idx] += float(weight)
+
+        total = w.sum()
+        if total <= 0:
+            raise ValueError("Nenhum ETF da carteira possui dados de alocação")
+
+        exposure = (w / total) @ self.matrix
+        return pd.Series(exposure, index=self.categories).sort_values(ascending=False)
+
+    def relative_to(self, benchmark):
+        """
+        Diferença de exposição de todos os ETFs contra um benchmark
+
+        Args:
+            benchmark (str): ETF de referência (ex: 'SPY')
+
+        Returns:
+            pd.DataFrame: Pesos - pesos do benchmark (fração)
+        """
+        diff = self.matrix - self.row(benchmark)
+        return pd.DataFrame(diff, index=self.symbols, columns=self.categories)
+
+    def most_overweight(self, category, benchmark='SPY', top=10):
+        """
+        ETFs mais sobreponderados numa categoria em relação ao benchmark
+
+        Args:
+            category (str): Setor/país (ex: 'INFORMATION TECHNOLOGY')
+            benchmark (str): ETF de referência
+            top (int): Número de ETFs retornados (None = todos)
+
+        Returns:
+            pd.DataFrame: ETF, peso, peso do benchmark e diferença (em %)
+        """
+        col = self.categories.index(category.upper())
+        weights = self.matrix[:, col]
+        bench_weight = self.row(benchmark)[col]
+        diff = weights - bench_weight
+
+        order = np.argsort(-diff, kind='stable')[:top]
+        return pd.DataFrame({
+            'etf': [self.symbols[i] for i in order],
+            'weight': weights[order] * 100,
+            'benchmark_weight': bench_weight * 100,
+            'overweight': diff[order] * 100
+        })
+
+
+def build_exposure(profiles, field='sectors'):
+    """
+    Monta a matriz de exposição a partir de perfis de ETFs
+
+    Args:
+        profiles (dict): {ETF: resposta de ETF_PROFILE}
+        field (str): 'sectors' ou 'countries'
+
+    Returns:
+        ExposureTable: Matriz com os ETFs que possuem o campo
+    """
+    name_key = EXPOSURE_FIELDS[field]
+    symbols, categories = [], {}
+    rows, cols, values = [], [], []
+
+    for symbol, profile in profiles.items():
+        entries = (profile or {}).get(field) or []
+        if not entries:
+            continue
+
+        row = len(symbols)
+        symbols.append(symbol.upper())
+        for entry in entries:
+            name = str(entry.get(name_key, '')).strip().upper()
+            if not name:
+                continue
+            rows.append(row)
+            cols.append(categories.setdefault(name, len(categories)))
+            values.append(safe_float(entry.get('weight', 0), 0.0))
+
+    # Acumula todos os pares (ETF, categoria) de uma vez
+    matrix = np.zeros((len(symbols), len(categories)))
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), np.array(values))
+
+    # Colunas em ordem decrescente de peso médio
+    order = np.argsort(-matrix.mean(axis=0), kind='stable') if len(symbols) else np.arange(len(categories))
+    names = list(categories)
+    return ExposureTable(symbols, [names[i] for i in order], matrix[:, order])
+
+
+class ExposureEngine:
+    """
+    Agregação de setores/países de todo um universo, com cache por versão
+
+    A versão do universo é um hash dos símbolos e das datas de modificação
+    dos perfis em cache; enquanto nenhum perfil mudar, a matriz é lida do
+    .npz salvo (ou da memória) sem reabrir os perfis. Cada universo (conjunto
+    de símbolos) tem seus próprios arquivos: só as versões antigas do mesmo
+    universo são apagadas.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache = CacheManager(self.cache_dir)
+        self._memory = {}
+
+    def universe_version(self, symbols):
+        """
+        Versão do universo (muda quando algum perfil em cache muda)
+
+        Args:
+            symbols (list): ETFs do universo
+
+        Returns:
+            str: Hash curto
+        """
+        h = hashlib.blake2b(digest_size=8)
+        for symbol in sorted(s.upper() for s in symbols):
+            try:
+                mtime = os.stat(self.cache_dir / f"profile_{symbol}.json").st_mtime_ns
+            except OSError:
+                mtime = 0
+            h.update(f"{symbol}:{mtime};".encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def universe_key(symbols):
+        """Hash curto só dos símbolos (identifica o universo entre versões)"""
+        joined = ",".join(sorted({s.upper() for s in symbols}))
+        return hashlib.blake2b(joined.encode('utf-8'), digest_size=6).hexdigest()
+
+    def exposures(self, symbols, field='sectors'):
+        """
+        Matriz de exposição do universo, a partir dos perfis em cache
+
+        Args:
+            symbols (list): ETFs do universo
+            field (str): 'sectors' ou 'countries'
+
+        Returns:
+            ExposureTable: Matriz de exposição
+        """
+        version = self.universe_version(symbols)
+
+        cached = self._memory.get(field)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        prefix = f"exposure_{field}_{self.universe_key(symbols)}_"
+        path = self.cache_dir / f"{prefix}{version}.npz"
+        table = self._load(path)
+        if table is None:
+            profiles = {}
+            for symbol in symbols:
+                profile = self.cache.get(f"profile_{symbol.upper()}", max_age_days=float('inf'))
+                if profile:
+                    profiles[symbol] = profile
+
+            table = build_exposure(profiles, field)
+            self._save(path, table)
+
+            # Remove as versões anteriores deste universo (outro processo pode já tê-las apagado)
+            for old in self.cache_dir.glob(f"{prefix}*.npz"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+
+        self._memory[field] = (version, table)
+        return table
+
+    @staticmethod
+    def _load(path):
+        # Matriz salva ou None (inexistente, ou apagada por outro processo entre a busca e a leitura)
+        try:
+            with np.load(path) as data:
+                return ExposureTable(data['symbols'].tolist(), data['categories'].tolist(), data['matrix'])
+        except OSError:
+            return None
+
+    def _save(self, path, table):
+        # Grava num arquivo temporário e renomeia: outro processo nunca lê um .npz pela metade
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, symbols=np.array(table.symbols, dtype=str),
+                         categories=np.array(table.categories, dtype=str), matrix=table.matrix)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
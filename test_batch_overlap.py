@@ -0,0 +1,50 @@
+# test_batch_overlap.py
+import pandas as pd
+import pytest
+
+from batch_overlap import RESULT_COLUMNS, compute_overlaps, main
+from holdings_store import ETFHoldings, HoldingsStore
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    store = HoldingsStore()
+    store.add('AAA', [{'symbol': 'X', 'weight': '0.6'}, {'symbol': 'Y', 'weight': '0.4'}])
+    store.add('BBB', [{'symbol': 'X', 'weight': '0.5'}, {'symbol': 'Z', 'weight': '0.5'}])
+    # ETF salvo só com placeholders (arquivo anterior ao filtro de add())
+    store._etfs['CCC'] = ETFHoldings('CCC', store.tickers.intern_many(['N/A']), [1.0])
+    path = tmp_path / 'holdings.npz'
+    store.save(path)
+    return path
+
+
+def test_pairs_without_holdings_are_skipped(store_path, tmp_path):
+    pairs = tmp_path / 'pairs.csv'
+    pairs.write_text("AAA,BBB\nAAA,CCC\nBBB,DDD\n", encoding='utf-8')
+    output = tmp_path / 'out.csv'
+
+    main(['--pairs', str(pairs), '--store', str(store_path), '-o', str(output), '--workers', '1'])
+
+    df = pd.read_csv(output)
+    assert list(df.columns) == RESULT_COLUMNS
+    assert df[['etf_a', 'etf_b']].values.tolist() == [['AAA', 'BBB']]
+    assert df['overlap_weight'].iloc[0] == pytest.approx(50.0)
+
+
+def test_no_valid_pairs_writes_header(store_path, tmp_path):
+    pairs = tmp_path / 'pairs.csv'
+    pairs.write_text("AAA,CCC\n", encoding='utf-8')
+    output = tmp_path / 'out.csv'
+
+    main(['--pairs', str(pairs), '--store', str(store_path), '-o', str(output)])
+
+    df = pd.read_csv(output)
+    assert df.empty and list(df.columns) == RESULT_COLUMNS
+
+
+def test_pool_matches_serial(store_path):
+    store = HoldingsStore.load(store_path)
+    pairs = [('AAA', 'BBB'), ('BBB', 'AAA')] * 4
+    serial = compute_overlaps(store, pairs, workers=1)
+    pooled = compute_overlaps(store, pairs, workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
@@ -0,0 +1,84 @@
+# test_fundamentals_store.py
+import operator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundamentals_store import FundamentalsStore, parse_condition
+
+SECTORS = ('TECHNOLOGY', 'ENERGY', 'FINANCE')
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    rng = np.random.default_rng(4)
+    store = FundamentalsStore(tmp_path_factory.mktemp('fundamentals') / 'fundamentals.sqlite')
+    for i in range(40):
+        symbol = f"C{i:02d}"
+        pe = 'None' if i % 10 == 0 else f"{rng.uniform(5, 40):.2f}"
+        store.ingest(symbol, 'overview', {
+            'Symbol': symbol, 'Name': f"Company {i}", 'Sector': SECTORS[i % 3], 'LatestQuarter': '2024-03-31',
+            'PERatio': pe, 'DividendYield': f"{rng.uniform(0, 0.06):.4f}", 'Beta': f"{rng.uniform(0.5, 1.5):.3f}",
+        })
+        revenue = rng.uniform(1e9, 5e9)
+        growth = rng.uniform(-0.2, 0.4)
+        store.ingest(symbol, 'income', {'annualReports': [
+            {'fiscalDateEnding': '2023-12-31', 'totalRevenue': str(revenue * (1 + growth)),
+             'netIncome': str(revenue * 0.1), 'grossProfit': str(revenue * 0.4)},
+            {'fiscalDateEnding': '2022-12-31', 'totalRevenue': str(revenue), 'netIncome': str(revenue * 0.08),
+             'grossProfit': str(revenue * 0.35)},
+        ]})
+    return store
+
+
+def reference(store, conditions, symbols=None):
+    """Mesmo screen filtrando latest() com pandas"""
+    ops = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq, '!=': operator.ne}
+    wide = store.latest(symbols)
+    mask = pd.Series(True, index=wide.index)
+    for metric, op, value in map(parse_condition, conditions):
+        mask &= ops[op](wide[metric], value).fillna(False)
+    return sorted(wide.index[mask])
+
+
+@pytest.mark.parametrize('conditions', [
+    ['PERatio<15'],
+    ['PERatio>10', 'PERatio<=25'],
+    ['DividendYield>=0.02', 'revenue_growth>0.1'],
+    ['net_margin>0', 'Beta!=1'],
+])
+def test_screen_matches_pandas_filter(store, conditions):
+    result = store.screen(conditions)
+    assert list(result['symbol']) == reference(store, conditions)
+    assert list(result.columns[:3]) == ['symbol', 'name', 'sector']
+
+
+def test_screen_universe_and_extra_columns(store):
+    universe = [f"c{i:02d}" for i in range(0, 40, 2)]
+    result = store.screen(['PERatio<30'], symbols=universe, columns=['Beta', 'PERatio', 'gross_margin'])
+
+    assert list(result['symbol']) == reference(store, ['PERatio<30'], universe)
+    assert list(result.columns) == ['symbol', 'name', 'sector', 'PERatio', 'Beta', 'gross_margin']
+    assert result['gross_margin'].notna().all()
+
+
+def test_derived_growth(store):
+    latest = store.latest(['C01'], ['revenue_growth', 'earnings_growth', 'totalRevenue'])
+    history = store.history('C01', 'totalRevenue')
+    assert latest.loc['C01', 'revenue_growth'] == pytest.approx(history.iloc[-1] / history.iloc[0] - 1)
+    assert latest.loc['C01', 'earnings_growth'] == pytest.approx(0.1 / 0.08 - 1)
+
+
+def test_none_values_do_not_match(store):
+    result = store.screen(['PERatio>0'])
+    assert 'C00' not in set(result['symbol'])
+
+
+def test_invalid_conditions(store):
+    with pytest.raises(ValueError):
+        store.screen([])
+    with pytest.raises(ValueError):
+        store.screen(['PERatio ~ 15'])
+    with pytest.raises(ValueError):
+        store.screen([('PERatio', '; DROP TABLE latest', 1)])
@@ -0,0 +1,117 @@
+# test_holdings_store.py
+import numpy as np
+import pytest
+
+from holdings_store import ETFHoldings, HoldingsStore, TickerTable
+
+
+def reference_overlap(holdings_a, holdings_b):
+    """Cálculo original do OverlapCalculator, com dicts {ticker: peso em %}"""
+    common = set(holdings_a) & set(holdings_b)
+    overlaps = {t: min(holdings_a[t], holdings_b[t]) for t in common}
+    overlap_weight = sum(overlaps.values())
+    total_a, total_b = sum(holdings_a.values()), sum(holdings_b.values())
+    return {
+        'overlap_weight': overlap_weight,
+        'overlap_a_in_b': overlap_weight / total_a * 100,
+        'overlap_b_in_a': overlap_weight / total_b * 100,
+        'common_count': len(common),
+        'top': max(overlaps, key=overlaps.get),
+    }
+
+
+def profile(weights):
+    return [{'symbol': t, 'weight': f"{w:.4f}"} for t, w in weights.items()]
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(11)
+    pool = [f"T{i:03d}" for i in range(300)]
+    funds = {}
+    for etf, size in (('AAA', 120), ('BBB', 80), ('CCC', 200)):
+        tickers = rng.choice(pool, size, replace=False)
+        weights = rng.dirichlet(np.ones(size))
+        funds[etf] = {t: round(float(w), 4) for t, w in zip(tickers, weights)}
+    return funds
+
+
+def test_overlap_matches_dict_reference(universe):
+    store = HoldingsStore()
+    for etf, weights in universe.items():
+        store.add(etf, profile(weights))
+
+    for a, b in (('AAA', 'BBB'), ('BBB', 'CCC'), ('CCC', 'AAA')):
+        as_percent = {etf: {t: w * 100 for t, w in universe[etf].items()} for etf in (a, b)}
+        expected = reference_overlap(as_percent[a], as_percent[b])
+        result = store.overlap(a, b)
+
+        assert result['common_count'] == expected['common_count']
+        assert result['overlap_weight'] == pytest.approx(expected['overlap_weight'], abs=1e-3)
+        assert result['overlap_a_in_b'] == pytest.approx(expected['overlap_a_in_b'], abs=1e-3)
+        assert result['overlap_b_in_a'] == pytest.approx(expected['overlap_b_in_a'], abs=1e-3)
+        assert result['common_holdings'][0]['ticker'] == expected['top']
+        assert store.overlap(a, b, top=3)['common_holdings'] == result['common_holdings'][:3]
+
+
+def test_placeholder_lines_are_not_common_holdings():
+    store = HoldingsStore()
+    store.add('SPY', [{'symbol': 'AAPL', 'weight': '0.07'}, {'symbol': 'n/a', 'weight': '0.002'},
+                      {'symbol': 'N/A', 'weight': '0.001'}, {'symbol': '', 'weight': '0.01'}])
+    store.add('SCHD', [{'symbol': 'AAPL', 'weight': '0.01'}, {'symbol': 'n/a', 'weight': '0.004'},
+                       {'symbol': 'PEP', 'weight': '0.04'}])
+
+    result = store.overlap('SPY', 'SCHD')
+    assert result['common_count'] == 1
+    assert result['total_holdings_a'] == 1 and result['total_holdings_b'] == 2
+    assert result['overlap_weight'] == pytest.approx(1.0)
+    assert result['overlap_a_in_b'] == pytest.approx(1.0 / 7.0 * 100)
+
+
+def test_etf_with_only_placeholders_is_skipped():
+    store = HoldingsStore()
+    assert store.add('XYZ', [{'symbol': 'n/a', 'weight': '0.5'}, {'symbol': '', 'weight': '0.5'}]) is None
+    assert 'XYZ' not in store and len(store) == 0
+
+
+def test_repeated_tickers_are_summed():
+    table = TickerTable()
+    etf = ETFHoldings('xyz', table.intern_many(['B', 'A', 'B']), [0.1, 0.2, 0.3])
+    assert len(etf) == 2
+    assert dict(zip(table.symbols(etf.ids), etf.weights.tolist())) == pytest.approx({'A': 0.2, 'B': 0.4})
+
+
+def test_save_and_load(universe, tmp_path):
+    store = HoldingsStore()
+    for etf, weights in universe.items():
+        store.add(etf, profile(weights))
+    path = tmp_path / 'universe.npz'
+    store.save(path)
+
+    loaded = HoldingsStore.load(path)
+    assert sorted(loaded.symbols()) == sorted(universe)
+    assert loaded.to_dict('BBB') == store.to_dict('BBB')
+    assert loaded.overlap('AAA', 'CCC') == store.overlap('AAA', 'CCC')
+
+
+def test_load_drops_placeholders_from_old_files(tmp_path):
+    # Arquivo gravado antes de add() descartar as linhas sem ticker
+    store = HoldingsStore()
+    for etf in ('SPY', 'SCHD'):
+        ids = store.tickers.intern_many(['AAPL', 'N/A'])
+        store._etfs[etf] = ETFHoldings(etf, ids, [0.05, 0.01])
+    store.save(tmp_path / 'old.npz')
+
+    loaded = HoldingsStore.load(tmp_path / 'old.npz')
+    assert loaded.to_dict('SPY') == {'AAPL': 5.0}
+    assert loaded.overlap('SPY', 'SCHD')['common_count'] == 1
+
+
+def test_load_skips_etfs_left_without_holdings(tmp_path):
+    store = HoldingsStore()
+    store.add('SPY', [{'symbol': 'AAPL', 'weight': '0.05'}])
+    store._etfs['XYZ'] = ETFHoldings('XYZ', store.tickers.intern_many(['N/A']), [1.0])
+    store.save(tmp_path / 'old.npz')
+
+    loaded = HoldingsStore.load(tmp_path / 'old.npz')
+    assert loaded.symbols() == ['SPY']
@@ -0,0 +1,71 @@
+# test_incremental_indicators.py
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import indicators
+from incremental_indicators import STATE_FILE, IndicatorSet, refresh_indicators
+from intraday_buffer import MARKET_TZ, forming_daily_bar
+from price_store import PRICE_COLUMNS, PriceStore
+
+DAYS = np.busday_offset(np.datetime64('2024-01-02', 'D'), np.arange(300), roll='forward')
+
+
+def columns(close):
+    return {c: np.asarray(close, dtype=np.float64) for c in PRICE_COLUMNS}
+
+
+def seconds(days):
+    return days.astype('datetime64[s]').astype('<i8')
+
+
+def session(day, hour):
+    """Instante em Nova York no dia de uma barra"""
+    y, m, d = (int(p) for p in str(day).split('-'))
+    return datetime(y, m, d, hour, tzinfo=MARKET_TZ)
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(3)
+    return 100.0 + np.cumsum(rng.normal(0, 1, len(DAYS)))
+
+
+def test_forming_daily_bar():
+    day = DAYS[10]
+    assert forming_daily_bar(session(day, 11)) == seconds(day)
+    assert forming_daily_bar(session(day, 17)) == seconds(day + 1)
+
+
+def test_update_series_matches_indicators(close, tmp_path):
+    store = PriceStore(tmp_path)
+    store.append('SPY', seconds(DAYS), columns(close))
+    indicator_set = IndicatorSet()
+    assert indicator_set.update_series(store.read('SPY')) == len(DAYS)
+
+    values = indicator_set.values()
+    assert values['sma_20'] == pytest.approx(indicators.sma(close, 20)[-1])
+    assert values['ema_26'] == pytest.approx(indicators.ema(close, 26)[-1])
+    assert values['rsi_14'] == pytest.approx(indicators.rsi(close, 14)[-1])
+    assert values['range_252_high'] == close[-252:].max()
+
+
+def test_forming_bar_is_reprocessed_after_close(close, tmp_path):
+    store = PriceStore(tmp_path)
+    store.append('SPY', seconds(DAYS[:-1]), columns(close[:-1]))
+    # Barra de hoje no meio do pregão, com um preço que ainda vai mudar
+    store.append('SPY', seconds(DAYS[-1:]), columns([close[-1] + 50.0]))
+
+    today = DAYS[-1]
+    refresh_indicators(store, ['SPY'], now=session(today, 11))
+    saved = IndicatorSet.load(store.state_path('SPY', STATE_FILE))
+    assert saved.last_timestamp == seconds(DAYS[-2])
+
+    # O fechamento reescreve a barra no lugar
+    store.append('SPY', seconds(DAYS[-1:]), columns(close[-1:]))
+    values = refresh_indicators(store, ['SPY'], now=session(today, 17))['SPY']
+
+    assert values['ema_12'] == pytest.approx(indicators.ema(close, 12)[-1])
+    assert values['rsi_14'] == pytest.approx(indicators.rsi(close, 14)[-1])
+    assert values['sma_200'] == pytest.approx(indicators.sma(close, 200)[-1])
@@ -0,0 +1,134 @@
+# test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators
+
+N = 600  # mais de um bloco de _ewm_filter
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, N)))
+    high = close * (1 + rng.uniform(0, 0.01, N))
+    low = close * (1 - rng.uniform(0, 0.01, N))
+    return high, low, close
+
+
+def ffill(x):
+    return pd.Series(x).ffill().to_numpy()
+
+
+def loop_ewm(x, period, alpha):
+    """Referência: SMA dos primeiros period valores e depois a recursão, barra a barra"""
+    x = ffill(x)
+    out = np.full(len(x), np.nan)
+    first = int(np.argmax(~np.isnan(x)))
+    seed = first + period - 1
+    if seed >= len(x):
+        return out
+    out[seed] = x[first:seed + 1].mean()
+    for t in range(seed + 1, len(x)):
+        out[t] = out[t - 1] + alpha * (x[t] - out[t - 1])
+    return out
+
+
+def loop_rsi(close, period):
+    close = ffill(close)
+    delta = np.r_[np.nan, np.diff(close)]
+    gain = loop_ewm(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0)), period, 1 / period)
+    loss = loop_ewm(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0)), period, 1 / period)
+    return 100 - 100 / (1 + gain / loss)
+
+
+def loop_atr(high, low, close, period):
+    high, low, close = ffill(high), ffill(low), ffill(close)
+    tr = np.full(len(close), np.nan)
+    for t in range(1, len(close)):
+        tr[t] = max(high[t] - low[t], abs(high[t] - close[t - 1]), abs(low[t] - close[t - 1]))
+    return loop_ewm(tr, period, 1 / period)
+
+
+def test_rolling_matches_pandas(prices):
+    _, _, close = prices
+    series = pd.Series(close)
+    np.testing.assert_allclose(indicators.sma(close, 20), series.rolling(20).mean(), rtol=1e-10)
+    np.testing.assert_allclose(indicators.rolling_std(close, 20), series.rolling(20).std(ddof=0), rtol=1e-8)
+    np.testing.assert_array_equal(indicators.rolling_max(close, 20), series.rolling(20).max())
+    np.testing.assert_array_equal(indicators.rolling_min(close, 20), series.rolling(20).min())
+
+
+@pytest.mark.parametrize('period', [1, 5, 20, 200])
+def test_ema_and_wilder_match_loop(prices, period):
+    _, _, close = prices
+    np.testing.assert_allclose(indicators.ema(close, period), loop_ewm(close, period, 2 / (period + 1)), rtol=1e-10)
+    np.testing.assert_allclose(indicators.wilder(close, period), loop_ewm(close, period, 1 / period), rtol=1e-10)
+
+
+def test_rsi_macd_atr_match_loop(prices):
+    high, low, close = prices
+    np.testing.assert_allclose(indicators.rsi(close, 14), loop_rsi(close, 14), rtol=1e-9)
+    np.testing.assert_allclose(indicators.atr(high, low, close, 14), loop_atr(high, low, close, 14), rtol=1e-9)
+
+    line, signal, hist = indicators.macd(close)
+    ref_line = loop_ewm(close, 12, 2 / 13) - loop_ewm(close, 26, 2 / 27)
+    ref_signal = loop_ewm(ref_line, 9, 2 / 10)
+    np.testing.assert_allclose(line, ref_line, rtol=1e-9)
+    np.testing.assert_allclose(signal, ref_signal, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(hist, ref_line - ref_signal, rtol=1e-9, atol=1e-12)
+
+
+def test_columns_are_independent(prices):
+    _, _, close = prices
+    panel = np.column_stack([close, close[::-1], np.r_[np.full(50, np.nan), close[50:]]])
+    out = indicators.ema(panel, 20)
+    for j in range(panel.shape[1]):
+        np.testing.assert_allclose(out[:, j], indicators.ema(panel[:, j], 20), rtol=1e-12)
+    assert np.isnan(out[:69, 2]).all() and np.isfinite(out[69:, 2]).all()
+
+
+def test_nan_gap_stays_local(prices):
+    high, low, close = prices
+    close, high, low = close.copy(), high.copy(), low.copy()
+    close[500] = high[500] = low[500] = np.nan
+
+    out = indicators.ema(close, 20)
+    # Só o início (sem histórico) é NaN; a barra faltante entra com o valor anterior
+    assert np.isnan(out[:19]).all() and np.isfinite(out[19:]).all()
+    np.testing.assert_allclose(out, loop_ewm(close, 20, 2 / 21), rtol=1e-10)
+
+    rsi = indicators.rsi(close, 14)
+    assert np.isfinite(rsi[14:]).all()
+    np.testing.assert_allclose(rsi, loop_rsi(close, 14), rtol=1e-9)
+
+    atr = indicators.atr(high, low, close, 14)
+    assert np.isfinite(atr[14:]).all()
+    np.testing.assert_allclose(atr, loop_atr(high, low, close, 14), rtol=1e-9)
+
+    line, signal, _ = indicators.macd(close)
+    assert np.isfinite(line[25:]).all() and np.isfinite(signal[33:]).all()
+
+
+def test_nan_inside_seed_window(prices):
+    _, _, close = prices
+    close = close.copy()
+    close[5] = np.nan
+    out = indicators.ema(close, 20)
+    assert np.isfinite(out[19:]).all()
+    np.testing.assert_allclose(out, loop_ewm(close, 20, 2 / 21), rtol=1e-10)
+
+
+def test_nan_in_windowed_indicators_only_affects_its_windows(prices):
+    _, _, close = prices
+    close = close.copy()
+    close[500] = np.nan
+    out = indicators.sma(close, 20)
+    assert np.isnan(out[500:520]).all()
+    assert np.isfinite(out[19:500]).all() and np.isfinite(out[520:]).all()
+
+
+def test_short_series_is_all_nan():
+    assert np.isnan(indicators.ema(np.arange(5.0), 20)).all()
+    assert np.isnan(indicators.rsi(np.arange(5.0), 14)).all()
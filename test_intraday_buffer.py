@@ -0,0 +1,86 @@
+# test_intraday_buffer.py
+import numpy as np
+import pytest
+
+from intraday_buffer import IntradayBuffers, RingBuffer
+from price_store import PRICE_COLUMNS, PriceStore
+
+START = int(np.datetime64('2024-01-02T09:30', 's').astype('<i8'))
+
+
+def bars(first, count, step=300):
+    index = START + (first + np.arange(count, dtype=np.int64)) * step
+    values = np.repeat((first + np.arange(count, dtype=np.float64))[:, None], len(PRICE_COLUMNS), axis=1)
+    return index, values
+
+
+def payload(first, count, interval='5min'):
+    index, values = bars(first, count)
+    stamps = index.astype('datetime64[s]').astype(str)
+    return {f"Time Series ({interval})": {
+        str(t).replace('T', ' '): {f: str(v[0]) for f in ('1. open', '2. high', '3. low', '4. close', '5. volume')}
+        for t, v in zip(stamps, values)
+    }}
+
+
+def test_extend_within_capacity():
+    buffer = RingBuffer(5)
+    evicted_index, _ = buffer.extend(*bars(0, 3))
+    assert len(evicted_index) == 0
+    index, values = buffer.view()
+    np.testing.assert_array_equal(index, bars(0, 3)[0])
+
+
+def test_extend_overflow_evicts_oldest_in_order():
+    buffer = RingBuffer(5)
+    buffer.extend(*bars(0, 4))
+    evicted_index, evicted_values = buffer.extend(*bars(4, 3))
+
+    np.testing.assert_array_equal(evicted_index, bars(0, 2)[0])
+    np.testing.assert_array_equal(evicted_values[:, 3], [0.0, 1.0])
+    index, values = buffer.view()
+    np.testing.assert_array_equal(index, bars(2, 5)[0])
+    assert buffer.first() == bars(2, 1)[0][0] and buffer.last() == bars(6, 1)[0][0]
+
+
+def test_extend_larger_than_capacity():
+    buffer = RingBuffer(4)
+    buffer.extend(*bars(0, 2))
+    evicted_index, _ = buffer.extend(*bars(2, 7))
+
+    # As 2 antigas e as 3 primeiras novas saem, em ordem cronológica
+    np.testing.assert_array_equal(evicted_index, bars(0, 5)[0])
+    np.testing.assert_array_equal(buffer.view()[0], bars(5, 4)[0])
+
+
+def test_view_since():
+    buffer = RingBuffer(4)
+    buffer.extend(*bars(0, 6))
+    index, _ = buffer.view(since=bars(4, 1)[0][0])
+    np.testing.assert_array_equal(index, bars(4, 2)[0])
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_update_spills_evicted_bars_to_store(tmp_path):
+    store = PriceStore(tmp_path)
+    buffers = IntradayBuffers(store, capacity=10)
+    assert buffers.update('SPY', '5min', payload(0, 15)) == 15
+    assert buffers.length('SPY', '5min') == 10
+    assert store.length('SPY', '5min') == 5
+
+
+def test_leaves_gap(tmp_path):
+    buffers = IntradayBuffers(PriceStore(tmp_path), capacity=50)
+    assert not buffers.leaves_gap('SPY', '5min', payload(0, 10))
+
+    buffers.update('SPY', '5min', payload(0, 10))
+    # Começa na barra seguinte à última local: sem buraco
+    assert not buffers.leaves_gap('SPY', '5min', payload(10, 10))
+    # Sobrepõe a última local: sem buraco
+    assert not buffers.leaves_gap('SPY', '5min', payload(5, 10))
+    # 'compact' que começa 20 barras depois
+    assert buffers.leaves_gap('SPY', '5min', payload(30, 10))
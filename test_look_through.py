@@ -0,0 +1,81 @@
+# test_look_through.py
+import numpy as np
+import pytest
+
+from look_through import LookThrough, aggregate, order_holdings
+
+
+class FakeAPI:
+    """Responde OVERVIEW a partir de um dict; símbolos ausentes recebem {}"""
+
+    def __init__(self, overviews, quota=None):
+        self.overviews = overviews
+        self.quota = quota
+        self.calls = []
+
+    def get_company_overview(self, symbol):
+        self.calls.append(symbol)
+        if self.quota is not None and len(self.calls) > self.quota:
+            return {'Information': "Daily API limit reached"}
+        return self.overviews.get(symbol, {})
+
+
+def overview(symbol, pe='20', dividend='0.02', roe='0.1', growth='0.05'):
+    return {'Symbol': symbol, 'PERatio': pe, 'DividendYield': dividend,
+            'ReturnOnEquityTTM': roe, 'QuarterlyRevenueGrowthYOY': growth}
+
+
+def run(api, holdings, coverage=1.0):
+    *_, result = LookThrough(api, max_workers=1).run('ETF', holdings, coverage, progress_interval=0.01)
+    return result
+
+
+def test_order_holdings_drops_placeholders():
+    weights = order_holdings({'AAA': 30, 'n/a': 5, '': 5, 'bbb': 60})
+    assert list(weights.index) == ['BBB', 'AAA']
+    assert weights.sum() == pytest.approx(1.0)
+
+
+def test_aggregate_harmonic_pe():
+    result = aggregate([0.5, 0.5], [[10, 0.02, 0.1, 0.0], [20, 0.04, np.nan, 0.0]])
+    assert result.loc['pe', 'value'] == pytest.approx(1 / (0.5 / 10 + 0.5 / 20))
+    assert result.loc['dividend_yield', 'value'] == pytest.approx(0.03)
+    assert result.loc['roe', 'coverage'] == pytest.approx(0.5)
+
+
+def test_empty_overview_is_missing_and_search_continues():
+    api = FakeAPI({'BBB': overview('BBB'), 'CCC': overview('CCC')})
+    result = run(api, {'AAA': 50, 'BBB': 30, 'CCC': 20}, coverage=0.5)
+
+    assert result.done
+    assert result.holdings.loc['AAA', 'status'] == 'missing'
+    assert result.coverage == pytest.approx(0.5)
+    assert api.calls == ['AAA', 'BBB', 'CCC']
+
+
+def test_non_payer_counts_as_zero_dividend():
+    api = FakeAPI({'AAA': overview('AAA', dividend='0.04'), 'BBB': overview('BBB', dividend='None', pe='None')})
+    metrics = run(api, {'AAA': 50, 'BBB': 50}).metrics()
+
+    assert metrics.loc['dividend_yield', 'value'] == pytest.approx(0.02)
+    assert metrics.loc['dividend_yield', 'coverage'] == pytest.approx(1.0)
+    # Nas outras métricas 'None' continua sendo falta de dado
+    assert metrics.loc['pe', 'coverage'] == pytest.approx(0.5)
+
+
+def test_quota_response_aborts_the_run():
+    overviews = {f"T{i}": overview(f"T{i}") for i in range(10)}
+    api = FakeAPI(overviews, quota=2)
+    with pytest.raises(Exception, match="Daily API limit"):
+        run(api, {f"T{i}": 10 - i for i in range(10)})
+    # Não continua pedindo holdings depois do limite
+    assert len(api.calls) <= 4
+
+
+def test_api_error_aborts_the_run():
+    class FailingAPI(FakeAPI):
+        def get_company_overview(self, symbol):
+            raise Exception("Rate limit atingido. Aguarde 1 minuto e tente novamente.")
+
+    with pytest.raises(Exception, match="Rate limit"):
+        run(FailingAPI({}), {'AAA': 50, 'BBB': 50})
@@ -0,0 +1,71 @@
+# test_monte_carlo.py
+import numpy as np
+import pytest
+
+import backtest
+import monte_carlo
+from monte_carlo import PERCENTILES, ReturnModel, simulate
+from price_store import PricePanel
+
+
+@pytest.fixture(scope='module')
+def model():
+    rng = np.random.default_rng(5)
+    returns = rng.multivariate_normal([0.0004, 0.0001], [[1e-4, 2e-5], [2e-5, 2e-5]], size=1500)
+    return ReturnModel.from_returns(returns, ['AAA', 'BBB'])
+
+
+def reference(model, weights, n_paths, years, seed, rebalance=True):
+    """Matriz completa de caminhos, com os mesmos blocos e sementes de simulate()"""
+    steps = years * monte_carlo.STEPS_PER_YEAR
+    chunk = monte_carlo._chunk_paths(model, steps)
+    sizes = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return np.concatenate([monte_carlo._simulate_chunk(size, steps, seeds[i], rebalance, model, weights)
+                           for i, size in enumerate(sizes)])
+
+
+@pytest.mark.parametrize('rebalance', [True, False])
+def test_bands_match_exact_percentiles(model, monkeypatch, rebalance):
+    # Blocos pequenos: as classes vêm do primeiro bloco e os outros só somam contagens
+    monkeypatch.setattr(monte_carlo, 'CHUNK_ELEMENTS', 200_000)
+    weights = np.array([0.6, 0.4])
+    result = simulate(model, weights, n_paths=20_000, years=5, seed=1, rebalance=rebalance, workers=1)
+    paths = reference(model, weights, 20_000, 5, 1, rebalance)
+
+    np.testing.assert_array_equal(result.yearly, paths[:, ::monte_carlo.STEPS_PER_YEAR])
+    exact = np.percentile(paths, PERCENTILES, axis=0)
+    np.testing.assert_allclose(result.bands, exact, rtol=2e-3)
+    assert result.bands_frame().shape == (5 * monte_carlo.STEPS_PER_YEAR + 1, len(PERCENTILES))
+
+
+def test_result_does_not_depend_on_workers(model, monkeypatch):
+    monkeypatch.setattr(monte_carlo, 'CHUNK_ELEMENTS', 100_000)
+    serial = simulate(model, [0.5, 0.5], n_paths=5_000, years=3, seed=2, workers=1)
+    pooled = simulate(model, [0.5, 0.5], n_paths=5_000, years=3, seed=2, workers=2)
+
+    assert pooled.workers == 2
+    np.testing.assert_array_equal(serial.yearly, pooled.yearly)
+    np.testing.assert_array_equal(serial.bands, pooled.bands)
+
+
+def test_risk(model):
+    result = simulate(model, [1, 0], n_paths=2_000, years=2, seed=3, workers=1)
+    risk = result.risk(1)
+    assert risk['var'] <= risk['cvar']
+    assert 0 <= risk['prob_loss'] <= 1
+    with pytest.raises(ValueError):
+        result.risk(3)
+
+
+def test_sweep_pool_matches_serial():
+    rng = np.random.default_rng(9)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (400, 3)), axis=0))
+    panel = PricePanel(np.arange(400).astype('datetime64[D]'), ['A', 'B', 'C'], {'close': close})
+    grid = {'fast': [5, 10], 'slow': [30, 50]}
+
+    serial = backtest.sweep(panel, 'sma_cross', grid, workers=1)
+    pooled = backtest.sweep(panel, 'sma_cross', grid, workers=2)
+    assert len(serial) == 12
+    np.testing.assert_allclose(pooled.sort_values(['symbol', 'fast', 'slow'])['sharpe'].to_numpy(),
+                               serial.sort_values(['symbol', 'fast', 'slow'])['sharpe'].to_numpy())
@@ -0,0 +1,40 @@
+# test_news_sentiment.py
+import numpy as np
+import pytest
+
+from news_sentiment import SentimentEngine, daily_sentiment
+from news_store import NewsStore
+from price_store import PriceStore
+
+
+def columns(rows):
+    ticker, published, relevance, sentiment = zip(*rows)
+    return {'ticker': np.array(ticker, dtype=object), 'published': np.array(published, dtype=object),
+            'relevance': np.array(relevance, dtype=np.float64), 'sentiment': np.array(sentiment, dtype=np.float64)}
+
+
+def test_daily_sentiment_is_relevance_weighted():
+    daily = daily_sentiment(columns([
+        ('AAPL', '20240102T100000', 0.8, 0.5),
+        ('AAPL', '20240102T150000', 0.2, -0.5),
+        ('AAPL', '20240103T100000', 0.05, 0.9),  # abaixo da relevância mínima
+        ('MSFT', '20240102T100000', 0.5, 0.1),
+    ]))
+    assert list(daily['ticker']) == ['AAPL', 'MSFT']
+    assert daily['sentiment'].iloc[0] == pytest.approx((0.8 * 0.5 - 0.2 * 0.5) / 1.0)
+    assert list(daily['articles']) == [2, 1]
+
+
+def test_watchlist_memory_is_bounded(tmp_path):
+    engine = SentimentEngine(NewsStore(tmp_path / 'news.sqlite'), PriceStore(tmp_path / 'prices'), max_entries=3)
+
+    first = engine.watchlist(['AAPL'])
+    assert engine.watchlist([' aapl ']) is first
+
+    for i in range(10):
+        engine.watchlist([f"T{i}", 'AAPL'])
+    assert len(engine) == 3
+
+    # A usada mais recentemente continua; a primeira saiu
+    assert engine.watchlist(['T9', 'AAPL']) is engine.watchlist(['T9', 'AAPL'])
+    assert engine.watchlist(['AAPL']) is not first
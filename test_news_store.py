@@ -0,0 +1,146 @@
+# test_news_store.py
+import pytest
+
+from news_store import NewsStore
+
+
+def article(i, minute, tickers=('AAPL',), sentiment=0.0, title=None, topics=('technology',)):
+    return {
+        'url': f"https://news.example/{i}",
+        'title': title or f"Article {i}",
+        'summary': f"Summary {i}",
+        'source': 'Example',
+        'authors': [],
+        'time_published': f"20240102T{10 + minute // 60:02d}{minute % 60:02d}00",
+        'overall_sentiment_score': sentiment,
+        'overall_sentiment_label': 'Neutral',
+        'topics': [{'topic': t.title(), 'relevance_score': '0.5'} for t in topics],
+        'ticker_sentiment': [{'ticker': t, 'relevance_score': '0.5', 'ticker_sentiment_score': str(sentiment),
+                              'ticker_sentiment_label': 'Neutral'} for t in tickers],
+    }
+
+
+class FakeNewsAPI:
+    """NEWS_SENTIMENT sobre uma lista de notícias (time_from com resolução de minutos)"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.calls = []
+
+    def get_news_sentiment(self, tickers=None, topics=None, time_from=None, time_to=None, limit=50, sort=None):
+        self.calls.append({'time_from': time_from, 'sort': sort})
+        items = [a for a in self.feed if time_from is None or a['time_published'][:13] >= time_from]
+        items.sort(key=lambda a: a['time_published'], reverse=sort != 'EARLIEST')
+        return {'feed': items[:limit]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(tmp_path / 'news.sqlite')
+
+
+def test_poll_pages_through_a_burst(store):
+    api = FakeNewsAPI([article(i, i) for i in range(5)])
+    assert store.poll(api, 'AAPL', limit=10) == 5
+
+    # 25 notícias novas com limite de 10 por requisição
+    api.feed += [article(i, i) for i in range(5, 30)]
+    assert store.poll(api, 'AAPL', limit=10, force=True) == 25
+    assert len(store) == 30
+    assert all(call['sort'] == 'EARLIEST' for call in api.calls[1:])
+
+
+def test_interrupted_poll_resumes_without_gaps(store):
+    api = FakeNewsAPI([article(0, 0)])
+    store.poll(api, 'AAPL', limit=10)
+
+    api.feed += [article(i, i) for i in range(1, 40)]
+    store.poll(api, 'AAPL', limit=10, force=True, max_pages=2)
+    assert len(store) < 40
+
+    store.poll(api, 'AAPL', limit=10, force=True)
+    assert len(store) == 40
+
+
+def test_full_page_within_one_minute_stops(store):
+    api = FakeNewsAPI([article(0, 0)])
+    store.poll(api, 'AAPL', limit=3)
+    api.feed += [article(i, 1) for i in range(1, 6)]
+
+    store.poll(api, 'AAPL', limit=3, force=True)
+    assert len(api.calls) <= 1 + 3
+
+
+def test_poll_respects_min_interval(store):
+    api = FakeNewsAPI([article(0, 0)])
+    store.poll(api, 'AAPL')
+    assert store.poll(api, 'AAPL') == 0
+    assert len(api.calls) == 1
+
+
+@pytest.fixture
+def filled(store):
+    store.ingest([
+        article(1, 0, ('AAPL',), 0.4, "Apple beats earnings", ('earnings', 'technology')),
+        article(2, 10, ('AAPL', 'MSFT'), -0.3, "Rate cut hopes fade", ('economy_monetary',)),
+        article(3, 20, ('MSFT',), 0.05, "Microsoft cloud growth", ('technology',)),
+        article(4, 30, ('XOM',), -0.5, "Oil slides on supply", ('energy_transportation',)),
+    ])
+    return store
+
+
+def test_ingest_deduplicates_by_url(filled):
+    again = [article(1, 0), article(5, 40)]
+    assert filled.ingest(again) == 1
+    assert len(filled) == 5
+
+
+def test_ingest_skips_items_without_url_or_date(store):
+    assert store.ingest([{'title': 'no url', 'time_published': '20240102T100000'}, {'url': 'x'}]) == 0
+
+
+def ids(frame):
+    return list(frame['id'])
+
+
+def test_search_filters(filled):
+    assert len(filled.search()) == 4
+    assert ids(filled.search(tickers='aapl')) == [2, 1]
+    assert ids(filled.search(tickers=['AAPL', 'XOM'])) == [4, 2, 1]
+    assert ids(filled.search(topics='technology')) == [3, 1]
+    assert ids(filled.search(sentiment='negative')) == [4, 2]
+    assert ids(filled.search(sentiment='neutral')) == [3]
+    assert ids(filled.search(text='rate cut')) == [2]
+    assert ids(filled.search(text='micro*')) == [3]
+    assert ids(filled.search(since='2024-01-02 10:15')) == [4, 3]
+    assert ids(filled.search(tickers='MSFT', sentiment='neutral')) == [3]
+
+
+def test_search_sorts_and_limit(filled):
+    assert ids(filled.search(sort='sentiment_desc')) == [1, 3, 2, 4]
+    assert ids(filled.search(sort='sentiment_asc', limit=2)) == [4, 2]
+    relevance = filled.search(tickers='AAPL', sort='relevance')
+    assert relevance['relevance'].notna().all()
+    assert filled.search()['relevance'].isna().all()
+
+
+def test_search_rejects_unknown_options(filled):
+    with pytest.raises(ValueError):
+        filled.search(sort='oldest')
+    with pytest.raises(ValueError):
+        filled.search(sentiment='bullish')
+
+
+def test_text_search_is_safe(filled):
+    # Aspas e operadores do FTS5 viram termos comuns
+    assert ids(filled.search(text='"rate" OR NEAR(')) == []
+
+
+def test_summary_and_articles(filled):
+    summary = filled.summary(tickers='AAPL')
+    assert summary['count'] == 2 and summary['positive'] == 1 and summary['negative'] == 1
+    assert summary['average'] == pytest.approx(0.05)
+
+    articles = filled.articles([3, 2], tickers='MSFT')
+    assert [a['id'] for a in articles] == [3, 2]
+    assert {ts['ticker'] for ts in articles[1]['ticker_sentiment']} == {'AAPL', 'MSFT'}
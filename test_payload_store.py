@@ -0,0 +1,99 @@
+# test_payload_store.py
+from concurrent.futures import Future
+
+import numpy as np
+
+from payload_store import PayloadStore, deep_size
+
+MB = 1024 * 1024
+
+
+def block(mb):
+    return np.zeros(int(mb * MB) // 8)
+
+
+def test_shared_value_is_stored_once():
+    store = PayloadStore(session_bytes=10 * MB)
+    value = store.put('s1', 'profile', ('spy',), {'a': block(1)})
+    # Outra sessão com a mesma chave recebe o valor já guardado
+    assert store.put('s2', 'profile', ('spy',), {'a': block(1)}) is value
+    assert len(store) == 1
+
+    store.release('s1', 'profile')
+    assert store.get('s2', 'profile') is value
+    store.release('s2', 'profile')
+    assert len(store) == 0
+
+
+def test_repointing_a_slot_releases_the_old_key():
+    store = PayloadStore(session_bytes=10 * MB)
+    store.put('s1', 'profile', ('spy',), 'SPY')
+    store.put('s1', 'profile', ('qqq',), 'QQQ')
+    assert len(store) == 1
+    assert store.get('s1', 'profile') == 'QQQ'
+    assert store.get('s1', 'profile', ('spy',)) is None
+
+
+def test_replace_updates_every_session():
+    store = PayloadStore()
+    store.put('s1', 'result', ('k',), 'old')
+    store.put('s2', 'result', ('k',), 'new', replace=True)
+    assert store.get('s1', 'result') == 'new'
+
+
+def test_budget_drops_least_recently_used_slots():
+    store = PayloadStore(session_bytes=3 * MB)
+    store.put('s1', 'a', ('a',), block(1))
+    store.put('s1', 'b', ('b',), block(1))
+    store.get('s1', 'a')
+    store.put('s1', 'c', ('c',), block(1.5))
+
+    # 'b' foi usado há mais tempo e sai; 'a' (lido depois) continua
+    assert store.get('s1', 'b') is None
+    assert store.get('s1', 'a') is not None and store.get('s1', 'c') is not None
+    assert store.session_nbytes('s1') <= 3 * MB
+
+
+def test_budget_keeps_the_newest_slot_even_if_too_large():
+    store = PayloadStore(session_bytes=1 * MB)
+    store.put('s1', 'small', ('s',), block(0.5))
+    store.put('s1', 'big', ('b',), block(2))
+    assert store.get('s1', 'big') is not None
+    assert store.get('s1', 'small') is None
+
+
+def test_budget_of_one_session_does_not_release_another():
+    store = PayloadStore(session_bytes=1.5 * MB)
+    shared = store.put('s1', 'a', ('a',), block(1))
+    store.put('s2', 'a', ('a',), shared)
+    store.put('s2', 'b', ('b',), block(1))
+    assert store.get('s2', 'a') is None
+    assert store.get('s1', 'a') is shared
+
+
+def test_idle_sessions_are_evicted():
+    store = PayloadStore(idle_seconds=60)
+    store.put('old', 'a', ('a',), 'A')
+    store.put('new', 'b', ('b',), 'B')
+    store._sessions['old'].last_seen -= 120
+
+    assert store.evict_idle() == 1
+    assert store.sessions == 1 and len(store) == 1
+    assert store.get('new', 'b') == 'B'
+
+
+def test_pending_future_is_measured_when_done():
+    store = PayloadStore(session_bytes=10 * MB)
+    future = Future()
+    store.put('s1', 'bundle', ('f',), future)
+    before = store.nbytes
+
+    future.set_result(block(1))
+    assert store.get('s1', 'bundle') is future
+    assert store.nbytes >= before + MB
+
+
+def test_deep_size_counts_views_and_containers():
+    base = block(1)
+    assert deep_size({'x': base, 'y': [base[:10]]}) >= MB
+    assert deep_size(base[:10]) >= MB
@@ -0,0 +1,128 @@
+# test_price_store.py
+import os
+
+import numpy as np
+import pytest
+
+from price_store import PRICE_COLUMNS, PriceGapError, PriceStore
+
+
+def bars(days, start=100.0):
+    """Barras diárias sintéticas (índice em segundos e colunas OHLCV)"""
+    index = np.array(days, dtype='datetime64[D]').astype('datetime64[s]').astype('<i8')
+    close = start + np.arange(len(index), dtype=np.float64)
+    columns = {c: close.copy() for c in PRICE_COLUMNS}
+    return index, columns
+
+
+def business_days(start, count):
+    return np.busday_offset(np.datetime64(start, 'D'), np.arange(count), roll='forward')
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(tmp_path)
+
+
+def test_append_and_read(store):
+    index, columns = bars(business_days('2024-01-02', 10))
+    assert store.append('SPY', index, columns) == 10
+    series = store.read('SPY')
+    assert len(series) == 10
+    np.testing.assert_array_equal(series.close, columns['close'])
+
+
+def test_append_new_bars_and_update_last(store):
+    days = business_days('2024-01-02', 12)
+    index, columns = bars(days[:10])
+    store.append('SPY', index, columns)
+
+    # Reenvia as 3 últimas (a última com valor novo) e mais 2 barras
+    index, columns = bars(days[7:], start=107.0)
+    columns['close'][2] = 999.0
+    assert store.append('SPY', index, columns) == 2
+
+    series = store.read('SPY')
+    assert len(series) == 12
+    assert series.close[9] == 999.0
+    assert series.close[-1] == 111.0
+
+
+def test_backfill_older_history_rewrites(store):
+    days = business_days('2024-01-02', 20)
+    index, columns = bars(days[10:], start=110.0)
+    store.append('SPY', index, columns)
+
+    index, columns = bars(days, start=100.0)
+    assert store.append('SPY', index, columns) == 10
+
+    series = store.read('SPY')
+    np.testing.assert_array_equal(series.index.astype('datetime64[D]'), days)
+    np.testing.assert_array_equal(series.close, np.arange(100.0, 120.0))
+
+
+def test_gap_raises_and_writes_nothing(store):
+    days = business_days('2024-01-02', 200)
+    index, columns = bars(days[:50])
+    store.append('SPY', index, columns)
+    version = store.version('SPY')
+
+    # 'compact' que começa 100 pregões depois da última barra
+    index, columns = bars(days[150:])
+    with pytest.raises(PriceGapError):
+        store.append('SPY', index, columns, contiguous=True)
+    assert store.version('SPY') == version
+
+    # Sem contiguous continua anexando (ex: barras vindas do buffer intraday)
+    assert store.append('SPY', index, columns) == 50
+
+
+def test_next_session_after_weekend_is_not_a_gap(store):
+    index, columns = bars(['2024-01-04', '2024-01-05'])
+    store.append('SPY', index, columns)
+
+    index, columns = bars(['2024-01-08', '2024-01-09'])
+    assert store.append('SPY', index, columns, contiguous=True) == 2
+
+
+def test_upsert_daily_detects_gap(store):
+    index, columns = bars(business_days('2024-01-02', 5))
+    store.append('SPY', index, columns)
+
+    payload = {'Time Series (Daily)': {
+        '2024-06-03': {'1. open': '1', '2. high': '1', '3. low': '1', '4. close': '1', '5. volume': '1'},
+    }}
+    with pytest.raises(PriceGapError):
+        store.upsert_daily('SPY', payload)
+
+
+def test_intraday_gap(store):
+    start = np.datetime64('2024-01-02T14:30', 's').astype('<i8')
+    index = start + np.arange(10) * 300
+    columns = {c: np.ones(10) for c in PRICE_COLUMNS}
+    store.append('SPY', index, columns, interval='5min')
+
+    # Barra seguinte exata: sem buraco
+    assert store.append('SPY', index[-1:] + 300, {c: np.ones(1) for c in PRICE_COLUMNS},
+                        interval='5min', contiguous=True) == 1
+    with pytest.raises(PriceGapError):
+        store.append('SPY', index[-1:] + 3600, {c: np.ones(1) for c in PRICE_COLUMNS},
+                     interval='5min', contiguous=True)
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="requer /proc/self/fd")
+def test_open_files_are_bounded(tmp_path):
+    before = len(os.listdir('/proc/self/fd'))
+    store = PriceStore(tmp_path, max_open=8)
+    index, columns = bars(business_days('2024-01-02', 30))
+    symbols = [f"S{i:03d}" for i in range(120)]
+    for symbol in symbols:
+        store.append(symbol, index, columns)
+
+    for symbol in symbols:
+        assert len(store.read(symbol)) == 30
+    panel = store.panel(symbols, ('close', 'high'))
+    after = len(os.listdir('/proc/self/fd'))
+
+    assert panel['close'].shape == (30, 120)
+    assert after - before <= 8 * (len(PRICE_COLUMNS) + 1)
@@ -0,0 +1,70 @@
+# test_sector_exposure.py
+import os
+
+import numpy as np
+import pytest
+
+from cache_manager import CacheManager
+from sector_exposure import ExposureEngine, build_exposure
+
+PROFILES = {
+    'SPY': {'sectors': [{'sector': 'Information Technology', 'weight': '0.30'},
+                        {'sector': 'Financials', 'weight': '0.13'}]},
+    'XLK': {'sectors': [{'sector': 'INFORMATION TECHNOLOGY', 'weight': '0.99'}]},
+    'XLF': {'sectors': [{'sector': 'Financials', 'weight': '0.97'}]},
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    cache = CacheManager(tmp_path)
+    for symbol, profile in PROFILES.items():
+        cache.set(f"profile_{symbol}", profile)
+    return ExposureEngine(tmp_path)
+
+
+def saved(engine):
+    return sorted(p.name for p in engine.cache_dir.glob('exposure_*.npz'))
+
+
+def test_build_exposure():
+    table = build_exposure(PROFILES)
+    assert table.categories == ['INFORMATION TECHNOLOGY', 'FINANCIALS']
+    np.testing.assert_allclose(table.row('SPY'), [0.30, 0.13])
+    assert table.portfolio({'XLK': 1, 'XLF': 1})['FINANCIALS'] == pytest.approx(0.485)
+
+
+def test_universes_keep_their_own_files(engine, tmp_path):
+    engine.exposures(['SPY', 'XLK'])
+    engine.exposures(['SPY', 'XLF'])
+    assert len(saved(engine)) == 2
+
+    # Outra instância (outro processo) lê as duas do disco
+    other = ExposureEngine(tmp_path)
+    assert other.exposures(['XLK', 'SPY']).symbols == ['SPY', 'XLK']
+    assert other.exposures(['SPY', 'XLF']).symbols == ['SPY', 'XLF']
+
+
+def test_new_version_prunes_only_the_same_universe(engine, tmp_path):
+    engine.exposures(['SPY', 'XLK'])
+    engine.exposures(['SPY', 'XLF'])
+    before = saved(engine)
+
+    profile = tmp_path / 'profile_XLK.json'
+    stat = profile.stat()
+    os.utime(profile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    engine.exposures(['SPY', 'XLK'])
+
+    after = saved(engine)
+    assert len(after) == 2
+    assert len(set(before) & set(after)) == 1
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_file_removed_by_another_process_is_rebuilt(engine, tmp_path):
+    engine.exposures(['SPY', 'XLK'])
+    for path in tmp_path.glob('exposure_*.npz'):
+        path.unlink()
+
+    table = ExposureEngine(tmp_path).exposures(['SPY', 'XLK'])
+    assert table.symbols == ['SPY', 'XLK']
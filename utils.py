@@ -0,0 +1,102 @@
+# utils.py
+import multiprocessing
+
+import numpy as np
+
+
+def pool_context():
+    """
+    Contexto dos pools de processos (ProcessPoolExecutor)
+
+    O padrão no Linux é fork, que copia o processo inteiro - no app, com as
+    threads do Streamlit, isso pode travar o filho num lock herdado. Os
+    processos partem do forkserver (ou de spawn, onde ele não existe).
+
+    Returns:
+        multiprocessing.context.BaseContext: Contexto para mp_context
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def ffill(values):
+    """
+    Preenche lacunas repetindo o último valor finito de cada coluna
+
+    Args:
+        values (np.ndarray): Matriz 2D (linhas = barras, colunas = séries)
+
+    Returns:
+        np.ndarray: Nova matriz; NaN só antes do primeiro valor finito
+    """
+    rows = np.where(np.isfinite(values), np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+def safe_float(value, default=0):
+    """
+    Converte valores da API para float
+
+    A Alpha Vantage devolve números como string e usa 'None' ou '' para
+    campos ausentes.
+
+    Args:
+        value: Valor a converter
+        default: Valor retornado se a conversão falhar
+
+    Returns:
+        float: Valor convertido ou default
+    """
+    try:
+        if value is None or value == '' or value == 'None':
+            return default
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def sentiment_to_emoji(score):
+    """
+    Emoji de um score de sentimento da Alpha Vantage (-1 a 1)
+
+    Args:
+        score: Score (None = neutro)
+
+    Returns:
+        str: Emoji da faixa do score
+    """
+    if score is None:
+        return "😐"
+    score = float(score)
+    if score >= 0.35:
+        return "😊"
+    elif score >= 0.15:
+        return "🙂"
+    elif score >= -0.15:
+        return "😐"
+    elif score >= -0.35:
+        return "😟"
+    else:
+        return "😢"
+
+
+def sentiment_to_color(score):
+    """
+    Cor de um score de sentimento (verde, laranja ou vermelho)
+
+    Args:
+        score: Score (None = cinza)
+
+    Returns:
+        str: Nome da cor
+    """
+    if score is None:
+        return "gray"
+    score = float(score)
+    if score >= 0.15:
+        return "green"
+    elif score >= -0.15:
+        return "orange"
+    else:
+        return "red"